@@ -2,18 +2,24 @@
 
 import othello
 import brain
-import time
+import parallel
+import timer
 
 class AI():
   def __init__( self, board, color, opening_book, weight=None ):
     self.__board = board  # boardへの参照
     self.__color = color  # 自分の色
-    self.__brain_mid = brain.BrainMid(board, color, weight)  # 中盤戦用の探索アルゴリズム
-    self.__brain_fin = brain.BrainFin(board, color)          # 終盤戦用の探索アルゴリズム
+    self.__timer = timer.TimeManager(othello.Config.GAME_TIME, othello.Config.GAME_INCREMENT)  # 持ち時間の管理
+    self.__brain_mid = brain.BrainMid(board, color, weight, self.__timer)  # 中盤戦用の探索アルゴリズム
+    self.__brain_fin = brain.BrainFin(board, color, self.__timer)          # 終盤戦用の探索アルゴリズム
+    if othello.Config.SMP_THREADS > 1:  # Lazy SMPで並列探索する
+      smp = parallel.get_lazy_smp(othello.Config.SMP_THREADS, self.__brain_mid.get_shared_weight())
+      self.__brain_mid.set_smp(smp)
+      self.__brain_fin.set_smp(smp)
     if opening_book is None:
       self.__brain = self.__brain_mid
     else:
-      self.__brain = brain.BrainBook(board, color, opening_book)
+      self.__brain = brain.BrainBook(board, color, opening_book, self.__timer)
 
   def set_weight( self, weight ):
     self.__brain_mid.set_weight(weight)
@@ -26,16 +32,16 @@ class AI():
     return "AI"
 
   def take_turn( self, num_discs ):
-    start = time.time()
-
     if not self.__brain.is_valid(num_discs):
       self.__change_brain()
     pos = self.__brain.evaluate(num_discs)  # 着手位置の選択
     self.__board.put[pos](self.__color)     # 位置posに駒を置く
     self.__board.update_empty_cells(pos)    # 空マスリストの更新
-    elapsed_time = time.time() - start
+    elapsed_time = self.__timer.stop()
 
     print ("elapsed_time:{0}".format(elapsed_time) + "[sec]")
+    if self.__timer.remaining is not None:
+      print ("remaining_time:{0}".format(self.__timer.remaining) + "[sec]")
     return pos
 
   def __change_brain( self ):
@@ -0,0 +1,343 @@
+# -*- coding:utf-8 -*-
+
+# 盤面表現・探索の性能計測
+# 使い方: cd src; python benchmark.py <項目名>
+
+import os
+import sys
+import time
+import random
+import tempfile
+import ctypes
+import multiprocessing
+
+import othello
+import board
+import bitboard
+import brain
+import parallel
+import weights
+
+# 乱数の種を固定したランダム対局の棋譜((位置, 色)のリスト)を返す
+def random_games(num_games, seed=0):
+  rand = random.Random(seed)
+  b = board.Board(False)
+  games = []
+  for i in range(num_games):
+    b.init()
+    moves = []
+    color = 0
+    passed = False
+    while 1:
+      cells = b.placeable_cells(color)
+      if len(cells):
+        pos = rand.choice(cells)
+        b.put[pos](color)
+        b.update_empty_cells(pos)
+        moves.append((pos, color))
+        passed = False
+      elif passed:
+        break
+      else:
+        passed = True
+      color = not color
+    games.append(moves)
+  return games
+
+# 盤面の実装毎に,1秒あたりに処理できる局面数を計測する
+# 着手のみ, 着手可能位置の列挙 + 着手, 着手 + 特徴量の計算 の3通り
+def bench_board(num_games=200):
+  games = random_games(num_games)
+  num_positions = sum(len(moves) for moves in games)
+  print "%d games, %d positions" % (num_games, num_positions)
+  for name, cls in (("Board", board.Board), ("BitBoard", bitboard.BitBoard)):
+    b = cls(False)
+    start = time.time()
+    for moves in games:
+      b.init()
+      for pos, color in moves:
+        b.put[pos](color)
+    put_time = time.time() - start
+
+    start = time.time()
+    for moves in games:
+      b.init()
+      for pos, color in moves:
+        b.placeable_cells(color)
+        b.put[pos](color)
+        b.update_empty_cells(pos)
+    move_time = time.time() - start
+
+    start = time.time()
+    for moves in games:
+      b.init()
+      for pos, color in moves:
+        b.put[pos](color)
+        b.get_features()
+    feature_time = time.time() - start
+
+    print "%-9s put: %9.0f pos/sec   put+placeable: %9.0f pos/sec   put+features: %9.0f pos/sec" % (
+      name, num_positions / put_time, num_positions / move_time, num_positions / feature_time)
+
+# 盤面評価関数の値を, 全パターンから計算し直す場合と putAt* で差分更新する場合で
+# 1秒あたりに評価できる局面数を比べる. MoveOrderingと同じく, 各局面の全ての着手について 着手 + 評価 + undo を行う
+def bench_eval(num_games=200):
+  b = board.Board(False)
+  states = []
+  for moves in random_games(num_games):
+    b.init()
+    for pos, color in moves:
+      states.append((b.get_state(), color))
+      b.put[pos](color)
+  weight = brain.BrainMid(b, 0).get_weight()[8]
+  tables = [(weight[pattern], weights.CANONICAL[pattern]) for pattern in board.FEATURE_PATTERNS]
+  for name, incremental in (("full", False), ("incremental", True)):
+    b.set_evaluator(weight if incremental else None)
+    num_children = 0
+    start = time.time()
+    for state, color in states:
+      b.restore_state(state)
+      for pos in b.placeable_cells(color):
+        b.put[pos](color)
+        if incremental:
+          b.get_score()
+        else:
+          sum(table[canonical[f]] for (table, canonical), f in zip(tables, b.get_features())) + b.get_mobility(0)
+        b.undo()
+        num_children += 1
+    print "%-11s put+eval+undo: %9.0f pos/sec" % (name, num_children / (time.time() - start))
+
+# Indexのテーブルのサイズと,
+# テーブルを計算して保存する場合(初回起動)と保存済みのファイルをmmapする場合の起動時間を計測する
+def bench_index():
+  print "put/takes tables: %8.1f KB" % (sum(ctypes.sizeof(table) for table in board.Index().get_tables()) / 1024.0)
+  tmp_dir = tempfile.mkdtemp()
+  index_file = board.INDEX_FILE
+  board.INDEX_FILE = os.path.join(tmp_dir, 'index.bin')
+  try:
+    start = time.time()
+    board.Index()
+    print "cold (build + save): %8.2f ms" % ((time.time() - start) * 1000)
+    start = time.time()
+    board.Index()
+    print "warm (mmap):         %8.2f ms" % ((time.time() - start) * 1000)
+  finally:
+    if os.path.exists(board.INDEX_FILE):
+      os.remove(board.INDEX_FILE)
+    os.rmdir(tmp_dir)
+    board.INDEX_FILE = index_file
+
+# ランダム対局の石数num_discsの局面を(棋譜, 手番)のリストで返す. 手番に着手可能位置がない局面は除く
+def positions(num_positions, num_discs, seed=0):
+  b = board.Board(False)
+  res = []
+  for moves in random_games(num_positions * 2, seed):
+    if len(moves) <= num_discs:
+      continue
+    b.init()
+    for pos, color in moves[:num_discs]:
+      b.put[pos](color)
+    color = moves[num_discs][1]
+    if b.placeable_cells(color):
+      res.append((moves[:num_discs], color))
+    if len(res) == num_positions:
+      break
+  return res
+
+# 局面(棋譜, 手番)のリストをbrain_classで探索し, 探索した内部節点の数と時間の合計を返す
+def search(brain_class, games, num_discs):
+  b = board.Board(False)
+  nodes = 0
+  start = time.time()
+  for moves, color in games:
+    b.init()
+    for pos, c in moves:
+      b.put[pos](c)
+      b.update_empty_cells(pos)
+    brain = brain_class(b, color)
+    brain.evaluate(num_discs)
+    nodes += brain.get_nodes()
+  return nodes, time.time() - start
+
+# killer move と history heuristic の有無で, 同じ局面を同じ深さまで探索したときの節点数を比べる
+# 中盤: 石数20,30,40の局面を深さ5(時間制限・Multi-ProbCutなし), 終盤: 空きマス12の局面を読み切り
+def bench_ordering(num_positions=10):
+  othello.Config.MID_HEIGHT = 5
+  othello.Config.MID_TIME = float('inf')
+  othello.Config.MPC_T = None
+  weight = brain.BrainMid(board.Board(False), 0).get_weight()
+  mid = [(positions(num_positions, n, n), n) for n in (20, 30, 40)]
+  fin = positions(num_positions, 48, 48)
+  for flag in (False, True):
+    othello.Config.KILLER_HISTORY = flag
+    mid_nodes = mid_time = 0
+    for games, n in mid:
+      nodes, t = search(lambda b, color: brain.BrainMid(b, color, weight), games, n)
+      mid_nodes += nodes
+      mid_time += t
+    fin_nodes, fin_time = search(brain.BrainFin, fin, 48)
+    print "killer/history %-5s  mid: %8d nodes %6.2f sec   fin: %8d nodes %6.2f sec" % (
+      flag, mid_nodes, mid_time, fin_nodes, fin_time)
+
+# ルート分割の並列探索のワーカー数を変えて, 同じ局面を同じ深さまで探索する時間を比べる
+# 石数20,30,40の局面を深さ6(時間制限・Multi-ProbCutなし). ワーカー数1は並列化しない探索
+# ワーカー数はコマンドライン引数でも指定できる (例: python benchmark.py rootsplit 1 2 4)
+def bench_rootsplit(num_positions=5):
+  othello.Config.MID_HEIGHT = 6
+  othello.Config.MID_TIME = float('inf')
+  othello.Config.MPC_T = None
+  weight = brain.BrainMid(board.Board(False), 0).get_shared_weight()
+  games = [(positions(num_positions, n, n), n) for n in (20, 30, 40)]
+  workers = [int(arg) for arg in sys.argv[2:]] or [1, 2, 4, 8, 16]
+  base = None
+  for num_workers in workers:
+    othello.Config.MID_WORKERS = num_workers
+    if num_workers > 1:
+      parallel.get_root_splitter(num_workers, weight)  # プロセスプールを作る時間は含めない
+    total = 0
+    for positions_n, n in games:
+      nodes, t = search(lambda b, color: brain.BrainMid(b, color, weight), positions_n, n)
+      total += t
+    if base is None:
+      base = total
+    print "workers %2d  %6.2f sec  speedup %.2f" % (num_workers, total, base / total)
+
+# プロセスのメモリ使用量 (PSS, プライベートなページ) [MB]. /proc/<pid>/smaps から求める
+def memory_usage(pid):
+  pss = private = 0
+  for line in open("/proc/%d/smaps" % pid):
+    if line.startswith("Pss:"):
+      pss += int(line.split()[1])
+    elif line.startswith("Private_"):
+      private += int(line.split()[1])
+  return pss / 1024.0, private / 1024.0
+
+# ルート分割のワーカー数を変えて, 同じ局面を探索した後のワーカー1つあたりのメモリ使用量を比べる
+# 重みを共有するハンドル(weights.SharedWeights)で渡す場合と, テキスト形式から読んだ重みのリストをfork時に引き継ぐ場合
+# ワーカー数はコマンドライン引数でも指定できる (例: python benchmark.py memory 1 2 4 8)
+def bench_memory(num_positions=3, num_discs=30, height=4):
+  games = positions(num_positions, num_discs, num_discs)
+  b = board.Board(False)
+  states = []
+  for moves, color in games:
+    b.init()
+    for pos, c in moves:
+      b.put[pos](c)
+    states.append((b.get_state(), color, b.placeable_cells(color)))
+  workers = [int(arg) for arg in sys.argv[2:]] or [1, 2, 4, 8]
+  shared = weights.share(brain.BrainMid.NUM_STAGES, brain.BrainMid.NUM_PATTARNS)
+  lists = weights.load_text(brain.BrainMid.NUM_STAGES, brain.BrainMid.NUM_PATTARNS)
+  for name, weight in (("shared", shared), ("list", lists)):
+    for num_workers in workers:
+      splitter = parallel.RootSplitter(num_workers, weight)
+      for state, color, list_pos in states:
+        splitter.search(state, color, num_discs, height, list_pos, -othello.Config.INF, othello.Config.INF, float('inf'))
+      usage = [memory_usage(p.pid) for p in multiprocessing.active_children()]
+      splitter.close()
+      print "%-6s workers %2d  PSS/worker %7.1f MB  private/worker %7.1f MB  PSS total %8.1f MB" % (
+        name, num_workers, sum(pss for pss, _ in usage) / len(usage), sum(private for _, private in usage) / len(usage),
+        sum(pss for pss, _ in usage))
+
+# YBWCによる終盤読み切りの並列化のワーカー数を変えて, 同じ局面を読み切る時間を比べる
+# 局面は乱数の種を固定したランダム対局の空きマス12の局面. ワーカー数1は並列化しない探索
+# ワーカー数はコマンドライン引数でも指定できる (例: python benchmark.py ybwc 1 2 4)
+def bench_ybwc(num_positions=5, empties=12):
+  games = positions(num_positions, 60 - empties, 60 - empties)
+  workers = [int(arg) for arg in sys.argv[2:]] or [1, 2, 4, 8, 16]
+  base = None
+  for num_workers in workers:
+    othello.Config.FIN_WORKERS = num_workers
+    if num_workers > 1:
+      parallel.get_ybwc_splitter(num_workers)  # プロセスプールを作る時間は含めない
+    nodes, t = search(brain.BrainFin, games, 60 - empties)
+    if base is None:
+      base = t
+    print "workers %2d  %6.2f sec  speedup %.2f  (nodes in main process %d)" % (num_workers, t, base / t, nodes)
+
+# Config.<attr>をoffとonにして, 同じ局面を読み切る節点数と時間を比べる
+# 局面は乱数の種を固定したランダム対局の空きマスemptiesの局面
+def _bench_fin_toggle(name, attr, off, on, empties=12, num_positions=10):
+  games = positions(num_positions, 60 - empties, 60 - empties)
+  for value in (off, on):
+    setattr(othello.Config, attr, value)
+    nodes, t = search(brain.BrainFin, games, 60 - empties)
+    setting = "%s=%s" % (attr, value)
+    print "%-9s %-26s fin: %8d nodes %6.2f sec %7.0f nodes/sec" % (name, setting, nodes, t, nodes / t)
+
+# 偶奇(parity)による手の順序付けの有無
+def bench_parity():
+  _bench_fin_toggle("parity", "FIN_PARITY", False, True)
+
+# 残り4マス以下の専用の読み切り関数の有無
+def bench_last():
+  _bench_fin_toggle("last", "FIN_LAST_SOLVER", False, True)
+
+# 終盤読み切りの置換表の有無と, 置換表を使うときのEnhanced Transposition Cutoff(既定で無効なら深さ7以上)の有無
+def bench_fintt():
+  _bench_fin_toggle("tt", "FIN_TT_HEIGHT", 61, othello.Config.FIN_TT_HEIGHT)
+  _bench_fin_toggle("etc", "FIN_ETC_HEIGHT", None, othello.Config.FIN_ETC_HEIGHT or 7)
+
+# 空きマス14の局面で, 石差を読み切る場合(FIN_EXACT_HEIGHT=14)と勝敗(WLD)だけを読み切る場合(13)
+def bench_wld(empties=14):
+  othello.Config.FIN_WLD_HEIGHT = empties
+  _bench_fin_toggle("wld", "FIN_EXACT_HEIGHT", empties, empties - 1, empties, 5)
+
+# 確定石による枝刈りの有無
+def bench_stability():
+  _bench_fin_toggle("stability", "FIN_STABILITY_HEIGHT", 61, othello.Config.FIN_STABILITY_HEIGHT)
+
+# float32とint16に量子化した重みで, 同じ局面を同じ深さまで探索して選ぶ手・評価値と時間を比べる
+# 石数20,30,40の局面を深さ5(時間制限なし). 選ぶ手が全て同じなら量子化による読み違いはない
+def bench_quantize(num_positions=10, height=5):
+  othello.Config.MID_HEIGHT = height
+  othello.Config.MID_TIME = float('inf')
+  games = [(positions(num_positions, n, n), n) for n in (20, 30, 40)]
+  b = board.Board(False)
+  results = {}
+  for typecode in ('f', 'h'):
+    shared = weights.share(brain.BrainMid.NUM_STAGES, brain.BrainMid.NUM_PATTARNS, typecode=typecode)
+    moves = []
+    values = []
+    nodes = 0
+    start = time.time()
+    for positions_n, n in games:
+      for game, color in positions_n:
+        b.init()
+        for pos, c in game:
+          b.put[pos](c)
+          b.update_empty_cells(pos)
+        mid = brain.BrainMid(b, color, shared)
+        moves.append(mid.evaluate(n))
+        values.append(mid.search_value(n, 1, height))
+        nodes += mid.get_nodes()
+    results[typecode] = moves, values
+    print "%-5s %8d nodes %6.2f sec  table: %6.1f MB" % (
+      {'f': "float", 'h': "int16"}[typecode], nodes, time.time() - start, os.path.getsize(shared.file_name) / 1048576.0)
+  same = sum(1 for f, h in zip(results['f'][0], results['h'][0]) if f == h)
+  error = max(abs(f - h) for f, h in zip(results['f'][1], results['h'][1]))
+  print "same move: %d/%d  max eval error: %.4f discs" % (same, len(results['f'][0]), error)
+
+BENCHMARKS = {
+  "board": bench_board,
+  "eval": bench_eval,
+  "fintt": bench_fintt,
+  "index": bench_index,
+  "last": bench_last,
+  "memory": bench_memory,
+  "ordering": bench_ordering,
+  "parity": bench_parity,
+  "quantize": bench_quantize,
+  "rootsplit": bench_rootsplit,
+  "stability": bench_stability,
+  "wld": bench_wld,
+  "ybwc": bench_ybwc,
+}
+
+def main():
+  if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+    print "usage: python benchmark.py [%s]" % "|".join(sorted(BENCHMARKS))
+    return
+  BENCHMARKS[sys.argv[1]]()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,275 @@
+# -*- coding:utf-8 -*-
+
+import functools
+
+import othello
+import board
+import cells
+import weights
+
+#######################################################################################################################
+# ビットボード用の定数・ルックアップテーブル
+# 位置pos(= x + y * 8)をbit posに対応させる
+
+FULL = 0xFFFFFFFFFFFFFFFF
+
+# 各ラインのマスを1byteに集める (X >> shift) & mask) * magic >> 56 のパラメータと,
+# 集めた1byteからラインのコードの3進数値への変換テーブル
+# 未使用のマスは空マス扱いなので, コード = 6560 - 2 * 黒 - 白 となる
+def _init_lines():
+  res = []
+  for line, line_cells in enumerate(cells.LINE_CELLS):
+    table = [0] * 256
+    if line < 8:     # 水平
+      shift, mask, magic = line * 8, 0xFF, 1 << 56
+      gathered = [pos % 8 for pos, _ in line_cells]
+    elif line < 16:  # 垂直
+      shift, mask, magic = line - 8, 0x0101010101010101, 0x0102040810204080
+      gathered = [pos / 8 for pos, _ in line_cells]
+    else:            # 斜め
+      shift, mask, magic = 0, sum(1 << pos for pos, _ in line_cells), 0x0101010101010101
+      gathered = [pos % 8 for pos, _ in line_cells]
+    for byte in range(256):
+      for bit, (_, x) in zip(gathered, line_cells):
+        if byte >> bit & 1:
+          table[byte] += 3 ** x
+    res.append((shift, mask, magic, table))
+  return tuple(res)
+
+LINES = _init_lines()
+
+EDGES = (0, 7, 8, 15)  # 4辺のライン
+
+CORNERS = cells.CORNERS
+popcount = cells.popcount
+
+# colorの石がp, 相手の石がoのときのcolorの着手可能位置をbitで返す
+def moves(p, o):
+  empty = ~(p | o) & FULL
+  h = o & 0x7e7e7e7e7e7e7e7e  # 左右端を跨がないようにマスク
+  res = 0
+  for shift, m in ((1, h), (8, o), (7, h), (9, h)):
+    t = m & (p << shift)
+    t |= m & (t << shift)
+    t |= m & (t << shift)
+    t |= m & (t << shift)
+    t |= m & (t << shift)
+    t |= m & (t << shift)
+    res |= t << shift
+    t = m & (p >> shift)
+    t |= m & (t >> shift)
+    t |= m & (t >> shift)
+    t |= m & (t >> shift)
+    t |= m & (t >> shift)
+    t |= m & (t >> shift)
+    res |= t >> shift
+  return res & empty
+
+# colorの石がp, 相手の石がoのときに位置posに置いて裏返る石をbitで返す
+# posから各方向にoの石を辿り(movesと同じマスク付きシフト), 辿った先がpの石の方向だけを裏返す
+def flips(pos, p, o):
+  x = 1 << pos
+  h = o & 0x7e7e7e7e7e7e7e7e  # 左右端を跨がないようにマスク
+  res = 0
+  for shift, m in ((1, h), (8, o), (7, h), (9, h)):
+    t = m & (x << shift)
+    if t:  # 隣が相手の石でない方向は裏返らない
+      t |= m & (t << shift)
+      t |= m & (t << shift)
+      t |= m & (t << shift)
+      t |= m & (t << shift)
+      t |= m & (t << shift)
+      if p & (t << shift):
+        res |= t
+    t = m & (x >> shift)
+    if t:  # 隣が相手の石でない方向は裏返らない
+      t |= m & (t >> shift)
+      t |= m & (t >> shift)
+      t |= m & (t >> shift)
+      t |= m & (t >> shift)
+      t |= m & (t >> shift)
+      if p & (t >> shift):
+        res |= t
+  return res
+
+
+#######################################################################################################################
+# ビットボード（= 黒石・白石をそれぞれ64bit整数で表現）
+# Boardと同じインターフェースを持ち, Boardの代わりにBrainMid, BrainFin, Learnerから使用できる
+class BitBoard:
+  def __init__(self, visible):
+    if visible:   # GUI関連の設定
+      self.__screen = board.Screen()
+
+    # 盤面状態の初期値
+    self.__INITIAL_STATE = ((1 << 28) | (1 << 35), (1 << 27) | (1 << 36))  # (黒, 白)
+    self.__INITIAL_EMPCELL = [0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,29,30,31,32,33,34,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63]
+
+    self.__disc = [0, 0]  # 盤面の実体 [黒, 白]
+    self.__journal = []   # put毎の変更履歴. (色, 裏返した石, 置いた石)を積む
+    self.__index = board.Index()  # 辺の確定石のテーブルだけを使う
+    self.__eval = None            # features()の各要素の重みのテーブルのリスト(set_evaluator)
+    self.__eval_scale = 1         # 重みの1石あたりの値
+
+    # マス毎に関数を用意
+    self.put       = [functools.partial(self.__put, pos) for pos in range(64)]
+    self.placeable = [functools.partial(self.__placeable, pos) for pos in range(64)]
+    self.takes     = [functools.partial(self.__takes, pos) for pos in range(64)]
+    self.init()
+
+  def init(self):
+    self.__disc = list(self.__INITIAL_STATE)
+    del self.__journal[:]
+    self.__empty_cells = list(self.__INITIAL_EMPCELL)
+    self.__prev_state = None  # Undo用
+    self.__prev_empty_cells = None
+
+  def at(self, x, y):
+    if self.__disc[0] >> (x + y * 8) & 1:
+      return othello.Config.BLACK
+    if self.__disc[1] >> (x + y * 8) & 1:
+      return othello.Config.WHITE
+    return othello.Config.EMPTY
+
+  def print_board(self, pos_putted, turn):
+    self.__screen.draw(self, pos_putted, turn)
+
+  # 駒の数をプリントする
+  def print_result(self):
+    print "BLACK:", popcount(self.__disc[0]), " WHITE:", popcount(self.__disc[1])
+
+  # color色の着手可能位置をbitで返す
+  def legal_moves_mask(self, color):
+    return moves(self.__disc[color], self.__disc[not color])
+
+  def placeable_cells(self, color):
+    mask = moves(self.__disc[color], self.__disc[not color])
+    return [pos for pos in self.__empty_cells if mask >> pos & 1]
+
+  # 重み付けされた着手可能数を返す
+  def placeable_cells_num(self, color):
+    mask = moves(self.__disc[color], self.__disc[not color])
+    return popcount(mask) + popcount(mask & CORNERS)
+
+  # ==================== 評価関数関連 ====================
+  # 端の4辺中の確定石数を返す
+  def get_settled(self, color):
+    settled = self.__index.get_settled
+    res = sum(settled(code, 0) for code in self.__edge_codes())
+    if color:
+      return -res
+    return res
+
+  # color色の確定石数を返す. 4辺の確定石から盤面全体の確定石を求める
+  def get_stable(self, color):
+    edge = 0
+    for line, code in zip(EDGES, self.__edge_codes()):
+      edge |= cells.LINE_TO_SQUARES[line*256+self.__index.get_stable(code)]
+    return popcount(cells.stable_discs(self.__disc[color], self.__disc[not color], edge))
+
+  # 着手可能位置数差を返す.
+  # Boardと同じく38ラインそれぞれの着手可能位置数の和で, 複数方向に着手可能なマスは方向の数だけカウントされる
+  # (盤面評価関数の重みはこの値で学習しているので, Boardと同じ値にする)
+  def get_mobility(self, color):
+    return self.__line_mobility(self.__line_codes(), color)
+
+  # 石差を返す
+  def get_difference(self, color):
+    return popcount(self.__disc[color]) - popcount(self.__disc[not color])
+
+  # logistelloパターンの各値を返す
+  def get_features(self):
+    return board.features(self.__line_codes())
+
+  # 盤面評価関数に使う重みを設定する(Board.set_evaluatorと同じ). BitBoardは差分計算せず, get_scoreのたびに計算する
+  def set_evaluator(self, weight, scale=1):
+    if weight is None:
+      self.__eval = None
+      return
+    self.__eval = [weight[pattern] for pattern in board.FEATURE_PATTERNS]
+    self.__eval_scale = scale
+
+  # 黒から見た評価値(パターンの重みの和 + 着手可能位置数差 * scale)を返す
+  def get_score(self):
+    codes = self.__line_codes()
+    feature = board.features(codes)
+    score = sum(table[weights.CANONICAL[pattern][f]]
+                for table, pattern, f in zip(self.__eval, board.FEATURE_PATTERNS, feature))
+    return score + self.__line_mobility(codes, 0) * self.__eval_scale
+
+  # 局面(盤面と手番color)のハッシュ値を返す. 置換表のキーに使う
+  def hash(self, color):
+    return hash((self.__disc[0], self.__disc[1], color))
+
+  # 38ラインのコードcodesから着手可能位置数差を求める
+  def __line_mobility(self, codes, color):
+    mobility = self.__index.get_mobility
+    return sum(mobility(code, color) for code in codes)
+
+  # Boardの38ラインのコードを計算する
+  def __line_codes(self):
+    b, w = self.__disc
+    return [6560 - 2 * t[((b >> s) & m) * k >> 56 & 0xFF] - t[((w >> s) & m) * k >> 56 & 0xFF] for s, m, k, t in LINES]
+
+  # 4辺(EDGES)のラインのコードを計算する
+  def __edge_codes(self):
+    b, w = self.__disc
+    return [6560 - 2 * t[((b >> s) & m) * k >> 56 & 0xFF] - t[((w >> s) & m) * k >> 56 & 0xFF]
+            for s, m, k, t in (LINES[line] for line in EDGES)]
+
+  # ==================== Undo 関連 =====================
+  def get_state(self):
+    return tuple(self.__disc)
+
+  def restore_state(self, state):
+    self.__disc = list(state)
+    del self.__journal[:]
+
+  # 直前のputを取り消す
+  def undo(self):
+    journal = self.__journal
+    bit = journal.pop()
+    flips = journal.pop()
+    color = journal.pop()
+    self.__disc[color] ^= flips | bit
+    self.__disc[not color] ^= flips
+
+  # 直前のputの結果を返す. redoに渡すと, 裏返る石を求め直さずにputをやり直せる
+  def get_child(self):
+    return tuple(self.__journal[-3:])
+
+  # get_childで得たputをやり直す. undoで取り消せる(putと同じ)
+  def redo(self, child):
+    color, flips, bit = child
+    self.__journal.extend(child)
+    self.__disc[color] |= flips | bit
+    self.__disc[not color] ^= flips
+
+  def store_state(self):
+    self.__prev_state = self.get_state()
+    self.__prev_empty_cells = list(self.__empty_cells)
+
+  def load_state(self):
+    self.restore_state(self.__prev_state)
+    self.__empty_cells = self.__prev_empty_cells
+  # ==================================================
+
+  # 空マスリストの更新
+  def update_empty_cells(self, pos):
+    self.__empty_cells.remove(pos)
+
+  def __put(self, pos, color):
+    flipped = flips(pos, self.__disc[color], self.__disc[not color])
+    self.__journal.append(color)
+    self.__journal.append(flipped)
+    self.__journal.append(1 << pos)
+    self.__disc[color] |= flipped | (1 << pos)
+    self.__disc[not color] ^= flipped
+
+  def __placeable(self, pos, color):
+    return moves(self.__disc[color], self.__disc[not color]) >> pos & 1 == 1
+
+  def __takes(self, pos, color):
+    if (self.__disc[0] | self.__disc[1]) >> pos & 1:
+      return 0
+    return popcount(flips(pos, self.__disc[color], self.__disc[not color]))
@@ -1,54 +1,163 @@
 # -*- coding:utf-8 -*-
 
+import os
+import mmap
+import zlib
+import array
+import ctypes
+import struct
+import random
+
 import pygame
 import othello
+import cells
+import weights
 
 #######################################################################################################################
 # 盤面状態に関する情報を事前計算して格納
 # e.g. ある盤面状態の時に位置(x,y)に石が置かれた場合の盤面状態の遷移先, ある盤面状態の時の確定石数や着手可能手数や石差
+# 各テーブルは型付きの1次元配列で, 一度計算したらINDEX_FILEに保存し, 以降の起動ではmmapで読み込むだけにする.
+# (mmapしたページは複数のプロセスで共有される)
+
+INDEX_FILE    = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'idx', 'index.bin')
+INDEX_VERSION = 3 # テーブルの内容・配置を変えたら上げる(古いINDEX_FILEは作り直される)
+
 class Index:
+  PATTERNS_NUM = 3 ** 8
+
+  # INDEX_FILE中のテーブルの並び: (名前, 型, 要素数)
+  TABLES = (
+    ('new_code',   'H', PATTERNS_NUM * 8 * 2), # 位置xにcolor色の駒を置いたあとのコード. 添字は(code*8+x)*2+color
+    ('flip_left',  'B', PATTERNS_NUM * 8 * 2), # そのときに左側で裏返る駒の数
+    ('flip_right', 'B', PATTERNS_NUM * 8 * 2), # そのときに右側で裏返る駒の数
+    ('takes',      'B', PATTERNS_NUM * 8 * 2), # そのときに裏返る駒の数
+    ('legal',      'B', PATTERNS_NUM * 2),     # color色の駒を置くと駒が裏返る位置のbitmask. 添字はcode*2+color
+    ('flip_disk',  'H', PATTERNS_NUM * 8),     # 位置xの駒が裏返ったあとのコード. 添字はcode*8+x
+    ('mobility',   'b', PATTERNS_NUM),
+    ('settled',    'b', PATTERNS_NUM),         # 確定石数(黒:正,白:負)
+    ('stable',     'B', PATTERNS_NUM),         # 辺として見たときの確定石の位置のbitmask
+    ('discs',      'B', PATTERNS_NUM * 2),     # color色の駒の位置のbitmask. 添字はcode*2+color
+    ('difference', 'b', PATTERNS_NUM),
+  )
+  CTYPES = {'H': ctypes.c_uint16, 'B': ctypes.c_uint8, 'b': ctypes.c_int8}
+  HEADER = struct.Struct('=4sIII') # マジックナンバー, INDEX_VERSION, テーブル部のサイズ, テーブル部のCRC32
+
   def __init__(self):
-    PATTERNS_NUM = 3 ** 8
-    self.__matrix     = [[[ [[0,0],[0,0]], [0, 0], [0, 0], 0] for j in range(8)] for i in range(PATTERNS_NUM)]
-    self.__mobility   = [0 for i in range(PATTERNS_NUM)]
-    self.__settled    = [0 for i in range(PATTERNS_NUM)]
-    self.__difference = [0 for i in range(PATTERNS_NUM)]
-    for code in range(PATTERNS_NUM):
-      self.__init_row(code)
+    tables = Index.__load(INDEX_FILE)
+    if tables is None:  # ファイルが無いか古い -> 計算し直して保存
+      tables = Index.__build()
+      if Index.__save(INDEX_FILE, tables):
+        tables = Index.__load(INDEX_FILE) or tables
+    self.__new_code   = tables['new_code']
+    self.__flip_left  = tables['flip_left']
+    self.__flip_right = tables['flip_right']
+    self.__takes      = tables['takes']
+    self.__flip_disk  = tables['flip_disk']
+    self.__legal      = tables['legal']
+    self.__mobility   = tables['mobility']
+    self.__settled    = tables['settled']
+    self.__stable     = tables['stable']
+    self.__discs      = tables['discs']
+    self.__difference = tables['difference']
+
+  # INDEX_FILEをmmapしてテーブルを返す. ファイルが無い,またはバージョン・チェックサムが合わない場合はNone
+  @classmethod
+  def __load(cls, file_name):
+    try:
+      f = open(file_name, 'rb')
+    except IOError:
+      return None
+    try:
+      mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)  # 書き込まないのでページは共有されたまま
+    except (ValueError, mmap.error):
+      return None
+    finally:
+      f.close()
+    size = sum(ctypes.sizeof(cls.CTYPES[typecode]) * num for _, typecode, num in cls.TABLES)
+    if len(mm) != cls.HEADER.size + size:
+      return None
+    magic, version, payload_size, crc = cls.HEADER.unpack_from(mm)
+    if magic != 'OIDX' or version != INDEX_VERSION or payload_size != size:
+      return None
+    if zlib.crc32(mm[cls.HEADER.size:]) & 0xffffffff != crc:
+      return None
+    tables = {}
+    offset = cls.HEADER.size
+    for name, typecode, num in cls.TABLES:
+      tables[name] = (cls.CTYPES[typecode] * num).from_buffer(mm, offset)
+      offset += ctypes.sizeof(tables[name])
+    return tables
+
+  # テーブルをINDEX_FILEに書き出す. 書き込めなければFalse
+  @classmethod
+  def __save(cls, file_name, tables):
+    payload = ''.join(tables[name].tostring() for name, _, _ in cls.TABLES)
+    header = cls.HEADER.pack('OIDX', INDEX_VERSION, len(payload), zlib.crc32(payload) & 0xffffffff)
+    tmp_name = file_name + '.%d.tmp' % os.getpid()
+    try:
+      if not os.path.isdir(os.path.dirname(file_name)):
+        os.makedirs(os.path.dirname(file_name))
+      f = open(tmp_name, 'wb')
+      f.write(header)
+      f.write(payload)
+      f.close()
+      os.rename(tmp_name, file_name)  # 書きかけのファイルを読まれないように置き換える
+    except (IOError, OSError):
+      return False
+    return True
 
-  # __matrix[code]の初期化
-  def __init_row(self, code):
+  # 全テーブルを計算する
+  @classmethod
+  def __build(cls):
+    tables = dict((name, array.array(typecode, [0] * num)) for name, typecode, num in cls.TABLES)
+    for code in range(cls.PATTERNS_NUM):
+      cls.__init_row(tables, code)
+    # 確定石は着手後の局面の確定石から求めるので, 空きマスの少ないコードから計算する
+    for code in sorted(range(cls.PATTERNS_NUM), key=lambda code: Index.__decode(code).count(2)):
+      cls.__init_stable(tables, code)
+    return tables
+
+  # codeに関する各テーブルの要素の初期化
+  @classmethod
+  def __init_row(cls, tables, code):
     line = Index.__decode(code)  # codeをデコード
     for x in range(8):
-      self.__init_element(code, x, line)  # lineの位置xに駒を置くときの処理を計算する
-    for color in [0, 1]:
-      flag = True
-      for cell in line:
-        if cell == color:
-          if cell == 0:
-            self.__settled[code] += 1
-          else:
-            self.__settled[code] -= 1
-        else:
-          flag = False
-          break
-      for cell in line[::-1]:
-        if cell == color:
-          if cell == 0:
-            self.__settled[code] += 1
-          else:
-            self.__settled[code] -= 1
-        else:
-          break
+      cls.__init_element(tables, code, x, line)  # lineの位置xに駒を置くときの処理を計算する
+    for x, cell in enumerate(line):
+      if cell != 2:
+        tables['discs'][code * 2 + cell] |= 1 << x
     for cell in line:
       if cell == 0:
-        self.__difference[code] += 1
+        tables['difference'][code] += 1
       elif cell == 1:
-        self.__difference[code] -= 1
+        tables['difference'][code] -= 1
+
+  # codeの辺の確定石の初期化
+  # 辺の駒は辺に沿ってしか裏返らない. 辺の空きマスにはどちらの色も(辺の駒を裏返さなくても)置かれうるので,
+  # 全ての着手について, 裏返らずに着手後の局面でも確定石である駒だけが確定石となる.
+  @classmethod
+  def __init_stable(cls, tables, code):
+    line = Index.__decode(code)
+    stable = 0
+    for x, cell in enumerate(line):
+      if cell != 2:
+        stable |= 1 << x
+    for x in range(8):
+      if line[x] == 2:
+        for color in (0, 1):
+          i = (code * 8 + x) * 2 + color
+          flipped = ((1 << tables['flip_left'][i]) - 1) << (x - tables['flip_left'][i])
+          flipped |= ((1 << tables['flip_right'][i]) - 1) << (x + 1)
+          stable &= tables['stable'][tables['new_code'][i]] & ~flipped
+    tables['stable'][code] = stable
+    for x, cell in enumerate(line):
+      if stable >> x & 1:
+        tables['settled'][code] += 1 if cell == 0 else -1
 
-  # __matrix[i][j]の初期化
+  # codeの位置xに関する各テーブルの要素の初期化
   # lineを着手位置の右側と左側に分割して計算している.
-  def __init_element(self, code, x, line):
+  @classmethod
+  def __init_element(cls, tables, code, x, line):
     if line[x] == 2: # Cell.EMPTY
       for color in (0, 1):
         line_fliped = list(line)
@@ -59,19 +168,22 @@ class Index:
           line_fliped[x - i - 1] = color
         for i in range(takes_right):
           line_fliped[x + i + 1] = color
-        self.__matrix[code][x][0][color] = (takes_left, takes_right)
-        self.__matrix[code][x][1][color] = takes_left + takes_right
-        self.__matrix[code][x][2][color] = Index.__encode(line_fliped)
+        i = (code * 8 + x) * 2 + color
+        tables['flip_left'][i]  = takes_left
+        tables['flip_right'][i] = takes_right
+        tables['takes'][i]      = takes_left + takes_right
+        tables['new_code'][i]   = Index.__encode(line_fliped)
         if takes_left or takes_right:
+          tables['legal'][code * 2 + color] |= 1 << x
           if color:
-            self.__mobility[code] -= 1
+            tables['mobility'][code] -= 1
           else:
-            self.__mobility[code] += 1
+            tables['mobility'][code] += 1
 
     else:
       line_fliped = list(line)
       line_fliped[x] = not line_fliped[x]
-      self.__matrix[code][x][3] = Index.__encode(line_fliped)
+      tables['flip_disk'][code * 8 + x] = Index.__encode(line_fliped)
 
   # デコード
   # <引数> code:int(0~6560)
@@ -109,18 +221,28 @@ class Index:
         return i
     return 0
 
+  # 着手可能位置数のテーブルを返す. 添字はcode(黒:正,白:負)
+  def get_mobility_table(self):
+    return self.__mobility
+
+  # put, takes, placeableで直接参照する1次元配列のテーブルを返す
+  # 添字は new_code, flip_left, flip_right, takes: (code*8+x)*2+color, flip_disk: code*8+x, legal: code*2+color
+  def get_tables(self):
+    return (self.__new_code, self.__flip_left, self.__flip_right, self.__takes, self.__flip_disk, self.__legal)
+
   # 入力のマス列(codeで符号化されている)の位置xにcolor色の駒を置いたときに裏返る駒の数を返す
   def takes(self, code, x, color):
-    return self.__matrix[code][x][1][color]
+    return self.__takes[(code * 8 + x) * 2 + color]
 
   # 入力のマス列(codeで符号化されている)の位置xにcolor色の駒を置いたあとのマス列を符号化した値と,
   # そのときに裏返る左右それぞれの駒の数を返す
   def flip_line(self, code, x, color):
-    return (self.__matrix[code][x][2][color], self.__matrix[code][x][0][color])
+    i = (code * 8 + x) * 2 + color
+    return (self.__new_code[i], (self.__flip_left[i], self.__flip_right[i]))
 
   # 入力のマス列(codeで符号化されている)の位置xの駒が裏返ったあとのマス列を符号化した値を返す
   def flip_disk(self, code, x):
-    return self.__matrix[code][x][3]
+    return self.__flip_disk[code * 8 + x]
 
   # 入力のマス列(codeで符号化されている)に対してcolor色の駒を置くことのできる場所の数を返す
   def get_mobility(self, code, color):
@@ -129,13 +251,21 @@ class Index:
     else:
       return self.__mobility[code]
 
-   # 入力のマス列(codeで符号化されている)に対してcolor色の確定石数の近似値を返す
+  # 入力のマス列(codeで符号化されている)を辺としたときのcolor色の確定石数を返す
   def get_settled(self, code, color):
     if color:
       return -self.__settled[code]
     else:
       return self.__settled[code]
 
+  # 入力のマス列(codeで符号化されている)を辺としたときの確定石(両方の色)の位置のbitmaskを返す
+  def get_stable(self, code):
+    return self.__stable[code]
+
+  # 入力のマス列(codeで符号化されている)のcolor色の駒の位置のbitmaskを返す
+  def get_discs(self, code, color):
+    return self.__discs[code * 2 + color]
+
   # 入力のマス列(codeで符号化されている)に対して駒の差を返す
   def get_difference(self, code, color):
     if color:
@@ -143,26 +273,139 @@ class Index:
     else:
       return self.__difference[code]
 
+#######################################################################################################################
+# 3進ビット抽出処理高速化のためのルックアップテーブル
+def _init_last(n):
+  l = [0] * 6561
+  for i in range(6561):
+    last = i / (3**(8-n))
+    for j in range(n):
+      l[i] += (last/(3**(n-1-j))) * (3**j)
+      last %= 3**(n-1-j)
+  return l
+
+FIRST3 = [i % (3**3) for i in range(6561)] # 3進8bitから下位3bitを得る
+FIRST4 = [i % (3**4) for i in range(6561)]
+FIRST5 = [i % (3**5) for i in range(6561)]
+FIRST6 = [i % (3**6) for i in range(6561)]
+FIRST7 = [i % (3**7) for i in range(6561)]
+LAST3  = _init_last(3)                    # 3進8bitから上位3bitを(反転して)得る
+LAST5  = _init_last(5)
+
+# 盤面の各ラインのコード(38要素)からlogistelloパターンの各値を返す
+def features(board):
+  return (
+    board[1], board[6], board[9], board[14],    # hori/vert2
+    board[2], board[5], board[10], board[13],   # hori/vert3
+    board[3], board[4], board[11], board[12],   # hori/vert4
+    FIRST4[board[17]], FIRST4[board[25]], FIRST4[board[28]], FIRST4[board[36]], # diag4
+    FIRST5[board[18]], FIRST5[board[24]], FIRST5[board[29]], FIRST5[board[35]], # diag5
+    FIRST6[board[19]], FIRST6[board[23]], FIRST6[board[30]], FIRST6[board[34]], # diag6
+    FIRST7[board[20]], FIRST7[board[22]], FIRST7[board[31]], FIRST7[board[33]], # diag7
+    board[21], board[32],                                 # diag8
+    ((board[1]/3)%3) + board[0]*3 + ((board[1]/729)%3)*19683,
+    ((board[6]/3)%3) + board[7]*3 + ((board[6]/729)%3)*19683,
+    ((board[9]/3)%3) + board[8]*3 + ((board[9]/729)%3)*19683,
+    ((board[14]/3)%3) + board[15]*3 + ((board[14]/729)%3)*19683, # edge+2x
+    FIRST5[board[0]] + FIRST5[board[1]]*243,
+    LAST5[board[0]] + LAST5[board[1]]*243,
+    FIRST5[board[7]] + FIRST5[board[6]]*243,
+    LAST5[board[7]] + LAST5[board[6]]*243,
+    FIRST5[board[8]] + FIRST5[board[9]]*243,
+    LAST5[board[8]] + LAST5[board[9]]*243,
+    FIRST5[board[15]] + FIRST5[board[14]]*243,
+    LAST5[board[15]] + LAST5[board[14]]*243,  # corner2x5
+    FIRST3[board[0]] + FIRST3[board[1]]*27 + FIRST3[board[2]]*729,
+    LAST3[board[0]] + LAST3[board[1]]*27 + LAST3[board[2]]*729,
+    FIRST3[board[7]] + FIRST3[board[6]]*27 + FIRST3[board[5]]*729,
+    LAST3[board[7]] + LAST3[board[6]]*27 + LAST3[board[5]]*729  # conrer3x3
+    )
+
+# features()の各要素の評価に使うパターン(重みのテーブル)の番号
+FEATURE_PATTERNS = (0,)*4 + (1,)*4 + (2,)*4 + (3,)*4 + (4,)*4 + (5,)*4 + (6,)*4 + (7,)*2 + (8,)*4 + (9,)*8 + (10,)*4
+
+# パターンの値はマスの値(黒0,白1,空2)の線形和なので, マスの値が変わったときのパターンの値の変化は
+# マス毎の係数から求まる. 係数は1マスだけ値1の盤面のfeatures()から求める.
+# PLACE_DELTAS[pos*2+color]: 空きマスposにcolor色の石を置いたときの (featuresの添字, パターンの値の変化) のタプル
+# FLIP_DELTAS[pos*2+color]:  位置posの石がcolor色に裏返ったときの (featuresの添字, パターンの値の変化) のタプル
+# SQUARE_LINES[pos]:         位置posを通るラインの番号のタプル
+def _init_deltas():
+  place, flip, lines = [], [], []
+  for pos in range(64):
+    board = [0] * 38
+    for line, line_cells in enumerate(cells.LINE_CELLS):
+      for p, x in line_cells:
+        if p == pos:
+          board[line] = 3 ** x
+    coefs = [(k, c) for k, c in enumerate(features(board)) if c]
+    for color in (0, 1):
+      place.append(tuple((k, c * (color - 2)) for k, c in coefs))
+      flip.append(tuple((k, c * (2 * color - 1)) for k, c in coefs))
+    lines.append(tuple(line for line, code in enumerate(board) if code))
+  return tuple(place), tuple(flip), tuple(lines)
+
+PLACE_DELTAS, FLIP_DELTAS, SQUARE_LINES = _init_deltas()
+
+#######################################################################################################################
+# Zobristハッシュ用の乱数表. 盤面のハッシュ値は石のあるマスの乱数のxor
+# Python2でint(long でない)に収まるように63bitにする. 起動毎に同じ値になるよう種は固定
+def _init_zobrist():
+  rand = random.Random(20161)
+  return [rand.getrandbits(63) for i in range(64 * 2 + 1)]
+
+ZOBRIST      = _init_zobrist()                                  # 位置posのcolor色の石. 添字はpos*2+color
+ZOBRIST_FLIP = [ZOBRIST[pos*2] ^ ZOBRIST[pos*2+1] for pos in range(64)] # 位置posの石が裏返ったときの変化
+ZOBRIST_SIDE = (0, ZOBRIST[128])                                # 手番
+
+#######################################################################################################################
+# GUIによる盤面表示
+# 盤面の実装(Board, BitBoard)によらず at() と placeable[] を通して描画する
+class Screen:
+  def __init__(self):
+    pygame.init()
+    self.__screen           = pygame.display.set_mode( (othello.Config.WINDOW_WIDTH, othello.Config.WINDOW_WIDTH) )
+    self.__empty_img        = pygame.image.load('../img/empty.png').convert()
+    self.__black_img        = pygame.image.load('../img/black.png').convert()
+    self.__white_img        = pygame.image.load('../img/white.png').convert()
+    self.__putted_black_img = pygame.image.load('../img/puttedBlack.png').convert()
+    self.__putted_white_img = pygame.image.load('../img/puttedWhite.png').convert()
+    self.__placeable_img    = pygame.image.load('../img/placeable.png').convert()
+    self.__empty_rect       = self.__empty_img.get_rect()
+    self.__black_rect       = self.__empty_img.get_rect()
+    self.__white_rect       = self.__empty_img.get_rect()
+    self.__screen.fill((0,0,0))
+    pygame.display.set_caption('Othello')
+    pygame.mouse.set_visible(True)
+
+  def draw(self, board, pos_putted, turn):
+    for x in range(8):
+      for y in range(8):
+        xy = (x*othello.Config.CELL_WIDTH, y*othello.Config.CELL_WIDTH)
+        state = board.at(x, y)
+        if state == othello.Config.EMPTY:
+          if board.placeable[x+y*8](turn):
+            self.__screen.blit(self.__placeable_img, self.__empty_rect.move(xy))
+          else:
+            self.__screen.blit(self.__empty_img, self.__empty_rect.move(xy))
+        if state == othello.Config.BLACK:
+          if x+y*8 == pos_putted:
+            self.__screen.blit(self.__putted_black_img, self.__black_rect.move(xy))
+          else:
+            self.__screen.blit(self.__black_img, self.__black_rect.move(xy))
+        if state == othello.Config.WHITE:
+          if x+y*8 == pos_putted:
+            self.__screen.blit(self.__putted_white_img, self.__black_rect.move(xy))
+          else:
+            self.__screen.blit(self.__white_img, self.__white_rect.move(xy))
+    pygame.display.flip()
+
 #######################################################################################################################
 # インデックスボード（= 盤面を分割・符号化して状態を表現）
 # Indexを用いた高速な状態遷移
 class Board:
   def __init__(self, visible):
     if visible:   # GUI関連の設定
-      pygame.init()
-      self.__screen           = pygame.display.set_mode( (othello.Config.WINDOW_WIDTH, othello.Config.WINDOW_WIDTH) )
-      self.__empty_img        = pygame.image.load('../img/empty.png').convert()
-      self.__black_img        = pygame.image.load('../img/black.png').convert()
-      self.__white_img        = pygame.image.load('../img/white.png').convert()
-      self.__putted_black_img = pygame.image.load('../img/puttedBlack.png').convert()
-      self.__putted_white_img = pygame.image.load('../img/puttedWhite.png').convert()
-      self.__placeable_img    = pygame.image.load('../img/placeable.png').convert()
-      self.__empty_rect       = self.__empty_img.get_rect()
-      self.__black_rect       = self.__empty_img.get_rect()
-      self.__white_rect       = self.__empty_img.get_rect()
-      self.__screen.fill((0,0,0))
-      pygame.display.set_caption('Othello')
-      pygame.mouse.set_visible(True)
+      self.__screen = Screen()
 
     # 盤面状態の初期値
     self.__INITIAL_STATE = [  6560, 6560, 6560, 6371, 6425, 6560, 6560, 6560, # 水平
@@ -173,15 +416,22 @@ class Board:
 
     self.__board  = [None] * 38 # 盤面の実体
     self.__index  = Index()
-
-    # 3進ビット抽出処理高速化のためのルックアップテーブル
-    self.__first3 = [i % (3**3) for i in range(6561)] # 3進8bitから下位3bitを得る
-    self.__first4 = [i % (3**4) for i in range(6561)]
-    self.__first5 = [i % (3**5) for i in range(6561)]
-    self.__first6 = [i % (3**6) for i in range(6561)]
-    self.__first7 = [i % (3**7) for i in range(6561)]
-    self.__last3  = self.__initLast3()                # 3進8bitから上位3bitを得る
-    self.__last5  = self.__initLast5()
+    self.__new_code, self.__flip_left, self.__flip_right, self.__takes, self.__flip_disk, self.__legal = self.__index.get_tables()
+    # Undo用のバッファ. putの直前の盤面を__undo_buffer[手数]に書き込む(確保済みのリストを使い回す)
+    # 対局中の着手(最大60手)+探索中の着手(最大60手)が収まる大きさを確保しておく
+    self.__undo_buffer = [[0] * 38 for i in range(128)]
+    self.__hash_buffer = [0] * 128  # putの直前のハッシュ値
+    # 盤面評価関数の差分計算(set_evaluatorで有効にする)
+    # 評価値 = features()の各要素の重みの和 + 着手可能位置数差 を putAt* で変わったパターン・ラインだけ更新して保持する
+    self.__eval = None              # features()の各要素の重みのテーブルのリスト. Noneなら差分計算しない
+    self.__canonical = [weights.CANONICAL[pattern] for pattern in FEATURE_PATTERNS]  # features()の各要素の値 -> 重みの添字
+    self.__eval_scale = 1           # 重みの1石あたりの値(量子化した重みならweights.QUANT_SCALE)
+    self.__mobility_table = self.__index.get_mobility_table()
+    self.__feature = [0] * len(FEATURE_PATTERNS)  # features()の値
+    self.__score = 0.0              # パターンの重みの和
+    self.__mobility = 0             # 着手可能位置数差(黒から見た値)
+    self.__feature_buffer = [[0] * len(FEATURE_PATTERNS) for i in range(128)]  # putの直前のfeatures()の値
+    self.__score_buffer = [None] * 128  # putの直前の(パターンの重みの和, 着手可能位置数差)
 
     # マス毎に関数を用意
     self.put = [  self.putAt0,self.putAt1,self.putAt2,self.putAt3,self.putAt4,self.putAt5,self.putAt6,self.putAt7,
@@ -212,6 +462,10 @@ class Board:
 
   def init(self):
     self.__board = list(self.__INITIAL_STATE)
+    self.__ply = 0
+    self.__hash = self.__compute_hash()  # 盤面のZobristハッシュ値(手番は含まない). putAt*で差分更新する
+    if self.__eval is not None:
+      self.__compute_eval()
     self.__empty_cells = list(self.__INITIAL_EMPCELL)
     self.__prev_state = None  # Undo用
     self.__prev_empty_cells = None
@@ -220,26 +474,7 @@ class Board:
     return (self.__board[y] % (3 ** (x + 1))) / (3 ** x)
 
   def print_board(self, pos_putted, turn):
-    for x in range(8):
-      for y in range(8):
-        xy = (x*othello.Config.CELL_WIDTH, y*othello.Config.CELL_WIDTH)
-        state = self.at(x, y)
-        if state == othello.Config.EMPTY:
-          if self.placeable[x+y*8](turn):
-            self.__screen.blit(self.__placeable_img, self.__empty_rect.move(xy))
-          else:
-            self.__screen.blit(self.__empty_img, self.__empty_rect.move(xy))
-        if state == othello.Config.BLACK:
-          if x+y*8 == pos_putted:
-            self.__screen.blit(self.__putted_black_img, self.__black_rect.move(xy))
-          else:
-            self.__screen.blit(self.__black_img, self.__black_rect.move(xy))
-        if state == othello.Config.WHITE:
-          if x+y*8 == pos_putted:
-            self.__screen.blit(self.__putted_white_img, self.__black_rect.move(xy))
-          else:
-            self.__screen.blit(self.__white_img, self.__white_rect.move(xy))
-    pygame.display.flip()
+    self.__screen.draw(self, pos_putted, turn)
 
   # 駒の数をプリントする
   def print_result(self):
@@ -251,24 +486,30 @@ class Board:
           counter[state] += 1
     print "BLACK:", counter[othello.Config.BLACK], " WHITE:", counter[othello.Config.WHITE]
 
+  # color色の着手可能位置をbitmaskで返す. 各ラインの着手可能位置を盤面上のマスに変換して重ね合わせる
+  def legal_moves_mask(self, color):
+    board = self.__board
+    legal = self.__legal
+    to_squares = cells.LINE_TO_SQUARES
+    return (to_squares[legal[board[0]*2+color]] | to_squares[256+legal[board[1]*2+color]] | to_squares[512+legal[board[2]*2+color]] | to_squares[768+legal[board[3]*2+color]] |
+            to_squares[1024+legal[board[4]*2+color]] | to_squares[1280+legal[board[5]*2+color]] | to_squares[1536+legal[board[6]*2+color]] | to_squares[1792+legal[board[7]*2+color]] |
+            to_squares[2048+legal[board[8]*2+color]] | to_squares[2304+legal[board[9]*2+color]] | to_squares[2560+legal[board[10]*2+color]] | to_squares[2816+legal[board[11]*2+color]] |
+            to_squares[3072+legal[board[12]*2+color]] | to_squares[3328+legal[board[13]*2+color]] | to_squares[3584+legal[board[14]*2+color]] | to_squares[3840+legal[board[15]*2+color]] |
+            to_squares[4096+legal[board[16]*2+color]] | to_squares[4352+legal[board[17]*2+color]] | to_squares[4608+legal[board[18]*2+color]] | to_squares[4864+legal[board[19]*2+color]] |
+            to_squares[5120+legal[board[20]*2+color]] | to_squares[5376+legal[board[21]*2+color]] | to_squares[5632+legal[board[22]*2+color]] | to_squares[5888+legal[board[23]*2+color]] |
+            to_squares[6144+legal[board[24]*2+color]] | to_squares[6400+legal[board[25]*2+color]] | to_squares[6656+legal[board[26]*2+color]] | to_squares[6912+legal[board[27]*2+color]] |
+            to_squares[7168+legal[board[28]*2+color]] | to_squares[7424+legal[board[29]*2+color]] | to_squares[7680+legal[board[30]*2+color]] | to_squares[7936+legal[board[31]*2+color]] |
+            to_squares[8192+legal[board[32]*2+color]] | to_squares[8448+legal[board[33]*2+color]] | to_squares[8704+legal[board[34]*2+color]] | to_squares[8960+legal[board[35]*2+color]] |
+            to_squares[9216+legal[board[36]*2+color]] | to_squares[9472+legal[board[37]*2+color]])
+
   def placeable_cells(self, color):
-    return [pos for pos in self.__empty_cells if self.placeable[pos](color) ]
+    mask = self.legal_moves_mask(color)
+    return [pos for pos in self.__empty_cells if mask >> pos & 1]
 
   # 重み付けされた着手可能数を返す
   def placeable_cells_num(self, color):
-    res = 0
-    for pos in self.__empty_cells:
-      if self.placeable[pos](color):
-        res += 1
-    if self.placeable[0](color):
-      res += 1
-    if self.placeable[7](color):
-      res += 1
-    if self.placeable[56](color):
-      res += 1
-    if self.placeable[63](color):
-      res += 1
-    return res
+    mask = self.legal_moves_mask(color)
+    return cells.popcount(mask) + cells.popcount(mask & cells.CORNERS)
 
   # ==================== 評価関数関連 ====================
   # 端の4辺中の確定石数を返す
@@ -276,6 +517,19 @@ class Board:
     return (self.__index.get_settled(self.__board[0],color) + self.__index.get_settled(self.__board[7],color) +
             self.__index.get_settled(self.__board[8],color) + self.__index.get_settled(self.__board[15],color))
 
+  # color色の確定石数を返す. 4辺の確定石から盤面全体の確定石を求める
+  def get_stable(self, color):
+    board = self.__board
+    index = self.__index
+    to_squares = cells.LINE_TO_SQUARES
+    edge = (to_squares[index.get_stable(board[0])] | to_squares[1792+index.get_stable(board[7])] |
+            to_squares[2048+index.get_stable(board[8])] | to_squares[3840+index.get_stable(board[15])])
+    discs = [0, 0]
+    for y in range(8):
+      discs[0] |= to_squares[y*256+index.get_discs(board[y], 0)]
+      discs[1] |= to_squares[y*256+index.get_discs(board[y], 1)]
+    return cells.popcount(cells.stable_discs(discs[color], discs[not color], edge))
+
   # 着手可能位置数差を返す.
   # なお,あるマスが複数方向に対して着手可能である場合は重複してカウントされる.
   def get_mobility(self, color):
@@ -293,32 +547,89 @@ class Board:
 
   # logistelloパターンの各値を返す
   def get_features(self):
-    return (
-      self.__board[1], self.__board[6], self.__board[9], self.__board[14],    # hori/vert2
-      self.__board[2], self.__board[5], self.__board[10], self.__board[13],   # hori/vert3
-      self.__board[3], self.__board[4], self.__board[11], self.__board[12],   # hori/vert4
-      self.__first4[self.__board[17]], self.__first4[self.__board[25]], self.__first4[self.__board[28]], self.__first4[self.__board[36]], # diag4
-      self.__first5[self.__board[18]], self.__first5[self.__board[24]], self.__first5[self.__board[29]], self.__first5[self.__board[35]], # diag5
-      self.__first6[self.__board[19]], self.__first6[self.__board[23]], self.__first6[self.__board[30]], self.__first6[self.__board[34]], # diag6
-      self.__first7[self.__board[20]], self.__first7[self.__board[22]], self.__first7[self.__board[31]], self.__first7[self.__board[33]], # diag7
-      self.__board[21], self.__board[32],                                 # diag8
-      ((self.__board[1]/3)%3) + self.__board[0]*3 + ((self.__board[1]/729)%3)*19683,
-      ((self.__board[6]/3)%3) + self.__board[7]*3 + ((self.__board[6]/729)%3)*19683,
-      ((self.__board[9]/3)%3) + self.__board[8]*3 + ((self.__board[9]/729)%3)*19683,
-      ((self.__board[14]/3)%3) + self.__board[15]*3 + ((self.__board[14]/729)%3)*19683, # edge+2x
-      self.__first5[self.__board[0]] + self.__first5[self.__board[1]]*243,
-      self.__last5[self.__board[0]] + self.__last5[self.__board[1]]*243,
-      self.__first5[self.__board[7]] + self.__first5[self.__board[6]]*243,
-      self.__last5[self.__board[7]] + self.__last5[self.__board[6]]*243,
-      self.__first5[self.__board[8]] + self.__first5[self.__board[9]]*243,
-      self.__last5[self.__board[8]] + self.__last5[self.__board[9]]*243,
-      self.__first5[self.__board[15]] + self.__first5[self.__board[14]]*243,
-      self.__last5[self.__board[15]] + self.__last5[self.__board[14]]*243,  # corner2x5
-      self.__first3[self.__board[0]] + self.__first3[self.__board[1]]*27 + self.__first3[self.__board[2]]*729,
-      self.__last3[self.__board[0]] + self.__last3[self.__board[1]]*27 + self.__last3[self.__board[2]]*729,
-      self.__first3[self.__board[7]] + self.__first3[self.__board[6]]*27 + self.__first3[self.__board[5]]*729,
-      self.__last3[self.__board[7]] + self.__last3[self.__board[6]]*27 + self.__last3[self.__board[5]]*729  # conrer3x3
-      )
+    return features(self.__board)
+
+  # 盤面評価関数の差分計算に使う重みを設定する. weightはあるステージのパターン毎の重みのテーブルのリスト
+  # (BrainMidの重みの1ステージ分. weights.CANONICALの添字で引く). Noneなら差分計算をやめる(putAt*が速くなる)
+  # scaleは重みの1石あたりの値. 着手可能位置数差にこれを掛けて足す(整数の重みなら評価値も整数になる)
+  def set_evaluator(self, weight, scale=1):
+    if weight is None:
+      self.__eval = None
+      return
+    self.__eval = [weight[pattern] for pattern in FEATURE_PATTERNS]
+    self.__eval_scale = scale
+    self.__compute_eval()
+
+  # 黒から見た評価値(パターンの重みの和 + 着手可能位置数差 * scale)を返す. set_evaluatorで重みを設定しておく
+  def get_score(self):
+    if othello.Config.DEBUG:
+      feature = features(self.__board)
+      score = sum(table[canonical[f]] for table, canonical, f in zip(self.__eval, self.__canonical, feature))
+      assert list(feature) == self.__feature, "feature mismatch"
+      assert abs(self.__score - score) < 1e-6, "pattern score mismatch"
+      assert self.__mobility == self.get_mobility(0), "mobility mismatch"
+    return self.__score + self.__mobility * self.__eval_scale
+
+  # 盤面から評価値を計算し直す
+  def __compute_eval(self):
+    self.__feature[:] = features(self.__board)
+    self.__score = sum(table[canonical[f]] for table, canonical, f in zip(self.__eval, self.__canonical, self.__feature))
+    self.__mobility = self.get_mobility(0)
+
+  # putAt*で位置posにcolor色の石を置き, flips(bitmask)の石を裏返したあとに評価値を差分更新する
+  # 変わったパターンの重みと, 変わったラインの着手可能位置数だけを引き直す
+  def __update_eval(self, pos, color, flips):
+    ply = self.__ply
+    feature = self.__feature
+    table = self.__eval
+    canonical = self.__canonical
+    self.__feature_buffer[ply][:] = feature
+    self.__score_buffer[ply] = (self.__score, self.__mobility)
+    score = self.__score
+    for k, d in PLACE_DELTAS[pos*2+color]:
+      old = feature[k]
+      new = feature[k] = old + d
+      t = table[k]
+      c = canonical[k]
+      score += t[c[new]] - t[c[old]]
+    lines = set(SQUARE_LINES[pos])
+    while flips:
+      bit = flips & -flips
+      flips ^= bit
+      sq = bit.bit_length() - 1
+      lines.update(SQUARE_LINES[sq])
+      for k, d in FLIP_DELTAS[sq*2+color]:
+        old = feature[k]
+        new = feature[k] = old + d
+        t = table[k]
+        c = canonical[k]
+        score += t[c[new]] - t[c[old]]
+    self.__score = score
+    board = self.__board
+    prev = self.__undo_buffer[ply]
+    mobility = self.__mobility_table
+    diff = self.__mobility
+    for line in lines:
+      diff += mobility[board[line]] - mobility[prev[line]]
+    self.__mobility = diff
+
+  # 局面(盤面と手番color)のZobristハッシュ値を返す. 置換表のキーに使う
+  # Boardは手番を持たない(パスは盤面を変えない)ので手番は引数で受け取る
+  def hash(self, color):
+    if othello.Config.DEBUG:
+      assert self.__hash == self.__compute_hash(), "zobrist hash mismatch"
+    return self.__hash ^ ZOBRIST_SIDE[color]
+
+  # 盤面からハッシュ値を計算し直す
+  def __compute_hash(self):
+    res = 0
+    for y in range(8):
+      code = self.__board[y]
+      for x in range(8):
+        if code % 3 != othello.Config.EMPTY:
+          res ^= ZOBRIST[(x + y * 8) * 2 + code % 3]
+        code /= 3
+    return res
 
   # ==================== Undo 関連 =====================
   def get_state(self):
@@ -326,6 +637,39 @@ class Board:
 
   def restore_state(self, state):
     self.__board = list(state)
+    self.__ply = 0
+    self.__hash = self.__compute_hash()
+    if self.__eval is not None:
+      self.__compute_eval()
+
+  # 直前のputを取り消す. 新たなリストは確保せずにバッファから書き戻す
+  def undo(self):
+    self.__board[:] = self.__undo_buffer[self.__ply]
+    self.__hash = self.__hash_buffer[self.__ply]
+    if self.__eval is not None:
+      self.__feature[:] = self.__feature_buffer[self.__ply]
+      self.__score, self.__mobility = self.__score_buffer[self.__ply]
+    self.__ply -= 1
+
+  # 直前のputの結果を返す. redoに渡すと, putをやり直さずにその局面にできる
+  def get_child(self):
+    if self.__eval is not None:
+      return (self.__board[:], self.__hash, self.__feature[:], self.__score, self.__mobility)
+    return (self.__board[:], self.__hash)
+
+  # get_childで得た局面にする. undoで取り消せる(putと同じ)
+  def redo(self, child):
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = self.__board
+    self.__hash_buffer[self.__ply] = self.__hash
+    self.__board[:] = child[0]
+    self.__hash = child[1]
+    if self.__eval is not None:
+      self.__feature_buffer[self.__ply][:] = self.__feature
+      self.__score_buffer[self.__ply] = (self.__score, self.__mobility)
+      self.__feature[:] = child[2]
+      self.__score = child[3]
+      self.__mobility = child[4]
 
   def store_state(self):
     self.__prev_state = self.get_state()
@@ -340,4803 +684,8580 @@ class Board:
   def update_empty_cells(self, pos):
     self.__empty_cells.remove(pos)
 
-  def __initLast5(self):
-    l = [0] * 6561
-    for i in range(6561):
-      last5 = i / (3**3)
-      for j in range(5):
-        l[i] += (last5/(3**(4-j))) * (3**j)
-        last5 %= 3**(4-j)
-    return l
-  def __initLast3(self):
-    l = [0] * 6561
-    for i in range(6561):
-      last3 = i / (3**5)
-      for j in range(3):
-        l[i] += (last3/(3**(2-j))) * (3**j)
-        last3 %= 3**(2-j)
-    return l
-
   # 以下マス毎のputとplaceableとtakes関数. 関数ポインタリストの該当位置に格納して使用
   def takes0(self, color):
-    return self.__index.takes(self.__board[0],0,color)+self.__index.takes(self.__board[8],0,color)+self.__index.takes(self.__board[32],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[0]*16+color]+takes[board[8]*16+color]+takes[board[32]*16+color]
   def takes1(self, color):
-    return self.__index.takes(self.__board[0],1,color)+self.__index.takes(self.__board[9],0,color)+self.__index.takes(self.__board[31],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[0]*16+2+color]+takes[board[9]*16+color]+takes[board[31]*16+color]
   def takes2(self, color):
-    return self.__index.takes(self.__board[0],2,color)+self.__index.takes(self.__board[10],0,color)+self.__index.takes(self.__board[16],0,color)+self.__index.takes(self.__board[30],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[0]*16+4+color]+takes[board[10]*16+color]+takes[board[16]*16+color]+takes[board[30]*16+color]
   def takes3(self, color):
-    return self.__index.takes(self.__board[0],3,color)+self.__index.takes(self.__board[11],0,color)+self.__index.takes(self.__board[17],0,color)+self.__index.takes(self.__board[29],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[0]*16+6+color]+takes[board[11]*16+color]+takes[board[17]*16+color]+takes[board[29]*16+color]
   def takes4(self, color):
-    return self.__index.takes(self.__board[0],4,color)+self.__index.takes(self.__board[12],0,color)+self.__index.takes(self.__board[18],0,color)+self.__index.takes(self.__board[28],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[0]*16+8+color]+takes[board[12]*16+color]+takes[board[18]*16+color]+takes[board[28]*16+color]
   def takes5(self, color):
-    return self.__index.takes(self.__board[0],5,color)+self.__index.takes(self.__board[13],0,color)+self.__index.takes(self.__board[19],0,color)+self.__index.takes(self.__board[27],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[0]*16+10+color]+takes[board[13]*16+color]+takes[board[19]*16+color]+takes[board[27]*16+color]
   def takes6(self, color):
-    return self.__index.takes(self.__board[0],6,color)+self.__index.takes(self.__board[14],0,color)+self.__index.takes(self.__board[20],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[0]*16+12+color]+takes[board[14]*16+color]+takes[board[20]*16+color]
   def takes7(self, color):
-    return self.__index.takes(self.__board[0],7,color)+self.__index.takes(self.__board[15],0,color)+self.__index.takes(self.__board[21],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[0]*16+14+color]+takes[board[15]*16+color]+takes[board[21]*16+color]
   def takes8(self, color):
-    return self.__index.takes(self.__board[1],0,color)+self.__index.takes(self.__board[8],1,color)+self.__index.takes(self.__board[33],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[1]*16+color]+takes[board[8]*16+2+color]+takes[board[33]*16+color]
   def takes9(self, color):
-    return self.__index.takes(self.__board[1],1,color)+self.__index.takes(self.__board[9],1,color)+self.__index.takes(self.__board[16],1,color)+self.__index.takes(self.__board[32],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[1]*16+2+color]+takes[board[9]*16+2+color]+takes[board[16]*16+2+color]+takes[board[32]*16+2+color]
   def takes10(self, color):
-    return self.__index.takes(self.__board[1],2,color)+self.__index.takes(self.__board[10],1,color)+self.__index.takes(self.__board[17],1,color)+self.__index.takes(self.__board[31],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[1]*16+4+color]+takes[board[10]*16+2+color]+takes[board[17]*16+2+color]+takes[board[31]*16+2+color]
   def takes11(self, color):
-    return self.__index.takes(self.__board[1],3,color)+self.__index.takes(self.__board[11],1,color)+self.__index.takes(self.__board[18],1,color)+self.__index.takes(self.__board[30],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[1]*16+6+color]+takes[board[11]*16+2+color]+takes[board[18]*16+2+color]+takes[board[30]*16+2+color]
   def takes12(self, color):
-    return self.__index.takes(self.__board[1],4,color)+self.__index.takes(self.__board[12],1,color)+self.__index.takes(self.__board[19],1,color)+self.__index.takes(self.__board[29],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[1]*16+8+color]+takes[board[12]*16+2+color]+takes[board[19]*16+2+color]+takes[board[29]*16+2+color]
   def takes13(self, color):
-    return self.__index.takes(self.__board[1],5,color)+self.__index.takes(self.__board[13],1,color)+self.__index.takes(self.__board[20],1,color)+self.__index.takes(self.__board[28],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[1]*16+10+color]+takes[board[13]*16+2+color]+takes[board[20]*16+2+color]+takes[board[28]*16+2+color]
   def takes14(self, color):
-    return self.__index.takes(self.__board[1],6,color)+self.__index.takes(self.__board[14],1,color)+self.__index.takes(self.__board[21],1,color)+self.__index.takes(self.__board[27],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[1]*16+12+color]+takes[board[14]*16+2+color]+takes[board[21]*16+2+color]+takes[board[27]*16+2+color]
   def takes15(self, color):
-    return self.__index.takes(self.__board[1],7,color)+self.__index.takes(self.__board[15],1,color)+self.__index.takes(self.__board[22],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[1]*16+14+color]+takes[board[15]*16+2+color]+takes[board[22]*16+color]
   def takes16(self, color):
-    return self.__index.takes(self.__board[2],0,color)+self.__index.takes(self.__board[8],2,color)+self.__index.takes(self.__board[16],2,color)+self.__index.takes(self.__board[34],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[2]*16+color]+takes[board[8]*16+4+color]+takes[board[16]*16+4+color]+takes[board[34]*16+color]
   def takes17(self, color):
-    return self.__index.takes(self.__board[2],1,color)+self.__index.takes(self.__board[9],2,color)+self.__index.takes(self.__board[17],2,color)+self.__index.takes(self.__board[33],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[2]*16+2+color]+takes[board[9]*16+4+color]+takes[board[17]*16+4+color]+takes[board[33]*16+2+color]
   def takes18(self, color):
-    return self.__index.takes(self.__board[2],2,color)+self.__index.takes(self.__board[10],2,color)+self.__index.takes(self.__board[18],2,color)+self.__index.takes(self.__board[32],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[2]*16+4+color]+takes[board[10]*16+4+color]+takes[board[18]*16+4+color]+takes[board[32]*16+4+color]
   def takes19(self, color):
-    return self.__index.takes(self.__board[2],3,color)+self.__index.takes(self.__board[11],2,color)+self.__index.takes(self.__board[19],2,color)+self.__index.takes(self.__board[31],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[2]*16+6+color]+takes[board[11]*16+4+color]+takes[board[19]*16+4+color]+takes[board[31]*16+4+color]
   def takes20(self, color):
-    return self.__index.takes(self.__board[2],4,color)+self.__index.takes(self.__board[12],2,color)+self.__index.takes(self.__board[20],2,color)+self.__index.takes(self.__board[30],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[2]*16+8+color]+takes[board[12]*16+4+color]+takes[board[20]*16+4+color]+takes[board[30]*16+4+color]
   def takes21(self, color):
-    return self.__index.takes(self.__board[2],5,color)+self.__index.takes(self.__board[13],2,color)+self.__index.takes(self.__board[21],2,color)+self.__index.takes(self.__board[29],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[2]*16+10+color]+takes[board[13]*16+4+color]+takes[board[21]*16+4+color]+takes[board[29]*16+4+color]
   def takes22(self, color):
-    return self.__index.takes(self.__board[2],6,color)+self.__index.takes(self.__board[14],2,color)+self.__index.takes(self.__board[22],1,color)+self.__index.takes(self.__board[28],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[2]*16+12+color]+takes[board[14]*16+4+color]+takes[board[22]*16+2+color]+takes[board[28]*16+4+color]
   def takes23(self, color):
-    return self.__index.takes(self.__board[2],7,color)+self.__index.takes(self.__board[15],2,color)+self.__index.takes(self.__board[23],0,color)+self.__index.takes(self.__board[27],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[2]*16+14+color]+takes[board[15]*16+4+color]+takes[board[23]*16+color]+takes[board[27]*16+4+color]
   def takes24(self, color):
-    return self.__index.takes(self.__board[3],0,color)+self.__index.takes(self.__board[8],3,color)+self.__index.takes(self.__board[17],3,color)+self.__index.takes(self.__board[35],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[3]*16+color]+takes[board[8]*16+6+color]+takes[board[17]*16+6+color]+takes[board[35]*16+color]
   def takes25(self, color):
-    return self.__index.takes(self.__board[3],1,color)+self.__index.takes(self.__board[9],3,color)+self.__index.takes(self.__board[18],3,color)+self.__index.takes(self.__board[34],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[3]*16+2+color]+takes[board[9]*16+6+color]+takes[board[18]*16+6+color]+takes[board[34]*16+2+color]
   def takes26(self, color):
-    return self.__index.takes(self.__board[3],2,color)+self.__index.takes(self.__board[10],3,color)+self.__index.takes(self.__board[19],3,color)+self.__index.takes(self.__board[33],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[3]*16+4+color]+takes[board[10]*16+6+color]+takes[board[19]*16+6+color]+takes[board[33]*16+4+color]
   def takes27(self, color):
-    return self.__index.takes(self.__board[3],3,color)+self.__index.takes(self.__board[11],3,color)+self.__index.takes(self.__board[20],3,color)+self.__index.takes(self.__board[32],3,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[3]*16+6+color]+takes[board[11]*16+6+color]+takes[board[20]*16+6+color]+takes[board[32]*16+6+color]
   def takes28(self, color):
-    return self.__index.takes(self.__board[3],4,color)+self.__index.takes(self.__board[12],3,color)+self.__index.takes(self.__board[21],3,color)+self.__index.takes(self.__board[31],3,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[3]*16+8+color]+takes[board[12]*16+6+color]+takes[board[21]*16+6+color]+takes[board[31]*16+6+color]
   def takes29(self, color):
-    return self.__index.takes(self.__board[3],5,color)+self.__index.takes(self.__board[13],3,color)+self.__index.takes(self.__board[22],2,color)+self.__index.takes(self.__board[30],3,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[3]*16+10+color]+takes[board[13]*16+6+color]+takes[board[22]*16+4+color]+takes[board[30]*16+6+color]
   def takes30(self, color):
-    return self.__index.takes(self.__board[3],6,color)+self.__index.takes(self.__board[14],3,color)+self.__index.takes(self.__board[23],1,color)+self.__index.takes(self.__board[29],3,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[3]*16+12+color]+takes[board[14]*16+6+color]+takes[board[23]*16+2+color]+takes[board[29]*16+6+color]
   def takes31(self, color):
-    return self.__index.takes(self.__board[3],7,color)+self.__index.takes(self.__board[15],3,color)+self.__index.takes(self.__board[24],0,color)+self.__index.takes(self.__board[28],3,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[3]*16+14+color]+takes[board[15]*16+6+color]+takes[board[24]*16+color]+takes[board[28]*16+6+color]
   def takes32(self, color):
-    return self.__index.takes(self.__board[4],0,color)+self.__index.takes(self.__board[8],4,color)+self.__index.takes(self.__board[18],4,color)+self.__index.takes(self.__board[36],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[4]*16+color]+takes[board[8]*16+8+color]+takes[board[18]*16+8+color]+takes[board[36]*16+color]
   def takes33(self, color):
-    return self.__index.takes(self.__board[4],1,color)+self.__index.takes(self.__board[9],4,color)+self.__index.takes(self.__board[19],4,color)+self.__index.takes(self.__board[35],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[4]*16+2+color]+takes[board[9]*16+8+color]+takes[board[19]*16+8+color]+takes[board[35]*16+2+color]
   def takes34(self, color):
-    return self.__index.takes(self.__board[4],2,color)+self.__index.takes(self.__board[10],4,color)+self.__index.takes(self.__board[20],4,color)+self.__index.takes(self.__board[34],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[4]*16+4+color]+takes[board[10]*16+8+color]+takes[board[20]*16+8+color]+takes[board[34]*16+4+color]
   def takes35(self, color):
-    return self.__index.takes(self.__board[4],3,color)+self.__index.takes(self.__board[11],4,color)+self.__index.takes(self.__board[21],4,color)+self.__index.takes(self.__board[33],3,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[4]*16+6+color]+takes[board[11]*16+8+color]+takes[board[21]*16+8+color]+takes[board[33]*16+6+color]
   def takes36(self, color):
-    return self.__index.takes(self.__board[4],4,color)+self.__index.takes(self.__board[12],4,color)+self.__index.takes(self.__board[22],3,color)+self.__index.takes(self.__board[32],4,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[4]*16+8+color]+takes[board[12]*16+8+color]+takes[board[22]*16+6+color]+takes[board[32]*16+8+color]
   def takes37(self, color):
-    return self.__index.takes(self.__board[4],5,color)+self.__index.takes(self.__board[13],4,color)+self.__index.takes(self.__board[23],2,color)+self.__index.takes(self.__board[31],4,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[4]*16+10+color]+takes[board[13]*16+8+color]+takes[board[23]*16+4+color]+takes[board[31]*16+8+color]
   def takes38(self, color):
-    return self.__index.takes(self.__board[4],6,color)+self.__index.takes(self.__board[14],4,color)+self.__index.takes(self.__board[24],1,color)+self.__index.takes(self.__board[30],4,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[4]*16+12+color]+takes[board[14]*16+8+color]+takes[board[24]*16+2+color]+takes[board[30]*16+8+color]
   def takes39(self, color):
-    return self.__index.takes(self.__board[4],7,color)+self.__index.takes(self.__board[15],4,color)+self.__index.takes(self.__board[25],0,color)+self.__index.takes(self.__board[29],4,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[4]*16+14+color]+takes[board[15]*16+8+color]+takes[board[25]*16+color]+takes[board[29]*16+8+color]
   def takes40(self, color):
-    return self.__index.takes(self.__board[5],0,color)+self.__index.takes(self.__board[8],5,color)+self.__index.takes(self.__board[19],5,color)+self.__index.takes(self.__board[37],0,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[5]*16+color]+takes[board[8]*16+10+color]+takes[board[19]*16+10+color]+takes[board[37]*16+color]
   def takes41(self, color):
-    return self.__index.takes(self.__board[5],1,color)+self.__index.takes(self.__board[9],5,color)+self.__index.takes(self.__board[20],5,color)+self.__index.takes(self.__board[36],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[5]*16+2+color]+takes[board[9]*16+10+color]+takes[board[20]*16+10+color]+takes[board[36]*16+2+color]
   def takes42(self, color):
-    return self.__index.takes(self.__board[5],2,color)+self.__index.takes(self.__board[10],5,color)+self.__index.takes(self.__board[21],5,color)+self.__index.takes(self.__board[35],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[5]*16+4+color]+takes[board[10]*16+10+color]+takes[board[21]*16+10+color]+takes[board[35]*16+4+color]
   def takes43(self, color):
-    return self.__index.takes(self.__board[5],3,color)+self.__index.takes(self.__board[11],5,color)+self.__index.takes(self.__board[22],4,color)+self.__index.takes(self.__board[34],3,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[5]*16+6+color]+takes[board[11]*16+10+color]+takes[board[22]*16+8+color]+takes[board[34]*16+6+color]
   def takes44(self, color):
-    return self.__index.takes(self.__board[5],4,color)+self.__index.takes(self.__board[12],5,color)+self.__index.takes(self.__board[23],3,color)+self.__index.takes(self.__board[33],4,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[5]*16+8+color]+takes[board[12]*16+10+color]+takes[board[23]*16+6+color]+takes[board[33]*16+8+color]
   def takes45(self, color):
-    return self.__index.takes(self.__board[5],5,color)+self.__index.takes(self.__board[13],5,color)+self.__index.takes(self.__board[24],2,color)+self.__index.takes(self.__board[32],5,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[5]*16+10+color]+takes[board[13]*16+10+color]+takes[board[24]*16+4+color]+takes[board[32]*16+10+color]
   def takes46(self, color):
-    return self.__index.takes(self.__board[5],6,color)+self.__index.takes(self.__board[14],5,color)+self.__index.takes(self.__board[25],1,color)+self.__index.takes(self.__board[31],5,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[5]*16+12+color]+takes[board[14]*16+10+color]+takes[board[25]*16+2+color]+takes[board[31]*16+10+color]
   def takes47(self, color):
-    return self.__index.takes(self.__board[5],7,color)+self.__index.takes(self.__board[15],5,color)+self.__index.takes(self.__board[26],0,color)+self.__index.takes(self.__board[30],5,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[5]*16+14+color]+takes[board[15]*16+10+color]+takes[board[26]*16+color]+takes[board[30]*16+10+color]
   def takes48(self, color):
-    return self.__index.takes(self.__board[6],0,color)+self.__index.takes(self.__board[8],6,color)+self.__index.takes(self.__board[20],6,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[6]*16+color]+takes[board[8]*16+12+color]+takes[board[20]*16+12+color]
   def takes49(self, color):
-    return self.__index.takes(self.__board[6],1,color)+self.__index.takes(self.__board[9],6,color)+self.__index.takes(self.__board[21],6,color)+self.__index.takes(self.__board[37],1,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[6]*16+2+color]+takes[board[9]*16+12+color]+takes[board[21]*16+12+color]+takes[board[37]*16+2+color]
   def takes50(self, color):
-    return self.__index.takes(self.__board[6],2,color)+self.__index.takes(self.__board[10],6,color)+self.__index.takes(self.__board[22],5,color)+self.__index.takes(self.__board[36],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[6]*16+4+color]+takes[board[10]*16+12+color]+takes[board[22]*16+10+color]+takes[board[36]*16+4+color]
   def takes51(self, color):
-    return self.__index.takes(self.__board[6],3,color)+self.__index.takes(self.__board[11],6,color)+self.__index.takes(self.__board[23],4,color)+self.__index.takes(self.__board[35],3,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[6]*16+6+color]+takes[board[11]*16+12+color]+takes[board[23]*16+8+color]+takes[board[35]*16+6+color]
   def takes52(self, color):
-    return self.__index.takes(self.__board[6],4,color)+self.__index.takes(self.__board[12],6,color)+self.__index.takes(self.__board[24],3,color)+self.__index.takes(self.__board[34],4,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[6]*16+8+color]+takes[board[12]*16+12+color]+takes[board[24]*16+6+color]+takes[board[34]*16+8+color]
   def takes53(self, color):
-    return self.__index.takes(self.__board[6],5,color)+self.__index.takes(self.__board[13],6,color)+self.__index.takes(self.__board[25],2,color)+self.__index.takes(self.__board[33],5,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[6]*16+10+color]+takes[board[13]*16+12+color]+takes[board[25]*16+4+color]+takes[board[33]*16+10+color]
   def takes54(self, color):
-    return self.__index.takes(self.__board[6],6,color)+self.__index.takes(self.__board[14],6,color)+self.__index.takes(self.__board[26],1,color)+self.__index.takes(self.__board[32],6,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[6]*16+12+color]+takes[board[14]*16+12+color]+takes[board[26]*16+2+color]+takes[board[32]*16+12+color]
   def takes55(self, color):
-    return self.__index.takes(self.__board[6],7,color)+self.__index.takes(self.__board[15],6,color)+self.__index.takes(self.__board[31],6,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[6]*16+14+color]+takes[board[15]*16+12+color]+takes[board[31]*16+12+color]
   def takes56(self, color):
-    return self.__index.takes(self.__board[7],0,color)+self.__index.takes(self.__board[8],7,color)+self.__index.takes(self.__board[21],7,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[7]*16+color]+takes[board[8]*16+14+color]+takes[board[21]*16+14+color]
   def takes57(self, color):
-    return self.__index.takes(self.__board[7],1,color)+self.__index.takes(self.__board[9],7,color)+self.__index.takes(self.__board[22],6,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[7]*16+2+color]+takes[board[9]*16+14+color]+takes[board[22]*16+12+color]
   def takes58(self, color):
-    return self.__index.takes(self.__board[7],2,color)+self.__index.takes(self.__board[10],7,color)+self.__index.takes(self.__board[23],5,color)+self.__index.takes(self.__board[37],2,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[7]*16+4+color]+takes[board[10]*16+14+color]+takes[board[23]*16+10+color]+takes[board[37]*16+4+color]
   def takes59(self, color):
-    return self.__index.takes(self.__board[7],3,color)+self.__index.takes(self.__board[11],7,color)+self.__index.takes(self.__board[24],4,color)+self.__index.takes(self.__board[36],3,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[7]*16+6+color]+takes[board[11]*16+14+color]+takes[board[24]*16+8+color]+takes[board[36]*16+6+color]
   def takes60(self, color):
-    return self.__index.takes(self.__board[7],4,color)+self.__index.takes(self.__board[12],7,color)+self.__index.takes(self.__board[25],3,color)+self.__index.takes(self.__board[35],4,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[7]*16+8+color]+takes[board[12]*16+14+color]+takes[board[25]*16+6+color]+takes[board[35]*16+8+color]
   def takes61(self, color):
-    return self.__index.takes(self.__board[7],5,color)+self.__index.takes(self.__board[13],7,color)+self.__index.takes(self.__board[26],2,color)+self.__index.takes(self.__board[34],5,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[7]*16+10+color]+takes[board[13]*16+14+color]+takes[board[26]*16+4+color]+takes[board[34]*16+10+color]
   def takes62(self, color):
-    return self.__index.takes(self.__board[7],6,color)+self.__index.takes(self.__board[14],7,color)+self.__index.takes(self.__board[33],6,color)
+    board = self.__board
+    takes = self.__takes
+    return takes[board[7]*16+12+color]+takes[board[14]*16+14+color]+takes[board[33]*16+12+color]
   def takes63(self, color):
-    return self.__index.takes(self.__board[7],7,color)+self.__index.takes(self.__board[15],7,color)+self.__index.takes(self.__board[32],7,color)
-
+    board = self.__board
+    takes = self.__takes
+    return takes[board[7]*16+14+color]+takes[board[15]*16+14+color]+takes[board[32]*16+14+color]
   def placeable0(self, color):
-    if self.__index.takes(self.__board[0],0,color) or self.__index.takes(self.__board[8],0,color) or self.__index.takes(self.__board[32],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[0]*16+color] or takes[board[8]*16+color] or takes[board[32]*16+color]:
       return True
     return False
   def placeable1(self, color):
-    if self.__index.takes(self.__board[0],1,color) or self.__index.takes(self.__board[9],0,color) or self.__index.takes(self.__board[31],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[0]*16+2+color] or takes[board[9]*16+color] or takes[board[31]*16+color]:
       return True
     return False
   def placeable2(self, color):
-    if self.__index.takes(self.__board[0],2,color) or self.__index.takes(self.__board[10],0,color) or self.__index.takes(self.__board[16],0,color) or self.__index.takes(self.__board[30],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[0]*16+4+color] or takes[board[10]*16+color] or takes[board[16]*16+color] or takes[board[30]*16+color]:
       return True
     return False
   def placeable3(self, color):
-    if self.__index.takes(self.__board[0],3,color) or self.__index.takes(self.__board[11],0,color) or self.__index.takes(self.__board[17],0,color) or self.__index.takes(self.__board[29],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[0]*16+6+color] or takes[board[11]*16+color] or takes[board[17]*16+color] or takes[board[29]*16+color]:
       return True
     return False
   def placeable4(self, color):
-    if self.__index.takes(self.__board[0],4,color) or self.__index.takes(self.__board[12],0,color) or self.__index.takes(self.__board[18],0,color) or self.__index.takes(self.__board[28],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[0]*16+8+color] or takes[board[12]*16+color] or takes[board[18]*16+color] or takes[board[28]*16+color]:
       return True
     return False
   def placeable5(self, color):
-    if self.__index.takes(self.__board[0],5,color) or self.__index.takes(self.__board[13],0,color) or self.__index.takes(self.__board[19],0,color) or self.__index.takes(self.__board[27],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[0]*16+10+color] or takes[board[13]*16+color] or takes[board[19]*16+color] or takes[board[27]*16+color]:
       return True
     return False
   def placeable6(self, color):
-    if self.__index.takes(self.__board[0],6,color) or self.__index.takes(self.__board[14],0,color) or self.__index.takes(self.__board[20],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[0]*16+12+color] or takes[board[14]*16+color] or takes[board[20]*16+color]:
       return True
     return False
   def placeable7(self, color):
-    if self.__index.takes(self.__board[0],7,color) or self.__index.takes(self.__board[15],0,color) or self.__index.takes(self.__board[21],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[0]*16+14+color] or takes[board[15]*16+color] or takes[board[21]*16+color]:
       return True
     return False
   def placeable8(self, color):
-    if self.__index.takes(self.__board[1],0,color) or self.__index.takes(self.__board[8],1,color) or self.__index.takes(self.__board[33],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[1]*16+color] or takes[board[8]*16+2+color] or takes[board[33]*16+color]:
       return True
     return False
   def placeable9(self, color):
-    if self.__index.takes(self.__board[1],1,color) or self.__index.takes(self.__board[9],1,color) or self.__index.takes(self.__board[16],1,color) or self.__index.takes(self.__board[32],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[1]*16+2+color] or takes[board[9]*16+2+color] or takes[board[16]*16+2+color] or takes[board[32]*16+2+color]:
       return True
     return False
   def placeable10(self, color):
-    if self.__index.takes(self.__board[1],2,color) or self.__index.takes(self.__board[10],1,color) or self.__index.takes(self.__board[17],1,color) or self.__index.takes(self.__board[31],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[1]*16+4+color] or takes[board[10]*16+2+color] or takes[board[17]*16+2+color] or takes[board[31]*16+2+color]:
       return True
     return False
   def placeable11(self, color):
-    if self.__index.takes(self.__board[1],3,color) or self.__index.takes(self.__board[11],1,color) or self.__index.takes(self.__board[18],1,color) or self.__index.takes(self.__board[30],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[1]*16+6+color] or takes[board[11]*16+2+color] or takes[board[18]*16+2+color] or takes[board[30]*16+2+color]:
       return True
     return False
   def placeable12(self, color):
-    if self.__index.takes(self.__board[1],4,color) or self.__index.takes(self.__board[12],1,color) or self.__index.takes(self.__board[19],1,color) or self.__index.takes(self.__board[29],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[1]*16+8+color] or takes[board[12]*16+2+color] or takes[board[19]*16+2+color] or takes[board[29]*16+2+color]:
       return True
     return False
   def placeable13(self, color):
-    if self.__index.takes(self.__board[1],5,color) or self.__index.takes(self.__board[13],1,color) or self.__index.takes(self.__board[20],1,color) or self.__index.takes(self.__board[28],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[1]*16+10+color] or takes[board[13]*16+2+color] or takes[board[20]*16+2+color] or takes[board[28]*16+2+color]:
       return True
     return False
   def placeable14(self, color):
-    if self.__index.takes(self.__board[1],6,color) or self.__index.takes(self.__board[14],1,color) or self.__index.takes(self.__board[21],1,color) or self.__index.takes(self.__board[27],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[1]*16+12+color] or takes[board[14]*16+2+color] or takes[board[21]*16+2+color] or takes[board[27]*16+2+color]:
       return True
     return False
   def placeable15(self, color):
-    if self.__index.takes(self.__board[1],7,color) or self.__index.takes(self.__board[15],1,color) or self.__index.takes(self.__board[22],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[1]*16+14+color] or takes[board[15]*16+2+color] or takes[board[22]*16+color]:
       return True
     return False
   def placeable16(self, color):
-    if self.__index.takes(self.__board[2],0,color) or self.__index.takes(self.__board[8],2,color) or self.__index.takes(self.__board[16],2,color) or self.__index.takes(self.__board[34],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[2]*16+color] or takes[board[8]*16+4+color] or takes[board[16]*16+4+color] or takes[board[34]*16+color]:
       return True
     return False
   def placeable17(self, color):
-    if self.__index.takes(self.__board[2],1,color) or self.__index.takes(self.__board[9],2,color) or self.__index.takes(self.__board[17],2,color) or self.__index.takes(self.__board[33],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[2]*16+2+color] or takes[board[9]*16+4+color] or takes[board[17]*16+4+color] or takes[board[33]*16+2+color]:
       return True
     return False
   def placeable18(self, color):
-    if self.__index.takes(self.__board[2],2,color) or self.__index.takes(self.__board[10],2,color) or self.__index.takes(self.__board[18],2,color) or self.__index.takes(self.__board[32],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[2]*16+4+color] or takes[board[10]*16+4+color] or takes[board[18]*16+4+color] or takes[board[32]*16+4+color]:
       return True
     return False
   def placeable19(self, color):
-    if self.__index.takes(self.__board[2],3,color) or self.__index.takes(self.__board[11],2,color) or self.__index.takes(self.__board[19],2,color) or self.__index.takes(self.__board[31],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[2]*16+6+color] or takes[board[11]*16+4+color] or takes[board[19]*16+4+color] or takes[board[31]*16+4+color]:
       return True
     return False
   def placeable20(self, color):
-    if self.__index.takes(self.__board[2],4,color) or self.__index.takes(self.__board[12],2,color) or self.__index.takes(self.__board[20],2,color) or self.__index.takes(self.__board[30],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[2]*16+8+color] or takes[board[12]*16+4+color] or takes[board[20]*16+4+color] or takes[board[30]*16+4+color]:
       return True
     return False
   def placeable21(self, color):
-    if self.__index.takes(self.__board[2],5,color) or self.__index.takes(self.__board[13],2,color) or self.__index.takes(self.__board[21],2,color) or self.__index.takes(self.__board[29],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[2]*16+10+color] or takes[board[13]*16+4+color] or takes[board[21]*16+4+color] or takes[board[29]*16+4+color]:
       return True
     return False
   def placeable22(self, color):
-    if self.__index.takes(self.__board[2],6,color) or self.__index.takes(self.__board[14],2,color) or self.__index.takes(self.__board[22],1,color) or self.__index.takes(self.__board[28],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[2]*16+12+color] or takes[board[14]*16+4+color] or takes[board[22]*16+2+color] or takes[board[28]*16+4+color]:
       return True
     return False
   def placeable23(self, color):
-    if self.__index.takes(self.__board[2],7,color) or self.__index.takes(self.__board[15],2,color) or self.__index.takes(self.__board[23],0,color) or self.__index.takes(self.__board[27],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[2]*16+14+color] or takes[board[15]*16+4+color] or takes[board[23]*16+color] or takes[board[27]*16+4+color]:
       return True
     return False
   def placeable24(self, color):
-    if self.__index.takes(self.__board[3],0,color) or self.__index.takes(self.__board[8],3,color) or self.__index.takes(self.__board[17],3,color) or self.__index.takes(self.__board[35],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[3]*16+color] or takes[board[8]*16+6+color] or takes[board[17]*16+6+color] or takes[board[35]*16+color]:
       return True
     return False
   def placeable25(self, color):
-    if self.__index.takes(self.__board[3],1,color) or self.__index.takes(self.__board[9],3,color) or self.__index.takes(self.__board[18],3,color) or self.__index.takes(self.__board[34],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[3]*16+2+color] or takes[board[9]*16+6+color] or takes[board[18]*16+6+color] or takes[board[34]*16+2+color]:
       return True
     return False
   def placeable26(self, color):
-    if self.__index.takes(self.__board[3],2,color) or self.__index.takes(self.__board[10],3,color) or self.__index.takes(self.__board[19],3,color) or self.__index.takes(self.__board[33],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[3]*16+4+color] or takes[board[10]*16+6+color] or takes[board[19]*16+6+color] or takes[board[33]*16+4+color]:
       return True
     return False
   def placeable27(self, color):
-    if self.__index.takes(self.__board[3],3,color) or self.__index.takes(self.__board[11],3,color) or self.__index.takes(self.__board[20],3,color) or self.__index.takes(self.__board[32],3,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[3]*16+6+color] or takes[board[11]*16+6+color] or takes[board[20]*16+6+color] or takes[board[32]*16+6+color]:
       return True
     return False
   def placeable28(self, color):
-    if self.__index.takes(self.__board[3],4,color) or self.__index.takes(self.__board[12],3,color) or self.__index.takes(self.__board[21],3,color) or self.__index.takes(self.__board[31],3,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[3]*16+8+color] or takes[board[12]*16+6+color] or takes[board[21]*16+6+color] or takes[board[31]*16+6+color]:
       return True
     return False
   def placeable29(self, color):
-    if self.__index.takes(self.__board[3],5,color) or self.__index.takes(self.__board[13],3,color) or self.__index.takes(self.__board[22],2,color) or self.__index.takes(self.__board[30],3,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[3]*16+10+color] or takes[board[13]*16+6+color] or takes[board[22]*16+4+color] or takes[board[30]*16+6+color]:
       return True
     return False
   def placeable30(self, color):
-    if self.__index.takes(self.__board[3],6,color) or self.__index.takes(self.__board[14],3,color) or self.__index.takes(self.__board[23],1,color) or self.__index.takes(self.__board[29],3,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[3]*16+12+color] or takes[board[14]*16+6+color] or takes[board[23]*16+2+color] or takes[board[29]*16+6+color]:
       return True
     return False
   def placeable31(self, color):
-    if self.__index.takes(self.__board[3],7,color) or self.__index.takes(self.__board[15],3,color) or self.__index.takes(self.__board[24],0,color) or self.__index.takes(self.__board[28],3,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[3]*16+14+color] or takes[board[15]*16+6+color] or takes[board[24]*16+color] or takes[board[28]*16+6+color]:
       return True
     return False
   def placeable32(self, color):
-    if self.__index.takes(self.__board[4],0,color) or self.__index.takes(self.__board[8],4,color) or self.__index.takes(self.__board[18],4,color) or self.__index.takes(self.__board[36],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[4]*16+color] or takes[board[8]*16+8+color] or takes[board[18]*16+8+color] or takes[board[36]*16+color]:
       return True
     return False
   def placeable33(self, color):
-    if self.__index.takes(self.__board[4],1,color) or self.__index.takes(self.__board[9],4,color) or self.__index.takes(self.__board[19],4,color) or self.__index.takes(self.__board[35],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[4]*16+2+color] or takes[board[9]*16+8+color] or takes[board[19]*16+8+color] or takes[board[35]*16+2+color]:
       return True
     return False
   def placeable34(self, color):
-    if self.__index.takes(self.__board[4],2,color) or self.__index.takes(self.__board[10],4,color) or self.__index.takes(self.__board[20],4,color) or self.__index.takes(self.__board[34],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[4]*16+4+color] or takes[board[10]*16+8+color] or takes[board[20]*16+8+color] or takes[board[34]*16+4+color]:
       return True
     return False
   def placeable35(self, color):
-    if self.__index.takes(self.__board[4],3,color) or self.__index.takes(self.__board[11],4,color) or self.__index.takes(self.__board[21],4,color) or self.__index.takes(self.__board[33],3,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[4]*16+6+color] or takes[board[11]*16+8+color] or takes[board[21]*16+8+color] or takes[board[33]*16+6+color]:
       return True
     return False
   def placeable36(self, color):
-    if self.__index.takes(self.__board[4],4,color) or self.__index.takes(self.__board[12],4,color) or self.__index.takes(self.__board[22],3,color) or self.__index.takes(self.__board[32],4,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[4]*16+8+color] or takes[board[12]*16+8+color] or takes[board[22]*16+6+color] or takes[board[32]*16+8+color]:
       return True
     return False
   def placeable37(self, color):
-    if self.__index.takes(self.__board[4],5,color) or self.__index.takes(self.__board[13],4,color) or self.__index.takes(self.__board[23],2,color) or self.__index.takes(self.__board[31],4,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[4]*16+10+color] or takes[board[13]*16+8+color] or takes[board[23]*16+4+color] or takes[board[31]*16+8+color]:
       return True
     return False
   def placeable38(self, color):
-    if self.__index.takes(self.__board[4],6,color) or self.__index.takes(self.__board[14],4,color) or self.__index.takes(self.__board[24],1,color) or self.__index.takes(self.__board[30],4,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[4]*16+12+color] or takes[board[14]*16+8+color] or takes[board[24]*16+2+color] or takes[board[30]*16+8+color]:
       return True
     return False
   def placeable39(self, color):
-    if self.__index.takes(self.__board[4],7,color) or self.__index.takes(self.__board[15],4,color) or self.__index.takes(self.__board[25],0,color) or self.__index.takes(self.__board[29],4,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[4]*16+14+color] or takes[board[15]*16+8+color] or takes[board[25]*16+color] or takes[board[29]*16+8+color]:
       return True
     return False
   def placeable40(self, color):
-    if self.__index.takes(self.__board[5],0,color) or self.__index.takes(self.__board[8],5,color) or self.__index.takes(self.__board[19],5,color) or self.__index.takes(self.__board[37],0,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[5]*16+color] or takes[board[8]*16+10+color] or takes[board[19]*16+10+color] or takes[board[37]*16+color]:
       return True
     return False
   def placeable41(self, color):
-    if self.__index.takes(self.__board[5],1,color) or self.__index.takes(self.__board[9],5,color) or self.__index.takes(self.__board[20],5,color) or self.__index.takes(self.__board[36],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[5]*16+2+color] or takes[board[9]*16+10+color] or takes[board[20]*16+10+color] or takes[board[36]*16+2+color]:
       return True
     return False
   def placeable42(self, color):
-    if self.__index.takes(self.__board[5],2,color) or self.__index.takes(self.__board[10],5,color) or self.__index.takes(self.__board[21],5,color) or self.__index.takes(self.__board[35],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[5]*16+4+color] or takes[board[10]*16+10+color] or takes[board[21]*16+10+color] or takes[board[35]*16+4+color]:
       return True
     return False
   def placeable43(self, color):
-    if self.__index.takes(self.__board[5],3,color) or self.__index.takes(self.__board[11],5,color) or self.__index.takes(self.__board[22],4,color) or self.__index.takes(self.__board[34],3,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[5]*16+6+color] or takes[board[11]*16+10+color] or takes[board[22]*16+8+color] or takes[board[34]*16+6+color]:
       return True
     return False
   def placeable44(self, color):
-    if self.__index.takes(self.__board[5],4,color) or self.__index.takes(self.__board[12],5,color) or self.__index.takes(self.__board[23],3,color) or self.__index.takes(self.__board[33],4,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[5]*16+8+color] or takes[board[12]*16+10+color] or takes[board[23]*16+6+color] or takes[board[33]*16+8+color]:
       return True
     return False
   def placeable45(self, color):
-    if self.__index.takes(self.__board[5],5,color) or self.__index.takes(self.__board[13],5,color) or self.__index.takes(self.__board[24],2,color) or self.__index.takes(self.__board[32],5,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[5]*16+10+color] or takes[board[13]*16+10+color] or takes[board[24]*16+4+color] or takes[board[32]*16+10+color]:
       return True
     return False
   def placeable46(self, color):
-    if self.__index.takes(self.__board[5],6,color) or self.__index.takes(self.__board[14],5,color) or self.__index.takes(self.__board[25],1,color) or self.__index.takes(self.__board[31],5,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[5]*16+12+color] or takes[board[14]*16+10+color] or takes[board[25]*16+2+color] or takes[board[31]*16+10+color]:
       return True
     return False
   def placeable47(self, color):
-    if self.__index.takes(self.__board[5],7,color) or self.__index.takes(self.__board[15],5,color) or self.__index.takes(self.__board[26],0,color) or self.__index.takes(self.__board[30],5,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[5]*16+14+color] or takes[board[15]*16+10+color] or takes[board[26]*16+color] or takes[board[30]*16+10+color]:
       return True
     return False
   def placeable48(self, color):
-    if self.__index.takes(self.__board[6],0,color) or self.__index.takes(self.__board[8],6,color) or self.__index.takes(self.__board[20],6,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[6]*16+color] or takes[board[8]*16+12+color] or takes[board[20]*16+12+color]:
       return True
     return False
   def placeable49(self, color):
-    if self.__index.takes(self.__board[6],1,color) or self.__index.takes(self.__board[9],6,color) or self.__index.takes(self.__board[21],6,color) or self.__index.takes(self.__board[37],1,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[6]*16+2+color] or takes[board[9]*16+12+color] or takes[board[21]*16+12+color] or takes[board[37]*16+2+color]:
       return True
     return False
   def placeable50(self, color):
-    if self.__index.takes(self.__board[6],2,color) or self.__index.takes(self.__board[10],6,color) or self.__index.takes(self.__board[22],5,color) or self.__index.takes(self.__board[36],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[6]*16+4+color] or takes[board[10]*16+12+color] or takes[board[22]*16+10+color] or takes[board[36]*16+4+color]:
       return True
     return False
   def placeable51(self, color):
-    if self.__index.takes(self.__board[6],3,color) or self.__index.takes(self.__board[11],6,color) or self.__index.takes(self.__board[23],4,color) or self.__index.takes(self.__board[35],3,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[6]*16+6+color] or takes[board[11]*16+12+color] or takes[board[23]*16+8+color] or takes[board[35]*16+6+color]:
       return True
     return False
   def placeable52(self, color):
-    if self.__index.takes(self.__board[6],4,color) or self.__index.takes(self.__board[12],6,color) or self.__index.takes(self.__board[24],3,color) or self.__index.takes(self.__board[34],4,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[6]*16+8+color] or takes[board[12]*16+12+color] or takes[board[24]*16+6+color] or takes[board[34]*16+8+color]:
       return True
     return False
   def placeable53(self, color):
-    if self.__index.takes(self.__board[6],5,color) or self.__index.takes(self.__board[13],6,color) or self.__index.takes(self.__board[25],2,color) or self.__index.takes(self.__board[33],5,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[6]*16+10+color] or takes[board[13]*16+12+color] or takes[board[25]*16+4+color] or takes[board[33]*16+10+color]:
       return True
     return False
   def placeable54(self, color):
-    if self.__index.takes(self.__board[6],6,color) or self.__index.takes(self.__board[14],6,color) or self.__index.takes(self.__board[26],1,color) or self.__index.takes(self.__board[32],6,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[6]*16+12+color] or takes[board[14]*16+12+color] or takes[board[26]*16+2+color] or takes[board[32]*16+12+color]:
       return True
     return False
   def placeable55(self, color):
-    if self.__index.takes(self.__board[6],7,color) or self.__index.takes(self.__board[15],6,color) or self.__index.takes(self.__board[31],6,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[6]*16+14+color] or takes[board[15]*16+12+color] or takes[board[31]*16+12+color]:
       return True
     return False
   def placeable56(self, color):
-    if self.__index.takes(self.__board[7],0,color) or self.__index.takes(self.__board[8],7,color) or self.__index.takes(self.__board[21],7,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[7]*16+color] or takes[board[8]*16+14+color] or takes[board[21]*16+14+color]:
       return True
     return False
   def placeable57(self, color):
-    if self.__index.takes(self.__board[7],1,color) or self.__index.takes(self.__board[9],7,color) or self.__index.takes(self.__board[22],6,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[7]*16+2+color] or takes[board[9]*16+14+color] or takes[board[22]*16+12+color]:
       return True
     return False
   def placeable58(self, color):
-    if self.__index.takes(self.__board[7],2,color) or self.__index.takes(self.__board[10],7,color) or self.__index.takes(self.__board[23],5,color) or self.__index.takes(self.__board[37],2,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[7]*16+4+color] or takes[board[10]*16+14+color] or takes[board[23]*16+10+color] or takes[board[37]*16+4+color]:
       return True
     return False
   def placeable59(self, color):
-    if self.__index.takes(self.__board[7],3,color) or self.__index.takes(self.__board[11],7,color) or self.__index.takes(self.__board[24],4,color) or self.__index.takes(self.__board[36],3,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[7]*16+6+color] or takes[board[11]*16+14+color] or takes[board[24]*16+8+color] or takes[board[36]*16+6+color]:
       return True
     return False
   def placeable60(self, color):
-    if self.__index.takes(self.__board[7],4,color) or self.__index.takes(self.__board[12],7,color) or self.__index.takes(self.__board[25],3,color) or self.__index.takes(self.__board[35],4,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[7]*16+8+color] or takes[board[12]*16+14+color] or takes[board[25]*16+6+color] or takes[board[35]*16+8+color]:
       return True
     return False
   def placeable61(self, color):
-    if self.__index.takes(self.__board[7],5,color) or self.__index.takes(self.__board[13],7,color) or self.__index.takes(self.__board[26],2,color) or self.__index.takes(self.__board[34],5,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[7]*16+10+color] or takes[board[13]*16+14+color] or takes[board[26]*16+4+color] or takes[board[34]*16+10+color]:
       return True
     return False
   def placeable62(self, color):
-    if self.__index.takes(self.__board[7],6,color) or self.__index.takes(self.__board[14],7,color) or self.__index.takes(self.__board[33],6,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[7]*16+12+color] or takes[board[14]*16+14+color] or takes[board[33]*16+12+color]:
       return True
     return False
   def placeable63(self, color):
-    if self.__index.takes(self.__board[7],7,color) or self.__index.takes(self.__board[15],7,color) or self.__index.takes(self.__board[32],7,color):
+    board = self.__board
+    takes = self.__takes
+    if takes[board[7]*16+14+color] or takes[board[15]*16+14+color] or takes[board[32]*16+14+color]:
       return True
     return False
-
   def putAt0(self, color):
-    self.__board[0],fliped = self.__index.flip_line(self.__board[0],0,color)
-    if fliped[1] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],0)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],0)
-      if fliped[1] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],0)
-        self.__board[16] = self.__index.flip_disk(self.__board[16],0)
-        self.__board[30] = self.__index.flip_disk(self.__board[30],0)
-        if fliped[1] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],0)
-          self.__board[17] = self.__index.flip_disk(self.__board[17],0)
-          self.__board[29] = self.__index.flip_disk(self.__board[29],0)
-          if fliped[1] >= 4:
-            self.__board[12] = self.__index.flip_disk(self.__board[12],0)
-            self.__board[18] = self.__index.flip_disk(self.__board[18],0)
-            self.__board[28] = self.__index.flip_disk(self.__board[28],0)
-            if fliped[1] >= 5:
-              self.__board[13] = self.__index.flip_disk(self.__board[13],0)
-              self.__board[19] = self.__index.flip_disk(self.__board[19],0)
-              self.__board[27] = self.__index.flip_disk(self.__board[27],0)
-              if fliped[1] >= 6:
-                self.__board[14] = self.__index.flip_disk(self.__board[14],0)
-                self.__board[20] = self.__index.flip_disk(self.__board[20],0)
-    self.__board[8],fliped = self.__index.flip_line(self.__board[8],0,color)
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],0);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],0);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],0);
-        self.__board[16] = self.__index.flip_disk(self.__board[16],2);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],0);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],0);
-          self.__board[17] = self.__index.flip_disk(self.__board[17],3);
-          self.__board[35] = self.__index.flip_disk(self.__board[35],0);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],0);
-            self.__board[18] = self.__index.flip_disk(self.__board[18],4);
-            self.__board[36] = self.__index.flip_disk(self.__board[36],0);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],0);
-              self.__board[19] = self.__index.flip_disk(self.__board[19],5);
-              self.__board[37] = self.__index.flip_disk(self.__board[37],0);
-              if fliped[1] >= 6:
-                self.__board[6] = self.__index.flip_disk(self.__board[6],0);
-                self.__board[20] = self.__index.flip_disk(self.__board[20],6);
-    self.__board[32],fliped = self.__index.flip_line(self.__board[32],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],1);
-      self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-            self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-            self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-              self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-              self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-              if fliped[1] >= 6:
-                self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-                self.__board[14] = self.__index.flip_disk(self.__board[14],6);
-                self.__board[26] = self.__index.flip_disk(self.__board[26],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[0+color]
+    i = board[0]*16+color
+    board[0] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[1]
+      flips |= 0x2
+      board[9] = flip_disk[board[9]*8+0]
+      board[31] = flip_disk[board[31]*8+0]
+      if fliped >= 2:
+        h ^= zflip[2]
+        flips |= 0x4
+        board[10] = flip_disk[board[10]*8+0]
+        board[16] = flip_disk[board[16]*8+0]
+        board[30] = flip_disk[board[30]*8+0]
+        if fliped >= 3:
+          h ^= zflip[3]
+          flips |= 0x8
+          board[11] = flip_disk[board[11]*8+0]
+          board[17] = flip_disk[board[17]*8+0]
+          board[29] = flip_disk[board[29]*8+0]
+          if fliped >= 4:
+            h ^= zflip[4]
+            flips |= 0x10
+            board[12] = flip_disk[board[12]*8+0]
+            board[18] = flip_disk[board[18]*8+0]
+            board[28] = flip_disk[board[28]*8+0]
+            if fliped >= 5:
+              h ^= zflip[5]
+              flips |= 0x20
+              board[13] = flip_disk[board[13]*8+0]
+              board[19] = flip_disk[board[19]*8+0]
+              board[27] = flip_disk[board[27]*8+0]
+              if fliped >= 6:
+                h ^= zflip[6]
+                flips |= 0x40
+                board[14] = flip_disk[board[14]*8+0]
+                board[20] = flip_disk[board[20]*8+0]
+    i = board[8]*16+color
+    board[8] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[8]
+      flips |= 0x100
+      board[1] = flip_disk[board[1]*8+0]
+      board[33] = flip_disk[board[33]*8+0]
+      if fliped >= 2:
+        h ^= zflip[16]
+        flips |= 0x10000
+        board[2] = flip_disk[board[2]*8+0]
+        board[16] = flip_disk[board[16]*8+2]
+        board[34] = flip_disk[board[34]*8+0]
+        if fliped >= 3:
+          h ^= zflip[24]
+          flips |= 0x1000000
+          board[3] = flip_disk[board[3]*8+0]
+          board[17] = flip_disk[board[17]*8+3]
+          board[35] = flip_disk[board[35]*8+0]
+          if fliped >= 4:
+            h ^= zflip[32]
+            flips |= 0x100000000
+            board[4] = flip_disk[board[4]*8+0]
+            board[18] = flip_disk[board[18]*8+4]
+            board[36] = flip_disk[board[36]*8+0]
+            if fliped >= 5:
+              h ^= zflip[40]
+              flips |= 0x10000000000
+              board[5] = flip_disk[board[5]*8+0]
+              board[19] = flip_disk[board[19]*8+5]
+              board[37] = flip_disk[board[37]*8+0]
+              if fliped >= 6:
+                h ^= zflip[48]
+                flips |= 0x1000000000000
+                board[6] = flip_disk[board[6]*8+0]
+                board[20] = flip_disk[board[20]*8+6]
+    i = board[32]*16+color
+    board[32] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[9]
+      flips |= 0x200
+      board[1] = flip_disk[board[1]*8+1]
+      board[9] = flip_disk[board[9]*8+1]
+      board[16] = flip_disk[board[16]*8+1]
+      if fliped >= 2:
+        h ^= zflip[18]
+        flips |= 0x40000
+        board[2] = flip_disk[board[2]*8+2]
+        board[10] = flip_disk[board[10]*8+2]
+        board[18] = flip_disk[board[18]*8+2]
+        if fliped >= 3:
+          h ^= zflip[27]
+          flips |= 0x8000000
+          board[3] = flip_disk[board[3]*8+3]
+          board[11] = flip_disk[board[11]*8+3]
+          board[20] = flip_disk[board[20]*8+3]
+          if fliped >= 4:
+            h ^= zflip[36]
+            flips |= 0x1000000000
+            board[4] = flip_disk[board[4]*8+4]
+            board[12] = flip_disk[board[12]*8+4]
+            board[22] = flip_disk[board[22]*8+3]
+            if fliped >= 5:
+              h ^= zflip[45]
+              flips |= 0x200000000000
+              board[5] = flip_disk[board[5]*8+5]
+              board[13] = flip_disk[board[13]*8+5]
+              board[24] = flip_disk[board[24]*8+2]
+              if fliped >= 6:
+                h ^= zflip[54]
+                flips |= 0x40000000000000
+                board[6] = flip_disk[board[6]*8+6]
+                board[14] = flip_disk[board[14]*8+6]
+                board[26] = flip_disk[board[26]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(0, color, flips)
   def putAt1(self, color):
-    self.__board[0],fliped = self.__index.flip_line(self.__board[0],1,color)
-    if fliped[1] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],0)
-      self.__board[16] = self.__index.flip_disk(self.__board[16],0)
-      self.__board[30] = self.__index.flip_disk(self.__board[30],0)
-      if fliped[1] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],0)
-        self.__board[17] = self.__index.flip_disk(self.__board[17],0)
-        self.__board[29] = self.__index.flip_disk(self.__board[29],0)
-        if fliped[1] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],0)
-          self.__board[18] = self.__index.flip_disk(self.__board[18],0)
-          self.__board[28] = self.__index.flip_disk(self.__board[28],0)
-          if fliped[1] >= 4:
-            self.__board[13] = self.__index.flip_disk(self.__board[13],0)
-            self.__board[19] = self.__index.flip_disk(self.__board[19],0)
-            self.__board[27] = self.__index.flip_disk(self.__board[27],0)
-            if fliped[1] >= 5:
-              self.__board[14] = self.__index.flip_disk(self.__board[14],0)
-              self.__board[20] = self.__index.flip_disk(self.__board[20],0)
-    self.__board[9],fliped = self.__index.flip_line(self.__board[9],0,color)
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-      self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-        self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],1);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-          self.__board[18] = self.__index.flip_disk(self.__board[18],3);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-            self.__board[19] = self.__index.flip_disk(self.__board[19],4);
-            self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-              self.__board[20] = self.__index.flip_disk(self.__board[20],5);
-              self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-              if fliped[1] >= 6:
-                self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-                self.__board[21] = self.__index.flip_disk(self.__board[21],6);
-                self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[31],fliped = self.__index.flip_line(self.__board[31],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],1);
-      self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-            self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-            self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-              self.__board[14] = self.__index.flip_disk(self.__board[14],5);
-              self.__board[25] = self.__index.flip_disk(self.__board[25],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[2+color]
+    i = board[0]*16+2+color
+    board[0] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[2]
+      flips |= 0x4
+      board[10] = flip_disk[board[10]*8+0]
+      board[16] = flip_disk[board[16]*8+0]
+      board[30] = flip_disk[board[30]*8+0]
+      if fliped >= 2:
+        h ^= zflip[3]
+        flips |= 0x8
+        board[11] = flip_disk[board[11]*8+0]
+        board[17] = flip_disk[board[17]*8+0]
+        board[29] = flip_disk[board[29]*8+0]
+        if fliped >= 3:
+          h ^= zflip[4]
+          flips |= 0x10
+          board[12] = flip_disk[board[12]*8+0]
+          board[18] = flip_disk[board[18]*8+0]
+          board[28] = flip_disk[board[28]*8+0]
+          if fliped >= 4:
+            h ^= zflip[5]
+            flips |= 0x20
+            board[13] = flip_disk[board[13]*8+0]
+            board[19] = flip_disk[board[19]*8+0]
+            board[27] = flip_disk[board[27]*8+0]
+            if fliped >= 5:
+              h ^= zflip[6]
+              flips |= 0x40
+              board[14] = flip_disk[board[14]*8+0]
+              board[20] = flip_disk[board[20]*8+0]
+    i = board[9]*16+color
+    board[9] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[9]
+      flips |= 0x200
+      board[1] = flip_disk[board[1]*8+1]
+      board[16] = flip_disk[board[16]*8+1]
+      board[32] = flip_disk[board[32]*8+1]
+      if fliped >= 2:
+        h ^= zflip[17]
+        flips |= 0x20000
+        board[2] = flip_disk[board[2]*8+1]
+        board[17] = flip_disk[board[17]*8+2]
+        board[33] = flip_disk[board[33]*8+1]
+        if fliped >= 3:
+          h ^= zflip[25]
+          flips |= 0x2000000
+          board[3] = flip_disk[board[3]*8+1]
+          board[18] = flip_disk[board[18]*8+3]
+          board[34] = flip_disk[board[34]*8+1]
+          if fliped >= 4:
+            h ^= zflip[33]
+            flips |= 0x200000000
+            board[4] = flip_disk[board[4]*8+1]
+            board[19] = flip_disk[board[19]*8+4]
+            board[35] = flip_disk[board[35]*8+1]
+            if fliped >= 5:
+              h ^= zflip[41]
+              flips |= 0x20000000000
+              board[5] = flip_disk[board[5]*8+1]
+              board[20] = flip_disk[board[20]*8+5]
+              board[36] = flip_disk[board[36]*8+1]
+              if fliped >= 6:
+                h ^= zflip[49]
+                flips |= 0x2000000000000
+                board[6] = flip_disk[board[6]*8+1]
+                board[21] = flip_disk[board[21]*8+6]
+                board[37] = flip_disk[board[37]*8+1]
+    i = board[31]*16+color
+    board[31] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[10]
+      flips |= 0x400
+      board[1] = flip_disk[board[1]*8+2]
+      board[10] = flip_disk[board[10]*8+1]
+      board[17] = flip_disk[board[17]*8+1]
+      if fliped >= 2:
+        h ^= zflip[19]
+        flips |= 0x80000
+        board[2] = flip_disk[board[2]*8+3]
+        board[11] = flip_disk[board[11]*8+2]
+        board[19] = flip_disk[board[19]*8+2]
+        if fliped >= 3:
+          h ^= zflip[28]
+          flips |= 0x10000000
+          board[3] = flip_disk[board[3]*8+4]
+          board[12] = flip_disk[board[12]*8+3]
+          board[21] = flip_disk[board[21]*8+3]
+          if fliped >= 4:
+            h ^= zflip[37]
+            flips |= 0x2000000000
+            board[4] = flip_disk[board[4]*8+5]
+            board[13] = flip_disk[board[13]*8+4]
+            board[23] = flip_disk[board[23]*8+2]
+            if fliped >= 5:
+              h ^= zflip[46]
+              flips |= 0x400000000000
+              board[5] = flip_disk[board[5]*8+6]
+              board[14] = flip_disk[board[14]*8+5]
+              board[25] = flip_disk[board[25]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(1, color, flips)
   def putAt2(self, color):
-    self.__board[0],fliped = self.__index.flip_line(self.__board[0],2,color)
-    if fliped[0] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],0)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],0)
-    if fliped[1] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],0)
-      self.__board[17] = self.__index.flip_disk(self.__board[17],0)
-      self.__board[29] = self.__index.flip_disk(self.__board[29],0)
-      if fliped[1] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],0)
-        self.__board[18] = self.__index.flip_disk(self.__board[18],0)
-        self.__board[28] = self.__index.flip_disk(self.__board[28],0)
-        if fliped[1] >= 3:
-          self.__board[13] = self.__index.flip_disk(self.__board[13],0)
-          self.__board[19] = self.__index.flip_disk(self.__board[19],0)
-          self.__board[27] = self.__index.flip_disk(self.__board[27],0)
-          if fliped[1] >= 4:
-            self.__board[14] = self.__index.flip_disk(self.__board[14],0)
-            self.__board[20] = self.__index.flip_disk(self.__board[20],0)
-    self.__board[10],fliped = self.__index.flip_line(self.__board[10],0,color)
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-      self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-            self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-            self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-              self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-              self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-              if fliped[1] >= 6:
-                self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-                self.__board[22] = self.__index.flip_disk(self.__board[22],5);
-                self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-    self.__board[16],fliped = self.__index.flip_line(self.__board[16],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],1);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],1);
-    self.__board[30],fliped = self.__index.flip_line(self.__board[30],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],1);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-          self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-            self.__board[14] = self.__index.flip_disk(self.__board[14],4);
-            self.__board[24] = self.__index.flip_disk(self.__board[24],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[4+color]
+    i = board[0]*16+4+color
+    board[0] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[1]
+      flips |= 0x2
+      board[9] = flip_disk[board[9]*8+0]
+      board[31] = flip_disk[board[31]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[3]
+      flips |= 0x8
+      board[11] = flip_disk[board[11]*8+0]
+      board[17] = flip_disk[board[17]*8+0]
+      board[29] = flip_disk[board[29]*8+0]
+      if fliped >= 2:
+        h ^= zflip[4]
+        flips |= 0x10
+        board[12] = flip_disk[board[12]*8+0]
+        board[18] = flip_disk[board[18]*8+0]
+        board[28] = flip_disk[board[28]*8+0]
+        if fliped >= 3:
+          h ^= zflip[5]
+          flips |= 0x20
+          board[13] = flip_disk[board[13]*8+0]
+          board[19] = flip_disk[board[19]*8+0]
+          board[27] = flip_disk[board[27]*8+0]
+          if fliped >= 4:
+            h ^= zflip[6]
+            flips |= 0x40
+            board[14] = flip_disk[board[14]*8+0]
+            board[20] = flip_disk[board[20]*8+0]
+    i = board[10]*16+color
+    board[10] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[10]
+      flips |= 0x400
+      board[1] = flip_disk[board[1]*8+2]
+      board[17] = flip_disk[board[17]*8+1]
+      board[31] = flip_disk[board[31]*8+1]
+      if fliped >= 2:
+        h ^= zflip[18]
+        flips |= 0x40000
+        board[2] = flip_disk[board[2]*8+2]
+        board[18] = flip_disk[board[18]*8+2]
+        board[32] = flip_disk[board[32]*8+2]
+        if fliped >= 3:
+          h ^= zflip[26]
+          flips |= 0x4000000
+          board[3] = flip_disk[board[3]*8+2]
+          board[19] = flip_disk[board[19]*8+3]
+          board[33] = flip_disk[board[33]*8+2]
+          if fliped >= 4:
+            h ^= zflip[34]
+            flips |= 0x400000000
+            board[4] = flip_disk[board[4]*8+2]
+            board[20] = flip_disk[board[20]*8+4]
+            board[34] = flip_disk[board[34]*8+2]
+            if fliped >= 5:
+              h ^= zflip[42]
+              flips |= 0x40000000000
+              board[5] = flip_disk[board[5]*8+2]
+              board[21] = flip_disk[board[21]*8+5]
+              board[35] = flip_disk[board[35]*8+2]
+              if fliped >= 6:
+                h ^= zflip[50]
+                flips |= 0x4000000000000
+                board[6] = flip_disk[board[6]*8+2]
+                board[22] = flip_disk[board[22]*8+5]
+                board[36] = flip_disk[board[36]*8+2]
+    i = board[16]*16+color
+    board[16] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[9]
+      flips |= 0x200
+      board[1] = flip_disk[board[1]*8+1]
+      board[9] = flip_disk[board[9]*8+1]
+      board[32] = flip_disk[board[32]*8+1]
+    i = board[30]*16+color
+    board[30] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[11]
+      flips |= 0x800
+      board[1] = flip_disk[board[1]*8+3]
+      board[11] = flip_disk[board[11]*8+1]
+      board[18] = flip_disk[board[18]*8+1]
+      if fliped >= 2:
+        h ^= zflip[20]
+        flips |= 0x100000
+        board[2] = flip_disk[board[2]*8+4]
+        board[12] = flip_disk[board[12]*8+2]
+        board[20] = flip_disk[board[20]*8+2]
+        if fliped >= 3:
+          h ^= zflip[29]
+          flips |= 0x20000000
+          board[3] = flip_disk[board[3]*8+5]
+          board[13] = flip_disk[board[13]*8+3]
+          board[22] = flip_disk[board[22]*8+2]
+          if fliped >= 4:
+            h ^= zflip[38]
+            flips |= 0x4000000000
+            board[4] = flip_disk[board[4]*8+6]
+            board[14] = flip_disk[board[14]*8+4]
+            board[24] = flip_disk[board[24]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(2, color, flips)
   def putAt3(self, color):
-    self.__board[0],fliped = self.__index.flip_line(self.__board[0],3,color)
-    if fliped[0] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],0)
-      self.__board[16] = self.__index.flip_disk(self.__board[16],0)
-      self.__board[30] = self.__index.flip_disk(self.__board[30],0)
-      if fliped[0] >= 2:
-        self.__board[9] = self.__index.flip_disk(self.__board[9],0)
-        self.__board[31] = self.__index.flip_disk(self.__board[31],0)
-    if fliped[1] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],0)
-      self.__board[18] = self.__index.flip_disk(self.__board[18],0)
-      self.__board[28] = self.__index.flip_disk(self.__board[28],0)
-      if fliped[1] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],0)
-        self.__board[19] = self.__index.flip_disk(self.__board[19],0)
-        self.__board[27] = self.__index.flip_disk(self.__board[27],0)
-        if fliped[1] >= 3:
-          self.__board[14] = self.__index.flip_disk(self.__board[14],0)
-          self.__board[20] = self.__index.flip_disk(self.__board[20],0)
-    self.__board[11],fliped = self.__index.flip_line(self.__board[11],0,color)
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],1);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-            self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-            self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-              self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-              self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-              if fliped[1] >= 6:
-                self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-                self.__board[23] = self.__index.flip_disk(self.__board[23],4);
-                self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-    self.__board[17],fliped = self.__index.flip_line(self.__board[17],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],1);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-        self.__board[9] = self.__index.flip_disk(self.__board[9],2);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],1);
-    self.__board[29],fliped = self.__index.flip_line(self.__board[29],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],1);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-          self.__board[14] = self.__index.flip_disk(self.__board[14],3);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[6+color]
+    i = board[0]*16+6+color
+    board[0] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[2]
+      flips |= 0x4
+      board[10] = flip_disk[board[10]*8+0]
+      board[16] = flip_disk[board[16]*8+0]
+      board[30] = flip_disk[board[30]*8+0]
+      if fliped >= 2:
+        h ^= zflip[1]
+        flips |= 0x2
+        board[9] = flip_disk[board[9]*8+0]
+        board[31] = flip_disk[board[31]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[4]
+      flips |= 0x10
+      board[12] = flip_disk[board[12]*8+0]
+      board[18] = flip_disk[board[18]*8+0]
+      board[28] = flip_disk[board[28]*8+0]
+      if fliped >= 2:
+        h ^= zflip[5]
+        flips |= 0x20
+        board[13] = flip_disk[board[13]*8+0]
+        board[19] = flip_disk[board[19]*8+0]
+        board[27] = flip_disk[board[27]*8+0]
+        if fliped >= 3:
+          h ^= zflip[6]
+          flips |= 0x40
+          board[14] = flip_disk[board[14]*8+0]
+          board[20] = flip_disk[board[20]*8+0]
+    i = board[11]*16+color
+    board[11] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[11]
+      flips |= 0x800
+      board[1] = flip_disk[board[1]*8+3]
+      board[18] = flip_disk[board[18]*8+1]
+      board[30] = flip_disk[board[30]*8+1]
+      if fliped >= 2:
+        h ^= zflip[19]
+        flips |= 0x80000
+        board[2] = flip_disk[board[2]*8+3]
+        board[19] = flip_disk[board[19]*8+2]
+        board[31] = flip_disk[board[31]*8+2]
+        if fliped >= 3:
+          h ^= zflip[27]
+          flips |= 0x8000000
+          board[3] = flip_disk[board[3]*8+3]
+          board[20] = flip_disk[board[20]*8+3]
+          board[32] = flip_disk[board[32]*8+3]
+          if fliped >= 4:
+            h ^= zflip[35]
+            flips |= 0x800000000
+            board[4] = flip_disk[board[4]*8+3]
+            board[21] = flip_disk[board[21]*8+4]
+            board[33] = flip_disk[board[33]*8+3]
+            if fliped >= 5:
+              h ^= zflip[43]
+              flips |= 0x80000000000
+              board[5] = flip_disk[board[5]*8+3]
+              board[22] = flip_disk[board[22]*8+4]
+              board[34] = flip_disk[board[34]*8+3]
+              if fliped >= 6:
+                h ^= zflip[51]
+                flips |= 0x8000000000000
+                board[6] = flip_disk[board[6]*8+3]
+                board[23] = flip_disk[board[23]*8+4]
+                board[35] = flip_disk[board[35]*8+3]
+    i = board[17]*16+color
+    board[17] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[10]
+      flips |= 0x400
+      board[1] = flip_disk[board[1]*8+2]
+      board[10] = flip_disk[board[10]*8+1]
+      board[31] = flip_disk[board[31]*8+1]
+      if fliped >= 2:
+        h ^= zflip[17]
+        flips |= 0x20000
+        board[2] = flip_disk[board[2]*8+1]
+        board[9] = flip_disk[board[9]*8+2]
+        board[33] = flip_disk[board[33]*8+1]
+    i = board[29]*16+color
+    board[29] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[12]
+      flips |= 0x1000
+      board[1] = flip_disk[board[1]*8+4]
+      board[12] = flip_disk[board[12]*8+1]
+      board[19] = flip_disk[board[19]*8+1]
+      if fliped >= 2:
+        h ^= zflip[21]
+        flips |= 0x200000
+        board[2] = flip_disk[board[2]*8+5]
+        board[13] = flip_disk[board[13]*8+2]
+        board[21] = flip_disk[board[21]*8+2]
+        if fliped >= 3:
+          h ^= zflip[30]
+          flips |= 0x40000000
+          board[3] = flip_disk[board[3]*8+6]
+          board[14] = flip_disk[board[14]*8+3]
+          board[23] = flip_disk[board[23]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(3, color, flips)
   def putAt4(self, color):
-    self.__board[0],fliped = self.__index.flip_line(self.__board[0],4,color)
-    if fliped[0] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],0)
-      self.__board[17] = self.__index.flip_disk(self.__board[17],0)
-      self.__board[29] = self.__index.flip_disk(self.__board[29],0)
-      if fliped[0] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],0)
-        self.__board[16] = self.__index.flip_disk(self.__board[16],0)
-        self.__board[30] = self.__index.flip_disk(self.__board[30],0)
-        if fliped[0] >= 3:
-          self.__board[9] = self.__index.flip_disk(self.__board[9],0)
-          self.__board[31] = self.__index.flip_disk(self.__board[31],0)
-    if fliped[1] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],0)
-      self.__board[19] = self.__index.flip_disk(self.__board[19],0)
-      self.__board[27] = self.__index.flip_disk(self.__board[27],0)
-      if fliped[1] >= 2:
-        self.__board[14] = self.__index.flip_disk(self.__board[14],0)
-        self.__board[20] = self.__index.flip_disk(self.__board[20],0)
-    self.__board[12],fliped = self.__index.flip_line(self.__board[12],0,color)
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],1);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-            self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-            self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-              self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-              self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-              if fliped[1] >= 6:
-                self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-                self.__board[24] = self.__index.flip_disk(self.__board[24],3);
-                self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-    self.__board[18],fliped = self.__index.flip_line(self.__board[18],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],1);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-          self.__board[9] = self.__index.flip_disk(self.__board[9],3);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-    self.__board[28],fliped = self.__index.flip_line(self.__board[28],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],1);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-        self.__board[14] = self.__index.flip_disk(self.__board[14],2);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[8+color]
+    i = board[0]*16+8+color
+    board[0] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[3]
+      flips |= 0x8
+      board[11] = flip_disk[board[11]*8+0]
+      board[17] = flip_disk[board[17]*8+0]
+      board[29] = flip_disk[board[29]*8+0]
+      if fliped >= 2:
+        h ^= zflip[2]
+        flips |= 0x4
+        board[10] = flip_disk[board[10]*8+0]
+        board[16] = flip_disk[board[16]*8+0]
+        board[30] = flip_disk[board[30]*8+0]
+        if fliped >= 3:
+          h ^= zflip[1]
+          flips |= 0x2
+          board[9] = flip_disk[board[9]*8+0]
+          board[31] = flip_disk[board[31]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[5]
+      flips |= 0x20
+      board[13] = flip_disk[board[13]*8+0]
+      board[19] = flip_disk[board[19]*8+0]
+      board[27] = flip_disk[board[27]*8+0]
+      if fliped >= 2:
+        h ^= zflip[6]
+        flips |= 0x40
+        board[14] = flip_disk[board[14]*8+0]
+        board[20] = flip_disk[board[20]*8+0]
+    i = board[12]*16+color
+    board[12] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[12]
+      flips |= 0x1000
+      board[1] = flip_disk[board[1]*8+4]
+      board[19] = flip_disk[board[19]*8+1]
+      board[29] = flip_disk[board[29]*8+1]
+      if fliped >= 2:
+        h ^= zflip[20]
+        flips |= 0x100000
+        board[2] = flip_disk[board[2]*8+4]
+        board[20] = flip_disk[board[20]*8+2]
+        board[30] = flip_disk[board[30]*8+2]
+        if fliped >= 3:
+          h ^= zflip[28]
+          flips |= 0x10000000
+          board[3] = flip_disk[board[3]*8+4]
+          board[21] = flip_disk[board[21]*8+3]
+          board[31] = flip_disk[board[31]*8+3]
+          if fliped >= 4:
+            h ^= zflip[36]
+            flips |= 0x1000000000
+            board[4] = flip_disk[board[4]*8+4]
+            board[22] = flip_disk[board[22]*8+3]
+            board[32] = flip_disk[board[32]*8+4]
+            if fliped >= 5:
+              h ^= zflip[44]
+              flips |= 0x100000000000
+              board[5] = flip_disk[board[5]*8+4]
+              board[23] = flip_disk[board[23]*8+3]
+              board[33] = flip_disk[board[33]*8+4]
+              if fliped >= 6:
+                h ^= zflip[52]
+                flips |= 0x10000000000000
+                board[6] = flip_disk[board[6]*8+4]
+                board[24] = flip_disk[board[24]*8+3]
+                board[34] = flip_disk[board[34]*8+4]
+    i = board[18]*16+color
+    board[18] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[11]
+      flips |= 0x800
+      board[1] = flip_disk[board[1]*8+3]
+      board[11] = flip_disk[board[11]*8+1]
+      board[30] = flip_disk[board[30]*8+1]
+      if fliped >= 2:
+        h ^= zflip[18]
+        flips |= 0x40000
+        board[2] = flip_disk[board[2]*8+2]
+        board[10] = flip_disk[board[10]*8+2]
+        board[32] = flip_disk[board[32]*8+2]
+        if fliped >= 3:
+          h ^= zflip[25]
+          flips |= 0x2000000
+          board[3] = flip_disk[board[3]*8+1]
+          board[9] = flip_disk[board[9]*8+3]
+          board[34] = flip_disk[board[34]*8+1]
+    i = board[28]*16+color
+    board[28] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[13]
+      flips |= 0x2000
+      board[1] = flip_disk[board[1]*8+5]
+      board[13] = flip_disk[board[13]*8+1]
+      board[20] = flip_disk[board[20]*8+1]
+      if fliped >= 2:
+        h ^= zflip[22]
+        flips |= 0x400000
+        board[2] = flip_disk[board[2]*8+6]
+        board[14] = flip_disk[board[14]*8+2]
+        board[22] = flip_disk[board[22]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(4, color, flips)
   def putAt5(self, color):
-    self.__board[0],fliped = self.__index.flip_line(self.__board[0],5,color)
-    if fliped[0] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],0)
-      self.__board[18] = self.__index.flip_disk(self.__board[18],0)
-      self.__board[28] = self.__index.flip_disk(self.__board[28],0)
-      if fliped[0] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],0)
-        self.__board[17] = self.__index.flip_disk(self.__board[17],0)
-        self.__board[29] = self.__index.flip_disk(self.__board[29],0)
-        if fliped[0] >= 3:
-          self.__board[10] = self.__index.flip_disk(self.__board[10],0)
-          self.__board[16] = self.__index.flip_disk(self.__board[16],0)
-          self.__board[30] = self.__index.flip_disk(self.__board[30],0)
-          if fliped[0] >= 4:
-            self.__board[9] = self.__index.flip_disk(self.__board[9],0)
-            self.__board[31] = self.__index.flip_disk(self.__board[31],0)
-    if fliped[1] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],0)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],0)
-    self.__board[13],fliped = self.__index.flip_line(self.__board[13],0,color)
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],1);
-      self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-            self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-            self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-              self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-              self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-              if fliped[1] >= 6:
-                self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-                self.__board[25] = self.__index.flip_disk(self.__board[25],2);
-                self.__board[33] = self.__index.flip_disk(self.__board[33],5);
-    self.__board[19],fliped = self.__index.flip_line(self.__board[19],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],1);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-          self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-            self.__board[9] = self.__index.flip_disk(self.__board[9],4);
-            self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-    self.__board[27],fliped = self.__index.flip_line(self.__board[27],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],1);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[10+color]
+    i = board[0]*16+10+color
+    board[0] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[4]
+      flips |= 0x10
+      board[12] = flip_disk[board[12]*8+0]
+      board[18] = flip_disk[board[18]*8+0]
+      board[28] = flip_disk[board[28]*8+0]
+      if fliped >= 2:
+        h ^= zflip[3]
+        flips |= 0x8
+        board[11] = flip_disk[board[11]*8+0]
+        board[17] = flip_disk[board[17]*8+0]
+        board[29] = flip_disk[board[29]*8+0]
+        if fliped >= 3:
+          h ^= zflip[2]
+          flips |= 0x4
+          board[10] = flip_disk[board[10]*8+0]
+          board[16] = flip_disk[board[16]*8+0]
+          board[30] = flip_disk[board[30]*8+0]
+          if fliped >= 4:
+            h ^= zflip[1]
+            flips |= 0x2
+            board[9] = flip_disk[board[9]*8+0]
+            board[31] = flip_disk[board[31]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[6]
+      flips |= 0x40
+      board[14] = flip_disk[board[14]*8+0]
+      board[20] = flip_disk[board[20]*8+0]
+    i = board[13]*16+color
+    board[13] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[13]
+      flips |= 0x2000
+      board[1] = flip_disk[board[1]*8+5]
+      board[20] = flip_disk[board[20]*8+1]
+      board[28] = flip_disk[board[28]*8+1]
+      if fliped >= 2:
+        h ^= zflip[21]
+        flips |= 0x200000
+        board[2] = flip_disk[board[2]*8+5]
+        board[21] = flip_disk[board[21]*8+2]
+        board[29] = flip_disk[board[29]*8+2]
+        if fliped >= 3:
+          h ^= zflip[29]
+          flips |= 0x20000000
+          board[3] = flip_disk[board[3]*8+5]
+          board[22] = flip_disk[board[22]*8+2]
+          board[30] = flip_disk[board[30]*8+3]
+          if fliped >= 4:
+            h ^= zflip[37]
+            flips |= 0x2000000000
+            board[4] = flip_disk[board[4]*8+5]
+            board[23] = flip_disk[board[23]*8+2]
+            board[31] = flip_disk[board[31]*8+4]
+            if fliped >= 5:
+              h ^= zflip[45]
+              flips |= 0x200000000000
+              board[5] = flip_disk[board[5]*8+5]
+              board[24] = flip_disk[board[24]*8+2]
+              board[32] = flip_disk[board[32]*8+5]
+              if fliped >= 6:
+                h ^= zflip[53]
+                flips |= 0x20000000000000
+                board[6] = flip_disk[board[6]*8+5]
+                board[25] = flip_disk[board[25]*8+2]
+                board[33] = flip_disk[board[33]*8+5]
+    i = board[19]*16+color
+    board[19] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[12]
+      flips |= 0x1000
+      board[1] = flip_disk[board[1]*8+4]
+      board[12] = flip_disk[board[12]*8+1]
+      board[29] = flip_disk[board[29]*8+1]
+      if fliped >= 2:
+        h ^= zflip[19]
+        flips |= 0x80000
+        board[2] = flip_disk[board[2]*8+3]
+        board[11] = flip_disk[board[11]*8+2]
+        board[31] = flip_disk[board[31]*8+2]
+        if fliped >= 3:
+          h ^= zflip[26]
+          flips |= 0x4000000
+          board[3] = flip_disk[board[3]*8+2]
+          board[10] = flip_disk[board[10]*8+3]
+          board[33] = flip_disk[board[33]*8+2]
+          if fliped >= 4:
+            h ^= zflip[33]
+            flips |= 0x200000000
+            board[4] = flip_disk[board[4]*8+1]
+            board[9] = flip_disk[board[9]*8+4]
+            board[35] = flip_disk[board[35]*8+1]
+    i = board[27]*16+color
+    board[27] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[14]
+      flips |= 0x4000
+      board[1] = flip_disk[board[1]*8+6]
+      board[14] = flip_disk[board[14]*8+1]
+      board[21] = flip_disk[board[21]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(5, color, flips)
   def putAt6(self, color):
-    self.__board[0],fliped = self.__index.flip_line(self.__board[0],6,color)
-    if fliped[0] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],0)
-      self.__board[19] = self.__index.flip_disk(self.__board[19],0)
-      self.__board[27] = self.__index.flip_disk(self.__board[27],0)
-      if fliped[0] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],0)
-        self.__board[18] = self.__index.flip_disk(self.__board[18],0)
-        self.__board[28] = self.__index.flip_disk(self.__board[28],0)
-        if fliped[0] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],0)
-          self.__board[17] = self.__index.flip_disk(self.__board[17],0)
-          self.__board[29] = self.__index.flip_disk(self.__board[29],0)
-          if fliped[0] >= 4:
-            self.__board[10] = self.__index.flip_disk(self.__board[10],0)
-            self.__board[16] = self.__index.flip_disk(self.__board[16],0)
-            self.__board[30] = self.__index.flip_disk(self.__board[30],0)
-            if fliped[0] >= 5:
-              self.__board[9] = self.__index.flip_disk(self.__board[9],0)
-              self.__board[31] = self.__index.flip_disk(self.__board[31],0)
-    self.__board[14],fliped = self.__index.flip_line(self.__board[14],0,color)
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],1);
-      self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],1);
-        self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],1);
-          self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-            self.__board[24] = self.__index.flip_disk(self.__board[24],1);
-            self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-              self.__board[25] = self.__index.flip_disk(self.__board[25],1);
-              self.__board[31] = self.__index.flip_disk(self.__board[31],5);
-              if fliped[1] >= 6:
-                self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-                self.__board[26] = self.__index.flip_disk(self.__board[26],1);
-                self.__board[32] = self.__index.flip_disk(self.__board[32],6);
-    self.__board[20],fliped = self.__index.flip_line(self.__board[20],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],1);
-      self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-            self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-            self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-              self.__board[9] = self.__index.flip_disk(self.__board[9],5);
-              self.__board[36] = self.__index.flip_disk(self.__board[36],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[12+color]
+    i = board[0]*16+12+color
+    board[0] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[5]
+      flips |= 0x20
+      board[13] = flip_disk[board[13]*8+0]
+      board[19] = flip_disk[board[19]*8+0]
+      board[27] = flip_disk[board[27]*8+0]
+      if fliped >= 2:
+        h ^= zflip[4]
+        flips |= 0x10
+        board[12] = flip_disk[board[12]*8+0]
+        board[18] = flip_disk[board[18]*8+0]
+        board[28] = flip_disk[board[28]*8+0]
+        if fliped >= 3:
+          h ^= zflip[3]
+          flips |= 0x8
+          board[11] = flip_disk[board[11]*8+0]
+          board[17] = flip_disk[board[17]*8+0]
+          board[29] = flip_disk[board[29]*8+0]
+          if fliped >= 4:
+            h ^= zflip[2]
+            flips |= 0x4
+            board[10] = flip_disk[board[10]*8+0]
+            board[16] = flip_disk[board[16]*8+0]
+            board[30] = flip_disk[board[30]*8+0]
+            if fliped >= 5:
+              h ^= zflip[1]
+              flips |= 0x2
+              board[9] = flip_disk[board[9]*8+0]
+              board[31] = flip_disk[board[31]*8+0]
+    i = board[14]*16+color
+    board[14] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[14]
+      flips |= 0x4000
+      board[1] = flip_disk[board[1]*8+6]
+      board[21] = flip_disk[board[21]*8+1]
+      board[27] = flip_disk[board[27]*8+1]
+      if fliped >= 2:
+        h ^= zflip[22]
+        flips |= 0x400000
+        board[2] = flip_disk[board[2]*8+6]
+        board[22] = flip_disk[board[22]*8+1]
+        board[28] = flip_disk[board[28]*8+2]
+        if fliped >= 3:
+          h ^= zflip[30]
+          flips |= 0x40000000
+          board[3] = flip_disk[board[3]*8+6]
+          board[23] = flip_disk[board[23]*8+1]
+          board[29] = flip_disk[board[29]*8+3]
+          if fliped >= 4:
+            h ^= zflip[38]
+            flips |= 0x4000000000
+            board[4] = flip_disk[board[4]*8+6]
+            board[24] = flip_disk[board[24]*8+1]
+            board[30] = flip_disk[board[30]*8+4]
+            if fliped >= 5:
+              h ^= zflip[46]
+              flips |= 0x400000000000
+              board[5] = flip_disk[board[5]*8+6]
+              board[25] = flip_disk[board[25]*8+1]
+              board[31] = flip_disk[board[31]*8+5]
+              if fliped >= 6:
+                h ^= zflip[54]
+                flips |= 0x40000000000000
+                board[6] = flip_disk[board[6]*8+6]
+                board[26] = flip_disk[board[26]*8+1]
+                board[32] = flip_disk[board[32]*8+6]
+    i = board[20]*16+color
+    board[20] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[13]
+      flips |= 0x2000
+      board[1] = flip_disk[board[1]*8+5]
+      board[13] = flip_disk[board[13]*8+1]
+      board[28] = flip_disk[board[28]*8+1]
+      if fliped >= 2:
+        h ^= zflip[20]
+        flips |= 0x100000
+        board[2] = flip_disk[board[2]*8+4]
+        board[12] = flip_disk[board[12]*8+2]
+        board[30] = flip_disk[board[30]*8+2]
+        if fliped >= 3:
+          h ^= zflip[27]
+          flips |= 0x8000000
+          board[3] = flip_disk[board[3]*8+3]
+          board[11] = flip_disk[board[11]*8+3]
+          board[32] = flip_disk[board[32]*8+3]
+          if fliped >= 4:
+            h ^= zflip[34]
+            flips |= 0x400000000
+            board[4] = flip_disk[board[4]*8+2]
+            board[10] = flip_disk[board[10]*8+4]
+            board[34] = flip_disk[board[34]*8+2]
+            if fliped >= 5:
+              h ^= zflip[41]
+              flips |= 0x20000000000
+              board[5] = flip_disk[board[5]*8+1]
+              board[9] = flip_disk[board[9]*8+5]
+              board[36] = flip_disk[board[36]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(6, color, flips)
   def putAt7(self, color):
-    self.__board[0],fliped = self.__index.flip_line(self.__board[0],7,color)
-    if fliped[0] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],0)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],0)
-      if fliped[0] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],0)
-        self.__board[19] = self.__index.flip_disk(self.__board[19],0)
-        self.__board[27] = self.__index.flip_disk(self.__board[27],0)
-        if fliped[0] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],0)
-          self.__board[18] = self.__index.flip_disk(self.__board[18],0)
-          self.__board[28] = self.__index.flip_disk(self.__board[28],0)
-          if fliped[0] >= 4:
-            self.__board[11] = self.__index.flip_disk(self.__board[11],0)
-            self.__board[17] = self.__index.flip_disk(self.__board[17],0)
-            self.__board[29] = self.__index.flip_disk(self.__board[29],0)
-            if fliped[0] >= 5:
-              self.__board[10] = self.__index.flip_disk(self.__board[10],0)
-              self.__board[16] = self.__index.flip_disk(self.__board[16],0)
-              self.__board[30] = self.__index.flip_disk(self.__board[30],0)
-              if fliped[0] >= 6:
-                self.__board[9] = self.__index.flip_disk(self.__board[9],0)
-                self.__board[31] = self.__index.flip_disk(self.__board[31],0)
-    self.__board[15],fliped = self.__index.flip_line(self.__board[15],0,color)
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],7);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],0);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],7);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],0);
-        self.__board[27] = self.__index.flip_disk(self.__board[27],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],7);
-          self.__board[24] = self.__index.flip_disk(self.__board[24],0);
-          self.__board[28] = self.__index.flip_disk(self.__board[28],3);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],7);
-            self.__board[25] = self.__index.flip_disk(self.__board[25],0);
-            self.__board[29] = self.__index.flip_disk(self.__board[29],4);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],7);
-              self.__board[26] = self.__index.flip_disk(self.__board[26],0);
-              self.__board[30] = self.__index.flip_disk(self.__board[30],5);
-              if fliped[1] >= 6:
-                self.__board[6] = self.__index.flip_disk(self.__board[6],7);
-                self.__board[31] = self.__index.flip_disk(self.__board[31],6);
-    self.__board[21],fliped = self.__index.flip_line(self.__board[21],0,color);
-    if fliped[1] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],1);
-      self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-      if fliped[1] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-        if fliped[1] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-          if fliped[1] >= 4:
-            self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-            self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-            self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-            if fliped[1] >= 5:
-              self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-              self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-              self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-              if fliped[1] >= 6:
-                self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-                self.__board[9] = self.__index.flip_disk(self.__board[9],6);
-                self.__board[37] = self.__index.flip_disk(self.__board[37],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[14+color]
+    i = board[0]*16+14+color
+    board[0] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[6]
+      flips |= 0x40
+      board[14] = flip_disk[board[14]*8+0]
+      board[20] = flip_disk[board[20]*8+0]
+      if fliped >= 2:
+        h ^= zflip[5]
+        flips |= 0x20
+        board[13] = flip_disk[board[13]*8+0]
+        board[19] = flip_disk[board[19]*8+0]
+        board[27] = flip_disk[board[27]*8+0]
+        if fliped >= 3:
+          h ^= zflip[4]
+          flips |= 0x10
+          board[12] = flip_disk[board[12]*8+0]
+          board[18] = flip_disk[board[18]*8+0]
+          board[28] = flip_disk[board[28]*8+0]
+          if fliped >= 4:
+            h ^= zflip[3]
+            flips |= 0x8
+            board[11] = flip_disk[board[11]*8+0]
+            board[17] = flip_disk[board[17]*8+0]
+            board[29] = flip_disk[board[29]*8+0]
+            if fliped >= 5:
+              h ^= zflip[2]
+              flips |= 0x4
+              board[10] = flip_disk[board[10]*8+0]
+              board[16] = flip_disk[board[16]*8+0]
+              board[30] = flip_disk[board[30]*8+0]
+              if fliped >= 6:
+                h ^= zflip[1]
+                flips |= 0x2
+                board[9] = flip_disk[board[9]*8+0]
+                board[31] = flip_disk[board[31]*8+0]
+    i = board[15]*16+color
+    board[15] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[15]
+      flips |= 0x8000
+      board[1] = flip_disk[board[1]*8+7]
+      board[22] = flip_disk[board[22]*8+0]
+      if fliped >= 2:
+        h ^= zflip[23]
+        flips |= 0x800000
+        board[2] = flip_disk[board[2]*8+7]
+        board[23] = flip_disk[board[23]*8+0]
+        board[27] = flip_disk[board[27]*8+2]
+        if fliped >= 3:
+          h ^= zflip[31]
+          flips |= 0x80000000
+          board[3] = flip_disk[board[3]*8+7]
+          board[24] = flip_disk[board[24]*8+0]
+          board[28] = flip_disk[board[28]*8+3]
+          if fliped >= 4:
+            h ^= zflip[39]
+            flips |= 0x8000000000
+            board[4] = flip_disk[board[4]*8+7]
+            board[25] = flip_disk[board[25]*8+0]
+            board[29] = flip_disk[board[29]*8+4]
+            if fliped >= 5:
+              h ^= zflip[47]
+              flips |= 0x800000000000
+              board[5] = flip_disk[board[5]*8+7]
+              board[26] = flip_disk[board[26]*8+0]
+              board[30] = flip_disk[board[30]*8+5]
+              if fliped >= 6:
+                h ^= zflip[55]
+                flips |= 0x80000000000000
+                board[6] = flip_disk[board[6]*8+7]
+                board[31] = flip_disk[board[31]*8+6]
+    i = board[21]*16+color
+    board[21] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[14]
+      flips |= 0x4000
+      board[1] = flip_disk[board[1]*8+6]
+      board[14] = flip_disk[board[14]*8+1]
+      board[27] = flip_disk[board[27]*8+1]
+      if fliped >= 2:
+        h ^= zflip[21]
+        flips |= 0x200000
+        board[2] = flip_disk[board[2]*8+5]
+        board[13] = flip_disk[board[13]*8+2]
+        board[29] = flip_disk[board[29]*8+2]
+        if fliped >= 3:
+          h ^= zflip[28]
+          flips |= 0x10000000
+          board[3] = flip_disk[board[3]*8+4]
+          board[12] = flip_disk[board[12]*8+3]
+          board[31] = flip_disk[board[31]*8+3]
+          if fliped >= 4:
+            h ^= zflip[35]
+            flips |= 0x800000000
+            board[4] = flip_disk[board[4]*8+3]
+            board[11] = flip_disk[board[11]*8+4]
+            board[33] = flip_disk[board[33]*8+3]
+            if fliped >= 5:
+              h ^= zflip[42]
+              flips |= 0x40000000000
+              board[5] = flip_disk[board[5]*8+2]
+              board[10] = flip_disk[board[10]*8+5]
+              board[35] = flip_disk[board[35]*8+2]
+              if fliped >= 6:
+                h ^= zflip[49]
+                flips |= 0x2000000000000
+                board[6] = flip_disk[board[6]*8+1]
+                board[9] = flip_disk[board[9]*8+6]
+                board[37] = flip_disk[board[37]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(7, color, flips)
   def putAt8(self, color):
-    self.__board[1],fliped = self.__index.flip_line(self.__board[1],0,color)
-    if fliped[1] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],1)
-      self.__board[16] = self.__index.flip_disk(self.__board[16],1)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],1)
-      if fliped[1] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],1)
-        self.__board[17] = self.__index.flip_disk(self.__board[17],1)
-        self.__board[31] = self.__index.flip_disk(self.__board[31],1)
-        if fliped[1] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],1)
-          self.__board[18] = self.__index.flip_disk(self.__board[18],1)
-          self.__board[30] = self.__index.flip_disk(self.__board[30],1)
-          if fliped[1] >= 4:
-            self.__board[12] = self.__index.flip_disk(self.__board[12],1)
-            self.__board[19] = self.__index.flip_disk(self.__board[19],1)
-            self.__board[29] = self.__index.flip_disk(self.__board[29],1)
-            if fliped[1] >= 5:
-              self.__board[13] = self.__index.flip_disk(self.__board[13],1)
-              self.__board[20] = self.__index.flip_disk(self.__board[20],1)
-              self.__board[28] = self.__index.flip_disk(self.__board[28],1)
-              if fliped[1] >= 6:
-                self.__board[14] = self.__index.flip_disk(self.__board[14],1)
-                self.__board[21] = self.__index.flip_disk(self.__board[21],1)
-                self.__board[27] = self.__index.flip_disk(self.__board[27],1)
-    self.__board[8],fliped = self.__index.flip_line(self.__board[8],1,color)
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],0);
-      self.__board[16] = self.__index.flip_disk(self.__board[16],2);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],0);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],0);
-        self.__board[17] = self.__index.flip_disk(self.__board[17],3);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],0);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],0);
-          self.__board[18] = self.__index.flip_disk(self.__board[18],4);
-          self.__board[36] = self.__index.flip_disk(self.__board[36],0);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],0);
-            self.__board[19] = self.__index.flip_disk(self.__board[19],5);
-            self.__board[37] = self.__index.flip_disk(self.__board[37],0);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],0);
-              self.__board[20] = self.__index.flip_disk(self.__board[20],6);
-    self.__board[33],fliped = self.__index.flip_line(self.__board[33],0,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],2);
-      self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-            self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-            self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-              self.__board[13] = self.__index.flip_disk(self.__board[13],6);
-              self.__board[25] = self.__index.flip_disk(self.__board[25],2);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[16+color]
+    i = board[1]*16+color
+    board[1] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[9]
+      flips |= 0x200
+      board[9] = flip_disk[board[9]*8+1]
+      board[16] = flip_disk[board[16]*8+1]
+      board[32] = flip_disk[board[32]*8+1]
+      if fliped >= 2:
+        h ^= zflip[10]
+        flips |= 0x400
+        board[10] = flip_disk[board[10]*8+1]
+        board[17] = flip_disk[board[17]*8+1]
+        board[31] = flip_disk[board[31]*8+1]
+        if fliped >= 3:
+          h ^= zflip[11]
+          flips |= 0x800
+          board[11] = flip_disk[board[11]*8+1]
+          board[18] = flip_disk[board[18]*8+1]
+          board[30] = flip_disk[board[30]*8+1]
+          if fliped >= 4:
+            h ^= zflip[12]
+            flips |= 0x1000
+            board[12] = flip_disk[board[12]*8+1]
+            board[19] = flip_disk[board[19]*8+1]
+            board[29] = flip_disk[board[29]*8+1]
+            if fliped >= 5:
+              h ^= zflip[13]
+              flips |= 0x2000
+              board[13] = flip_disk[board[13]*8+1]
+              board[20] = flip_disk[board[20]*8+1]
+              board[28] = flip_disk[board[28]*8+1]
+              if fliped >= 6:
+                h ^= zflip[14]
+                flips |= 0x4000
+                board[14] = flip_disk[board[14]*8+1]
+                board[21] = flip_disk[board[21]*8+1]
+                board[27] = flip_disk[board[27]*8+1]
+    i = board[8]*16+2+color
+    board[8] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[16]
+      flips |= 0x10000
+      board[2] = flip_disk[board[2]*8+0]
+      board[16] = flip_disk[board[16]*8+2]
+      board[34] = flip_disk[board[34]*8+0]
+      if fliped >= 2:
+        h ^= zflip[24]
+        flips |= 0x1000000
+        board[3] = flip_disk[board[3]*8+0]
+        board[17] = flip_disk[board[17]*8+3]
+        board[35] = flip_disk[board[35]*8+0]
+        if fliped >= 3:
+          h ^= zflip[32]
+          flips |= 0x100000000
+          board[4] = flip_disk[board[4]*8+0]
+          board[18] = flip_disk[board[18]*8+4]
+          board[36] = flip_disk[board[36]*8+0]
+          if fliped >= 4:
+            h ^= zflip[40]
+            flips |= 0x10000000000
+            board[5] = flip_disk[board[5]*8+0]
+            board[19] = flip_disk[board[19]*8+5]
+            board[37] = flip_disk[board[37]*8+0]
+            if fliped >= 5:
+              h ^= zflip[48]
+              flips |= 0x1000000000000
+              board[6] = flip_disk[board[6]*8+0]
+              board[20] = flip_disk[board[20]*8+6]
+    i = board[33]*16+color
+    board[33] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[17]
+      flips |= 0x20000
+      board[2] = flip_disk[board[2]*8+1]
+      board[9] = flip_disk[board[9]*8+2]
+      board[17] = flip_disk[board[17]*8+2]
+      if fliped >= 2:
+        h ^= zflip[26]
+        flips |= 0x4000000
+        board[3] = flip_disk[board[3]*8+2]
+        board[10] = flip_disk[board[10]*8+3]
+        board[19] = flip_disk[board[19]*8+3]
+        if fliped >= 3:
+          h ^= zflip[35]
+          flips |= 0x800000000
+          board[4] = flip_disk[board[4]*8+3]
+          board[11] = flip_disk[board[11]*8+4]
+          board[21] = flip_disk[board[21]*8+4]
+          if fliped >= 4:
+            h ^= zflip[44]
+            flips |= 0x100000000000
+            board[5] = flip_disk[board[5]*8+4]
+            board[12] = flip_disk[board[12]*8+5]
+            board[23] = flip_disk[board[23]*8+3]
+            if fliped >= 5:
+              h ^= zflip[53]
+              flips |= 0x20000000000000
+              board[6] = flip_disk[board[6]*8+5]
+              board[13] = flip_disk[board[13]*8+6]
+              board[25] = flip_disk[board[25]*8+2]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(8, color, flips)
   def putAt9(self, color):
-    self.__board[1],fliped = self.__index.flip_line(self.__board[1],1,color)
-    if fliped[1] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],1)
-      self.__board[17] = self.__index.flip_disk(self.__board[17],1)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],1)
-      if fliped[1] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],1)
-        self.__board[18] = self.__index.flip_disk(self.__board[18],1)
-        self.__board[30] = self.__index.flip_disk(self.__board[30],1)
-        if fliped[1] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],1)
-          self.__board[19] = self.__index.flip_disk(self.__board[19],1)
-          self.__board[29] = self.__index.flip_disk(self.__board[29],1)
-          if fliped[1] >= 4:
-            self.__board[13] = self.__index.flip_disk(self.__board[13],1)
-            self.__board[20] = self.__index.flip_disk(self.__board[20],1)
-            self.__board[28] = self.__index.flip_disk(self.__board[28],1)
-            if fliped[1] >= 5:
-              self.__board[14] = self.__index.flip_disk(self.__board[14],1)
-              self.__board[21] = self.__index.flip_disk(self.__board[21],1)
-              self.__board[27] = self.__index.flip_disk(self.__board[27],1)
-    self.__board[9],fliped = self.__index.flip_line(self.__board[9],1,color)
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-      self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],1);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],3);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],4);
-          self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-            self.__board[20] = self.__index.flip_disk(self.__board[20],5);
-            self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-              self.__board[21] = self.__index.flip_disk(self.__board[21],6);
-              self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[16],fliped = self.__index.flip_line(self.__board[16],1,color);
-    self.__board[32],fliped = self.__index.flip_line(self.__board[32],1,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-            self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-            self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-              self.__board[14] = self.__index.flip_disk(self.__board[14],6);
-              self.__board[26] = self.__index.flip_disk(self.__board[26],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[18+color]
+    i = board[1]*16+2+color
+    board[1] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[10]
+      flips |= 0x400
+      board[10] = flip_disk[board[10]*8+1]
+      board[17] = flip_disk[board[17]*8+1]
+      board[31] = flip_disk[board[31]*8+1]
+      if fliped >= 2:
+        h ^= zflip[11]
+        flips |= 0x800
+        board[11] = flip_disk[board[11]*8+1]
+        board[18] = flip_disk[board[18]*8+1]
+        board[30] = flip_disk[board[30]*8+1]
+        if fliped >= 3:
+          h ^= zflip[12]
+          flips |= 0x1000
+          board[12] = flip_disk[board[12]*8+1]
+          board[19] = flip_disk[board[19]*8+1]
+          board[29] = flip_disk[board[29]*8+1]
+          if fliped >= 4:
+            h ^= zflip[13]
+            flips |= 0x2000
+            board[13] = flip_disk[board[13]*8+1]
+            board[20] = flip_disk[board[20]*8+1]
+            board[28] = flip_disk[board[28]*8+1]
+            if fliped >= 5:
+              h ^= zflip[14]
+              flips |= 0x4000
+              board[14] = flip_disk[board[14]*8+1]
+              board[21] = flip_disk[board[21]*8+1]
+              board[27] = flip_disk[board[27]*8+1]
+    i = board[9]*16+2+color
+    board[9] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[17]
+      flips |= 0x20000
+      board[2] = flip_disk[board[2]*8+1]
+      board[17] = flip_disk[board[17]*8+2]
+      board[33] = flip_disk[board[33]*8+1]
+      if fliped >= 2:
+        h ^= zflip[25]
+        flips |= 0x2000000
+        board[3] = flip_disk[board[3]*8+1]
+        board[18] = flip_disk[board[18]*8+3]
+        board[34] = flip_disk[board[34]*8+1]
+        if fliped >= 3:
+          h ^= zflip[33]
+          flips |= 0x200000000
+          board[4] = flip_disk[board[4]*8+1]
+          board[19] = flip_disk[board[19]*8+4]
+          board[35] = flip_disk[board[35]*8+1]
+          if fliped >= 4:
+            h ^= zflip[41]
+            flips |= 0x20000000000
+            board[5] = flip_disk[board[5]*8+1]
+            board[20] = flip_disk[board[20]*8+5]
+            board[36] = flip_disk[board[36]*8+1]
+            if fliped >= 5:
+              h ^= zflip[49]
+              flips |= 0x2000000000000
+              board[6] = flip_disk[board[6]*8+1]
+              board[21] = flip_disk[board[21]*8+6]
+              board[37] = flip_disk[board[37]*8+1]
+    i = board[16]*16+2+color
+    board[16] = new_code[i]
+    i = board[32]*16+2+color
+    board[32] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[18]
+      flips |= 0x40000
+      board[2] = flip_disk[board[2]*8+2]
+      board[10] = flip_disk[board[10]*8+2]
+      board[18] = flip_disk[board[18]*8+2]
+      if fliped >= 2:
+        h ^= zflip[27]
+        flips |= 0x8000000
+        board[3] = flip_disk[board[3]*8+3]
+        board[11] = flip_disk[board[11]*8+3]
+        board[20] = flip_disk[board[20]*8+3]
+        if fliped >= 3:
+          h ^= zflip[36]
+          flips |= 0x1000000000
+          board[4] = flip_disk[board[4]*8+4]
+          board[12] = flip_disk[board[12]*8+4]
+          board[22] = flip_disk[board[22]*8+3]
+          if fliped >= 4:
+            h ^= zflip[45]
+            flips |= 0x200000000000
+            board[5] = flip_disk[board[5]*8+5]
+            board[13] = flip_disk[board[13]*8+5]
+            board[24] = flip_disk[board[24]*8+2]
+            if fliped >= 5:
+              h ^= zflip[54]
+              flips |= 0x40000000000000
+              board[6] = flip_disk[board[6]*8+6]
+              board[14] = flip_disk[board[14]*8+6]
+              board[26] = flip_disk[board[26]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(9, color, flips)
   def putAt10(self, color):
-    self.__board[1],fliped = self.__index.flip_line(self.__board[1],2,color)
-    if fliped[0] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],1)
-      self.__board[16] = self.__index.flip_disk(self.__board[16],1)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],1)
-    if fliped[1] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],1)
-      self.__board[18] = self.__index.flip_disk(self.__board[18],1)
-      self.__board[30] = self.__index.flip_disk(self.__board[30],1)
-      if fliped[1] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],1)
-        self.__board[19] = self.__index.flip_disk(self.__board[19],1)
-        self.__board[29] = self.__index.flip_disk(self.__board[29],1)
-        if fliped[1] >= 3:
-          self.__board[13] = self.__index.flip_disk(self.__board[13],1)
-          self.__board[20] = self.__index.flip_disk(self.__board[20],1)
-          self.__board[28] = self.__index.flip_disk(self.__board[28],1)
-          if fliped[1] >= 4:
-            self.__board[14] = self.__index.flip_disk(self.__board[14],1)
-            self.__board[21] = self.__index.flip_disk(self.__board[21],1)
-            self.__board[27] = self.__index.flip_disk(self.__board[27],1)
-    self.__board[10],fliped = self.__index.flip_line(self.__board[10],1,color)
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-            self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-            self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-              self.__board[22] = self.__index.flip_disk(self.__board[22],5);
-              self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-    self.__board[17],fliped = self.__index.flip_line(self.__board[17],1,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],2);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],1);
-    self.__board[31],fliped = self.__index.flip_line(self.__board[31],1,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-          self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-            self.__board[14] = self.__index.flip_disk(self.__board[14],5);
-            self.__board[25] = self.__index.flip_disk(self.__board[25],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[20+color]
+    i = board[1]*16+4+color
+    board[1] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[9]
+      flips |= 0x200
+      board[9] = flip_disk[board[9]*8+1]
+      board[16] = flip_disk[board[16]*8+1]
+      board[32] = flip_disk[board[32]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[11]
+      flips |= 0x800
+      board[11] = flip_disk[board[11]*8+1]
+      board[18] = flip_disk[board[18]*8+1]
+      board[30] = flip_disk[board[30]*8+1]
+      if fliped >= 2:
+        h ^= zflip[12]
+        flips |= 0x1000
+        board[12] = flip_disk[board[12]*8+1]
+        board[19] = flip_disk[board[19]*8+1]
+        board[29] = flip_disk[board[29]*8+1]
+        if fliped >= 3:
+          h ^= zflip[13]
+          flips |= 0x2000
+          board[13] = flip_disk[board[13]*8+1]
+          board[20] = flip_disk[board[20]*8+1]
+          board[28] = flip_disk[board[28]*8+1]
+          if fliped >= 4:
+            h ^= zflip[14]
+            flips |= 0x4000
+            board[14] = flip_disk[board[14]*8+1]
+            board[21] = flip_disk[board[21]*8+1]
+            board[27] = flip_disk[board[27]*8+1]
+    i = board[10]*16+2+color
+    board[10] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[18]
+      flips |= 0x40000
+      board[2] = flip_disk[board[2]*8+2]
+      board[18] = flip_disk[board[18]*8+2]
+      board[32] = flip_disk[board[32]*8+2]
+      if fliped >= 2:
+        h ^= zflip[26]
+        flips |= 0x4000000
+        board[3] = flip_disk[board[3]*8+2]
+        board[19] = flip_disk[board[19]*8+3]
+        board[33] = flip_disk[board[33]*8+2]
+        if fliped >= 3:
+          h ^= zflip[34]
+          flips |= 0x400000000
+          board[4] = flip_disk[board[4]*8+2]
+          board[20] = flip_disk[board[20]*8+4]
+          board[34] = flip_disk[board[34]*8+2]
+          if fliped >= 4:
+            h ^= zflip[42]
+            flips |= 0x40000000000
+            board[5] = flip_disk[board[5]*8+2]
+            board[21] = flip_disk[board[21]*8+5]
+            board[35] = flip_disk[board[35]*8+2]
+            if fliped >= 5:
+              h ^= zflip[50]
+              flips |= 0x4000000000000
+              board[6] = flip_disk[board[6]*8+2]
+              board[22] = flip_disk[board[22]*8+5]
+              board[36] = flip_disk[board[36]*8+2]
+    i = board[17]*16+2+color
+    board[17] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[17]
+      flips |= 0x20000
+      board[2] = flip_disk[board[2]*8+1]
+      board[9] = flip_disk[board[9]*8+2]
+      board[33] = flip_disk[board[33]*8+1]
+    i = board[31]*16+2+color
+    board[31] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[19]
+      flips |= 0x80000
+      board[2] = flip_disk[board[2]*8+3]
+      board[11] = flip_disk[board[11]*8+2]
+      board[19] = flip_disk[board[19]*8+2]
+      if fliped >= 2:
+        h ^= zflip[28]
+        flips |= 0x10000000
+        board[3] = flip_disk[board[3]*8+4]
+        board[12] = flip_disk[board[12]*8+3]
+        board[21] = flip_disk[board[21]*8+3]
+        if fliped >= 3:
+          h ^= zflip[37]
+          flips |= 0x2000000000
+          board[4] = flip_disk[board[4]*8+5]
+          board[13] = flip_disk[board[13]*8+4]
+          board[23] = flip_disk[board[23]*8+2]
+          if fliped >= 4:
+            h ^= zflip[46]
+            flips |= 0x400000000000
+            board[5] = flip_disk[board[5]*8+6]
+            board[14] = flip_disk[board[14]*8+5]
+            board[25] = flip_disk[board[25]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(10, color, flips)
   def putAt11(self, color):
-    self.__board[1],fliped = self.__index.flip_line(self.__board[1],3,color)
-    if fliped[0] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],1)
-      self.__board[17] = self.__index.flip_disk(self.__board[17],1)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],1)
-      if fliped[0] >= 2:
-        self.__board[9] = self.__index.flip_disk(self.__board[9],1)
-        self.__board[16] = self.__index.flip_disk(self.__board[16],1)
-        self.__board[32] = self.__index.flip_disk(self.__board[32],1)
-    if fliped[1] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],1)
-      self.__board[19] = self.__index.flip_disk(self.__board[19],1)
-      self.__board[29] = self.__index.flip_disk(self.__board[29],1)
-      if fliped[1] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],1)
-        self.__board[20] = self.__index.flip_disk(self.__board[20],1)
-        self.__board[28] = self.__index.flip_disk(self.__board[28],1)
-        if fliped[1] >= 3:
-          self.__board[14] = self.__index.flip_disk(self.__board[14],1)
-          self.__board[21] = self.__index.flip_disk(self.__board[21],1)
-          self.__board[27] = self.__index.flip_disk(self.__board[27],1)
-    self.__board[11],fliped = self.__index.flip_line(self.__board[11],1,color)
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-            self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-            self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-              self.__board[23] = self.__index.flip_disk(self.__board[23],4);
-              self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-    self.__board[18],fliped = self.__index.flip_line(self.__board[18],1,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-        self.__board[9] = self.__index.flip_disk(self.__board[9],3);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-    self.__board[30],fliped = self.__index.flip_line(self.__board[30],1,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-          self.__board[14] = self.__index.flip_disk(self.__board[14],4);
-          self.__board[24] = self.__index.flip_disk(self.__board[24],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[22+color]
+    i = board[1]*16+6+color
+    board[1] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[10]
+      flips |= 0x400
+      board[10] = flip_disk[board[10]*8+1]
+      board[17] = flip_disk[board[17]*8+1]
+      board[31] = flip_disk[board[31]*8+1]
+      if fliped >= 2:
+        h ^= zflip[9]
+        flips |= 0x200
+        board[9] = flip_disk[board[9]*8+1]
+        board[16] = flip_disk[board[16]*8+1]
+        board[32] = flip_disk[board[32]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[12]
+      flips |= 0x1000
+      board[12] = flip_disk[board[12]*8+1]
+      board[19] = flip_disk[board[19]*8+1]
+      board[29] = flip_disk[board[29]*8+1]
+      if fliped >= 2:
+        h ^= zflip[13]
+        flips |= 0x2000
+        board[13] = flip_disk[board[13]*8+1]
+        board[20] = flip_disk[board[20]*8+1]
+        board[28] = flip_disk[board[28]*8+1]
+        if fliped >= 3:
+          h ^= zflip[14]
+          flips |= 0x4000
+          board[14] = flip_disk[board[14]*8+1]
+          board[21] = flip_disk[board[21]*8+1]
+          board[27] = flip_disk[board[27]*8+1]
+    i = board[11]*16+2+color
+    board[11] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[19]
+      flips |= 0x80000
+      board[2] = flip_disk[board[2]*8+3]
+      board[19] = flip_disk[board[19]*8+2]
+      board[31] = flip_disk[board[31]*8+2]
+      if fliped >= 2:
+        h ^= zflip[27]
+        flips |= 0x8000000
+        board[3] = flip_disk[board[3]*8+3]
+        board[20] = flip_disk[board[20]*8+3]
+        board[32] = flip_disk[board[32]*8+3]
+        if fliped >= 3:
+          h ^= zflip[35]
+          flips |= 0x800000000
+          board[4] = flip_disk[board[4]*8+3]
+          board[21] = flip_disk[board[21]*8+4]
+          board[33] = flip_disk[board[33]*8+3]
+          if fliped >= 4:
+            h ^= zflip[43]
+            flips |= 0x80000000000
+            board[5] = flip_disk[board[5]*8+3]
+            board[22] = flip_disk[board[22]*8+4]
+            board[34] = flip_disk[board[34]*8+3]
+            if fliped >= 5:
+              h ^= zflip[51]
+              flips |= 0x8000000000000
+              board[6] = flip_disk[board[6]*8+3]
+              board[23] = flip_disk[board[23]*8+4]
+              board[35] = flip_disk[board[35]*8+3]
+    i = board[18]*16+2+color
+    board[18] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[18]
+      flips |= 0x40000
+      board[2] = flip_disk[board[2]*8+2]
+      board[10] = flip_disk[board[10]*8+2]
+      board[32] = flip_disk[board[32]*8+2]
+      if fliped >= 2:
+        h ^= zflip[25]
+        flips |= 0x2000000
+        board[3] = flip_disk[board[3]*8+1]
+        board[9] = flip_disk[board[9]*8+3]
+        board[34] = flip_disk[board[34]*8+1]
+    i = board[30]*16+2+color
+    board[30] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[20]
+      flips |= 0x100000
+      board[2] = flip_disk[board[2]*8+4]
+      board[12] = flip_disk[board[12]*8+2]
+      board[20] = flip_disk[board[20]*8+2]
+      if fliped >= 2:
+        h ^= zflip[29]
+        flips |= 0x20000000
+        board[3] = flip_disk[board[3]*8+5]
+        board[13] = flip_disk[board[13]*8+3]
+        board[22] = flip_disk[board[22]*8+2]
+        if fliped >= 3:
+          h ^= zflip[38]
+          flips |= 0x4000000000
+          board[4] = flip_disk[board[4]*8+6]
+          board[14] = flip_disk[board[14]*8+4]
+          board[24] = flip_disk[board[24]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(11, color, flips)
   def putAt12(self, color):
-    self.__board[1],fliped = self.__index.flip_line(self.__board[1],4,color)
-    if fliped[0] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],1)
-      self.__board[18] = self.__index.flip_disk(self.__board[18],1)
-      self.__board[30] = self.__index.flip_disk(self.__board[30],1)
-      if fliped[0] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],1)
-        self.__board[17] = self.__index.flip_disk(self.__board[17],1)
-        self.__board[31] = self.__index.flip_disk(self.__board[31],1)
-        if fliped[0] >= 3:
-          self.__board[9] = self.__index.flip_disk(self.__board[9],1)
-          self.__board[16] = self.__index.flip_disk(self.__board[16],1)
-          self.__board[32] = self.__index.flip_disk(self.__board[32],1)
-    if fliped[1] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],1)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],1)
-      self.__board[28] = self.__index.flip_disk(self.__board[28],1)
-      if fliped[1] >= 2:
-        self.__board[14] = self.__index.flip_disk(self.__board[14],1)
-        self.__board[21] = self.__index.flip_disk(self.__board[21],1)
-        self.__board[27] = self.__index.flip_disk(self.__board[27],1)
-    self.__board[12],fliped = self.__index.flip_line(self.__board[12],1,color)
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-            self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-            self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-              self.__board[24] = self.__index.flip_disk(self.__board[24],3);
-              self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-    self.__board[19],fliped = self.__index.flip_line(self.__board[19],1,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-          self.__board[9] = self.__index.flip_disk(self.__board[9],4);
-          self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-    self.__board[29],fliped = self.__index.flip_line(self.__board[29],1,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-        self.__board[14] = self.__index.flip_disk(self.__board[14],3);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[24+color]
+    i = board[1]*16+8+color
+    board[1] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[11]
+      flips |= 0x800
+      board[11] = flip_disk[board[11]*8+1]
+      board[18] = flip_disk[board[18]*8+1]
+      board[30] = flip_disk[board[30]*8+1]
+      if fliped >= 2:
+        h ^= zflip[10]
+        flips |= 0x400
+        board[10] = flip_disk[board[10]*8+1]
+        board[17] = flip_disk[board[17]*8+1]
+        board[31] = flip_disk[board[31]*8+1]
+        if fliped >= 3:
+          h ^= zflip[9]
+          flips |= 0x200
+          board[9] = flip_disk[board[9]*8+1]
+          board[16] = flip_disk[board[16]*8+1]
+          board[32] = flip_disk[board[32]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[13]
+      flips |= 0x2000
+      board[13] = flip_disk[board[13]*8+1]
+      board[20] = flip_disk[board[20]*8+1]
+      board[28] = flip_disk[board[28]*8+1]
+      if fliped >= 2:
+        h ^= zflip[14]
+        flips |= 0x4000
+        board[14] = flip_disk[board[14]*8+1]
+        board[21] = flip_disk[board[21]*8+1]
+        board[27] = flip_disk[board[27]*8+1]
+    i = board[12]*16+2+color
+    board[12] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[20]
+      flips |= 0x100000
+      board[2] = flip_disk[board[2]*8+4]
+      board[20] = flip_disk[board[20]*8+2]
+      board[30] = flip_disk[board[30]*8+2]
+      if fliped >= 2:
+        h ^= zflip[28]
+        flips |= 0x10000000
+        board[3] = flip_disk[board[3]*8+4]
+        board[21] = flip_disk[board[21]*8+3]
+        board[31] = flip_disk[board[31]*8+3]
+        if fliped >= 3:
+          h ^= zflip[36]
+          flips |= 0x1000000000
+          board[4] = flip_disk[board[4]*8+4]
+          board[22] = flip_disk[board[22]*8+3]
+          board[32] = flip_disk[board[32]*8+4]
+          if fliped >= 4:
+            h ^= zflip[44]
+            flips |= 0x100000000000
+            board[5] = flip_disk[board[5]*8+4]
+            board[23] = flip_disk[board[23]*8+3]
+            board[33] = flip_disk[board[33]*8+4]
+            if fliped >= 5:
+              h ^= zflip[52]
+              flips |= 0x10000000000000
+              board[6] = flip_disk[board[6]*8+4]
+              board[24] = flip_disk[board[24]*8+3]
+              board[34] = flip_disk[board[34]*8+4]
+    i = board[19]*16+2+color
+    board[19] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[19]
+      flips |= 0x80000
+      board[2] = flip_disk[board[2]*8+3]
+      board[11] = flip_disk[board[11]*8+2]
+      board[31] = flip_disk[board[31]*8+2]
+      if fliped >= 2:
+        h ^= zflip[26]
+        flips |= 0x4000000
+        board[3] = flip_disk[board[3]*8+2]
+        board[10] = flip_disk[board[10]*8+3]
+        board[33] = flip_disk[board[33]*8+2]
+        if fliped >= 3:
+          h ^= zflip[33]
+          flips |= 0x200000000
+          board[4] = flip_disk[board[4]*8+1]
+          board[9] = flip_disk[board[9]*8+4]
+          board[35] = flip_disk[board[35]*8+1]
+    i = board[29]*16+2+color
+    board[29] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[21]
+      flips |= 0x200000
+      board[2] = flip_disk[board[2]*8+5]
+      board[13] = flip_disk[board[13]*8+2]
+      board[21] = flip_disk[board[21]*8+2]
+      if fliped >= 2:
+        h ^= zflip[30]
+        flips |= 0x40000000
+        board[3] = flip_disk[board[3]*8+6]
+        board[14] = flip_disk[board[14]*8+3]
+        board[23] = flip_disk[board[23]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(12, color, flips)
   def putAt13(self, color):
-    self.__board[1],fliped = self.__index.flip_line(self.__board[1],5,color)
-    if fliped[0] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],1)
-      self.__board[19] = self.__index.flip_disk(self.__board[19],1)
-      self.__board[29] = self.__index.flip_disk(self.__board[29],1)
-      if fliped[0] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],1)
-        self.__board[18] = self.__index.flip_disk(self.__board[18],1)
-        self.__board[30] = self.__index.flip_disk(self.__board[30],1)
-        if fliped[0] >= 3:
-          self.__board[10] = self.__index.flip_disk(self.__board[10],1)
-          self.__board[17] = self.__index.flip_disk(self.__board[17],1)
-          self.__board[31] = self.__index.flip_disk(self.__board[31],1)
-          if fliped[0] >= 4:
-            self.__board[9] = self.__index.flip_disk(self.__board[9],1)
-            self.__board[16] = self.__index.flip_disk(self.__board[16],1)
-            self.__board[32] = self.__index.flip_disk(self.__board[32],1)
-    if fliped[1] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],1)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],1)
-      self.__board[27] = self.__index.flip_disk(self.__board[27],1)
-    self.__board[13],fliped = self.__index.flip_line(self.__board[13],1,color)
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-            self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-            self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-              self.__board[25] = self.__index.flip_disk(self.__board[25],2);
-              self.__board[33] = self.__index.flip_disk(self.__board[33],5);
-    self.__board[20],fliped = self.__index.flip_line(self.__board[20],1,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-          self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-            self.__board[9] = self.__index.flip_disk(self.__board[9],5);
-            self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-    self.__board[28],fliped = self.__index.flip_line(self.__board[28],1,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],2);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[26+color]
+    i = board[1]*16+10+color
+    board[1] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[12]
+      flips |= 0x1000
+      board[12] = flip_disk[board[12]*8+1]
+      board[19] = flip_disk[board[19]*8+1]
+      board[29] = flip_disk[board[29]*8+1]
+      if fliped >= 2:
+        h ^= zflip[11]
+        flips |= 0x800
+        board[11] = flip_disk[board[11]*8+1]
+        board[18] = flip_disk[board[18]*8+1]
+        board[30] = flip_disk[board[30]*8+1]
+        if fliped >= 3:
+          h ^= zflip[10]
+          flips |= 0x400
+          board[10] = flip_disk[board[10]*8+1]
+          board[17] = flip_disk[board[17]*8+1]
+          board[31] = flip_disk[board[31]*8+1]
+          if fliped >= 4:
+            h ^= zflip[9]
+            flips |= 0x200
+            board[9] = flip_disk[board[9]*8+1]
+            board[16] = flip_disk[board[16]*8+1]
+            board[32] = flip_disk[board[32]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[14]
+      flips |= 0x4000
+      board[14] = flip_disk[board[14]*8+1]
+      board[21] = flip_disk[board[21]*8+1]
+      board[27] = flip_disk[board[27]*8+1]
+    i = board[13]*16+2+color
+    board[13] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[21]
+      flips |= 0x200000
+      board[2] = flip_disk[board[2]*8+5]
+      board[21] = flip_disk[board[21]*8+2]
+      board[29] = flip_disk[board[29]*8+2]
+      if fliped >= 2:
+        h ^= zflip[29]
+        flips |= 0x20000000
+        board[3] = flip_disk[board[3]*8+5]
+        board[22] = flip_disk[board[22]*8+2]
+        board[30] = flip_disk[board[30]*8+3]
+        if fliped >= 3:
+          h ^= zflip[37]
+          flips |= 0x2000000000
+          board[4] = flip_disk[board[4]*8+5]
+          board[23] = flip_disk[board[23]*8+2]
+          board[31] = flip_disk[board[31]*8+4]
+          if fliped >= 4:
+            h ^= zflip[45]
+            flips |= 0x200000000000
+            board[5] = flip_disk[board[5]*8+5]
+            board[24] = flip_disk[board[24]*8+2]
+            board[32] = flip_disk[board[32]*8+5]
+            if fliped >= 5:
+              h ^= zflip[53]
+              flips |= 0x20000000000000
+              board[6] = flip_disk[board[6]*8+5]
+              board[25] = flip_disk[board[25]*8+2]
+              board[33] = flip_disk[board[33]*8+5]
+    i = board[20]*16+2+color
+    board[20] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[20]
+      flips |= 0x100000
+      board[2] = flip_disk[board[2]*8+4]
+      board[12] = flip_disk[board[12]*8+2]
+      board[30] = flip_disk[board[30]*8+2]
+      if fliped >= 2:
+        h ^= zflip[27]
+        flips |= 0x8000000
+        board[3] = flip_disk[board[3]*8+3]
+        board[11] = flip_disk[board[11]*8+3]
+        board[32] = flip_disk[board[32]*8+3]
+        if fliped >= 3:
+          h ^= zflip[34]
+          flips |= 0x400000000
+          board[4] = flip_disk[board[4]*8+2]
+          board[10] = flip_disk[board[10]*8+4]
+          board[34] = flip_disk[board[34]*8+2]
+          if fliped >= 4:
+            h ^= zflip[41]
+            flips |= 0x20000000000
+            board[5] = flip_disk[board[5]*8+1]
+            board[9] = flip_disk[board[9]*8+5]
+            board[36] = flip_disk[board[36]*8+1]
+    i = board[28]*16+2+color
+    board[28] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[22]
+      flips |= 0x400000
+      board[2] = flip_disk[board[2]*8+6]
+      board[14] = flip_disk[board[14]*8+2]
+      board[22] = flip_disk[board[22]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(13, color, flips)
   def putAt14(self, color):
-    self.__board[1],fliped = self.__index.flip_line(self.__board[1],6,color)
-    if fliped[0] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],1)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],1)
-      self.__board[28] = self.__index.flip_disk(self.__board[28],1)
-      if fliped[0] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],1)
-        self.__board[19] = self.__index.flip_disk(self.__board[19],1)
-        self.__board[29] = self.__index.flip_disk(self.__board[29],1)
-        if fliped[0] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],1)
-          self.__board[18] = self.__index.flip_disk(self.__board[18],1)
-          self.__board[30] = self.__index.flip_disk(self.__board[30],1)
-          if fliped[0] >= 4:
-            self.__board[10] = self.__index.flip_disk(self.__board[10],1)
-            self.__board[17] = self.__index.flip_disk(self.__board[17],1)
-            self.__board[31] = self.__index.flip_disk(self.__board[31],1)
-            if fliped[0] >= 5:
-              self.__board[9] = self.__index.flip_disk(self.__board[9],1)
-              self.__board[16] = self.__index.flip_disk(self.__board[16],1)
-              self.__board[32] = self.__index.flip_disk(self.__board[32],1)
-    self.__board[14],fliped = self.__index.flip_line(self.__board[14],1,color)
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],1);
-      self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],1);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-          self.__board[24] = self.__index.flip_disk(self.__board[24],1);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-            self.__board[25] = self.__index.flip_disk(self.__board[25],1);
-            self.__board[31] = self.__index.flip_disk(self.__board[31],5);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-              self.__board[26] = self.__index.flip_disk(self.__board[26],1);
-              self.__board[32] = self.__index.flip_disk(self.__board[32],6);
-    self.__board[21],fliped = self.__index.flip_line(self.__board[21],1,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-            self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-            self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-              self.__board[9] = self.__index.flip_disk(self.__board[9],6);
-              self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[27],fliped = self.__index.flip_line(self.__board[27],1,color);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[28+color]
+    i = board[1]*16+12+color
+    board[1] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[13]
+      flips |= 0x2000
+      board[13] = flip_disk[board[13]*8+1]
+      board[20] = flip_disk[board[20]*8+1]
+      board[28] = flip_disk[board[28]*8+1]
+      if fliped >= 2:
+        h ^= zflip[12]
+        flips |= 0x1000
+        board[12] = flip_disk[board[12]*8+1]
+        board[19] = flip_disk[board[19]*8+1]
+        board[29] = flip_disk[board[29]*8+1]
+        if fliped >= 3:
+          h ^= zflip[11]
+          flips |= 0x800
+          board[11] = flip_disk[board[11]*8+1]
+          board[18] = flip_disk[board[18]*8+1]
+          board[30] = flip_disk[board[30]*8+1]
+          if fliped >= 4:
+            h ^= zflip[10]
+            flips |= 0x400
+            board[10] = flip_disk[board[10]*8+1]
+            board[17] = flip_disk[board[17]*8+1]
+            board[31] = flip_disk[board[31]*8+1]
+            if fliped >= 5:
+              h ^= zflip[9]
+              flips |= 0x200
+              board[9] = flip_disk[board[9]*8+1]
+              board[16] = flip_disk[board[16]*8+1]
+              board[32] = flip_disk[board[32]*8+1]
+    i = board[14]*16+2+color
+    board[14] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[22]
+      flips |= 0x400000
+      board[2] = flip_disk[board[2]*8+6]
+      board[22] = flip_disk[board[22]*8+1]
+      board[28] = flip_disk[board[28]*8+2]
+      if fliped >= 2:
+        h ^= zflip[30]
+        flips |= 0x40000000
+        board[3] = flip_disk[board[3]*8+6]
+        board[23] = flip_disk[board[23]*8+1]
+        board[29] = flip_disk[board[29]*8+3]
+        if fliped >= 3:
+          h ^= zflip[38]
+          flips |= 0x4000000000
+          board[4] = flip_disk[board[4]*8+6]
+          board[24] = flip_disk[board[24]*8+1]
+          board[30] = flip_disk[board[30]*8+4]
+          if fliped >= 4:
+            h ^= zflip[46]
+            flips |= 0x400000000000
+            board[5] = flip_disk[board[5]*8+6]
+            board[25] = flip_disk[board[25]*8+1]
+            board[31] = flip_disk[board[31]*8+5]
+            if fliped >= 5:
+              h ^= zflip[54]
+              flips |= 0x40000000000000
+              board[6] = flip_disk[board[6]*8+6]
+              board[26] = flip_disk[board[26]*8+1]
+              board[32] = flip_disk[board[32]*8+6]
+    i = board[21]*16+2+color
+    board[21] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[21]
+      flips |= 0x200000
+      board[2] = flip_disk[board[2]*8+5]
+      board[13] = flip_disk[board[13]*8+2]
+      board[29] = flip_disk[board[29]*8+2]
+      if fliped >= 2:
+        h ^= zflip[28]
+        flips |= 0x10000000
+        board[3] = flip_disk[board[3]*8+4]
+        board[12] = flip_disk[board[12]*8+3]
+        board[31] = flip_disk[board[31]*8+3]
+        if fliped >= 3:
+          h ^= zflip[35]
+          flips |= 0x800000000
+          board[4] = flip_disk[board[4]*8+3]
+          board[11] = flip_disk[board[11]*8+4]
+          board[33] = flip_disk[board[33]*8+3]
+          if fliped >= 4:
+            h ^= zflip[42]
+            flips |= 0x40000000000
+            board[5] = flip_disk[board[5]*8+2]
+            board[10] = flip_disk[board[10]*8+5]
+            board[35] = flip_disk[board[35]*8+2]
+            if fliped >= 5:
+              h ^= zflip[49]
+              flips |= 0x2000000000000
+              board[6] = flip_disk[board[6]*8+1]
+              board[9] = flip_disk[board[9]*8+6]
+              board[37] = flip_disk[board[37]*8+1]
+    i = board[27]*16+2+color
+    board[27] = new_code[i]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(14, color, flips)
   def putAt15(self, color):
-    self.__board[1],fliped = self.__index.flip_line(self.__board[1],7,color)
-    if fliped[0] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],1)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],1)
-      self.__board[27] = self.__index.flip_disk(self.__board[27],1)
-      if fliped[0] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],1)
-        self.__board[20] = self.__index.flip_disk(self.__board[20],1)
-        self.__board[28] = self.__index.flip_disk(self.__board[28],1)
-        if fliped[0] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],1)
-          self.__board[19] = self.__index.flip_disk(self.__board[19],1)
-          self.__board[29] = self.__index.flip_disk(self.__board[29],1)
-          if fliped[0] >= 4:
-            self.__board[11] = self.__index.flip_disk(self.__board[11],1)
-            self.__board[18] = self.__index.flip_disk(self.__board[18],1)
-            self.__board[30] = self.__index.flip_disk(self.__board[30],1)
-            if fliped[0] >= 5:
-              self.__board[10] = self.__index.flip_disk(self.__board[10],1)
-              self.__board[17] = self.__index.flip_disk(self.__board[17],1)
-              self.__board[31] = self.__index.flip_disk(self.__board[31],1)
-              if fliped[0] >= 6:
-                self.__board[9] = self.__index.flip_disk(self.__board[9],1)
-                self.__board[16] = self.__index.flip_disk(self.__board[16],1)
-                self.__board[32] = self.__index.flip_disk(self.__board[32],1)
-    self.__board[15],fliped = self.__index.flip_line(self.__board[15],1,color)
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],7);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],0);
-      self.__board[27] = self.__index.flip_disk(self.__board[27],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],7);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],0);
-        self.__board[28] = self.__index.flip_disk(self.__board[28],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],7);
-          self.__board[25] = self.__index.flip_disk(self.__board[25],0);
-          self.__board[29] = self.__index.flip_disk(self.__board[29],4);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],7);
-            self.__board[26] = self.__index.flip_disk(self.__board[26],0);
-            self.__board[30] = self.__index.flip_disk(self.__board[30],5);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],7);
-              self.__board[31] = self.__index.flip_disk(self.__board[31],6);
-    self.__board[22],fliped = self.__index.flip_line(self.__board[22],0,color);
-    if fliped[1] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],2);
-      self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-      if fliped[1] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-        if fliped[1] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-          if fliped[1] >= 4:
-            self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-            self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-            self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-            if fliped[1] >= 5:
-              self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-              self.__board[10] = self.__index.flip_disk(self.__board[10],6);
-              self.__board[36] = self.__index.flip_disk(self.__board[36],2);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[30+color]
+    i = board[1]*16+14+color
+    board[1] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[14]
+      flips |= 0x4000
+      board[14] = flip_disk[board[14]*8+1]
+      board[21] = flip_disk[board[21]*8+1]
+      board[27] = flip_disk[board[27]*8+1]
+      if fliped >= 2:
+        h ^= zflip[13]
+        flips |= 0x2000
+        board[13] = flip_disk[board[13]*8+1]
+        board[20] = flip_disk[board[20]*8+1]
+        board[28] = flip_disk[board[28]*8+1]
+        if fliped >= 3:
+          h ^= zflip[12]
+          flips |= 0x1000
+          board[12] = flip_disk[board[12]*8+1]
+          board[19] = flip_disk[board[19]*8+1]
+          board[29] = flip_disk[board[29]*8+1]
+          if fliped >= 4:
+            h ^= zflip[11]
+            flips |= 0x800
+            board[11] = flip_disk[board[11]*8+1]
+            board[18] = flip_disk[board[18]*8+1]
+            board[30] = flip_disk[board[30]*8+1]
+            if fliped >= 5:
+              h ^= zflip[10]
+              flips |= 0x400
+              board[10] = flip_disk[board[10]*8+1]
+              board[17] = flip_disk[board[17]*8+1]
+              board[31] = flip_disk[board[31]*8+1]
+              if fliped >= 6:
+                h ^= zflip[9]
+                flips |= 0x200
+                board[9] = flip_disk[board[9]*8+1]
+                board[16] = flip_disk[board[16]*8+1]
+                board[32] = flip_disk[board[32]*8+1]
+    i = board[15]*16+2+color
+    board[15] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[23]
+      flips |= 0x800000
+      board[2] = flip_disk[board[2]*8+7]
+      board[23] = flip_disk[board[23]*8+0]
+      board[27] = flip_disk[board[27]*8+2]
+      if fliped >= 2:
+        h ^= zflip[31]
+        flips |= 0x80000000
+        board[3] = flip_disk[board[3]*8+7]
+        board[24] = flip_disk[board[24]*8+0]
+        board[28] = flip_disk[board[28]*8+3]
+        if fliped >= 3:
+          h ^= zflip[39]
+          flips |= 0x8000000000
+          board[4] = flip_disk[board[4]*8+7]
+          board[25] = flip_disk[board[25]*8+0]
+          board[29] = flip_disk[board[29]*8+4]
+          if fliped >= 4:
+            h ^= zflip[47]
+            flips |= 0x800000000000
+            board[5] = flip_disk[board[5]*8+7]
+            board[26] = flip_disk[board[26]*8+0]
+            board[30] = flip_disk[board[30]*8+5]
+            if fliped >= 5:
+              h ^= zflip[55]
+              flips |= 0x80000000000000
+              board[6] = flip_disk[board[6]*8+7]
+              board[31] = flip_disk[board[31]*8+6]
+    i = board[22]*16+color
+    board[22] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[22]
+      flips |= 0x400000
+      board[2] = flip_disk[board[2]*8+6]
+      board[14] = flip_disk[board[14]*8+2]
+      board[28] = flip_disk[board[28]*8+2]
+      if fliped >= 2:
+        h ^= zflip[29]
+        flips |= 0x20000000
+        board[3] = flip_disk[board[3]*8+5]
+        board[13] = flip_disk[board[13]*8+3]
+        board[30] = flip_disk[board[30]*8+3]
+        if fliped >= 3:
+          h ^= zflip[36]
+          flips |= 0x1000000000
+          board[4] = flip_disk[board[4]*8+4]
+          board[12] = flip_disk[board[12]*8+4]
+          board[32] = flip_disk[board[32]*8+4]
+          if fliped >= 4:
+            h ^= zflip[43]
+            flips |= 0x80000000000
+            board[5] = flip_disk[board[5]*8+3]
+            board[11] = flip_disk[board[11]*8+5]
+            board[34] = flip_disk[board[34]*8+3]
+            if fliped >= 5:
+              h ^= zflip[50]
+              flips |= 0x4000000000000
+              board[6] = flip_disk[board[6]*8+2]
+              board[10] = flip_disk[board[10]*8+6]
+              board[36] = flip_disk[board[36]*8+2]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(15, color, flips)
   def putAt16(self, color):
-    self.__board[2],fliped = self.__index.flip_line(self.__board[2],0,color)
-    if fliped[1] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],2)
-      self.__board[17] = self.__index.flip_disk(self.__board[17],2)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],1)
-      if fliped[1] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],2)
-        self.__board[18] = self.__index.flip_disk(self.__board[18],2)
-        self.__board[32] = self.__index.flip_disk(self.__board[32],2)
-        if fliped[1] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],2)
-          self.__board[19] = self.__index.flip_disk(self.__board[19],2)
-          self.__board[31] = self.__index.flip_disk(self.__board[31],2)
-          if fliped[1] >= 4:
-            self.__board[12] = self.__index.flip_disk(self.__board[12],2)
-            self.__board[20] = self.__index.flip_disk(self.__board[20],2)
-            self.__board[30] = self.__index.flip_disk(self.__board[30],2)
-            if fliped[1] >= 5:
-              self.__board[13] = self.__index.flip_disk(self.__board[13],2)
-              self.__board[21] = self.__index.flip_disk(self.__board[21],2)
-              self.__board[29] = self.__index.flip_disk(self.__board[29],2)
-              if fliped[1] >= 6:
-                self.__board[14] = self.__index.flip_disk(self.__board[14],2)
-                self.__board[22] = self.__index.flip_disk(self.__board[22],1)
-                self.__board[28] = self.__index.flip_disk(self.__board[28],2)
-    self.__board[8],fliped = self.__index.flip_line(self.__board[8],2,color)
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],0);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],0);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],0);
-      self.__board[17] = self.__index.flip_disk(self.__board[17],3);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],0);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],0);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],4);
-        self.__board[36] = self.__index.flip_disk(self.__board[36],0);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],0);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],5);
-          self.__board[37] = self.__index.flip_disk(self.__board[37],0);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],0);
-            self.__board[20] = self.__index.flip_disk(self.__board[20],6);
-    self.__board[16],fliped = self.__index.flip_line(self.__board[16],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],1);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],1);
-    self.__board[34],fliped = self.__index.flip_line(self.__board[34],0,color);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],3);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-            self.__board[12] = self.__index.flip_disk(self.__board[12],6);
-            self.__board[24] = self.__index.flip_disk(self.__board[24],3);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[32+color]
+    i = board[2]*16+color
+    board[2] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[17]
+      flips |= 0x20000
+      board[9] = flip_disk[board[9]*8+2]
+      board[17] = flip_disk[board[17]*8+2]
+      board[33] = flip_disk[board[33]*8+1]
+      if fliped >= 2:
+        h ^= zflip[18]
+        flips |= 0x40000
+        board[10] = flip_disk[board[10]*8+2]
+        board[18] = flip_disk[board[18]*8+2]
+        board[32] = flip_disk[board[32]*8+2]
+        if fliped >= 3:
+          h ^= zflip[19]
+          flips |= 0x80000
+          board[11] = flip_disk[board[11]*8+2]
+          board[19] = flip_disk[board[19]*8+2]
+          board[31] = flip_disk[board[31]*8+2]
+          if fliped >= 4:
+            h ^= zflip[20]
+            flips |= 0x100000
+            board[12] = flip_disk[board[12]*8+2]
+            board[20] = flip_disk[board[20]*8+2]
+            board[30] = flip_disk[board[30]*8+2]
+            if fliped >= 5:
+              h ^= zflip[21]
+              flips |= 0x200000
+              board[13] = flip_disk[board[13]*8+2]
+              board[21] = flip_disk[board[21]*8+2]
+              board[29] = flip_disk[board[29]*8+2]
+              if fliped >= 6:
+                h ^= zflip[22]
+                flips |= 0x400000
+                board[14] = flip_disk[board[14]*8+2]
+                board[22] = flip_disk[board[22]*8+1]
+                board[28] = flip_disk[board[28]*8+2]
+    i = board[8]*16+4+color
+    board[8] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[8]
+      flips |= 0x100
+      board[1] = flip_disk[board[1]*8+0]
+      board[33] = flip_disk[board[33]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[24]
+      flips |= 0x1000000
+      board[3] = flip_disk[board[3]*8+0]
+      board[17] = flip_disk[board[17]*8+3]
+      board[35] = flip_disk[board[35]*8+0]
+      if fliped >= 2:
+        h ^= zflip[32]
+        flips |= 0x100000000
+        board[4] = flip_disk[board[4]*8+0]
+        board[18] = flip_disk[board[18]*8+4]
+        board[36] = flip_disk[board[36]*8+0]
+        if fliped >= 3:
+          h ^= zflip[40]
+          flips |= 0x10000000000
+          board[5] = flip_disk[board[5]*8+0]
+          board[19] = flip_disk[board[19]*8+5]
+          board[37] = flip_disk[board[37]*8+0]
+          if fliped >= 4:
+            h ^= zflip[48]
+            flips |= 0x1000000000000
+            board[6] = flip_disk[board[6]*8+0]
+            board[20] = flip_disk[board[20]*8+6]
+    i = board[16]*16+4+color
+    board[16] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[9]
+      flips |= 0x200
+      board[1] = flip_disk[board[1]*8+1]
+      board[9] = flip_disk[board[9]*8+1]
+      board[32] = flip_disk[board[32]*8+1]
+    i = board[34]*16+color
+    board[34] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[25]
+      flips |= 0x2000000
+      board[3] = flip_disk[board[3]*8+1]
+      board[9] = flip_disk[board[9]*8+3]
+      board[18] = flip_disk[board[18]*8+3]
+      if fliped >= 2:
+        h ^= zflip[34]
+        flips |= 0x400000000
+        board[4] = flip_disk[board[4]*8+2]
+        board[10] = flip_disk[board[10]*8+4]
+        board[20] = flip_disk[board[20]*8+4]
+        if fliped >= 3:
+          h ^= zflip[43]
+          flips |= 0x80000000000
+          board[5] = flip_disk[board[5]*8+3]
+          board[11] = flip_disk[board[11]*8+5]
+          board[22] = flip_disk[board[22]*8+4]
+          if fliped >= 4:
+            h ^= zflip[52]
+            flips |= 0x10000000000000
+            board[6] = flip_disk[board[6]*8+4]
+            board[12] = flip_disk[board[12]*8+6]
+            board[24] = flip_disk[board[24]*8+3]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(16, color, flips)
   def putAt17(self, color):
-    self.__board[2],fliped = self.__index.flip_line(self.__board[2],1,color)
-    if fliped[1] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],2)
-      self.__board[18] = self.__index.flip_disk(self.__board[18],2)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],2)
-      if fliped[1] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],2)
-        self.__board[19] = self.__index.flip_disk(self.__board[19],2)
-        self.__board[31] = self.__index.flip_disk(self.__board[31],2)
-        if fliped[1] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],2)
-          self.__board[20] = self.__index.flip_disk(self.__board[20],2)
-          self.__board[30] = self.__index.flip_disk(self.__board[30],2)
-          if fliped[1] >= 4:
-            self.__board[13] = self.__index.flip_disk(self.__board[13],2)
-            self.__board[21] = self.__index.flip_disk(self.__board[21],2)
-            self.__board[29] = self.__index.flip_disk(self.__board[29],2)
-            if fliped[1] >= 5:
-              self.__board[14] = self.__index.flip_disk(self.__board[14],2)
-              self.__board[22] = self.__index.flip_disk(self.__board[22],1)
-              self.__board[28] = self.__index.flip_disk(self.__board[28],2)
-    self.__board[9],fliped = self.__index.flip_line(self.__board[9],2,color)
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-      self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],3);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],4);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],5);
-          self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-            self.__board[21] = self.__index.flip_disk(self.__board[21],6);
-            self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[17],fliped = self.__index.flip_line(self.__board[17],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],1);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],1);
-    self.__board[33],fliped = self.__index.flip_line(self.__board[33],1,color);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-            self.__board[13] = self.__index.flip_disk(self.__board[13],6);
-            self.__board[25] = self.__index.flip_disk(self.__board[25],2);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[34+color]
+    i = board[2]*16+2+color
+    board[2] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[18]
+      flips |= 0x40000
+      board[10] = flip_disk[board[10]*8+2]
+      board[18] = flip_disk[board[18]*8+2]
+      board[32] = flip_disk[board[32]*8+2]
+      if fliped >= 2:
+        h ^= zflip[19]
+        flips |= 0x80000
+        board[11] = flip_disk[board[11]*8+2]
+        board[19] = flip_disk[board[19]*8+2]
+        board[31] = flip_disk[board[31]*8+2]
+        if fliped >= 3:
+          h ^= zflip[20]
+          flips |= 0x100000
+          board[12] = flip_disk[board[12]*8+2]
+          board[20] = flip_disk[board[20]*8+2]
+          board[30] = flip_disk[board[30]*8+2]
+          if fliped >= 4:
+            h ^= zflip[21]
+            flips |= 0x200000
+            board[13] = flip_disk[board[13]*8+2]
+            board[21] = flip_disk[board[21]*8+2]
+            board[29] = flip_disk[board[29]*8+2]
+            if fliped >= 5:
+              h ^= zflip[22]
+              flips |= 0x400000
+              board[14] = flip_disk[board[14]*8+2]
+              board[22] = flip_disk[board[22]*8+1]
+              board[28] = flip_disk[board[28]*8+2]
+    i = board[9]*16+4+color
+    board[9] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[9]
+      flips |= 0x200
+      board[1] = flip_disk[board[1]*8+1]
+      board[16] = flip_disk[board[16]*8+1]
+      board[32] = flip_disk[board[32]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[25]
+      flips |= 0x2000000
+      board[3] = flip_disk[board[3]*8+1]
+      board[18] = flip_disk[board[18]*8+3]
+      board[34] = flip_disk[board[34]*8+1]
+      if fliped >= 2:
+        h ^= zflip[33]
+        flips |= 0x200000000
+        board[4] = flip_disk[board[4]*8+1]
+        board[19] = flip_disk[board[19]*8+4]
+        board[35] = flip_disk[board[35]*8+1]
+        if fliped >= 3:
+          h ^= zflip[41]
+          flips |= 0x20000000000
+          board[5] = flip_disk[board[5]*8+1]
+          board[20] = flip_disk[board[20]*8+5]
+          board[36] = flip_disk[board[36]*8+1]
+          if fliped >= 4:
+            h ^= zflip[49]
+            flips |= 0x2000000000000
+            board[6] = flip_disk[board[6]*8+1]
+            board[21] = flip_disk[board[21]*8+6]
+            board[37] = flip_disk[board[37]*8+1]
+    i = board[17]*16+4+color
+    board[17] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[10]
+      flips |= 0x400
+      board[1] = flip_disk[board[1]*8+2]
+      board[10] = flip_disk[board[10]*8+1]
+      board[31] = flip_disk[board[31]*8+1]
+    i = board[33]*16+2+color
+    board[33] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[26]
+      flips |= 0x4000000
+      board[3] = flip_disk[board[3]*8+2]
+      board[10] = flip_disk[board[10]*8+3]
+      board[19] = flip_disk[board[19]*8+3]
+      if fliped >= 2:
+        h ^= zflip[35]
+        flips |= 0x800000000
+        board[4] = flip_disk[board[4]*8+3]
+        board[11] = flip_disk[board[11]*8+4]
+        board[21] = flip_disk[board[21]*8+4]
+        if fliped >= 3:
+          h ^= zflip[44]
+          flips |= 0x100000000000
+          board[5] = flip_disk[board[5]*8+4]
+          board[12] = flip_disk[board[12]*8+5]
+          board[23] = flip_disk[board[23]*8+3]
+          if fliped >= 4:
+            h ^= zflip[53]
+            flips |= 0x20000000000000
+            board[6] = flip_disk[board[6]*8+5]
+            board[13] = flip_disk[board[13]*8+6]
+            board[25] = flip_disk[board[25]*8+2]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(17, color, flips)
   def putAt18(self, color):
-    self.__board[2],fliped = self.__index.flip_line(self.__board[2],2,color)
-    if fliped[0] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],2)
-      self.__board[17] = self.__index.flip_disk(self.__board[17],2)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],1)
-    if fliped[1] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],2)
-      self.__board[19] = self.__index.flip_disk(self.__board[19],2)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],2)
-      if fliped[1] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],2)
-        self.__board[20] = self.__index.flip_disk(self.__board[20],2)
-        self.__board[30] = self.__index.flip_disk(self.__board[30],2)
-        if fliped[1] >= 3:
-          self.__board[13] = self.__index.flip_disk(self.__board[13],2)
-          self.__board[21] = self.__index.flip_disk(self.__board[21],2)
-          self.__board[29] = self.__index.flip_disk(self.__board[29],2)
-          if fliped[1] >= 4:
-            self.__board[14] = self.__index.flip_disk(self.__board[14],2)
-            self.__board[22] = self.__index.flip_disk(self.__board[22],1)
-            self.__board[28] = self.__index.flip_disk(self.__board[28],2)
-    self.__board[10],fliped = self.__index.flip_line(self.__board[10],2,color)
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-      self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-          self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-            self.__board[22] = self.__index.flip_disk(self.__board[22],5);
-            self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-    self.__board[18],fliped = self.__index.flip_line(self.__board[18],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],1);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],3);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-    self.__board[32],fliped = self.__index.flip_line(self.__board[32],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],1);
-      self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-          self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-          self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-            self.__board[14] = self.__index.flip_disk(self.__board[14],6);
-            self.__board[26] = self.__index.flip_disk(self.__board[26],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[36+color]
+    i = board[2]*16+4+color
+    board[2] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[17]
+      flips |= 0x20000
+      board[9] = flip_disk[board[9]*8+2]
+      board[17] = flip_disk[board[17]*8+2]
+      board[33] = flip_disk[board[33]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[19]
+      flips |= 0x80000
+      board[11] = flip_disk[board[11]*8+2]
+      board[19] = flip_disk[board[19]*8+2]
+      board[31] = flip_disk[board[31]*8+2]
+      if fliped >= 2:
+        h ^= zflip[20]
+        flips |= 0x100000
+        board[12] = flip_disk[board[12]*8+2]
+        board[20] = flip_disk[board[20]*8+2]
+        board[30] = flip_disk[board[30]*8+2]
+        if fliped >= 3:
+          h ^= zflip[21]
+          flips |= 0x200000
+          board[13] = flip_disk[board[13]*8+2]
+          board[21] = flip_disk[board[21]*8+2]
+          board[29] = flip_disk[board[29]*8+2]
+          if fliped >= 4:
+            h ^= zflip[22]
+            flips |= 0x400000
+            board[14] = flip_disk[board[14]*8+2]
+            board[22] = flip_disk[board[22]*8+1]
+            board[28] = flip_disk[board[28]*8+2]
+    i = board[10]*16+4+color
+    board[10] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[10]
+      flips |= 0x400
+      board[1] = flip_disk[board[1]*8+2]
+      board[17] = flip_disk[board[17]*8+1]
+      board[31] = flip_disk[board[31]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[26]
+      flips |= 0x4000000
+      board[3] = flip_disk[board[3]*8+2]
+      board[19] = flip_disk[board[19]*8+3]
+      board[33] = flip_disk[board[33]*8+2]
+      if fliped >= 2:
+        h ^= zflip[34]
+        flips |= 0x400000000
+        board[4] = flip_disk[board[4]*8+2]
+        board[20] = flip_disk[board[20]*8+4]
+        board[34] = flip_disk[board[34]*8+2]
+        if fliped >= 3:
+          h ^= zflip[42]
+          flips |= 0x40000000000
+          board[5] = flip_disk[board[5]*8+2]
+          board[21] = flip_disk[board[21]*8+5]
+          board[35] = flip_disk[board[35]*8+2]
+          if fliped >= 4:
+            h ^= zflip[50]
+            flips |= 0x4000000000000
+            board[6] = flip_disk[board[6]*8+2]
+            board[22] = flip_disk[board[22]*8+5]
+            board[36] = flip_disk[board[36]*8+2]
+    i = board[18]*16+4+color
+    board[18] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[11]
+      flips |= 0x800
+      board[1] = flip_disk[board[1]*8+3]
+      board[11] = flip_disk[board[11]*8+1]
+      board[30] = flip_disk[board[30]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[25]
+      flips |= 0x2000000
+      board[3] = flip_disk[board[3]*8+1]
+      board[9] = flip_disk[board[9]*8+3]
+      board[34] = flip_disk[board[34]*8+1]
+    i = board[32]*16+4+color
+    board[32] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[9]
+      flips |= 0x200
+      board[1] = flip_disk[board[1]*8+1]
+      board[9] = flip_disk[board[9]*8+1]
+      board[16] = flip_disk[board[16]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[27]
+      flips |= 0x8000000
+      board[3] = flip_disk[board[3]*8+3]
+      board[11] = flip_disk[board[11]*8+3]
+      board[20] = flip_disk[board[20]*8+3]
+      if fliped >= 2:
+        h ^= zflip[36]
+        flips |= 0x1000000000
+        board[4] = flip_disk[board[4]*8+4]
+        board[12] = flip_disk[board[12]*8+4]
+        board[22] = flip_disk[board[22]*8+3]
+        if fliped >= 3:
+          h ^= zflip[45]
+          flips |= 0x200000000000
+          board[5] = flip_disk[board[5]*8+5]
+          board[13] = flip_disk[board[13]*8+5]
+          board[24] = flip_disk[board[24]*8+2]
+          if fliped >= 4:
+            h ^= zflip[54]
+            flips |= 0x40000000000000
+            board[6] = flip_disk[board[6]*8+6]
+            board[14] = flip_disk[board[14]*8+6]
+            board[26] = flip_disk[board[26]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(18, color, flips)
   def putAt19(self, color):
-    self.__board[2],fliped = self.__index.flip_line(self.__board[2],3,color)
-    if fliped[0] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],2)
-      self.__board[18] = self.__index.flip_disk(self.__board[18],2)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],2)
-      if fliped[0] >= 2:
-        self.__board[9] = self.__index.flip_disk(self.__board[9],2)
-        self.__board[17] = self.__index.flip_disk(self.__board[17],2)
-        self.__board[33] = self.__index.flip_disk(self.__board[33],1)
-    if fliped[1] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],2)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],2)
-      self.__board[30] = self.__index.flip_disk(self.__board[30],2)
-      if fliped[1] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],2)
-        self.__board[21] = self.__index.flip_disk(self.__board[21],2)
-        self.__board[29] = self.__index.flip_disk(self.__board[29],2)
-        if fliped[1] >= 3:
-          self.__board[14] = self.__index.flip_disk(self.__board[14],2)
-          self.__board[22] = self.__index.flip_disk(self.__board[22],1)
-          self.__board[28] = self.__index.flip_disk(self.__board[28],2)
-    self.__board[11],fliped = self.__index.flip_line(self.__board[11],2,color)
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],1);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-            self.__board[23] = self.__index.flip_disk(self.__board[23],4);
-            self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-    self.__board[19],fliped = self.__index.flip_line(self.__board[19],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],1);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-        self.__board[9] = self.__index.flip_disk(self.__board[9],4);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-    self.__board[31],fliped = self.__index.flip_line(self.__board[31],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],1);
-      self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-          self.__board[14] = self.__index.flip_disk(self.__board[14],5);
-          self.__board[25] = self.__index.flip_disk(self.__board[25],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[38+color]
+    i = board[2]*16+6+color
+    board[2] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[18]
+      flips |= 0x40000
+      board[10] = flip_disk[board[10]*8+2]
+      board[18] = flip_disk[board[18]*8+2]
+      board[32] = flip_disk[board[32]*8+2]
+      if fliped >= 2:
+        h ^= zflip[17]
+        flips |= 0x20000
+        board[9] = flip_disk[board[9]*8+2]
+        board[17] = flip_disk[board[17]*8+2]
+        board[33] = flip_disk[board[33]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[20]
+      flips |= 0x100000
+      board[12] = flip_disk[board[12]*8+2]
+      board[20] = flip_disk[board[20]*8+2]
+      board[30] = flip_disk[board[30]*8+2]
+      if fliped >= 2:
+        h ^= zflip[21]
+        flips |= 0x200000
+        board[13] = flip_disk[board[13]*8+2]
+        board[21] = flip_disk[board[21]*8+2]
+        board[29] = flip_disk[board[29]*8+2]
+        if fliped >= 3:
+          h ^= zflip[22]
+          flips |= 0x400000
+          board[14] = flip_disk[board[14]*8+2]
+          board[22] = flip_disk[board[22]*8+1]
+          board[28] = flip_disk[board[28]*8+2]
+    i = board[11]*16+4+color
+    board[11] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[11]
+      flips |= 0x800
+      board[1] = flip_disk[board[1]*8+3]
+      board[18] = flip_disk[board[18]*8+1]
+      board[30] = flip_disk[board[30]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[27]
+      flips |= 0x8000000
+      board[3] = flip_disk[board[3]*8+3]
+      board[20] = flip_disk[board[20]*8+3]
+      board[32] = flip_disk[board[32]*8+3]
+      if fliped >= 2:
+        h ^= zflip[35]
+        flips |= 0x800000000
+        board[4] = flip_disk[board[4]*8+3]
+        board[21] = flip_disk[board[21]*8+4]
+        board[33] = flip_disk[board[33]*8+3]
+        if fliped >= 3:
+          h ^= zflip[43]
+          flips |= 0x80000000000
+          board[5] = flip_disk[board[5]*8+3]
+          board[22] = flip_disk[board[22]*8+4]
+          board[34] = flip_disk[board[34]*8+3]
+          if fliped >= 4:
+            h ^= zflip[51]
+            flips |= 0x8000000000000
+            board[6] = flip_disk[board[6]*8+3]
+            board[23] = flip_disk[board[23]*8+4]
+            board[35] = flip_disk[board[35]*8+3]
+    i = board[19]*16+4+color
+    board[19] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[12]
+      flips |= 0x1000
+      board[1] = flip_disk[board[1]*8+4]
+      board[12] = flip_disk[board[12]*8+1]
+      board[29] = flip_disk[board[29]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[26]
+      flips |= 0x4000000
+      board[3] = flip_disk[board[3]*8+2]
+      board[10] = flip_disk[board[10]*8+3]
+      board[33] = flip_disk[board[33]*8+2]
+      if fliped >= 2:
+        h ^= zflip[33]
+        flips |= 0x200000000
+        board[4] = flip_disk[board[4]*8+1]
+        board[9] = flip_disk[board[9]*8+4]
+        board[35] = flip_disk[board[35]*8+1]
+    i = board[31]*16+4+color
+    board[31] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[10]
+      flips |= 0x400
+      board[1] = flip_disk[board[1]*8+2]
+      board[10] = flip_disk[board[10]*8+1]
+      board[17] = flip_disk[board[17]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[28]
+      flips |= 0x10000000
+      board[3] = flip_disk[board[3]*8+4]
+      board[12] = flip_disk[board[12]*8+3]
+      board[21] = flip_disk[board[21]*8+3]
+      if fliped >= 2:
+        h ^= zflip[37]
+        flips |= 0x2000000000
+        board[4] = flip_disk[board[4]*8+5]
+        board[13] = flip_disk[board[13]*8+4]
+        board[23] = flip_disk[board[23]*8+2]
+        if fliped >= 3:
+          h ^= zflip[46]
+          flips |= 0x400000000000
+          board[5] = flip_disk[board[5]*8+6]
+          board[14] = flip_disk[board[14]*8+5]
+          board[25] = flip_disk[board[25]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(19, color, flips)
   def putAt20(self, color):
-    self.__board[2],fliped = self.__index.flip_line(self.__board[2],4,color)
-    if fliped[0] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],2)
-      self.__board[19] = self.__index.flip_disk(self.__board[19],2)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],2)
-      if fliped[0] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],2)
-        self.__board[18] = self.__index.flip_disk(self.__board[18],2)
-        self.__board[32] = self.__index.flip_disk(self.__board[32],2)
-        if fliped[0] >= 3:
-          self.__board[9] = self.__index.flip_disk(self.__board[9],2)
-          self.__board[17] = self.__index.flip_disk(self.__board[17],2)
-          self.__board[33] = self.__index.flip_disk(self.__board[33],1)
-    if fliped[1] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],2)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],2)
-      self.__board[29] = self.__index.flip_disk(self.__board[29],2)
-      if fliped[1] >= 2:
-        self.__board[14] = self.__index.flip_disk(self.__board[14],2)
-        self.__board[22] = self.__index.flip_disk(self.__board[22],1)
-        self.__board[28] = self.__index.flip_disk(self.__board[28],2)
-    self.__board[12],fliped = self.__index.flip_line(self.__board[12],2,color)
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],1);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-            self.__board[24] = self.__index.flip_disk(self.__board[24],3);
-            self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-    self.__board[20],fliped = self.__index.flip_line(self.__board[20],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],1);
-      self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-          self.__board[9] = self.__index.flip_disk(self.__board[9],5);
-          self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-    self.__board[30],fliped = self.__index.flip_line(self.__board[30],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],1);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-        self.__board[14] = self.__index.flip_disk(self.__board[14],4);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[40+color]
+    i = board[2]*16+8+color
+    board[2] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[19]
+      flips |= 0x80000
+      board[11] = flip_disk[board[11]*8+2]
+      board[19] = flip_disk[board[19]*8+2]
+      board[31] = flip_disk[board[31]*8+2]
+      if fliped >= 2:
+        h ^= zflip[18]
+        flips |= 0x40000
+        board[10] = flip_disk[board[10]*8+2]
+        board[18] = flip_disk[board[18]*8+2]
+        board[32] = flip_disk[board[32]*8+2]
+        if fliped >= 3:
+          h ^= zflip[17]
+          flips |= 0x20000
+          board[9] = flip_disk[board[9]*8+2]
+          board[17] = flip_disk[board[17]*8+2]
+          board[33] = flip_disk[board[33]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[21]
+      flips |= 0x200000
+      board[13] = flip_disk[board[13]*8+2]
+      board[21] = flip_disk[board[21]*8+2]
+      board[29] = flip_disk[board[29]*8+2]
+      if fliped >= 2:
+        h ^= zflip[22]
+        flips |= 0x400000
+        board[14] = flip_disk[board[14]*8+2]
+        board[22] = flip_disk[board[22]*8+1]
+        board[28] = flip_disk[board[28]*8+2]
+    i = board[12]*16+4+color
+    board[12] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[12]
+      flips |= 0x1000
+      board[1] = flip_disk[board[1]*8+4]
+      board[19] = flip_disk[board[19]*8+1]
+      board[29] = flip_disk[board[29]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[28]
+      flips |= 0x10000000
+      board[3] = flip_disk[board[3]*8+4]
+      board[21] = flip_disk[board[21]*8+3]
+      board[31] = flip_disk[board[31]*8+3]
+      if fliped >= 2:
+        h ^= zflip[36]
+        flips |= 0x1000000000
+        board[4] = flip_disk[board[4]*8+4]
+        board[22] = flip_disk[board[22]*8+3]
+        board[32] = flip_disk[board[32]*8+4]
+        if fliped >= 3:
+          h ^= zflip[44]
+          flips |= 0x100000000000
+          board[5] = flip_disk[board[5]*8+4]
+          board[23] = flip_disk[board[23]*8+3]
+          board[33] = flip_disk[board[33]*8+4]
+          if fliped >= 4:
+            h ^= zflip[52]
+            flips |= 0x10000000000000
+            board[6] = flip_disk[board[6]*8+4]
+            board[24] = flip_disk[board[24]*8+3]
+            board[34] = flip_disk[board[34]*8+4]
+    i = board[20]*16+4+color
+    board[20] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[13]
+      flips |= 0x2000
+      board[1] = flip_disk[board[1]*8+5]
+      board[13] = flip_disk[board[13]*8+1]
+      board[28] = flip_disk[board[28]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[27]
+      flips |= 0x8000000
+      board[3] = flip_disk[board[3]*8+3]
+      board[11] = flip_disk[board[11]*8+3]
+      board[32] = flip_disk[board[32]*8+3]
+      if fliped >= 2:
+        h ^= zflip[34]
+        flips |= 0x400000000
+        board[4] = flip_disk[board[4]*8+2]
+        board[10] = flip_disk[board[10]*8+4]
+        board[34] = flip_disk[board[34]*8+2]
+        if fliped >= 3:
+          h ^= zflip[41]
+          flips |= 0x20000000000
+          board[5] = flip_disk[board[5]*8+1]
+          board[9] = flip_disk[board[9]*8+5]
+          board[36] = flip_disk[board[36]*8+1]
+    i = board[30]*16+4+color
+    board[30] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[11]
+      flips |= 0x800
+      board[1] = flip_disk[board[1]*8+3]
+      board[11] = flip_disk[board[11]*8+1]
+      board[18] = flip_disk[board[18]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[29]
+      flips |= 0x20000000
+      board[3] = flip_disk[board[3]*8+5]
+      board[13] = flip_disk[board[13]*8+3]
+      board[22] = flip_disk[board[22]*8+2]
+      if fliped >= 2:
+        h ^= zflip[38]
+        flips |= 0x4000000000
+        board[4] = flip_disk[board[4]*8+6]
+        board[14] = flip_disk[board[14]*8+4]
+        board[24] = flip_disk[board[24]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(20, color, flips)
   def putAt21(self, color):
-    self.__board[2],fliped = self.__index.flip_line(self.__board[2],5,color)
-    if fliped[0] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],2)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],2)
-      self.__board[30] = self.__index.flip_disk(self.__board[30],2)
-      if fliped[0] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],2)
-        self.__board[19] = self.__index.flip_disk(self.__board[19],2)
-        self.__board[31] = self.__index.flip_disk(self.__board[31],2)
-        if fliped[0] >= 3:
-          self.__board[10] = self.__index.flip_disk(self.__board[10],2)
-          self.__board[18] = self.__index.flip_disk(self.__board[18],2)
-          self.__board[32] = self.__index.flip_disk(self.__board[32],2)
-          if fliped[0] >= 4:
-            self.__board[9] = self.__index.flip_disk(self.__board[9],2)
-            self.__board[17] = self.__index.flip_disk(self.__board[17],2)
-            self.__board[33] = self.__index.flip_disk(self.__board[33],1)
-    if fliped[1] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],2)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],1)
-      self.__board[28] = self.__index.flip_disk(self.__board[28],2)
-    self.__board[13],fliped = self.__index.flip_line(self.__board[13],2,color)
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],1);
-      self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-          self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-            self.__board[25] = self.__index.flip_disk(self.__board[25],2);
-            self.__board[33] = self.__index.flip_disk(self.__board[33],5);
-    self.__board[21],fliped = self.__index.flip_line(self.__board[21],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],1);
-      self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-          self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-          self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-            self.__board[9] = self.__index.flip_disk(self.__board[9],6);
-            self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[29],fliped = self.__index.flip_line(self.__board[29],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],1);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],3);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[42+color]
+    i = board[2]*16+10+color
+    board[2] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[20]
+      flips |= 0x100000
+      board[12] = flip_disk[board[12]*8+2]
+      board[20] = flip_disk[board[20]*8+2]
+      board[30] = flip_disk[board[30]*8+2]
+      if fliped >= 2:
+        h ^= zflip[19]
+        flips |= 0x80000
+        board[11] = flip_disk[board[11]*8+2]
+        board[19] = flip_disk[board[19]*8+2]
+        board[31] = flip_disk[board[31]*8+2]
+        if fliped >= 3:
+          h ^= zflip[18]
+          flips |= 0x40000
+          board[10] = flip_disk[board[10]*8+2]
+          board[18] = flip_disk[board[18]*8+2]
+          board[32] = flip_disk[board[32]*8+2]
+          if fliped >= 4:
+            h ^= zflip[17]
+            flips |= 0x20000
+            board[9] = flip_disk[board[9]*8+2]
+            board[17] = flip_disk[board[17]*8+2]
+            board[33] = flip_disk[board[33]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[22]
+      flips |= 0x400000
+      board[14] = flip_disk[board[14]*8+2]
+      board[22] = flip_disk[board[22]*8+1]
+      board[28] = flip_disk[board[28]*8+2]
+    i = board[13]*16+4+color
+    board[13] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[13]
+      flips |= 0x2000
+      board[1] = flip_disk[board[1]*8+5]
+      board[20] = flip_disk[board[20]*8+1]
+      board[28] = flip_disk[board[28]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[29]
+      flips |= 0x20000000
+      board[3] = flip_disk[board[3]*8+5]
+      board[22] = flip_disk[board[22]*8+2]
+      board[30] = flip_disk[board[30]*8+3]
+      if fliped >= 2:
+        h ^= zflip[37]
+        flips |= 0x2000000000
+        board[4] = flip_disk[board[4]*8+5]
+        board[23] = flip_disk[board[23]*8+2]
+        board[31] = flip_disk[board[31]*8+4]
+        if fliped >= 3:
+          h ^= zflip[45]
+          flips |= 0x200000000000
+          board[5] = flip_disk[board[5]*8+5]
+          board[24] = flip_disk[board[24]*8+2]
+          board[32] = flip_disk[board[32]*8+5]
+          if fliped >= 4:
+            h ^= zflip[53]
+            flips |= 0x20000000000000
+            board[6] = flip_disk[board[6]*8+5]
+            board[25] = flip_disk[board[25]*8+2]
+            board[33] = flip_disk[board[33]*8+5]
+    i = board[21]*16+4+color
+    board[21] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[14]
+      flips |= 0x4000
+      board[1] = flip_disk[board[1]*8+6]
+      board[14] = flip_disk[board[14]*8+1]
+      board[27] = flip_disk[board[27]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[28]
+      flips |= 0x10000000
+      board[3] = flip_disk[board[3]*8+4]
+      board[12] = flip_disk[board[12]*8+3]
+      board[31] = flip_disk[board[31]*8+3]
+      if fliped >= 2:
+        h ^= zflip[35]
+        flips |= 0x800000000
+        board[4] = flip_disk[board[4]*8+3]
+        board[11] = flip_disk[board[11]*8+4]
+        board[33] = flip_disk[board[33]*8+3]
+        if fliped >= 3:
+          h ^= zflip[42]
+          flips |= 0x40000000000
+          board[5] = flip_disk[board[5]*8+2]
+          board[10] = flip_disk[board[10]*8+5]
+          board[35] = flip_disk[board[35]*8+2]
+          if fliped >= 4:
+            h ^= zflip[49]
+            flips |= 0x2000000000000
+            board[6] = flip_disk[board[6]*8+1]
+            board[9] = flip_disk[board[9]*8+6]
+            board[37] = flip_disk[board[37]*8+1]
+    i = board[29]*16+4+color
+    board[29] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[12]
+      flips |= 0x1000
+      board[1] = flip_disk[board[1]*8+4]
+      board[12] = flip_disk[board[12]*8+1]
+      board[19] = flip_disk[board[19]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[30]
+      flips |= 0x40000000
+      board[3] = flip_disk[board[3]*8+6]
+      board[14] = flip_disk[board[14]*8+3]
+      board[23] = flip_disk[board[23]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(21, color, flips)
   def putAt22(self, color):
-    self.__board[2],fliped = self.__index.flip_line(self.__board[2],6,color)
-    if fliped[0] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],2)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],2)
-      self.__board[29] = self.__index.flip_disk(self.__board[29],2)
-      if fliped[0] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],2)
-        self.__board[20] = self.__index.flip_disk(self.__board[20],2)
-        self.__board[30] = self.__index.flip_disk(self.__board[30],2)
-        if fliped[0] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],2)
-          self.__board[19] = self.__index.flip_disk(self.__board[19],2)
-          self.__board[31] = self.__index.flip_disk(self.__board[31],2)
-          if fliped[0] >= 4:
-            self.__board[10] = self.__index.flip_disk(self.__board[10],2)
-            self.__board[18] = self.__index.flip_disk(self.__board[18],2)
-            self.__board[32] = self.__index.flip_disk(self.__board[32],2)
-            if fliped[0] >= 5:
-              self.__board[9] = self.__index.flip_disk(self.__board[9],2)
-              self.__board[17] = self.__index.flip_disk(self.__board[17],2)
-              self.__board[33] = self.__index.flip_disk(self.__board[33],1)
-    self.__board[14],fliped = self.__index.flip_line(self.__board[14],2,color)
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],1);
-      self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],1);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],1);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-          self.__board[25] = self.__index.flip_disk(self.__board[25],1);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],5);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-            self.__board[26] = self.__index.flip_disk(self.__board[26],1);
-            self.__board[32] = self.__index.flip_disk(self.__board[32],6);
-    self.__board[22],fliped = self.__index.flip_line(self.__board[22],1,color);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-            self.__board[10] = self.__index.flip_disk(self.__board[10],6);
-            self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-    self.__board[28],fliped = self.__index.flip_line(self.__board[28],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],1);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[44+color]
+    i = board[2]*16+12+color
+    board[2] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[21]
+      flips |= 0x200000
+      board[13] = flip_disk[board[13]*8+2]
+      board[21] = flip_disk[board[21]*8+2]
+      board[29] = flip_disk[board[29]*8+2]
+      if fliped >= 2:
+        h ^= zflip[20]
+        flips |= 0x100000
+        board[12] = flip_disk[board[12]*8+2]
+        board[20] = flip_disk[board[20]*8+2]
+        board[30] = flip_disk[board[30]*8+2]
+        if fliped >= 3:
+          h ^= zflip[19]
+          flips |= 0x80000
+          board[11] = flip_disk[board[11]*8+2]
+          board[19] = flip_disk[board[19]*8+2]
+          board[31] = flip_disk[board[31]*8+2]
+          if fliped >= 4:
+            h ^= zflip[18]
+            flips |= 0x40000
+            board[10] = flip_disk[board[10]*8+2]
+            board[18] = flip_disk[board[18]*8+2]
+            board[32] = flip_disk[board[32]*8+2]
+            if fliped >= 5:
+              h ^= zflip[17]
+              flips |= 0x20000
+              board[9] = flip_disk[board[9]*8+2]
+              board[17] = flip_disk[board[17]*8+2]
+              board[33] = flip_disk[board[33]*8+1]
+    i = board[14]*16+4+color
+    board[14] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[14]
+      flips |= 0x4000
+      board[1] = flip_disk[board[1]*8+6]
+      board[21] = flip_disk[board[21]*8+1]
+      board[27] = flip_disk[board[27]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[30]
+      flips |= 0x40000000
+      board[3] = flip_disk[board[3]*8+6]
+      board[23] = flip_disk[board[23]*8+1]
+      board[29] = flip_disk[board[29]*8+3]
+      if fliped >= 2:
+        h ^= zflip[38]
+        flips |= 0x4000000000
+        board[4] = flip_disk[board[4]*8+6]
+        board[24] = flip_disk[board[24]*8+1]
+        board[30] = flip_disk[board[30]*8+4]
+        if fliped >= 3:
+          h ^= zflip[46]
+          flips |= 0x400000000000
+          board[5] = flip_disk[board[5]*8+6]
+          board[25] = flip_disk[board[25]*8+1]
+          board[31] = flip_disk[board[31]*8+5]
+          if fliped >= 4:
+            h ^= zflip[54]
+            flips |= 0x40000000000000
+            board[6] = flip_disk[board[6]*8+6]
+            board[26] = flip_disk[board[26]*8+1]
+            board[32] = flip_disk[board[32]*8+6]
+    i = board[22]*16+2+color
+    board[22] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[29]
+      flips |= 0x20000000
+      board[3] = flip_disk[board[3]*8+5]
+      board[13] = flip_disk[board[13]*8+3]
+      board[30] = flip_disk[board[30]*8+3]
+      if fliped >= 2:
+        h ^= zflip[36]
+        flips |= 0x1000000000
+        board[4] = flip_disk[board[4]*8+4]
+        board[12] = flip_disk[board[12]*8+4]
+        board[32] = flip_disk[board[32]*8+4]
+        if fliped >= 3:
+          h ^= zflip[43]
+          flips |= 0x80000000000
+          board[5] = flip_disk[board[5]*8+3]
+          board[11] = flip_disk[board[11]*8+5]
+          board[34] = flip_disk[board[34]*8+3]
+          if fliped >= 4:
+            h ^= zflip[50]
+            flips |= 0x4000000000000
+            board[6] = flip_disk[board[6]*8+2]
+            board[10] = flip_disk[board[10]*8+6]
+            board[36] = flip_disk[board[36]*8+2]
+    i = board[28]*16+4+color
+    board[28] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[13]
+      flips |= 0x2000
+      board[1] = flip_disk[board[1]*8+5]
+      board[13] = flip_disk[board[13]*8+1]
+      board[20] = flip_disk[board[20]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(22, color, flips)
   def putAt23(self, color):
-    self.__board[2],fliped = self.__index.flip_line(self.__board[2],7,color)
-    if fliped[0] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],2)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],1)
-      self.__board[28] = self.__index.flip_disk(self.__board[28],2)
-      if fliped[0] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],2)
-        self.__board[21] = self.__index.flip_disk(self.__board[21],2)
-        self.__board[29] = self.__index.flip_disk(self.__board[29],2)
-        if fliped[0] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],2)
-          self.__board[20] = self.__index.flip_disk(self.__board[20],2)
-          self.__board[30] = self.__index.flip_disk(self.__board[30],2)
-          if fliped[0] >= 4:
-            self.__board[11] = self.__index.flip_disk(self.__board[11],2)
-            self.__board[19] = self.__index.flip_disk(self.__board[19],2)
-            self.__board[31] = self.__index.flip_disk(self.__board[31],2)
-            if fliped[0] >= 5:
-              self.__board[10] = self.__index.flip_disk(self.__board[10],2)
-              self.__board[18] = self.__index.flip_disk(self.__board[18],2)
-              self.__board[32] = self.__index.flip_disk(self.__board[32],2)
-              if fliped[0] >= 6:
-                self.__board[9] = self.__index.flip_disk(self.__board[9],2)
-                self.__board[17] = self.__index.flip_disk(self.__board[17],2)
-                self.__board[33] = self.__index.flip_disk(self.__board[33],1)
-    self.__board[15],fliped = self.__index.flip_line(self.__board[15],2,color)
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],7);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],0);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],7);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],0);
-      self.__board[28] = self.__index.flip_disk(self.__board[28],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],7);
-        self.__board[25] = self.__index.flip_disk(self.__board[25],0);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],4);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],7);
-          self.__board[26] = self.__index.flip_disk(self.__board[26],0);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],5);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],7);
-            self.__board[31] = self.__index.flip_disk(self.__board[31],6);
-    self.__board[23],fliped = self.__index.flip_line(self.__board[23],0,color);
-    if fliped[1] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],3);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-      if fliped[1] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-        if fliped[1] >= 3:
-          self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-          if fliped[1] >= 4:
-            self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-            self.__board[11] = self.__index.flip_disk(self.__board[11],6);
-            self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-    self.__board[27],fliped = self.__index.flip_line(self.__board[27],2,color);
-    if fliped[0] >= 1:
-      self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],1);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[46+color]
+    i = board[2]*16+14+color
+    board[2] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[22]
+      flips |= 0x400000
+      board[14] = flip_disk[board[14]*8+2]
+      board[22] = flip_disk[board[22]*8+1]
+      board[28] = flip_disk[board[28]*8+2]
+      if fliped >= 2:
+        h ^= zflip[21]
+        flips |= 0x200000
+        board[13] = flip_disk[board[13]*8+2]
+        board[21] = flip_disk[board[21]*8+2]
+        board[29] = flip_disk[board[29]*8+2]
+        if fliped >= 3:
+          h ^= zflip[20]
+          flips |= 0x100000
+          board[12] = flip_disk[board[12]*8+2]
+          board[20] = flip_disk[board[20]*8+2]
+          board[30] = flip_disk[board[30]*8+2]
+          if fliped >= 4:
+            h ^= zflip[19]
+            flips |= 0x80000
+            board[11] = flip_disk[board[11]*8+2]
+            board[19] = flip_disk[board[19]*8+2]
+            board[31] = flip_disk[board[31]*8+2]
+            if fliped >= 5:
+              h ^= zflip[18]
+              flips |= 0x40000
+              board[10] = flip_disk[board[10]*8+2]
+              board[18] = flip_disk[board[18]*8+2]
+              board[32] = flip_disk[board[32]*8+2]
+              if fliped >= 6:
+                h ^= zflip[17]
+                flips |= 0x20000
+                board[9] = flip_disk[board[9]*8+2]
+                board[17] = flip_disk[board[17]*8+2]
+                board[33] = flip_disk[board[33]*8+1]
+    i = board[15]*16+4+color
+    board[15] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[15]
+      flips |= 0x8000
+      board[1] = flip_disk[board[1]*8+7]
+      board[22] = flip_disk[board[22]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[31]
+      flips |= 0x80000000
+      board[3] = flip_disk[board[3]*8+7]
+      board[24] = flip_disk[board[24]*8+0]
+      board[28] = flip_disk[board[28]*8+3]
+      if fliped >= 2:
+        h ^= zflip[39]
+        flips |= 0x8000000000
+        board[4] = flip_disk[board[4]*8+7]
+        board[25] = flip_disk[board[25]*8+0]
+        board[29] = flip_disk[board[29]*8+4]
+        if fliped >= 3:
+          h ^= zflip[47]
+          flips |= 0x800000000000
+          board[5] = flip_disk[board[5]*8+7]
+          board[26] = flip_disk[board[26]*8+0]
+          board[30] = flip_disk[board[30]*8+5]
+          if fliped >= 4:
+            h ^= zflip[55]
+            flips |= 0x80000000000000
+            board[6] = flip_disk[board[6]*8+7]
+            board[31] = flip_disk[board[31]*8+6]
+    i = board[23]*16+color
+    board[23] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[30]
+      flips |= 0x40000000
+      board[3] = flip_disk[board[3]*8+6]
+      board[14] = flip_disk[board[14]*8+3]
+      board[29] = flip_disk[board[29]*8+3]
+      if fliped >= 2:
+        h ^= zflip[37]
+        flips |= 0x2000000000
+        board[4] = flip_disk[board[4]*8+5]
+        board[13] = flip_disk[board[13]*8+4]
+        board[31] = flip_disk[board[31]*8+4]
+        if fliped >= 3:
+          h ^= zflip[44]
+          flips |= 0x100000000000
+          board[5] = flip_disk[board[5]*8+4]
+          board[12] = flip_disk[board[12]*8+5]
+          board[33] = flip_disk[board[33]*8+4]
+          if fliped >= 4:
+            h ^= zflip[51]
+            flips |= 0x8000000000000
+            board[6] = flip_disk[board[6]*8+3]
+            board[11] = flip_disk[board[11]*8+6]
+            board[35] = flip_disk[board[35]*8+3]
+    i = board[27]*16+4+color
+    board[27] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[14]
+      flips |= 0x4000
+      board[1] = flip_disk[board[1]*8+6]
+      board[14] = flip_disk[board[14]*8+1]
+      board[21] = flip_disk[board[21]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(23, color, flips)
   def putAt24(self, color):
-    self.__board[3],fliped = self.__index.flip_line(self.__board[3],0,color)
-    if fliped[1] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],3)
-      self.__board[18] = self.__index.flip_disk(self.__board[18],3)
-      self.__board[34] = self.__index.flip_disk(self.__board[34],1)
-      if fliped[1] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],3)
-        self.__board[19] = self.__index.flip_disk(self.__board[19],3)
-        self.__board[33] = self.__index.flip_disk(self.__board[33],2)
-        if fliped[1] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],3)
-          self.__board[20] = self.__index.flip_disk(self.__board[20],3)
-          self.__board[32] = self.__index.flip_disk(self.__board[32],3)
-          if fliped[1] >= 4:
-            self.__board[12] = self.__index.flip_disk(self.__board[12],3)
-            self.__board[21] = self.__index.flip_disk(self.__board[21],3)
-            self.__board[31] = self.__index.flip_disk(self.__board[31],3)
-            if fliped[1] >= 5:
-              self.__board[13] = self.__index.flip_disk(self.__board[13],3)
-              self.__board[22] = self.__index.flip_disk(self.__board[22],2)
-              self.__board[30] = self.__index.flip_disk(self.__board[30],3)
-              if fliped[1] >= 6:
-                self.__board[14] = self.__index.flip_disk(self.__board[14],3)
-                self.__board[23] = self.__index.flip_disk(self.__board[23],1)
-                self.__board[29] = self.__index.flip_disk(self.__board[29],3)
-    self.__board[8],fliped = self.__index.flip_line(self.__board[8],3,color)
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],0);
-      self.__board[16] = self.__index.flip_disk(self.__board[16],2);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],0);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],0);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],0);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],0);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],4);
-      self.__board[36] = self.__index.flip_disk(self.__board[36],0);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],0);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],5);
-        self.__board[37] = self.__index.flip_disk(self.__board[37],0);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],0);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],6);
-    self.__board[17],fliped = self.__index.flip_line(self.__board[17],3,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],2);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],1);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],1);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],1);
-    self.__board[35],fliped = self.__index.flip_line(self.__board[35],0,color);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],4);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],4);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],6);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],4);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[48+color]
+    i = board[3]*16+color
+    board[3] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[25]
+      flips |= 0x2000000
+      board[9] = flip_disk[board[9]*8+3]
+      board[18] = flip_disk[board[18]*8+3]
+      board[34] = flip_disk[board[34]*8+1]
+      if fliped >= 2:
+        h ^= zflip[26]
+        flips |= 0x4000000
+        board[10] = flip_disk[board[10]*8+3]
+        board[19] = flip_disk[board[19]*8+3]
+        board[33] = flip_disk[board[33]*8+2]
+        if fliped >= 3:
+          h ^= zflip[27]
+          flips |= 0x8000000
+          board[11] = flip_disk[board[11]*8+3]
+          board[20] = flip_disk[board[20]*8+3]
+          board[32] = flip_disk[board[32]*8+3]
+          if fliped >= 4:
+            h ^= zflip[28]
+            flips |= 0x10000000
+            board[12] = flip_disk[board[12]*8+3]
+            board[21] = flip_disk[board[21]*8+3]
+            board[31] = flip_disk[board[31]*8+3]
+            if fliped >= 5:
+              h ^= zflip[29]
+              flips |= 0x20000000
+              board[13] = flip_disk[board[13]*8+3]
+              board[22] = flip_disk[board[22]*8+2]
+              board[30] = flip_disk[board[30]*8+3]
+              if fliped >= 6:
+                h ^= zflip[30]
+                flips |= 0x40000000
+                board[14] = flip_disk[board[14]*8+3]
+                board[23] = flip_disk[board[23]*8+1]
+                board[29] = flip_disk[board[29]*8+3]
+    i = board[8]*16+6+color
+    board[8] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[16]
+      flips |= 0x10000
+      board[2] = flip_disk[board[2]*8+0]
+      board[16] = flip_disk[board[16]*8+2]
+      board[34] = flip_disk[board[34]*8+0]
+      if fliped >= 2:
+        h ^= zflip[8]
+        flips |= 0x100
+        board[1] = flip_disk[board[1]*8+0]
+        board[33] = flip_disk[board[33]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[32]
+      flips |= 0x100000000
+      board[4] = flip_disk[board[4]*8+0]
+      board[18] = flip_disk[board[18]*8+4]
+      board[36] = flip_disk[board[36]*8+0]
+      if fliped >= 2:
+        h ^= zflip[40]
+        flips |= 0x10000000000
+        board[5] = flip_disk[board[5]*8+0]
+        board[19] = flip_disk[board[19]*8+5]
+        board[37] = flip_disk[board[37]*8+0]
+        if fliped >= 3:
+          h ^= zflip[48]
+          flips |= 0x1000000000000
+          board[6] = flip_disk[board[6]*8+0]
+          board[20] = flip_disk[board[20]*8+6]
+    i = board[17]*16+6+color
+    board[17] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[17]
+      flips |= 0x20000
+      board[2] = flip_disk[board[2]*8+1]
+      board[9] = flip_disk[board[9]*8+2]
+      board[33] = flip_disk[board[33]*8+1]
+      if fliped >= 2:
+        h ^= zflip[10]
+        flips |= 0x400
+        board[1] = flip_disk[board[1]*8+2]
+        board[10] = flip_disk[board[10]*8+1]
+        board[31] = flip_disk[board[31]*8+1]
+    i = board[35]*16+color
+    board[35] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[33]
+      flips |= 0x200000000
+      board[4] = flip_disk[board[4]*8+1]
+      board[9] = flip_disk[board[9]*8+4]
+      board[19] = flip_disk[board[19]*8+4]
+      if fliped >= 2:
+        h ^= zflip[42]
+        flips |= 0x40000000000
+        board[5] = flip_disk[board[5]*8+2]
+        board[10] = flip_disk[board[10]*8+5]
+        board[21] = flip_disk[board[21]*8+5]
+        if fliped >= 3:
+          h ^= zflip[51]
+          flips |= 0x8000000000000
+          board[6] = flip_disk[board[6]*8+3]
+          board[11] = flip_disk[board[11]*8+6]
+          board[23] = flip_disk[board[23]*8+4]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(24, color, flips)
   def putAt25(self, color):
-    self.__board[3],fliped = self.__index.flip_line(self.__board[3],1,color)
-    if fliped[1] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],3)
-      self.__board[19] = self.__index.flip_disk(self.__board[19],3)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],2)
-      if fliped[1] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],3)
-        self.__board[20] = self.__index.flip_disk(self.__board[20],3)
-        self.__board[32] = self.__index.flip_disk(self.__board[32],3)
-        if fliped[1] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],3)
-          self.__board[21] = self.__index.flip_disk(self.__board[21],3)
-          self.__board[31] = self.__index.flip_disk(self.__board[31],3)
-          if fliped[1] >= 4:
-            self.__board[13] = self.__index.flip_disk(self.__board[13],3)
-            self.__board[22] = self.__index.flip_disk(self.__board[22],2)
-            self.__board[30] = self.__index.flip_disk(self.__board[30],3)
-            if fliped[1] >= 5:
-              self.__board[14] = self.__index.flip_disk(self.__board[14],3)
-              self.__board[23] = self.__index.flip_disk(self.__board[23],1)
-              self.__board[29] = self.__index.flip_disk(self.__board[29],3)
-    self.__board[9],fliped = self.__index.flip_line(self.__board[9],3,color)
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-      self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],1);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-        self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],4);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],5);
-        self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],6);
-          self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[18],fliped = self.__index.flip_line(self.__board[18],3,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],1);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-    self.__board[34],fliped = self.__index.flip_line(self.__board[34],1,color);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],6);
-          self.__board[24] = self.__index.flip_disk(self.__board[24],3);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[50+color]
+    i = board[3]*16+2+color
+    board[3] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[26]
+      flips |= 0x4000000
+      board[10] = flip_disk[board[10]*8+3]
+      board[19] = flip_disk[board[19]*8+3]
+      board[33] = flip_disk[board[33]*8+2]
+      if fliped >= 2:
+        h ^= zflip[27]
+        flips |= 0x8000000
+        board[11] = flip_disk[board[11]*8+3]
+        board[20] = flip_disk[board[20]*8+3]
+        board[32] = flip_disk[board[32]*8+3]
+        if fliped >= 3:
+          h ^= zflip[28]
+          flips |= 0x10000000
+          board[12] = flip_disk[board[12]*8+3]
+          board[21] = flip_disk[board[21]*8+3]
+          board[31] = flip_disk[board[31]*8+3]
+          if fliped >= 4:
+            h ^= zflip[29]
+            flips |= 0x20000000
+            board[13] = flip_disk[board[13]*8+3]
+            board[22] = flip_disk[board[22]*8+2]
+            board[30] = flip_disk[board[30]*8+3]
+            if fliped >= 5:
+              h ^= zflip[30]
+              flips |= 0x40000000
+              board[14] = flip_disk[board[14]*8+3]
+              board[23] = flip_disk[board[23]*8+1]
+              board[29] = flip_disk[board[29]*8+3]
+    i = board[9]*16+6+color
+    board[9] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[17]
+      flips |= 0x20000
+      board[2] = flip_disk[board[2]*8+1]
+      board[17] = flip_disk[board[17]*8+2]
+      board[33] = flip_disk[board[33]*8+1]
+      if fliped >= 2:
+        h ^= zflip[9]
+        flips |= 0x200
+        board[1] = flip_disk[board[1]*8+1]
+        board[16] = flip_disk[board[16]*8+1]
+        board[32] = flip_disk[board[32]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[33]
+      flips |= 0x200000000
+      board[4] = flip_disk[board[4]*8+1]
+      board[19] = flip_disk[board[19]*8+4]
+      board[35] = flip_disk[board[35]*8+1]
+      if fliped >= 2:
+        h ^= zflip[41]
+        flips |= 0x20000000000
+        board[5] = flip_disk[board[5]*8+1]
+        board[20] = flip_disk[board[20]*8+5]
+        board[36] = flip_disk[board[36]*8+1]
+        if fliped >= 3:
+          h ^= zflip[49]
+          flips |= 0x2000000000000
+          board[6] = flip_disk[board[6]*8+1]
+          board[21] = flip_disk[board[21]*8+6]
+          board[37] = flip_disk[board[37]*8+1]
+    i = board[18]*16+6+color
+    board[18] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[18]
+      flips |= 0x40000
+      board[2] = flip_disk[board[2]*8+2]
+      board[10] = flip_disk[board[10]*8+2]
+      board[32] = flip_disk[board[32]*8+2]
+      if fliped >= 2:
+        h ^= zflip[11]
+        flips |= 0x800
+        board[1] = flip_disk[board[1]*8+3]
+        board[11] = flip_disk[board[11]*8+1]
+        board[30] = flip_disk[board[30]*8+1]
+    i = board[34]*16+2+color
+    board[34] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[34]
+      flips |= 0x400000000
+      board[4] = flip_disk[board[4]*8+2]
+      board[10] = flip_disk[board[10]*8+4]
+      board[20] = flip_disk[board[20]*8+4]
+      if fliped >= 2:
+        h ^= zflip[43]
+        flips |= 0x80000000000
+        board[5] = flip_disk[board[5]*8+3]
+        board[11] = flip_disk[board[11]*8+5]
+        board[22] = flip_disk[board[22]*8+4]
+        if fliped >= 3:
+          h ^= zflip[52]
+          flips |= 0x10000000000000
+          board[6] = flip_disk[board[6]*8+4]
+          board[12] = flip_disk[board[12]*8+6]
+          board[24] = flip_disk[board[24]*8+3]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(25, color, flips)
   def putAt26(self, color):
-    self.__board[3],fliped = self.__index.flip_line(self.__board[3],2,color)
-    if fliped[0] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],3)
-      self.__board[18] = self.__index.flip_disk(self.__board[18],3)
-      self.__board[34] = self.__index.flip_disk(self.__board[34],1)
-    if fliped[1] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],3)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],3)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],3)
-      if fliped[1] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],3)
-        self.__board[21] = self.__index.flip_disk(self.__board[21],3)
-        self.__board[31] = self.__index.flip_disk(self.__board[31],3)
-        if fliped[1] >= 3:
-          self.__board[13] = self.__index.flip_disk(self.__board[13],3)
-          self.__board[22] = self.__index.flip_disk(self.__board[22],2)
-          self.__board[30] = self.__index.flip_disk(self.__board[30],3)
-          if fliped[1] >= 4:
-            self.__board[14] = self.__index.flip_disk(self.__board[14],3)
-            self.__board[23] = self.__index.flip_disk(self.__board[23],1)
-            self.__board[29] = self.__index.flip_disk(self.__board[29],3)
-    self.__board[10],fliped = self.__index.flip_line(self.__board[10],3,color)
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-        self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],5);
-          self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-    self.__board[19],fliped = self.__index.flip_line(self.__board[19],3,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],1);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],4);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-    self.__board[33],fliped = self.__index.flip_line(self.__board[33],2,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],2);
-      self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-          self.__board[13] = self.__index.flip_disk(self.__board[13],6);
-          self.__board[25] = self.__index.flip_disk(self.__board[25],2);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[52+color]
+    i = board[3]*16+4+color
+    board[3] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[25]
+      flips |= 0x2000000
+      board[9] = flip_disk[board[9]*8+3]
+      board[18] = flip_disk[board[18]*8+3]
+      board[34] = flip_disk[board[34]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[27]
+      flips |= 0x8000000
+      board[11] = flip_disk[board[11]*8+3]
+      board[20] = flip_disk[board[20]*8+3]
+      board[32] = flip_disk[board[32]*8+3]
+      if fliped >= 2:
+        h ^= zflip[28]
+        flips |= 0x10000000
+        board[12] = flip_disk[board[12]*8+3]
+        board[21] = flip_disk[board[21]*8+3]
+        board[31] = flip_disk[board[31]*8+3]
+        if fliped >= 3:
+          h ^= zflip[29]
+          flips |= 0x20000000
+          board[13] = flip_disk[board[13]*8+3]
+          board[22] = flip_disk[board[22]*8+2]
+          board[30] = flip_disk[board[30]*8+3]
+          if fliped >= 4:
+            h ^= zflip[30]
+            flips |= 0x40000000
+            board[14] = flip_disk[board[14]*8+3]
+            board[23] = flip_disk[board[23]*8+1]
+            board[29] = flip_disk[board[29]*8+3]
+    i = board[10]*16+6+color
+    board[10] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[18]
+      flips |= 0x40000
+      board[2] = flip_disk[board[2]*8+2]
+      board[18] = flip_disk[board[18]*8+2]
+      board[32] = flip_disk[board[32]*8+2]
+      if fliped >= 2:
+        h ^= zflip[10]
+        flips |= 0x400
+        board[1] = flip_disk[board[1]*8+2]
+        board[17] = flip_disk[board[17]*8+1]
+        board[31] = flip_disk[board[31]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[34]
+      flips |= 0x400000000
+      board[4] = flip_disk[board[4]*8+2]
+      board[20] = flip_disk[board[20]*8+4]
+      board[34] = flip_disk[board[34]*8+2]
+      if fliped >= 2:
+        h ^= zflip[42]
+        flips |= 0x40000000000
+        board[5] = flip_disk[board[5]*8+2]
+        board[21] = flip_disk[board[21]*8+5]
+        board[35] = flip_disk[board[35]*8+2]
+        if fliped >= 3:
+          h ^= zflip[50]
+          flips |= 0x4000000000000
+          board[6] = flip_disk[board[6]*8+2]
+          board[22] = flip_disk[board[22]*8+5]
+          board[36] = flip_disk[board[36]*8+2]
+    i = board[19]*16+6+color
+    board[19] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[19]
+      flips |= 0x80000
+      board[2] = flip_disk[board[2]*8+3]
+      board[11] = flip_disk[board[11]*8+2]
+      board[31] = flip_disk[board[31]*8+2]
+      if fliped >= 2:
+        h ^= zflip[12]
+        flips |= 0x1000
+        board[1] = flip_disk[board[1]*8+4]
+        board[12] = flip_disk[board[12]*8+1]
+        board[29] = flip_disk[board[29]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[33]
+      flips |= 0x200000000
+      board[4] = flip_disk[board[4]*8+1]
+      board[9] = flip_disk[board[9]*8+4]
+      board[35] = flip_disk[board[35]*8+1]
+    i = board[33]*16+4+color
+    board[33] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[17]
+      flips |= 0x20000
+      board[2] = flip_disk[board[2]*8+1]
+      board[9] = flip_disk[board[9]*8+2]
+      board[17] = flip_disk[board[17]*8+2]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[35]
+      flips |= 0x800000000
+      board[4] = flip_disk[board[4]*8+3]
+      board[11] = flip_disk[board[11]*8+4]
+      board[21] = flip_disk[board[21]*8+4]
+      if fliped >= 2:
+        h ^= zflip[44]
+        flips |= 0x100000000000
+        board[5] = flip_disk[board[5]*8+4]
+        board[12] = flip_disk[board[12]*8+5]
+        board[23] = flip_disk[board[23]*8+3]
+        if fliped >= 3:
+          h ^= zflip[53]
+          flips |= 0x20000000000000
+          board[6] = flip_disk[board[6]*8+5]
+          board[13] = flip_disk[board[13]*8+6]
+          board[25] = flip_disk[board[25]*8+2]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(26, color, flips)
   def putAt27(self, color):
-    self.__board[3],fliped = self.__index.flip_line(self.__board[3],3,color)
-    if fliped[0] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],3)
-      self.__board[19] = self.__index.flip_disk(self.__board[19],3)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],2)
-      if fliped[0] >= 2:
-        self.__board[9] = self.__index.flip_disk(self.__board[9],3)
-        self.__board[18] = self.__index.flip_disk(self.__board[18],3)
-        self.__board[34] = self.__index.flip_disk(self.__board[34],1)
-    if fliped[1] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],3)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],3)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],3)
-      if fliped[1] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],3)
-        self.__board[22] = self.__index.flip_disk(self.__board[22],2)
-        self.__board[30] = self.__index.flip_disk(self.__board[30],3)
-        if fliped[1] >= 3:
-          self.__board[14] = self.__index.flip_disk(self.__board[14],3)
-          self.__board[23] = self.__index.flip_disk(self.__board[23],1)
-          self.__board[29] = self.__index.flip_disk(self.__board[29],3)
-    self.__board[11],fliped = self.__index.flip_line(self.__board[11],3,color)
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],1);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],4);
-          self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-    self.__board[20],fliped = self.__index.flip_line(self.__board[20],3,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],1);
-        self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-        self.__board[9] = self.__index.flip_disk(self.__board[9],5);
-        self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-    self.__board[32],fliped = self.__index.flip_line(self.__board[32],3,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-        self.__board[9] = self.__index.flip_disk(self.__board[9],1);
-        self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-          self.__board[14] = self.__index.flip_disk(self.__board[14],6);
-          self.__board[26] = self.__index.flip_disk(self.__board[26],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[54+color]
+    i = board[3]*16+6+color
+    board[3] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[26]
+      flips |= 0x4000000
+      board[10] = flip_disk[board[10]*8+3]
+      board[19] = flip_disk[board[19]*8+3]
+      board[33] = flip_disk[board[33]*8+2]
+      if fliped >= 2:
+        h ^= zflip[25]
+        flips |= 0x2000000
+        board[9] = flip_disk[board[9]*8+3]
+        board[18] = flip_disk[board[18]*8+3]
+        board[34] = flip_disk[board[34]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[28]
+      flips |= 0x10000000
+      board[12] = flip_disk[board[12]*8+3]
+      board[21] = flip_disk[board[21]*8+3]
+      board[31] = flip_disk[board[31]*8+3]
+      if fliped >= 2:
+        h ^= zflip[29]
+        flips |= 0x20000000
+        board[13] = flip_disk[board[13]*8+3]
+        board[22] = flip_disk[board[22]*8+2]
+        board[30] = flip_disk[board[30]*8+3]
+        if fliped >= 3:
+          h ^= zflip[30]
+          flips |= 0x40000000
+          board[14] = flip_disk[board[14]*8+3]
+          board[23] = flip_disk[board[23]*8+1]
+          board[29] = flip_disk[board[29]*8+3]
+    i = board[11]*16+6+color
+    board[11] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[19]
+      flips |= 0x80000
+      board[2] = flip_disk[board[2]*8+3]
+      board[19] = flip_disk[board[19]*8+2]
+      board[31] = flip_disk[board[31]*8+2]
+      if fliped >= 2:
+        h ^= zflip[11]
+        flips |= 0x800
+        board[1] = flip_disk[board[1]*8+3]
+        board[18] = flip_disk[board[18]*8+1]
+        board[30] = flip_disk[board[30]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[35]
+      flips |= 0x800000000
+      board[4] = flip_disk[board[4]*8+3]
+      board[21] = flip_disk[board[21]*8+4]
+      board[33] = flip_disk[board[33]*8+3]
+      if fliped >= 2:
+        h ^= zflip[43]
+        flips |= 0x80000000000
+        board[5] = flip_disk[board[5]*8+3]
+        board[22] = flip_disk[board[22]*8+4]
+        board[34] = flip_disk[board[34]*8+3]
+        if fliped >= 3:
+          h ^= zflip[51]
+          flips |= 0x8000000000000
+          board[6] = flip_disk[board[6]*8+3]
+          board[23] = flip_disk[board[23]*8+4]
+          board[35] = flip_disk[board[35]*8+3]
+    i = board[20]*16+6+color
+    board[20] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[20]
+      flips |= 0x100000
+      board[2] = flip_disk[board[2]*8+4]
+      board[12] = flip_disk[board[12]*8+2]
+      board[30] = flip_disk[board[30]*8+2]
+      if fliped >= 2:
+        h ^= zflip[13]
+        flips |= 0x2000
+        board[1] = flip_disk[board[1]*8+5]
+        board[13] = flip_disk[board[13]*8+1]
+        board[28] = flip_disk[board[28]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[34]
+      flips |= 0x400000000
+      board[4] = flip_disk[board[4]*8+2]
+      board[10] = flip_disk[board[10]*8+4]
+      board[34] = flip_disk[board[34]*8+2]
+      if fliped >= 2:
+        h ^= zflip[41]
+        flips |= 0x20000000000
+        board[5] = flip_disk[board[5]*8+1]
+        board[9] = flip_disk[board[9]*8+5]
+        board[36] = flip_disk[board[36]*8+1]
+    i = board[32]*16+6+color
+    board[32] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[18]
+      flips |= 0x40000
+      board[2] = flip_disk[board[2]*8+2]
+      board[10] = flip_disk[board[10]*8+2]
+      board[18] = flip_disk[board[18]*8+2]
+      if fliped >= 2:
+        h ^= zflip[9]
+        flips |= 0x200
+        board[1] = flip_disk[board[1]*8+1]
+        board[9] = flip_disk[board[9]*8+1]
+        board[16] = flip_disk[board[16]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[36]
+      flips |= 0x1000000000
+      board[4] = flip_disk[board[4]*8+4]
+      board[12] = flip_disk[board[12]*8+4]
+      board[22] = flip_disk[board[22]*8+3]
+      if fliped >= 2:
+        h ^= zflip[45]
+        flips |= 0x200000000000
+        board[5] = flip_disk[board[5]*8+5]
+        board[13] = flip_disk[board[13]*8+5]
+        board[24] = flip_disk[board[24]*8+2]
+        if fliped >= 3:
+          h ^= zflip[54]
+          flips |= 0x40000000000000
+          board[6] = flip_disk[board[6]*8+6]
+          board[14] = flip_disk[board[14]*8+6]
+          board[26] = flip_disk[board[26]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(27, color, flips)
   def putAt28(self, color):
-    self.__board[3],fliped = self.__index.flip_line(self.__board[3],4,color)
-    if fliped[0] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],3)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],3)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],3)
-      if fliped[0] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],3)
-        self.__board[19] = self.__index.flip_disk(self.__board[19],3)
-        self.__board[33] = self.__index.flip_disk(self.__board[33],2)
-        if fliped[0] >= 3:
-          self.__board[9] = self.__index.flip_disk(self.__board[9],3)
-          self.__board[18] = self.__index.flip_disk(self.__board[18],3)
-          self.__board[34] = self.__index.flip_disk(self.__board[34],1)
-    if fliped[1] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],3)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],2)
-      self.__board[30] = self.__index.flip_disk(self.__board[30],3)
-      if fliped[1] >= 2:
-        self.__board[14] = self.__index.flip_disk(self.__board[14],3)
-        self.__board[23] = self.__index.flip_disk(self.__board[23],1)
-        self.__board[29] = self.__index.flip_disk(self.__board[29],3)
-    self.__board[12],fliped = self.__index.flip_line(self.__board[12],3,color)
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],1);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-          self.__board[24] = self.__index.flip_disk(self.__board[24],3);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-    self.__board[21],fliped = self.__index.flip_line(self.__board[21],3,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-        self.__board[14] = self.__index.flip_disk(self.__board[14],1);
-        self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-          self.__board[9] = self.__index.flip_disk(self.__board[9],6);
-          self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[31],fliped = self.__index.flip_line(self.__board[31],3,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],1);
-        self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-        self.__board[14] = self.__index.flip_disk(self.__board[14],5);
-        self.__board[25] = self.__index.flip_disk(self.__board[25],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[56+color]
+    i = board[3]*16+8+color
+    board[3] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[27]
+      flips |= 0x8000000
+      board[11] = flip_disk[board[11]*8+3]
+      board[20] = flip_disk[board[20]*8+3]
+      board[32] = flip_disk[board[32]*8+3]
+      if fliped >= 2:
+        h ^= zflip[26]
+        flips |= 0x4000000
+        board[10] = flip_disk[board[10]*8+3]
+        board[19] = flip_disk[board[19]*8+3]
+        board[33] = flip_disk[board[33]*8+2]
+        if fliped >= 3:
+          h ^= zflip[25]
+          flips |= 0x2000000
+          board[9] = flip_disk[board[9]*8+3]
+          board[18] = flip_disk[board[18]*8+3]
+          board[34] = flip_disk[board[34]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[29]
+      flips |= 0x20000000
+      board[13] = flip_disk[board[13]*8+3]
+      board[22] = flip_disk[board[22]*8+2]
+      board[30] = flip_disk[board[30]*8+3]
+      if fliped >= 2:
+        h ^= zflip[30]
+        flips |= 0x40000000
+        board[14] = flip_disk[board[14]*8+3]
+        board[23] = flip_disk[board[23]*8+1]
+        board[29] = flip_disk[board[29]*8+3]
+    i = board[12]*16+6+color
+    board[12] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[20]
+      flips |= 0x100000
+      board[2] = flip_disk[board[2]*8+4]
+      board[20] = flip_disk[board[20]*8+2]
+      board[30] = flip_disk[board[30]*8+2]
+      if fliped >= 2:
+        h ^= zflip[12]
+        flips |= 0x1000
+        board[1] = flip_disk[board[1]*8+4]
+        board[19] = flip_disk[board[19]*8+1]
+        board[29] = flip_disk[board[29]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[36]
+      flips |= 0x1000000000
+      board[4] = flip_disk[board[4]*8+4]
+      board[22] = flip_disk[board[22]*8+3]
+      board[32] = flip_disk[board[32]*8+4]
+      if fliped >= 2:
+        h ^= zflip[44]
+        flips |= 0x100000000000
+        board[5] = flip_disk[board[5]*8+4]
+        board[23] = flip_disk[board[23]*8+3]
+        board[33] = flip_disk[board[33]*8+4]
+        if fliped >= 3:
+          h ^= zflip[52]
+          flips |= 0x10000000000000
+          board[6] = flip_disk[board[6]*8+4]
+          board[24] = flip_disk[board[24]*8+3]
+          board[34] = flip_disk[board[34]*8+4]
+    i = board[21]*16+6+color
+    board[21] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[21]
+      flips |= 0x200000
+      board[2] = flip_disk[board[2]*8+5]
+      board[13] = flip_disk[board[13]*8+2]
+      board[29] = flip_disk[board[29]*8+2]
+      if fliped >= 2:
+        h ^= zflip[14]
+        flips |= 0x4000
+        board[1] = flip_disk[board[1]*8+6]
+        board[14] = flip_disk[board[14]*8+1]
+        board[27] = flip_disk[board[27]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[35]
+      flips |= 0x800000000
+      board[4] = flip_disk[board[4]*8+3]
+      board[11] = flip_disk[board[11]*8+4]
+      board[33] = flip_disk[board[33]*8+3]
+      if fliped >= 2:
+        h ^= zflip[42]
+        flips |= 0x40000000000
+        board[5] = flip_disk[board[5]*8+2]
+        board[10] = flip_disk[board[10]*8+5]
+        board[35] = flip_disk[board[35]*8+2]
+        if fliped >= 3:
+          h ^= zflip[49]
+          flips |= 0x2000000000000
+          board[6] = flip_disk[board[6]*8+1]
+          board[9] = flip_disk[board[9]*8+6]
+          board[37] = flip_disk[board[37]*8+1]
+    i = board[31]*16+6+color
+    board[31] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[19]
+      flips |= 0x80000
+      board[2] = flip_disk[board[2]*8+3]
+      board[11] = flip_disk[board[11]*8+2]
+      board[19] = flip_disk[board[19]*8+2]
+      if fliped >= 2:
+        h ^= zflip[10]
+        flips |= 0x400
+        board[1] = flip_disk[board[1]*8+2]
+        board[10] = flip_disk[board[10]*8+1]
+        board[17] = flip_disk[board[17]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[37]
+      flips |= 0x2000000000
+      board[4] = flip_disk[board[4]*8+5]
+      board[13] = flip_disk[board[13]*8+4]
+      board[23] = flip_disk[board[23]*8+2]
+      if fliped >= 2:
+        h ^= zflip[46]
+        flips |= 0x400000000000
+        board[5] = flip_disk[board[5]*8+6]
+        board[14] = flip_disk[board[14]*8+5]
+        board[25] = flip_disk[board[25]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(28, color, flips)
   def putAt29(self, color):
-    self.__board[3],fliped = self.__index.flip_line(self.__board[3],5,color)
-    if fliped[0] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],3)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],3)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],3)
-      if fliped[0] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],3)
-        self.__board[20] = self.__index.flip_disk(self.__board[20],3)
-        self.__board[32] = self.__index.flip_disk(self.__board[32],3)
-        if fliped[0] >= 3:
-          self.__board[10] = self.__index.flip_disk(self.__board[10],3)
-          self.__board[19] = self.__index.flip_disk(self.__board[19],3)
-          self.__board[33] = self.__index.flip_disk(self.__board[33],2)
-          if fliped[0] >= 4:
-            self.__board[9] = self.__index.flip_disk(self.__board[9],3)
-            self.__board[18] = self.__index.flip_disk(self.__board[18],3)
-            self.__board[34] = self.__index.flip_disk(self.__board[34],1)
-    if fliped[1] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],3)
-      self.__board[23] = self.__index.flip_disk(self.__board[23],1)
-      self.__board[29] = self.__index.flip_disk(self.__board[29],3)
-    self.__board[13],fliped = self.__index.flip_line(self.__board[13],3,color)
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],1);
-        self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-          self.__board[25] = self.__index.flip_disk(self.__board[25],2);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],5);
-    self.__board[22],fliped = self.__index.flip_line(self.__board[22],2,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],2);
-      self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-          self.__board[10] = self.__index.flip_disk(self.__board[10],6);
-          self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-    self.__board[30],fliped = self.__index.flip_line(self.__board[30],3,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],1);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],4);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[58+color]
+    i = board[3]*16+10+color
+    board[3] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[28]
+      flips |= 0x10000000
+      board[12] = flip_disk[board[12]*8+3]
+      board[21] = flip_disk[board[21]*8+3]
+      board[31] = flip_disk[board[31]*8+3]
+      if fliped >= 2:
+        h ^= zflip[27]
+        flips |= 0x8000000
+        board[11] = flip_disk[board[11]*8+3]
+        board[20] = flip_disk[board[20]*8+3]
+        board[32] = flip_disk[board[32]*8+3]
+        if fliped >= 3:
+          h ^= zflip[26]
+          flips |= 0x4000000
+          board[10] = flip_disk[board[10]*8+3]
+          board[19] = flip_disk[board[19]*8+3]
+          board[33] = flip_disk[board[33]*8+2]
+          if fliped >= 4:
+            h ^= zflip[25]
+            flips |= 0x2000000
+            board[9] = flip_disk[board[9]*8+3]
+            board[18] = flip_disk[board[18]*8+3]
+            board[34] = flip_disk[board[34]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[30]
+      flips |= 0x40000000
+      board[14] = flip_disk[board[14]*8+3]
+      board[23] = flip_disk[board[23]*8+1]
+      board[29] = flip_disk[board[29]*8+3]
+    i = board[13]*16+6+color
+    board[13] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[21]
+      flips |= 0x200000
+      board[2] = flip_disk[board[2]*8+5]
+      board[21] = flip_disk[board[21]*8+2]
+      board[29] = flip_disk[board[29]*8+2]
+      if fliped >= 2:
+        h ^= zflip[13]
+        flips |= 0x2000
+        board[1] = flip_disk[board[1]*8+5]
+        board[20] = flip_disk[board[20]*8+1]
+        board[28] = flip_disk[board[28]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[37]
+      flips |= 0x2000000000
+      board[4] = flip_disk[board[4]*8+5]
+      board[23] = flip_disk[board[23]*8+2]
+      board[31] = flip_disk[board[31]*8+4]
+      if fliped >= 2:
+        h ^= zflip[45]
+        flips |= 0x200000000000
+        board[5] = flip_disk[board[5]*8+5]
+        board[24] = flip_disk[board[24]*8+2]
+        board[32] = flip_disk[board[32]*8+5]
+        if fliped >= 3:
+          h ^= zflip[53]
+          flips |= 0x20000000000000
+          board[6] = flip_disk[board[6]*8+5]
+          board[25] = flip_disk[board[25]*8+2]
+          board[33] = flip_disk[board[33]*8+5]
+    i = board[22]*16+4+color
+    board[22] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[22]
+      flips |= 0x400000
+      board[2] = flip_disk[board[2]*8+6]
+      board[14] = flip_disk[board[14]*8+2]
+      board[28] = flip_disk[board[28]*8+2]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[36]
+      flips |= 0x1000000000
+      board[4] = flip_disk[board[4]*8+4]
+      board[12] = flip_disk[board[12]*8+4]
+      board[32] = flip_disk[board[32]*8+4]
+      if fliped >= 2:
+        h ^= zflip[43]
+        flips |= 0x80000000000
+        board[5] = flip_disk[board[5]*8+3]
+        board[11] = flip_disk[board[11]*8+5]
+        board[34] = flip_disk[board[34]*8+3]
+        if fliped >= 3:
+          h ^= zflip[50]
+          flips |= 0x4000000000000
+          board[6] = flip_disk[board[6]*8+2]
+          board[10] = flip_disk[board[10]*8+6]
+          board[36] = flip_disk[board[36]*8+2]
+    i = board[30]*16+6+color
+    board[30] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[20]
+      flips |= 0x100000
+      board[2] = flip_disk[board[2]*8+4]
+      board[12] = flip_disk[board[12]*8+2]
+      board[20] = flip_disk[board[20]*8+2]
+      if fliped >= 2:
+        h ^= zflip[11]
+        flips |= 0x800
+        board[1] = flip_disk[board[1]*8+3]
+        board[11] = flip_disk[board[11]*8+1]
+        board[18] = flip_disk[board[18]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[38]
+      flips |= 0x4000000000
+      board[4] = flip_disk[board[4]*8+6]
+      board[14] = flip_disk[board[14]*8+4]
+      board[24] = flip_disk[board[24]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(29, color, flips)
   def putAt30(self, color):
-    self.__board[3],fliped = self.__index.flip_line(self.__board[3],6,color)
-    if fliped[0] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],3)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],2)
-      self.__board[30] = self.__index.flip_disk(self.__board[30],3)
-      if fliped[0] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],3)
-        self.__board[21] = self.__index.flip_disk(self.__board[21],3)
-        self.__board[31] = self.__index.flip_disk(self.__board[31],3)
-        if fliped[0] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],3)
-          self.__board[20] = self.__index.flip_disk(self.__board[20],3)
-          self.__board[32] = self.__index.flip_disk(self.__board[32],3)
-          if fliped[0] >= 4:
-            self.__board[10] = self.__index.flip_disk(self.__board[10],3)
-            self.__board[19] = self.__index.flip_disk(self.__board[19],3)
-            self.__board[33] = self.__index.flip_disk(self.__board[33],2)
-            if fliped[0] >= 5:
-              self.__board[9] = self.__index.flip_disk(self.__board[9],3)
-              self.__board[18] = self.__index.flip_disk(self.__board[18],3)
-              self.__board[34] = self.__index.flip_disk(self.__board[34],1)
-    self.__board[14],fliped = self.__index.flip_line(self.__board[14],3,color)
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],1);
-      self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],1);
-        self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],1);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-        self.__board[25] = self.__index.flip_disk(self.__board[25],1);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],5);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-          self.__board[26] = self.__index.flip_disk(self.__board[26],1);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],6);
-    self.__board[23],fliped = self.__index.flip_line(self.__board[23],1,color);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],6);
-          self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-    self.__board[29],fliped = self.__index.flip_line(self.__board[29],3,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],1);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[60+color]
+    i = board[3]*16+12+color
+    board[3] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[29]
+      flips |= 0x20000000
+      board[13] = flip_disk[board[13]*8+3]
+      board[22] = flip_disk[board[22]*8+2]
+      board[30] = flip_disk[board[30]*8+3]
+      if fliped >= 2:
+        h ^= zflip[28]
+        flips |= 0x10000000
+        board[12] = flip_disk[board[12]*8+3]
+        board[21] = flip_disk[board[21]*8+3]
+        board[31] = flip_disk[board[31]*8+3]
+        if fliped >= 3:
+          h ^= zflip[27]
+          flips |= 0x8000000
+          board[11] = flip_disk[board[11]*8+3]
+          board[20] = flip_disk[board[20]*8+3]
+          board[32] = flip_disk[board[32]*8+3]
+          if fliped >= 4:
+            h ^= zflip[26]
+            flips |= 0x4000000
+            board[10] = flip_disk[board[10]*8+3]
+            board[19] = flip_disk[board[19]*8+3]
+            board[33] = flip_disk[board[33]*8+2]
+            if fliped >= 5:
+              h ^= zflip[25]
+              flips |= 0x2000000
+              board[9] = flip_disk[board[9]*8+3]
+              board[18] = flip_disk[board[18]*8+3]
+              board[34] = flip_disk[board[34]*8+1]
+    i = board[14]*16+6+color
+    board[14] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[22]
+      flips |= 0x400000
+      board[2] = flip_disk[board[2]*8+6]
+      board[22] = flip_disk[board[22]*8+1]
+      board[28] = flip_disk[board[28]*8+2]
+      if fliped >= 2:
+        h ^= zflip[14]
+        flips |= 0x4000
+        board[1] = flip_disk[board[1]*8+6]
+        board[21] = flip_disk[board[21]*8+1]
+        board[27] = flip_disk[board[27]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[38]
+      flips |= 0x4000000000
+      board[4] = flip_disk[board[4]*8+6]
+      board[24] = flip_disk[board[24]*8+1]
+      board[30] = flip_disk[board[30]*8+4]
+      if fliped >= 2:
+        h ^= zflip[46]
+        flips |= 0x400000000000
+        board[5] = flip_disk[board[5]*8+6]
+        board[25] = flip_disk[board[25]*8+1]
+        board[31] = flip_disk[board[31]*8+5]
+        if fliped >= 3:
+          h ^= zflip[54]
+          flips |= 0x40000000000000
+          board[6] = flip_disk[board[6]*8+6]
+          board[26] = flip_disk[board[26]*8+1]
+          board[32] = flip_disk[board[32]*8+6]
+    i = board[23]*16+2+color
+    board[23] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[37]
+      flips |= 0x2000000000
+      board[4] = flip_disk[board[4]*8+5]
+      board[13] = flip_disk[board[13]*8+4]
+      board[31] = flip_disk[board[31]*8+4]
+      if fliped >= 2:
+        h ^= zflip[44]
+        flips |= 0x100000000000
+        board[5] = flip_disk[board[5]*8+4]
+        board[12] = flip_disk[board[12]*8+5]
+        board[33] = flip_disk[board[33]*8+4]
+        if fliped >= 3:
+          h ^= zflip[51]
+          flips |= 0x8000000000000
+          board[6] = flip_disk[board[6]*8+3]
+          board[11] = flip_disk[board[11]*8+6]
+          board[35] = flip_disk[board[35]*8+3]
+    i = board[29]*16+6+color
+    board[29] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[21]
+      flips |= 0x200000
+      board[2] = flip_disk[board[2]*8+5]
+      board[13] = flip_disk[board[13]*8+2]
+      board[21] = flip_disk[board[21]*8+2]
+      if fliped >= 2:
+        h ^= zflip[12]
+        flips |= 0x1000
+        board[1] = flip_disk[board[1]*8+4]
+        board[12] = flip_disk[board[12]*8+1]
+        board[19] = flip_disk[board[19]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(30, color, flips)
   def putAt31(self, color):
-    self.__board[3],fliped = self.__index.flip_line(self.__board[3],7,color)
-    if fliped[0] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],3)
-      self.__board[23] = self.__index.flip_disk(self.__board[23],1)
-      self.__board[29] = self.__index.flip_disk(self.__board[29],3)
-      if fliped[0] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],3)
-        self.__board[22] = self.__index.flip_disk(self.__board[22],2)
-        self.__board[30] = self.__index.flip_disk(self.__board[30],3)
-        if fliped[0] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],3)
-          self.__board[21] = self.__index.flip_disk(self.__board[21],3)
-          self.__board[31] = self.__index.flip_disk(self.__board[31],3)
-          if fliped[0] >= 4:
-            self.__board[11] = self.__index.flip_disk(self.__board[11],3)
-            self.__board[20] = self.__index.flip_disk(self.__board[20],3)
-            self.__board[32] = self.__index.flip_disk(self.__board[32],3)
-            if fliped[0] >= 5:
-              self.__board[10] = self.__index.flip_disk(self.__board[10],3)
-              self.__board[19] = self.__index.flip_disk(self.__board[19],3)
-              self.__board[33] = self.__index.flip_disk(self.__board[33],2)
-              if fliped[0] >= 6:
-                self.__board[9] = self.__index.flip_disk(self.__board[9],3)
-                self.__board[18] = self.__index.flip_disk(self.__board[18],3)
-                self.__board[34] = self.__index.flip_disk(self.__board[34],1)
-    self.__board[15],fliped = self.__index.flip_line(self.__board[15],3,color)
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],7);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],0);
-      self.__board[27] = self.__index.flip_disk(self.__board[27],2);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],7);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],0);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],7);
-      self.__board[25] = self.__index.flip_disk(self.__board[25],0);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],4);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],7);
-        self.__board[26] = self.__index.flip_disk(self.__board[26],0);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],5);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],7);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],6);
-    self.__board[24],fliped = self.__index.flip_line(self.__board[24],0,color);
-    if fliped[1] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],4);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-      if fliped[1] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-        if fliped[1] >= 3:
-          self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],6);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-    self.__board[28],fliped = self.__index.flip_line(self.__board[28],3,color);
-    if fliped[0] >= 1:
-      self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],2);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],1);
-      if fliped[0] >= 2:
-        self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],1);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[62+color]
+    i = board[3]*16+14+color
+    board[3] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[30]
+      flips |= 0x40000000
+      board[14] = flip_disk[board[14]*8+3]
+      board[23] = flip_disk[board[23]*8+1]
+      board[29] = flip_disk[board[29]*8+3]
+      if fliped >= 2:
+        h ^= zflip[29]
+        flips |= 0x20000000
+        board[13] = flip_disk[board[13]*8+3]
+        board[22] = flip_disk[board[22]*8+2]
+        board[30] = flip_disk[board[30]*8+3]
+        if fliped >= 3:
+          h ^= zflip[28]
+          flips |= 0x10000000
+          board[12] = flip_disk[board[12]*8+3]
+          board[21] = flip_disk[board[21]*8+3]
+          board[31] = flip_disk[board[31]*8+3]
+          if fliped >= 4:
+            h ^= zflip[27]
+            flips |= 0x8000000
+            board[11] = flip_disk[board[11]*8+3]
+            board[20] = flip_disk[board[20]*8+3]
+            board[32] = flip_disk[board[32]*8+3]
+            if fliped >= 5:
+              h ^= zflip[26]
+              flips |= 0x4000000
+              board[10] = flip_disk[board[10]*8+3]
+              board[19] = flip_disk[board[19]*8+3]
+              board[33] = flip_disk[board[33]*8+2]
+              if fliped >= 6:
+                h ^= zflip[25]
+                flips |= 0x2000000
+                board[9] = flip_disk[board[9]*8+3]
+                board[18] = flip_disk[board[18]*8+3]
+                board[34] = flip_disk[board[34]*8+1]
+    i = board[15]*16+6+color
+    board[15] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[23]
+      flips |= 0x800000
+      board[2] = flip_disk[board[2]*8+7]
+      board[23] = flip_disk[board[23]*8+0]
+      board[27] = flip_disk[board[27]*8+2]
+      if fliped >= 2:
+        h ^= zflip[15]
+        flips |= 0x8000
+        board[1] = flip_disk[board[1]*8+7]
+        board[22] = flip_disk[board[22]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[39]
+      flips |= 0x8000000000
+      board[4] = flip_disk[board[4]*8+7]
+      board[25] = flip_disk[board[25]*8+0]
+      board[29] = flip_disk[board[29]*8+4]
+      if fliped >= 2:
+        h ^= zflip[47]
+        flips |= 0x800000000000
+        board[5] = flip_disk[board[5]*8+7]
+        board[26] = flip_disk[board[26]*8+0]
+        board[30] = flip_disk[board[30]*8+5]
+        if fliped >= 3:
+          h ^= zflip[55]
+          flips |= 0x80000000000000
+          board[6] = flip_disk[board[6]*8+7]
+          board[31] = flip_disk[board[31]*8+6]
+    i = board[24]*16+color
+    board[24] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[38]
+      flips |= 0x4000000000
+      board[4] = flip_disk[board[4]*8+6]
+      board[14] = flip_disk[board[14]*8+4]
+      board[30] = flip_disk[board[30]*8+4]
+      if fliped >= 2:
+        h ^= zflip[45]
+        flips |= 0x200000000000
+        board[5] = flip_disk[board[5]*8+5]
+        board[13] = flip_disk[board[13]*8+5]
+        board[32] = flip_disk[board[32]*8+5]
+        if fliped >= 3:
+          h ^= zflip[52]
+          flips |= 0x10000000000000
+          board[6] = flip_disk[board[6]*8+4]
+          board[12] = flip_disk[board[12]*8+6]
+          board[34] = flip_disk[board[34]*8+4]
+    i = board[28]*16+6+color
+    board[28] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[22]
+      flips |= 0x400000
+      board[2] = flip_disk[board[2]*8+6]
+      board[14] = flip_disk[board[14]*8+2]
+      board[22] = flip_disk[board[22]*8+1]
+      if fliped >= 2:
+        h ^= zflip[13]
+        flips |= 0x2000
+        board[1] = flip_disk[board[1]*8+5]
+        board[13] = flip_disk[board[13]*8+1]
+        board[20] = flip_disk[board[20]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(31, color, flips)
   def putAt32(self, color):
-    self.__board[4],fliped = self.__index.flip_line(self.__board[4],0,color)
-    if fliped[1] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],4)
-      self.__board[19] = self.__index.flip_disk(self.__board[19],4)
-      self.__board[35] = self.__index.flip_disk(self.__board[35],1)
-      if fliped[1] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],4)
-        self.__board[20] = self.__index.flip_disk(self.__board[20],4)
-        self.__board[34] = self.__index.flip_disk(self.__board[34],2)
-        if fliped[1] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],4)
-          self.__board[21] = self.__index.flip_disk(self.__board[21],4)
-          self.__board[33] = self.__index.flip_disk(self.__board[33],3)
-          if fliped[1] >= 4:
-            self.__board[12] = self.__index.flip_disk(self.__board[12],4)
-            self.__board[22] = self.__index.flip_disk(self.__board[22],3)
-            self.__board[32] = self.__index.flip_disk(self.__board[32],4)
-            if fliped[1] >= 5:
-              self.__board[13] = self.__index.flip_disk(self.__board[13],4)
-              self.__board[23] = self.__index.flip_disk(self.__board[23],2)
-              self.__board[31] = self.__index.flip_disk(self.__board[31],4)
-              if fliped[1] >= 6:
-                self.__board[14] = self.__index.flip_disk(self.__board[14],4)
-                self.__board[24] = self.__index.flip_disk(self.__board[24],1)
-                self.__board[30] = self.__index.flip_disk(self.__board[30],4)
-    self.__board[8],fliped = self.__index.flip_line(self.__board[8],4,color)
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],0);
-      self.__board[17] = self.__index.flip_disk(self.__board[17],3);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],0);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],0);
-        self.__board[16] = self.__index.flip_disk(self.__board[16],2);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],0);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],0);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],0);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],0);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],5);
-      self.__board[37] = self.__index.flip_disk(self.__board[37],0);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],0);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],6);
-    self.__board[18],fliped = self.__index.flip_line(self.__board[18],4,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],3);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],1);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-    self.__board[36],fliped = self.__index.flip_line(self.__board[36],0,color);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],5);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],5);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],6);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],5);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[64+color]
+    i = board[4]*16+color
+    board[4] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[33]
+      flips |= 0x200000000
+      board[9] = flip_disk[board[9]*8+4]
+      board[19] = flip_disk[board[19]*8+4]
+      board[35] = flip_disk[board[35]*8+1]
+      if fliped >= 2:
+        h ^= zflip[34]
+        flips |= 0x400000000
+        board[10] = flip_disk[board[10]*8+4]
+        board[20] = flip_disk[board[20]*8+4]
+        board[34] = flip_disk[board[34]*8+2]
+        if fliped >= 3:
+          h ^= zflip[35]
+          flips |= 0x800000000
+          board[11] = flip_disk[board[11]*8+4]
+          board[21] = flip_disk[board[21]*8+4]
+          board[33] = flip_disk[board[33]*8+3]
+          if fliped >= 4:
+            h ^= zflip[36]
+            flips |= 0x1000000000
+            board[12] = flip_disk[board[12]*8+4]
+            board[22] = flip_disk[board[22]*8+3]
+            board[32] = flip_disk[board[32]*8+4]
+            if fliped >= 5:
+              h ^= zflip[37]
+              flips |= 0x2000000000
+              board[13] = flip_disk[board[13]*8+4]
+              board[23] = flip_disk[board[23]*8+2]
+              board[31] = flip_disk[board[31]*8+4]
+              if fliped >= 6:
+                h ^= zflip[38]
+                flips |= 0x4000000000
+                board[14] = flip_disk[board[14]*8+4]
+                board[24] = flip_disk[board[24]*8+1]
+                board[30] = flip_disk[board[30]*8+4]
+    i = board[8]*16+8+color
+    board[8] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[24]
+      flips |= 0x1000000
+      board[3] = flip_disk[board[3]*8+0]
+      board[17] = flip_disk[board[17]*8+3]
+      board[35] = flip_disk[board[35]*8+0]
+      if fliped >= 2:
+        h ^= zflip[16]
+        flips |= 0x10000
+        board[2] = flip_disk[board[2]*8+0]
+        board[16] = flip_disk[board[16]*8+2]
+        board[34] = flip_disk[board[34]*8+0]
+        if fliped >= 3:
+          h ^= zflip[8]
+          flips |= 0x100
+          board[1] = flip_disk[board[1]*8+0]
+          board[33] = flip_disk[board[33]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[40]
+      flips |= 0x10000000000
+      board[5] = flip_disk[board[5]*8+0]
+      board[19] = flip_disk[board[19]*8+5]
+      board[37] = flip_disk[board[37]*8+0]
+      if fliped >= 2:
+        h ^= zflip[48]
+        flips |= 0x1000000000000
+        board[6] = flip_disk[board[6]*8+0]
+        board[20] = flip_disk[board[20]*8+6]
+    i = board[18]*16+8+color
+    board[18] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[25]
+      flips |= 0x2000000
+      board[3] = flip_disk[board[3]*8+1]
+      board[9] = flip_disk[board[9]*8+3]
+      board[34] = flip_disk[board[34]*8+1]
+      if fliped >= 2:
+        h ^= zflip[18]
+        flips |= 0x40000
+        board[2] = flip_disk[board[2]*8+2]
+        board[10] = flip_disk[board[10]*8+2]
+        board[32] = flip_disk[board[32]*8+2]
+        if fliped >= 3:
+          h ^= zflip[11]
+          flips |= 0x800
+          board[1] = flip_disk[board[1]*8+3]
+          board[11] = flip_disk[board[11]*8+1]
+          board[30] = flip_disk[board[30]*8+1]
+    i = board[36]*16+color
+    board[36] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[41]
+      flips |= 0x20000000000
+      board[5] = flip_disk[board[5]*8+1]
+      board[9] = flip_disk[board[9]*8+5]
+      board[20] = flip_disk[board[20]*8+5]
+      if fliped >= 2:
+        h ^= zflip[50]
+        flips |= 0x4000000000000
+        board[6] = flip_disk[board[6]*8+2]
+        board[10] = flip_disk[board[10]*8+6]
+        board[22] = flip_disk[board[22]*8+5]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(32, color, flips)
   def putAt33(self, color):
-    self.__board[4],fliped = self.__index.flip_line(self.__board[4],1,color)
-    if fliped[1] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],4)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],4)
-      self.__board[34] = self.__index.flip_disk(self.__board[34],2)
-      if fliped[1] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],4)
-        self.__board[21] = self.__index.flip_disk(self.__board[21],4)
-        self.__board[33] = self.__index.flip_disk(self.__board[33],3)
-        if fliped[1] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],4)
-          self.__board[22] = self.__index.flip_disk(self.__board[22],3)
-          self.__board[32] = self.__index.flip_disk(self.__board[32],4)
-          if fliped[1] >= 4:
-            self.__board[13] = self.__index.flip_disk(self.__board[13],4)
-            self.__board[23] = self.__index.flip_disk(self.__board[23],2)
-            self.__board[31] = self.__index.flip_disk(self.__board[31],4)
-            if fliped[1] >= 5:
-              self.__board[14] = self.__index.flip_disk(self.__board[14],4)
-              self.__board[24] = self.__index.flip_disk(self.__board[24],1)
-              self.__board[30] = self.__index.flip_disk(self.__board[30],4)
-    self.__board[9],fliped = self.__index.flip_line(self.__board[9],4,color)
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],3);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-        self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],1);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-          self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],1);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],5);
-      self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],6);
-        self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[19],fliped = self.__index.flip_line(self.__board[19],4,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],1);
-          self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-    self.__board[35],fliped = self.__index.flip_line(self.__board[35],1,color);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],6);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],4);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[66+color]
+    i = board[4]*16+2+color
+    board[4] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[34]
+      flips |= 0x400000000
+      board[10] = flip_disk[board[10]*8+4]
+      board[20] = flip_disk[board[20]*8+4]
+      board[34] = flip_disk[board[34]*8+2]
+      if fliped >= 2:
+        h ^= zflip[35]
+        flips |= 0x800000000
+        board[11] = flip_disk[board[11]*8+4]
+        board[21] = flip_disk[board[21]*8+4]
+        board[33] = flip_disk[board[33]*8+3]
+        if fliped >= 3:
+          h ^= zflip[36]
+          flips |= 0x1000000000
+          board[12] = flip_disk[board[12]*8+4]
+          board[22] = flip_disk[board[22]*8+3]
+          board[32] = flip_disk[board[32]*8+4]
+          if fliped >= 4:
+            h ^= zflip[37]
+            flips |= 0x2000000000
+            board[13] = flip_disk[board[13]*8+4]
+            board[23] = flip_disk[board[23]*8+2]
+            board[31] = flip_disk[board[31]*8+4]
+            if fliped >= 5:
+              h ^= zflip[38]
+              flips |= 0x4000000000
+              board[14] = flip_disk[board[14]*8+4]
+              board[24] = flip_disk[board[24]*8+1]
+              board[30] = flip_disk[board[30]*8+4]
+    i = board[9]*16+8+color
+    board[9] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[25]
+      flips |= 0x2000000
+      board[3] = flip_disk[board[3]*8+1]
+      board[18] = flip_disk[board[18]*8+3]
+      board[34] = flip_disk[board[34]*8+1]
+      if fliped >= 2:
+        h ^= zflip[17]
+        flips |= 0x20000
+        board[2] = flip_disk[board[2]*8+1]
+        board[17] = flip_disk[board[17]*8+2]
+        board[33] = flip_disk[board[33]*8+1]
+        if fliped >= 3:
+          h ^= zflip[9]
+          flips |= 0x200
+          board[1] = flip_disk[board[1]*8+1]
+          board[16] = flip_disk[board[16]*8+1]
+          board[32] = flip_disk[board[32]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[41]
+      flips |= 0x20000000000
+      board[5] = flip_disk[board[5]*8+1]
+      board[20] = flip_disk[board[20]*8+5]
+      board[36] = flip_disk[board[36]*8+1]
+      if fliped >= 2:
+        h ^= zflip[49]
+        flips |= 0x2000000000000
+        board[6] = flip_disk[board[6]*8+1]
+        board[21] = flip_disk[board[21]*8+6]
+        board[37] = flip_disk[board[37]*8+1]
+    i = board[19]*16+8+color
+    board[19] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[26]
+      flips |= 0x4000000
+      board[3] = flip_disk[board[3]*8+2]
+      board[10] = flip_disk[board[10]*8+3]
+      board[33] = flip_disk[board[33]*8+2]
+      if fliped >= 2:
+        h ^= zflip[19]
+        flips |= 0x80000
+        board[2] = flip_disk[board[2]*8+3]
+        board[11] = flip_disk[board[11]*8+2]
+        board[31] = flip_disk[board[31]*8+2]
+        if fliped >= 3:
+          h ^= zflip[12]
+          flips |= 0x1000
+          board[1] = flip_disk[board[1]*8+4]
+          board[12] = flip_disk[board[12]*8+1]
+          board[29] = flip_disk[board[29]*8+1]
+    i = board[35]*16+2+color
+    board[35] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[42]
+      flips |= 0x40000000000
+      board[5] = flip_disk[board[5]*8+2]
+      board[10] = flip_disk[board[10]*8+5]
+      board[21] = flip_disk[board[21]*8+5]
+      if fliped >= 2:
+        h ^= zflip[51]
+        flips |= 0x8000000000000
+        board[6] = flip_disk[board[6]*8+3]
+        board[11] = flip_disk[board[11]*8+6]
+        board[23] = flip_disk[board[23]*8+4]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(33, color, flips)
   def putAt34(self, color):
-    self.__board[4],fliped = self.__index.flip_line(self.__board[4],2,color)
-    if fliped[0] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],4)
-      self.__board[19] = self.__index.flip_disk(self.__board[19],4)
-      self.__board[35] = self.__index.flip_disk(self.__board[35],1)
-    if fliped[1] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],4)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],4)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],3)
-      if fliped[1] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],4)
-        self.__board[22] = self.__index.flip_disk(self.__board[22],3)
-        self.__board[32] = self.__index.flip_disk(self.__board[32],4)
-        if fliped[1] >= 3:
-          self.__board[13] = self.__index.flip_disk(self.__board[13],4)
-          self.__board[23] = self.__index.flip_disk(self.__board[23],2)
-          self.__board[31] = self.__index.flip_disk(self.__board[31],4)
-          if fliped[1] >= 4:
-            self.__board[14] = self.__index.flip_disk(self.__board[14],4)
-            self.__board[24] = self.__index.flip_disk(self.__board[24],1)
-            self.__board[30] = self.__index.flip_disk(self.__board[30],4)
-    self.__board[10],fliped = self.__index.flip_line(self.__board[10],4,color)
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-          self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],1);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],5);
-        self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-    self.__board[20],fliped = self.__index.flip_line(self.__board[20],4,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-          self.__board[13] = self.__index.flip_disk(self.__board[13],1);
-          self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],5);
-      self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-    self.__board[34],fliped = self.__index.flip_line(self.__board[34],2,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],3);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],3);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],6);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],3);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[68+color]
+    i = board[4]*16+4+color
+    board[4] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[33]
+      flips |= 0x200000000
+      board[9] = flip_disk[board[9]*8+4]
+      board[19] = flip_disk[board[19]*8+4]
+      board[35] = flip_disk[board[35]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[35]
+      flips |= 0x800000000
+      board[11] = flip_disk[board[11]*8+4]
+      board[21] = flip_disk[board[21]*8+4]
+      board[33] = flip_disk[board[33]*8+3]
+      if fliped >= 2:
+        h ^= zflip[36]
+        flips |= 0x1000000000
+        board[12] = flip_disk[board[12]*8+4]
+        board[22] = flip_disk[board[22]*8+3]
+        board[32] = flip_disk[board[32]*8+4]
+        if fliped >= 3:
+          h ^= zflip[37]
+          flips |= 0x2000000000
+          board[13] = flip_disk[board[13]*8+4]
+          board[23] = flip_disk[board[23]*8+2]
+          board[31] = flip_disk[board[31]*8+4]
+          if fliped >= 4:
+            h ^= zflip[38]
+            flips |= 0x4000000000
+            board[14] = flip_disk[board[14]*8+4]
+            board[24] = flip_disk[board[24]*8+1]
+            board[30] = flip_disk[board[30]*8+4]
+    i = board[10]*16+8+color
+    board[10] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[26]
+      flips |= 0x4000000
+      board[3] = flip_disk[board[3]*8+2]
+      board[19] = flip_disk[board[19]*8+3]
+      board[33] = flip_disk[board[33]*8+2]
+      if fliped >= 2:
+        h ^= zflip[18]
+        flips |= 0x40000
+        board[2] = flip_disk[board[2]*8+2]
+        board[18] = flip_disk[board[18]*8+2]
+        board[32] = flip_disk[board[32]*8+2]
+        if fliped >= 3:
+          h ^= zflip[10]
+          flips |= 0x400
+          board[1] = flip_disk[board[1]*8+2]
+          board[17] = flip_disk[board[17]*8+1]
+          board[31] = flip_disk[board[31]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[42]
+      flips |= 0x40000000000
+      board[5] = flip_disk[board[5]*8+2]
+      board[21] = flip_disk[board[21]*8+5]
+      board[35] = flip_disk[board[35]*8+2]
+      if fliped >= 2:
+        h ^= zflip[50]
+        flips |= 0x4000000000000
+        board[6] = flip_disk[board[6]*8+2]
+        board[22] = flip_disk[board[22]*8+5]
+        board[36] = flip_disk[board[36]*8+2]
+    i = board[20]*16+8+color
+    board[20] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[27]
+      flips |= 0x8000000
+      board[3] = flip_disk[board[3]*8+3]
+      board[11] = flip_disk[board[11]*8+3]
+      board[32] = flip_disk[board[32]*8+3]
+      if fliped >= 2:
+        h ^= zflip[20]
+        flips |= 0x100000
+        board[2] = flip_disk[board[2]*8+4]
+        board[12] = flip_disk[board[12]*8+2]
+        board[30] = flip_disk[board[30]*8+2]
+        if fliped >= 3:
+          h ^= zflip[13]
+          flips |= 0x2000
+          board[1] = flip_disk[board[1]*8+5]
+          board[13] = flip_disk[board[13]*8+1]
+          board[28] = flip_disk[board[28]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[41]
+      flips |= 0x20000000000
+      board[5] = flip_disk[board[5]*8+1]
+      board[9] = flip_disk[board[9]*8+5]
+      board[36] = flip_disk[board[36]*8+1]
+    i = board[34]*16+4+color
+    board[34] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[25]
+      flips |= 0x2000000
+      board[3] = flip_disk[board[3]*8+1]
+      board[9] = flip_disk[board[9]*8+3]
+      board[18] = flip_disk[board[18]*8+3]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[43]
+      flips |= 0x80000000000
+      board[5] = flip_disk[board[5]*8+3]
+      board[11] = flip_disk[board[11]*8+5]
+      board[22] = flip_disk[board[22]*8+4]
+      if fliped >= 2:
+        h ^= zflip[52]
+        flips |= 0x10000000000000
+        board[6] = flip_disk[board[6]*8+4]
+        board[12] = flip_disk[board[12]*8+6]
+        board[24] = flip_disk[board[24]*8+3]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(34, color, flips)
   def putAt35(self, color):
-    self.__board[4],fliped = self.__index.flip_line(self.__board[4],3,color)
-    if fliped[0] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],4)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],4)
-      self.__board[34] = self.__index.flip_disk(self.__board[34],2)
-      if fliped[0] >= 2:
-        self.__board[9] = self.__index.flip_disk(self.__board[9],4)
-        self.__board[19] = self.__index.flip_disk(self.__board[19],4)
-        self.__board[35] = self.__index.flip_disk(self.__board[35],1)
-    if fliped[1] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],4)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],3)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],4)
-      if fliped[1] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],4)
-        self.__board[23] = self.__index.flip_disk(self.__board[23],2)
-        self.__board[31] = self.__index.flip_disk(self.__board[31],4)
-        if fliped[1] >= 3:
-          self.__board[14] = self.__index.flip_disk(self.__board[14],4)
-          self.__board[24] = self.__index.flip_disk(self.__board[24],1)
-          self.__board[30] = self.__index.flip_disk(self.__board[30],4)
-    self.__board[11],fliped = self.__index.flip_line(self.__board[11],4,color)
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-          self.__board[18] = self.__index.flip_disk(self.__board[18],1);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],4);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-    self.__board[21],fliped = self.__index.flip_line(self.__board[21],4,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-          self.__board[14] = self.__index.flip_disk(self.__board[14],1);
-          self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-        self.__board[9] = self.__index.flip_disk(self.__board[9],6);
-        self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[33],fliped = self.__index.flip_line(self.__board[33],3,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-        self.__board[9] = self.__index.flip_disk(self.__board[9],2);
-        self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],6);
-        self.__board[25] = self.__index.flip_disk(self.__board[25],2);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[70+color]
+    i = board[4]*16+6+color
+    board[4] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[34]
+      flips |= 0x400000000
+      board[10] = flip_disk[board[10]*8+4]
+      board[20] = flip_disk[board[20]*8+4]
+      board[34] = flip_disk[board[34]*8+2]
+      if fliped >= 2:
+        h ^= zflip[33]
+        flips |= 0x200000000
+        board[9] = flip_disk[board[9]*8+4]
+        board[19] = flip_disk[board[19]*8+4]
+        board[35] = flip_disk[board[35]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[36]
+      flips |= 0x1000000000
+      board[12] = flip_disk[board[12]*8+4]
+      board[22] = flip_disk[board[22]*8+3]
+      board[32] = flip_disk[board[32]*8+4]
+      if fliped >= 2:
+        h ^= zflip[37]
+        flips |= 0x2000000000
+        board[13] = flip_disk[board[13]*8+4]
+        board[23] = flip_disk[board[23]*8+2]
+        board[31] = flip_disk[board[31]*8+4]
+        if fliped >= 3:
+          h ^= zflip[38]
+          flips |= 0x4000000000
+          board[14] = flip_disk[board[14]*8+4]
+          board[24] = flip_disk[board[24]*8+1]
+          board[30] = flip_disk[board[30]*8+4]
+    i = board[11]*16+8+color
+    board[11] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[27]
+      flips |= 0x8000000
+      board[3] = flip_disk[board[3]*8+3]
+      board[20] = flip_disk[board[20]*8+3]
+      board[32] = flip_disk[board[32]*8+3]
+      if fliped >= 2:
+        h ^= zflip[19]
+        flips |= 0x80000
+        board[2] = flip_disk[board[2]*8+3]
+        board[19] = flip_disk[board[19]*8+2]
+        board[31] = flip_disk[board[31]*8+2]
+        if fliped >= 3:
+          h ^= zflip[11]
+          flips |= 0x800
+          board[1] = flip_disk[board[1]*8+3]
+          board[18] = flip_disk[board[18]*8+1]
+          board[30] = flip_disk[board[30]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[43]
+      flips |= 0x80000000000
+      board[5] = flip_disk[board[5]*8+3]
+      board[22] = flip_disk[board[22]*8+4]
+      board[34] = flip_disk[board[34]*8+3]
+      if fliped >= 2:
+        h ^= zflip[51]
+        flips |= 0x8000000000000
+        board[6] = flip_disk[board[6]*8+3]
+        board[23] = flip_disk[board[23]*8+4]
+        board[35] = flip_disk[board[35]*8+3]
+    i = board[21]*16+8+color
+    board[21] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[28]
+      flips |= 0x10000000
+      board[3] = flip_disk[board[3]*8+4]
+      board[12] = flip_disk[board[12]*8+3]
+      board[31] = flip_disk[board[31]*8+3]
+      if fliped >= 2:
+        h ^= zflip[21]
+        flips |= 0x200000
+        board[2] = flip_disk[board[2]*8+5]
+        board[13] = flip_disk[board[13]*8+2]
+        board[29] = flip_disk[board[29]*8+2]
+        if fliped >= 3:
+          h ^= zflip[14]
+          flips |= 0x4000
+          board[1] = flip_disk[board[1]*8+6]
+          board[14] = flip_disk[board[14]*8+1]
+          board[27] = flip_disk[board[27]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[42]
+      flips |= 0x40000000000
+      board[5] = flip_disk[board[5]*8+2]
+      board[10] = flip_disk[board[10]*8+5]
+      board[35] = flip_disk[board[35]*8+2]
+      if fliped >= 2:
+        h ^= zflip[49]
+        flips |= 0x2000000000000
+        board[6] = flip_disk[board[6]*8+1]
+        board[9] = flip_disk[board[9]*8+6]
+        board[37] = flip_disk[board[37]*8+1]
+    i = board[33]*16+6+color
+    board[33] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[26]
+      flips |= 0x4000000
+      board[3] = flip_disk[board[3]*8+2]
+      board[10] = flip_disk[board[10]*8+3]
+      board[19] = flip_disk[board[19]*8+3]
+      if fliped >= 2:
+        h ^= zflip[17]
+        flips |= 0x20000
+        board[2] = flip_disk[board[2]*8+1]
+        board[9] = flip_disk[board[9]*8+2]
+        board[17] = flip_disk[board[17]*8+2]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[44]
+      flips |= 0x100000000000
+      board[5] = flip_disk[board[5]*8+4]
+      board[12] = flip_disk[board[12]*8+5]
+      board[23] = flip_disk[board[23]*8+3]
+      if fliped >= 2:
+        h ^= zflip[53]
+        flips |= 0x20000000000000
+        board[6] = flip_disk[board[6]*8+5]
+        board[13] = flip_disk[board[13]*8+6]
+        board[25] = flip_disk[board[25]*8+2]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(35, color, flips)
   def putAt36(self, color):
-    self.__board[4],fliped = self.__index.flip_line(self.__board[4],4,color)
-    if fliped[0] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],4)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],4)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],3)
-      if fliped[0] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],4)
-        self.__board[20] = self.__index.flip_disk(self.__board[20],4)
-        self.__board[34] = self.__index.flip_disk(self.__board[34],2)
-        if fliped[0] >= 3:
-          self.__board[9] = self.__index.flip_disk(self.__board[9],4)
-          self.__board[19] = self.__index.flip_disk(self.__board[19],4)
-          self.__board[35] = self.__index.flip_disk(self.__board[35],1)
-    if fliped[1] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],4)
-      self.__board[23] = self.__index.flip_disk(self.__board[23],2)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],4)
-      if fliped[1] >= 2:
-        self.__board[14] = self.__index.flip_disk(self.__board[14],4)
-        self.__board[24] = self.__index.flip_disk(self.__board[24],1)
-        self.__board[30] = self.__index.flip_disk(self.__board[30],4)
-    self.__board[12],fliped = self.__index.flip_line(self.__board[12],4,color)
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],1);
-          self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],3);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-    self.__board[22],fliped = self.__index.flip_line(self.__board[22],3,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-        self.__board[14] = self.__index.flip_disk(self.__board[14],2);
-        self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],6);
-        self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-    self.__board[32],fliped = self.__index.flip_line(self.__board[32],4,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-          self.__board[9] = self.__index.flip_disk(self.__board[9],1);
-          self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-        self.__board[14] = self.__index.flip_disk(self.__board[14],6);
-        self.__board[26] = self.__index.flip_disk(self.__board[26],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[72+color]
+    i = board[4]*16+8+color
+    board[4] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[35]
+      flips |= 0x800000000
+      board[11] = flip_disk[board[11]*8+4]
+      board[21] = flip_disk[board[21]*8+4]
+      board[33] = flip_disk[board[33]*8+3]
+      if fliped >= 2:
+        h ^= zflip[34]
+        flips |= 0x400000000
+        board[10] = flip_disk[board[10]*8+4]
+        board[20] = flip_disk[board[20]*8+4]
+        board[34] = flip_disk[board[34]*8+2]
+        if fliped >= 3:
+          h ^= zflip[33]
+          flips |= 0x200000000
+          board[9] = flip_disk[board[9]*8+4]
+          board[19] = flip_disk[board[19]*8+4]
+          board[35] = flip_disk[board[35]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[37]
+      flips |= 0x2000000000
+      board[13] = flip_disk[board[13]*8+4]
+      board[23] = flip_disk[board[23]*8+2]
+      board[31] = flip_disk[board[31]*8+4]
+      if fliped >= 2:
+        h ^= zflip[38]
+        flips |= 0x4000000000
+        board[14] = flip_disk[board[14]*8+4]
+        board[24] = flip_disk[board[24]*8+1]
+        board[30] = flip_disk[board[30]*8+4]
+    i = board[12]*16+8+color
+    board[12] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[28]
+      flips |= 0x10000000
+      board[3] = flip_disk[board[3]*8+4]
+      board[21] = flip_disk[board[21]*8+3]
+      board[31] = flip_disk[board[31]*8+3]
+      if fliped >= 2:
+        h ^= zflip[20]
+        flips |= 0x100000
+        board[2] = flip_disk[board[2]*8+4]
+        board[20] = flip_disk[board[20]*8+2]
+        board[30] = flip_disk[board[30]*8+2]
+        if fliped >= 3:
+          h ^= zflip[12]
+          flips |= 0x1000
+          board[1] = flip_disk[board[1]*8+4]
+          board[19] = flip_disk[board[19]*8+1]
+          board[29] = flip_disk[board[29]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[44]
+      flips |= 0x100000000000
+      board[5] = flip_disk[board[5]*8+4]
+      board[23] = flip_disk[board[23]*8+3]
+      board[33] = flip_disk[board[33]*8+4]
+      if fliped >= 2:
+        h ^= zflip[52]
+        flips |= 0x10000000000000
+        board[6] = flip_disk[board[6]*8+4]
+        board[24] = flip_disk[board[24]*8+3]
+        board[34] = flip_disk[board[34]*8+4]
+    i = board[22]*16+6+color
+    board[22] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[29]
+      flips |= 0x20000000
+      board[3] = flip_disk[board[3]*8+5]
+      board[13] = flip_disk[board[13]*8+3]
+      board[30] = flip_disk[board[30]*8+3]
+      if fliped >= 2:
+        h ^= zflip[22]
+        flips |= 0x400000
+        board[2] = flip_disk[board[2]*8+6]
+        board[14] = flip_disk[board[14]*8+2]
+        board[28] = flip_disk[board[28]*8+2]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[43]
+      flips |= 0x80000000000
+      board[5] = flip_disk[board[5]*8+3]
+      board[11] = flip_disk[board[11]*8+5]
+      board[34] = flip_disk[board[34]*8+3]
+      if fliped >= 2:
+        h ^= zflip[50]
+        flips |= 0x4000000000000
+        board[6] = flip_disk[board[6]*8+2]
+        board[10] = flip_disk[board[10]*8+6]
+        board[36] = flip_disk[board[36]*8+2]
+    i = board[32]*16+8+color
+    board[32] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[27]
+      flips |= 0x8000000
+      board[3] = flip_disk[board[3]*8+3]
+      board[11] = flip_disk[board[11]*8+3]
+      board[20] = flip_disk[board[20]*8+3]
+      if fliped >= 2:
+        h ^= zflip[18]
+        flips |= 0x40000
+        board[2] = flip_disk[board[2]*8+2]
+        board[10] = flip_disk[board[10]*8+2]
+        board[18] = flip_disk[board[18]*8+2]
+        if fliped >= 3:
+          h ^= zflip[9]
+          flips |= 0x200
+          board[1] = flip_disk[board[1]*8+1]
+          board[9] = flip_disk[board[9]*8+1]
+          board[16] = flip_disk[board[16]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[45]
+      flips |= 0x200000000000
+      board[5] = flip_disk[board[5]*8+5]
+      board[13] = flip_disk[board[13]*8+5]
+      board[24] = flip_disk[board[24]*8+2]
+      if fliped >= 2:
+        h ^= zflip[54]
+        flips |= 0x40000000000000
+        board[6] = flip_disk[board[6]*8+6]
+        board[14] = flip_disk[board[14]*8+6]
+        board[26] = flip_disk[board[26]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(36, color, flips)
   def putAt37(self, color):
-    self.__board[4],fliped = self.__index.flip_line(self.__board[4],5,color)
-    if fliped[0] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],4)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],3)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],4)
-      if fliped[0] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],4)
-        self.__board[21] = self.__index.flip_disk(self.__board[21],4)
-        self.__board[33] = self.__index.flip_disk(self.__board[33],3)
-        if fliped[0] >= 3:
-          self.__board[10] = self.__index.flip_disk(self.__board[10],4)
-          self.__board[20] = self.__index.flip_disk(self.__board[20],4)
-          self.__board[34] = self.__index.flip_disk(self.__board[34],2)
-          if fliped[0] >= 4:
-            self.__board[9] = self.__index.flip_disk(self.__board[9],4)
-            self.__board[19] = self.__index.flip_disk(self.__board[19],4)
-            self.__board[35] = self.__index.flip_disk(self.__board[35],1)
-    if fliped[1] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],4)
-      self.__board[24] = self.__index.flip_disk(self.__board[24],1)
-      self.__board[30] = self.__index.flip_disk(self.__board[30],4)
-    self.__board[13],fliped = self.__index.flip_line(self.__board[13],4,color)
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],1);
-          self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-        self.__board[25] = self.__index.flip_disk(self.__board[25],2);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],5);
-    self.__board[23],fliped = self.__index.flip_line(self.__board[23],2,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],3);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],6);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-    self.__board[31],fliped = self.__index.flip_line(self.__board[31],4,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-          self.__board[10] = self.__index.flip_disk(self.__board[10],1);
-          self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],5);
-      self.__board[25] = self.__index.flip_disk(self.__board[25],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[74+color]
+    i = board[4]*16+10+color
+    board[4] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[36]
+      flips |= 0x1000000000
+      board[12] = flip_disk[board[12]*8+4]
+      board[22] = flip_disk[board[22]*8+3]
+      board[32] = flip_disk[board[32]*8+4]
+      if fliped >= 2:
+        h ^= zflip[35]
+        flips |= 0x800000000
+        board[11] = flip_disk[board[11]*8+4]
+        board[21] = flip_disk[board[21]*8+4]
+        board[33] = flip_disk[board[33]*8+3]
+        if fliped >= 3:
+          h ^= zflip[34]
+          flips |= 0x400000000
+          board[10] = flip_disk[board[10]*8+4]
+          board[20] = flip_disk[board[20]*8+4]
+          board[34] = flip_disk[board[34]*8+2]
+          if fliped >= 4:
+            h ^= zflip[33]
+            flips |= 0x200000000
+            board[9] = flip_disk[board[9]*8+4]
+            board[19] = flip_disk[board[19]*8+4]
+            board[35] = flip_disk[board[35]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[38]
+      flips |= 0x4000000000
+      board[14] = flip_disk[board[14]*8+4]
+      board[24] = flip_disk[board[24]*8+1]
+      board[30] = flip_disk[board[30]*8+4]
+    i = board[13]*16+8+color
+    board[13] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[29]
+      flips |= 0x20000000
+      board[3] = flip_disk[board[3]*8+5]
+      board[22] = flip_disk[board[22]*8+2]
+      board[30] = flip_disk[board[30]*8+3]
+      if fliped >= 2:
+        h ^= zflip[21]
+        flips |= 0x200000
+        board[2] = flip_disk[board[2]*8+5]
+        board[21] = flip_disk[board[21]*8+2]
+        board[29] = flip_disk[board[29]*8+2]
+        if fliped >= 3:
+          h ^= zflip[13]
+          flips |= 0x2000
+          board[1] = flip_disk[board[1]*8+5]
+          board[20] = flip_disk[board[20]*8+1]
+          board[28] = flip_disk[board[28]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[45]
+      flips |= 0x200000000000
+      board[5] = flip_disk[board[5]*8+5]
+      board[24] = flip_disk[board[24]*8+2]
+      board[32] = flip_disk[board[32]*8+5]
+      if fliped >= 2:
+        h ^= zflip[53]
+        flips |= 0x20000000000000
+        board[6] = flip_disk[board[6]*8+5]
+        board[25] = flip_disk[board[25]*8+2]
+        board[33] = flip_disk[board[33]*8+5]
+    i = board[23]*16+4+color
+    board[23] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[30]
+      flips |= 0x40000000
+      board[3] = flip_disk[board[3]*8+6]
+      board[14] = flip_disk[board[14]*8+3]
+      board[29] = flip_disk[board[29]*8+3]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[44]
+      flips |= 0x100000000000
+      board[5] = flip_disk[board[5]*8+4]
+      board[12] = flip_disk[board[12]*8+5]
+      board[33] = flip_disk[board[33]*8+4]
+      if fliped >= 2:
+        h ^= zflip[51]
+        flips |= 0x8000000000000
+        board[6] = flip_disk[board[6]*8+3]
+        board[11] = flip_disk[board[11]*8+6]
+        board[35] = flip_disk[board[35]*8+3]
+    i = board[31]*16+8+color
+    board[31] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[28]
+      flips |= 0x10000000
+      board[3] = flip_disk[board[3]*8+4]
+      board[12] = flip_disk[board[12]*8+3]
+      board[21] = flip_disk[board[21]*8+3]
+      if fliped >= 2:
+        h ^= zflip[19]
+        flips |= 0x80000
+        board[2] = flip_disk[board[2]*8+3]
+        board[11] = flip_disk[board[11]*8+2]
+        board[19] = flip_disk[board[19]*8+2]
+        if fliped >= 3:
+          h ^= zflip[10]
+          flips |= 0x400
+          board[1] = flip_disk[board[1]*8+2]
+          board[10] = flip_disk[board[10]*8+1]
+          board[17] = flip_disk[board[17]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[46]
+      flips |= 0x400000000000
+      board[5] = flip_disk[board[5]*8+6]
+      board[14] = flip_disk[board[14]*8+5]
+      board[25] = flip_disk[board[25]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(37, color, flips)
   def putAt38(self, color):
-    self.__board[4],fliped = self.__index.flip_line(self.__board[4],6,color)
-    if fliped[0] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],4)
-      self.__board[23] = self.__index.flip_disk(self.__board[23],2)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],4)
-      if fliped[0] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],4)
-        self.__board[22] = self.__index.flip_disk(self.__board[22],3)
-        self.__board[32] = self.__index.flip_disk(self.__board[32],4)
-        if fliped[0] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],4)
-          self.__board[21] = self.__index.flip_disk(self.__board[21],4)
-          self.__board[33] = self.__index.flip_disk(self.__board[33],3)
-          if fliped[0] >= 4:
-            self.__board[10] = self.__index.flip_disk(self.__board[10],4)
-            self.__board[20] = self.__index.flip_disk(self.__board[20],4)
-            self.__board[34] = self.__index.flip_disk(self.__board[34],2)
-            if fliped[0] >= 5:
-              self.__board[9] = self.__index.flip_disk(self.__board[9],4)
-              self.__board[19] = self.__index.flip_disk(self.__board[19],4)
-              self.__board[35] = self.__index.flip_disk(self.__board[35],1)
-    self.__board[14],fliped = self.__index.flip_line(self.__board[14],4,color)
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],1);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],1);
-        self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],1);
-          self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-      self.__board[25] = self.__index.flip_disk(self.__board[25],1);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],5);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-        self.__board[26] = self.__index.flip_disk(self.__board[26],1);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],6);
-    self.__board[24],fliped = self.__index.flip_line(self.__board[24],1,color);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],6);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-    self.__board[30],fliped = self.__index.flip_line(self.__board[30],4,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],1);
-          self.__board[18] = self.__index.flip_disk(self.__board[18],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[76+color]
+    i = board[4]*16+12+color
+    board[4] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[37]
+      flips |= 0x2000000000
+      board[13] = flip_disk[board[13]*8+4]
+      board[23] = flip_disk[board[23]*8+2]
+      board[31] = flip_disk[board[31]*8+4]
+      if fliped >= 2:
+        h ^= zflip[36]
+        flips |= 0x1000000000
+        board[12] = flip_disk[board[12]*8+4]
+        board[22] = flip_disk[board[22]*8+3]
+        board[32] = flip_disk[board[32]*8+4]
+        if fliped >= 3:
+          h ^= zflip[35]
+          flips |= 0x800000000
+          board[11] = flip_disk[board[11]*8+4]
+          board[21] = flip_disk[board[21]*8+4]
+          board[33] = flip_disk[board[33]*8+3]
+          if fliped >= 4:
+            h ^= zflip[34]
+            flips |= 0x400000000
+            board[10] = flip_disk[board[10]*8+4]
+            board[20] = flip_disk[board[20]*8+4]
+            board[34] = flip_disk[board[34]*8+2]
+            if fliped >= 5:
+              h ^= zflip[33]
+              flips |= 0x200000000
+              board[9] = flip_disk[board[9]*8+4]
+              board[19] = flip_disk[board[19]*8+4]
+              board[35] = flip_disk[board[35]*8+1]
+    i = board[14]*16+8+color
+    board[14] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[30]
+      flips |= 0x40000000
+      board[3] = flip_disk[board[3]*8+6]
+      board[23] = flip_disk[board[23]*8+1]
+      board[29] = flip_disk[board[29]*8+3]
+      if fliped >= 2:
+        h ^= zflip[22]
+        flips |= 0x400000
+        board[2] = flip_disk[board[2]*8+6]
+        board[22] = flip_disk[board[22]*8+1]
+        board[28] = flip_disk[board[28]*8+2]
+        if fliped >= 3:
+          h ^= zflip[14]
+          flips |= 0x4000
+          board[1] = flip_disk[board[1]*8+6]
+          board[21] = flip_disk[board[21]*8+1]
+          board[27] = flip_disk[board[27]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[46]
+      flips |= 0x400000000000
+      board[5] = flip_disk[board[5]*8+6]
+      board[25] = flip_disk[board[25]*8+1]
+      board[31] = flip_disk[board[31]*8+5]
+      if fliped >= 2:
+        h ^= zflip[54]
+        flips |= 0x40000000000000
+        board[6] = flip_disk[board[6]*8+6]
+        board[26] = flip_disk[board[26]*8+1]
+        board[32] = flip_disk[board[32]*8+6]
+    i = board[24]*16+2+color
+    board[24] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[45]
+      flips |= 0x200000000000
+      board[5] = flip_disk[board[5]*8+5]
+      board[13] = flip_disk[board[13]*8+5]
+      board[32] = flip_disk[board[32]*8+5]
+      if fliped >= 2:
+        h ^= zflip[52]
+        flips |= 0x10000000000000
+        board[6] = flip_disk[board[6]*8+4]
+        board[12] = flip_disk[board[12]*8+6]
+        board[34] = flip_disk[board[34]*8+4]
+    i = board[30]*16+8+color
+    board[30] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[29]
+      flips |= 0x20000000
+      board[3] = flip_disk[board[3]*8+5]
+      board[13] = flip_disk[board[13]*8+3]
+      board[22] = flip_disk[board[22]*8+2]
+      if fliped >= 2:
+        h ^= zflip[20]
+        flips |= 0x100000
+        board[2] = flip_disk[board[2]*8+4]
+        board[12] = flip_disk[board[12]*8+2]
+        board[20] = flip_disk[board[20]*8+2]
+        if fliped >= 3:
+          h ^= zflip[11]
+          flips |= 0x800
+          board[1] = flip_disk[board[1]*8+3]
+          board[11] = flip_disk[board[11]*8+1]
+          board[18] = flip_disk[board[18]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(38, color, flips)
   def putAt39(self, color):
-    self.__board[4],fliped = self.__index.flip_line(self.__board[4],7,color)
-    if fliped[0] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],4)
-      self.__board[24] = self.__index.flip_disk(self.__board[24],1)
-      self.__board[30] = self.__index.flip_disk(self.__board[30],4)
-      if fliped[0] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],4)
-        self.__board[23] = self.__index.flip_disk(self.__board[23],2)
-        self.__board[31] = self.__index.flip_disk(self.__board[31],4)
-        if fliped[0] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],4)
-          self.__board[22] = self.__index.flip_disk(self.__board[22],3)
-          self.__board[32] = self.__index.flip_disk(self.__board[32],4)
-          if fliped[0] >= 4:
-            self.__board[11] = self.__index.flip_disk(self.__board[11],4)
-            self.__board[21] = self.__index.flip_disk(self.__board[21],4)
-            self.__board[33] = self.__index.flip_disk(self.__board[33],3)
-            if fliped[0] >= 5:
-              self.__board[10] = self.__index.flip_disk(self.__board[10],4)
-              self.__board[20] = self.__index.flip_disk(self.__board[20],4)
-              self.__board[34] = self.__index.flip_disk(self.__board[34],2)
-              if fliped[0] >= 6:
-                self.__board[9] = self.__index.flip_disk(self.__board[9],4)
-                self.__board[19] = self.__index.flip_disk(self.__board[19],4)
-                self.__board[35] = self.__index.flip_disk(self.__board[35],1)
-    self.__board[15],fliped = self.__index.flip_line(self.__board[15],4,color)
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],7);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],0);
-      self.__board[28] = self.__index.flip_disk(self.__board[28],3);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],7);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],0);
-        self.__board[27] = self.__index.flip_disk(self.__board[27],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],7);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],0);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],7);
-      self.__board[26] = self.__index.flip_disk(self.__board[26],0);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],5);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],7);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],6);
-    self.__board[25],fliped = self.__index.flip_line(self.__board[25],0,color);
-    if fliped[1] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],5);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],5);
-      if fliped[1] >= 2:
-        self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],6);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],5);
-    self.__board[29],fliped = self.__index.flip_line(self.__board[29],4,color);
-    if fliped[0] >= 1:
-      self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],3);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],1);
-      if fliped[0] >= 2:
-        self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-        if fliped[0] >= 3:
-          self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],1);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[78+color]
+    i = board[4]*16+14+color
+    board[4] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[38]
+      flips |= 0x4000000000
+      board[14] = flip_disk[board[14]*8+4]
+      board[24] = flip_disk[board[24]*8+1]
+      board[30] = flip_disk[board[30]*8+4]
+      if fliped >= 2:
+        h ^= zflip[37]
+        flips |= 0x2000000000
+        board[13] = flip_disk[board[13]*8+4]
+        board[23] = flip_disk[board[23]*8+2]
+        board[31] = flip_disk[board[31]*8+4]
+        if fliped >= 3:
+          h ^= zflip[36]
+          flips |= 0x1000000000
+          board[12] = flip_disk[board[12]*8+4]
+          board[22] = flip_disk[board[22]*8+3]
+          board[32] = flip_disk[board[32]*8+4]
+          if fliped >= 4:
+            h ^= zflip[35]
+            flips |= 0x800000000
+            board[11] = flip_disk[board[11]*8+4]
+            board[21] = flip_disk[board[21]*8+4]
+            board[33] = flip_disk[board[33]*8+3]
+            if fliped >= 5:
+              h ^= zflip[34]
+              flips |= 0x400000000
+              board[10] = flip_disk[board[10]*8+4]
+              board[20] = flip_disk[board[20]*8+4]
+              board[34] = flip_disk[board[34]*8+2]
+              if fliped >= 6:
+                h ^= zflip[33]
+                flips |= 0x200000000
+                board[9] = flip_disk[board[9]*8+4]
+                board[19] = flip_disk[board[19]*8+4]
+                board[35] = flip_disk[board[35]*8+1]
+    i = board[15]*16+8+color
+    board[15] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[31]
+      flips |= 0x80000000
+      board[3] = flip_disk[board[3]*8+7]
+      board[24] = flip_disk[board[24]*8+0]
+      board[28] = flip_disk[board[28]*8+3]
+      if fliped >= 2:
+        h ^= zflip[23]
+        flips |= 0x800000
+        board[2] = flip_disk[board[2]*8+7]
+        board[23] = flip_disk[board[23]*8+0]
+        board[27] = flip_disk[board[27]*8+2]
+        if fliped >= 3:
+          h ^= zflip[15]
+          flips |= 0x8000
+          board[1] = flip_disk[board[1]*8+7]
+          board[22] = flip_disk[board[22]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[47]
+      flips |= 0x800000000000
+      board[5] = flip_disk[board[5]*8+7]
+      board[26] = flip_disk[board[26]*8+0]
+      board[30] = flip_disk[board[30]*8+5]
+      if fliped >= 2:
+        h ^= zflip[55]
+        flips |= 0x80000000000000
+        board[6] = flip_disk[board[6]*8+7]
+        board[31] = flip_disk[board[31]*8+6]
+    i = board[25]*16+color
+    board[25] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[46]
+      flips |= 0x400000000000
+      board[5] = flip_disk[board[5]*8+6]
+      board[14] = flip_disk[board[14]*8+5]
+      board[31] = flip_disk[board[31]*8+5]
+      if fliped >= 2:
+        h ^= zflip[53]
+        flips |= 0x20000000000000
+        board[6] = flip_disk[board[6]*8+5]
+        board[13] = flip_disk[board[13]*8+6]
+        board[33] = flip_disk[board[33]*8+5]
+    i = board[29]*16+8+color
+    board[29] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[30]
+      flips |= 0x40000000
+      board[3] = flip_disk[board[3]*8+6]
+      board[14] = flip_disk[board[14]*8+3]
+      board[23] = flip_disk[board[23]*8+1]
+      if fliped >= 2:
+        h ^= zflip[21]
+        flips |= 0x200000
+        board[2] = flip_disk[board[2]*8+5]
+        board[13] = flip_disk[board[13]*8+2]
+        board[21] = flip_disk[board[21]*8+2]
+        if fliped >= 3:
+          h ^= zflip[12]
+          flips |= 0x1000
+          board[1] = flip_disk[board[1]*8+4]
+          board[12] = flip_disk[board[12]*8+1]
+          board[19] = flip_disk[board[19]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(39, color, flips)
   def putAt40(self, color):
-    self.__board[5],fliped = self.__index.flip_line(self.__board[5],0,color)
-    if fliped[1] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],5)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],5)
-      self.__board[36] = self.__index.flip_disk(self.__board[36],1)
-      if fliped[1] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],5)
-        self.__board[21] = self.__index.flip_disk(self.__board[21],5)
-        self.__board[35] = self.__index.flip_disk(self.__board[35],2)
-        if fliped[1] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],5)
-          self.__board[22] = self.__index.flip_disk(self.__board[22],4)
-          self.__board[34] = self.__index.flip_disk(self.__board[34],3)
-          if fliped[1] >= 4:
-            self.__board[12] = self.__index.flip_disk(self.__board[12],5)
-            self.__board[23] = self.__index.flip_disk(self.__board[23],3)
-            self.__board[33] = self.__index.flip_disk(self.__board[33],4)
-            if fliped[1] >= 5:
-              self.__board[13] = self.__index.flip_disk(self.__board[13],5)
-              self.__board[24] = self.__index.flip_disk(self.__board[24],2)
-              self.__board[32] = self.__index.flip_disk(self.__board[32],5)
-              if fliped[1] >= 6:
-                self.__board[14] = self.__index.flip_disk(self.__board[14],5)
-                self.__board[25] = self.__index.flip_disk(self.__board[25],1)
-                self.__board[31] = self.__index.flip_disk(self.__board[31],5)
-    self.__board[8],fliped = self.__index.flip_line(self.__board[8],5,color)
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],0);
-      self.__board[18] = self.__index.flip_disk(self.__board[18],4);
-      self.__board[36] = self.__index.flip_disk(self.__board[36],0);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],0);
-        self.__board[17] = self.__index.flip_disk(self.__board[17],3);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],0);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],0);
-          self.__board[16] = self.__index.flip_disk(self.__board[16],2);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],0);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],0);
-            self.__board[33] = self.__index.flip_disk(self.__board[33],0);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],0);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],6);
-    self.__board[19],fliped = self.__index.flip_line(self.__board[19],5,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],4);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-            self.__board[12] = self.__index.flip_disk(self.__board[12],1);
-            self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-    self.__board[37],fliped = self.__index.flip_line(self.__board[37],0,color);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],6);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],6);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[80+color]
+    i = board[5]*16+color
+    board[5] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[41]
+      flips |= 0x20000000000
+      board[9] = flip_disk[board[9]*8+5]
+      board[20] = flip_disk[board[20]*8+5]
+      board[36] = flip_disk[board[36]*8+1]
+      if fliped >= 2:
+        h ^= zflip[42]
+        flips |= 0x40000000000
+        board[10] = flip_disk[board[10]*8+5]
+        board[21] = flip_disk[board[21]*8+5]
+        board[35] = flip_disk[board[35]*8+2]
+        if fliped >= 3:
+          h ^= zflip[43]
+          flips |= 0x80000000000
+          board[11] = flip_disk[board[11]*8+5]
+          board[22] = flip_disk[board[22]*8+4]
+          board[34] = flip_disk[board[34]*8+3]
+          if fliped >= 4:
+            h ^= zflip[44]
+            flips |= 0x100000000000
+            board[12] = flip_disk[board[12]*8+5]
+            board[23] = flip_disk[board[23]*8+3]
+            board[33] = flip_disk[board[33]*8+4]
+            if fliped >= 5:
+              h ^= zflip[45]
+              flips |= 0x200000000000
+              board[13] = flip_disk[board[13]*8+5]
+              board[24] = flip_disk[board[24]*8+2]
+              board[32] = flip_disk[board[32]*8+5]
+              if fliped >= 6:
+                h ^= zflip[46]
+                flips |= 0x400000000000
+                board[14] = flip_disk[board[14]*8+5]
+                board[25] = flip_disk[board[25]*8+1]
+                board[31] = flip_disk[board[31]*8+5]
+    i = board[8]*16+10+color
+    board[8] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[32]
+      flips |= 0x100000000
+      board[4] = flip_disk[board[4]*8+0]
+      board[18] = flip_disk[board[18]*8+4]
+      board[36] = flip_disk[board[36]*8+0]
+      if fliped >= 2:
+        h ^= zflip[24]
+        flips |= 0x1000000
+        board[3] = flip_disk[board[3]*8+0]
+        board[17] = flip_disk[board[17]*8+3]
+        board[35] = flip_disk[board[35]*8+0]
+        if fliped >= 3:
+          h ^= zflip[16]
+          flips |= 0x10000
+          board[2] = flip_disk[board[2]*8+0]
+          board[16] = flip_disk[board[16]*8+2]
+          board[34] = flip_disk[board[34]*8+0]
+          if fliped >= 4:
+            h ^= zflip[8]
+            flips |= 0x100
+            board[1] = flip_disk[board[1]*8+0]
+            board[33] = flip_disk[board[33]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[48]
+      flips |= 0x1000000000000
+      board[6] = flip_disk[board[6]*8+0]
+      board[20] = flip_disk[board[20]*8+6]
+    i = board[19]*16+10+color
+    board[19] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[33]
+      flips |= 0x200000000
+      board[4] = flip_disk[board[4]*8+1]
+      board[9] = flip_disk[board[9]*8+4]
+      board[35] = flip_disk[board[35]*8+1]
+      if fliped >= 2:
+        h ^= zflip[26]
+        flips |= 0x4000000
+        board[3] = flip_disk[board[3]*8+2]
+        board[10] = flip_disk[board[10]*8+3]
+        board[33] = flip_disk[board[33]*8+2]
+        if fliped >= 3:
+          h ^= zflip[19]
+          flips |= 0x80000
+          board[2] = flip_disk[board[2]*8+3]
+          board[11] = flip_disk[board[11]*8+2]
+          board[31] = flip_disk[board[31]*8+2]
+          if fliped >= 4:
+            h ^= zflip[12]
+            flips |= 0x1000
+            board[1] = flip_disk[board[1]*8+4]
+            board[12] = flip_disk[board[12]*8+1]
+            board[29] = flip_disk[board[29]*8+1]
+    i = board[37]*16+color
+    board[37] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[49]
+      flips |= 0x2000000000000
+      board[6] = flip_disk[board[6]*8+1]
+      board[9] = flip_disk[board[9]*8+6]
+      board[21] = flip_disk[board[21]*8+6]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(40, color, flips)
   def putAt41(self, color):
-    self.__board[5],fliped = self.__index.flip_line(self.__board[5],1,color)
-    if fliped[1] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],5)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],5)
-      self.__board[35] = self.__index.flip_disk(self.__board[35],2)
-      if fliped[1] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],5)
-        self.__board[22] = self.__index.flip_disk(self.__board[22],4)
-        self.__board[34] = self.__index.flip_disk(self.__board[34],3)
-        if fliped[1] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],5)
-          self.__board[23] = self.__index.flip_disk(self.__board[23],3)
-          self.__board[33] = self.__index.flip_disk(self.__board[33],4)
-          if fliped[1] >= 4:
-            self.__board[13] = self.__index.flip_disk(self.__board[13],5)
-            self.__board[24] = self.__index.flip_disk(self.__board[24],2)
-            self.__board[32] = self.__index.flip_disk(self.__board[32],5)
-            if fliped[1] >= 5:
-              self.__board[14] = self.__index.flip_disk(self.__board[14],5)
-              self.__board[25] = self.__index.flip_disk(self.__board[25],1)
-              self.__board[31] = self.__index.flip_disk(self.__board[31],5)
-    self.__board[9],fliped = self.__index.flip_line(self.__board[9],5,color)
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],4);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],3);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-          self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],1);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-            self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-            self.__board[32] = self.__index.flip_disk(self.__board[32],1);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],6);
-      self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[20],fliped = self.__index.flip_line(self.__board[20],5,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-            self.__board[13] = self.__index.flip_disk(self.__board[13],1);
-            self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-    self.__board[36],fliped = self.__index.flip_line(self.__board[36],1,color);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],6);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],5);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[82+color]
+    i = board[5]*16+2+color
+    board[5] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[42]
+      flips |= 0x40000000000
+      board[10] = flip_disk[board[10]*8+5]
+      board[21] = flip_disk[board[21]*8+5]
+      board[35] = flip_disk[board[35]*8+2]
+      if fliped >= 2:
+        h ^= zflip[43]
+        flips |= 0x80000000000
+        board[11] = flip_disk[board[11]*8+5]
+        board[22] = flip_disk[board[22]*8+4]
+        board[34] = flip_disk[board[34]*8+3]
+        if fliped >= 3:
+          h ^= zflip[44]
+          flips |= 0x100000000000
+          board[12] = flip_disk[board[12]*8+5]
+          board[23] = flip_disk[board[23]*8+3]
+          board[33] = flip_disk[board[33]*8+4]
+          if fliped >= 4:
+            h ^= zflip[45]
+            flips |= 0x200000000000
+            board[13] = flip_disk[board[13]*8+5]
+            board[24] = flip_disk[board[24]*8+2]
+            board[32] = flip_disk[board[32]*8+5]
+            if fliped >= 5:
+              h ^= zflip[46]
+              flips |= 0x400000000000
+              board[14] = flip_disk[board[14]*8+5]
+              board[25] = flip_disk[board[25]*8+1]
+              board[31] = flip_disk[board[31]*8+5]
+    i = board[9]*16+10+color
+    board[9] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[33]
+      flips |= 0x200000000
+      board[4] = flip_disk[board[4]*8+1]
+      board[19] = flip_disk[board[19]*8+4]
+      board[35] = flip_disk[board[35]*8+1]
+      if fliped >= 2:
+        h ^= zflip[25]
+        flips |= 0x2000000
+        board[3] = flip_disk[board[3]*8+1]
+        board[18] = flip_disk[board[18]*8+3]
+        board[34] = flip_disk[board[34]*8+1]
+        if fliped >= 3:
+          h ^= zflip[17]
+          flips |= 0x20000
+          board[2] = flip_disk[board[2]*8+1]
+          board[17] = flip_disk[board[17]*8+2]
+          board[33] = flip_disk[board[33]*8+1]
+          if fliped >= 4:
+            h ^= zflip[9]
+            flips |= 0x200
+            board[1] = flip_disk[board[1]*8+1]
+            board[16] = flip_disk[board[16]*8+1]
+            board[32] = flip_disk[board[32]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[49]
+      flips |= 0x2000000000000
+      board[6] = flip_disk[board[6]*8+1]
+      board[21] = flip_disk[board[21]*8+6]
+      board[37] = flip_disk[board[37]*8+1]
+    i = board[20]*16+10+color
+    board[20] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[34]
+      flips |= 0x400000000
+      board[4] = flip_disk[board[4]*8+2]
+      board[10] = flip_disk[board[10]*8+4]
+      board[34] = flip_disk[board[34]*8+2]
+      if fliped >= 2:
+        h ^= zflip[27]
+        flips |= 0x8000000
+        board[3] = flip_disk[board[3]*8+3]
+        board[11] = flip_disk[board[11]*8+3]
+        board[32] = flip_disk[board[32]*8+3]
+        if fliped >= 3:
+          h ^= zflip[20]
+          flips |= 0x100000
+          board[2] = flip_disk[board[2]*8+4]
+          board[12] = flip_disk[board[12]*8+2]
+          board[30] = flip_disk[board[30]*8+2]
+          if fliped >= 4:
+            h ^= zflip[13]
+            flips |= 0x2000
+            board[1] = flip_disk[board[1]*8+5]
+            board[13] = flip_disk[board[13]*8+1]
+            board[28] = flip_disk[board[28]*8+1]
+    i = board[36]*16+2+color
+    board[36] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[50]
+      flips |= 0x4000000000000
+      board[6] = flip_disk[board[6]*8+2]
+      board[10] = flip_disk[board[10]*8+6]
+      board[22] = flip_disk[board[22]*8+5]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(41, color, flips)
   def putAt42(self, color):
-    self.__board[5],fliped = self.__index.flip_line(self.__board[5],2,color)
-    if fliped[0] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],5)
-      self.__board[20] = self.__index.flip_disk(self.__board[20],5)
-      self.__board[36] = self.__index.flip_disk(self.__board[36],1)
-    if fliped[1] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],5)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],4)
-      self.__board[34] = self.__index.flip_disk(self.__board[34],3)
-      if fliped[1] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],5)
-        self.__board[23] = self.__index.flip_disk(self.__board[23],3)
-        self.__board[33] = self.__index.flip_disk(self.__board[33],4)
-        if fliped[1] >= 3:
-          self.__board[13] = self.__index.flip_disk(self.__board[13],5)
-          self.__board[24] = self.__index.flip_disk(self.__board[24],2)
-          self.__board[32] = self.__index.flip_disk(self.__board[32],5)
-          if fliped[1] >= 4:
-            self.__board[14] = self.__index.flip_disk(self.__board[14],5)
-            self.__board[25] = self.__index.flip_disk(self.__board[25],1)
-            self.__board[31] = self.__index.flip_disk(self.__board[31],5)
-    self.__board[10],fliped = self.__index.flip_line(self.__board[10],5,color)
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-          self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-            self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-            self.__board[31] = self.__index.flip_disk(self.__board[31],1);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],5);
-      self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-    self.__board[21],fliped = self.__index.flip_line(self.__board[21],5,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-          self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-          self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-            self.__board[14] = self.__index.flip_disk(self.__board[14],1);
-            self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],6);
-      self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-    self.__board[35],fliped = self.__index.flip_line(self.__board[35],2,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],4);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],4);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],6);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],4);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[84+color]
+    i = board[5]*16+4+color
+    board[5] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[41]
+      flips |= 0x20000000000
+      board[9] = flip_disk[board[9]*8+5]
+      board[20] = flip_disk[board[20]*8+5]
+      board[36] = flip_disk[board[36]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[43]
+      flips |= 0x80000000000
+      board[11] = flip_disk[board[11]*8+5]
+      board[22] = flip_disk[board[22]*8+4]
+      board[34] = flip_disk[board[34]*8+3]
+      if fliped >= 2:
+        h ^= zflip[44]
+        flips |= 0x100000000000
+        board[12] = flip_disk[board[12]*8+5]
+        board[23] = flip_disk[board[23]*8+3]
+        board[33] = flip_disk[board[33]*8+4]
+        if fliped >= 3:
+          h ^= zflip[45]
+          flips |= 0x200000000000
+          board[13] = flip_disk[board[13]*8+5]
+          board[24] = flip_disk[board[24]*8+2]
+          board[32] = flip_disk[board[32]*8+5]
+          if fliped >= 4:
+            h ^= zflip[46]
+            flips |= 0x400000000000
+            board[14] = flip_disk[board[14]*8+5]
+            board[25] = flip_disk[board[25]*8+1]
+            board[31] = flip_disk[board[31]*8+5]
+    i = board[10]*16+10+color
+    board[10] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[34]
+      flips |= 0x400000000
+      board[4] = flip_disk[board[4]*8+2]
+      board[20] = flip_disk[board[20]*8+4]
+      board[34] = flip_disk[board[34]*8+2]
+      if fliped >= 2:
+        h ^= zflip[26]
+        flips |= 0x4000000
+        board[3] = flip_disk[board[3]*8+2]
+        board[19] = flip_disk[board[19]*8+3]
+        board[33] = flip_disk[board[33]*8+2]
+        if fliped >= 3:
+          h ^= zflip[18]
+          flips |= 0x40000
+          board[2] = flip_disk[board[2]*8+2]
+          board[18] = flip_disk[board[18]*8+2]
+          board[32] = flip_disk[board[32]*8+2]
+          if fliped >= 4:
+            h ^= zflip[10]
+            flips |= 0x400
+            board[1] = flip_disk[board[1]*8+2]
+            board[17] = flip_disk[board[17]*8+1]
+            board[31] = flip_disk[board[31]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[50]
+      flips |= 0x4000000000000
+      board[6] = flip_disk[board[6]*8+2]
+      board[22] = flip_disk[board[22]*8+5]
+      board[36] = flip_disk[board[36]*8+2]
+    i = board[21]*16+10+color
+    board[21] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[35]
+      flips |= 0x800000000
+      board[4] = flip_disk[board[4]*8+3]
+      board[11] = flip_disk[board[11]*8+4]
+      board[33] = flip_disk[board[33]*8+3]
+      if fliped >= 2:
+        h ^= zflip[28]
+        flips |= 0x10000000
+        board[3] = flip_disk[board[3]*8+4]
+        board[12] = flip_disk[board[12]*8+3]
+        board[31] = flip_disk[board[31]*8+3]
+        if fliped >= 3:
+          h ^= zflip[21]
+          flips |= 0x200000
+          board[2] = flip_disk[board[2]*8+5]
+          board[13] = flip_disk[board[13]*8+2]
+          board[29] = flip_disk[board[29]*8+2]
+          if fliped >= 4:
+            h ^= zflip[14]
+            flips |= 0x4000
+            board[1] = flip_disk[board[1]*8+6]
+            board[14] = flip_disk[board[14]*8+1]
+            board[27] = flip_disk[board[27]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[49]
+      flips |= 0x2000000000000
+      board[6] = flip_disk[board[6]*8+1]
+      board[9] = flip_disk[board[9]*8+6]
+      board[37] = flip_disk[board[37]*8+1]
+    i = board[35]*16+4+color
+    board[35] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[33]
+      flips |= 0x200000000
+      board[4] = flip_disk[board[4]*8+1]
+      board[9] = flip_disk[board[9]*8+4]
+      board[19] = flip_disk[board[19]*8+4]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[51]
+      flips |= 0x8000000000000
+      board[6] = flip_disk[board[6]*8+3]
+      board[11] = flip_disk[board[11]*8+6]
+      board[23] = flip_disk[board[23]*8+4]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(42, color, flips)
   def putAt43(self, color):
-    self.__board[5],fliped = self.__index.flip_line(self.__board[5],3,color)
-    if fliped[0] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],5)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],5)
-      self.__board[35] = self.__index.flip_disk(self.__board[35],2)
-      if fliped[0] >= 2:
-        self.__board[9] = self.__index.flip_disk(self.__board[9],5)
-        self.__board[20] = self.__index.flip_disk(self.__board[20],5)
-        self.__board[36] = self.__index.flip_disk(self.__board[36],1)
-    if fliped[1] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],5)
-      self.__board[23] = self.__index.flip_disk(self.__board[23],3)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],4)
-      if fliped[1] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],5)
-        self.__board[24] = self.__index.flip_disk(self.__board[24],2)
-        self.__board[32] = self.__index.flip_disk(self.__board[32],5)
-        if fliped[1] >= 3:
-          self.__board[14] = self.__index.flip_disk(self.__board[14],5)
-          self.__board[25] = self.__index.flip_disk(self.__board[25],1)
-          self.__board[31] = self.__index.flip_disk(self.__board[31],5)
-    self.__board[11],fliped = self.__index.flip_line(self.__board[11],5,color)
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-            self.__board[18] = self.__index.flip_disk(self.__board[18],1);
-            self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],4);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-    self.__board[22],fliped = self.__index.flip_line(self.__board[22],4,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-          self.__board[14] = self.__index.flip_disk(self.__board[14],2);
-          self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],6);
-      self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-    self.__board[34],fliped = self.__index.flip_line(self.__board[34],3,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-        self.__board[9] = self.__index.flip_disk(self.__board[9],3);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],3);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],6);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],3);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[86+color]
+    i = board[5]*16+6+color
+    board[5] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[42]
+      flips |= 0x40000000000
+      board[10] = flip_disk[board[10]*8+5]
+      board[21] = flip_disk[board[21]*8+5]
+      board[35] = flip_disk[board[35]*8+2]
+      if fliped >= 2:
+        h ^= zflip[41]
+        flips |= 0x20000000000
+        board[9] = flip_disk[board[9]*8+5]
+        board[20] = flip_disk[board[20]*8+5]
+        board[36] = flip_disk[board[36]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[44]
+      flips |= 0x100000000000
+      board[12] = flip_disk[board[12]*8+5]
+      board[23] = flip_disk[board[23]*8+3]
+      board[33] = flip_disk[board[33]*8+4]
+      if fliped >= 2:
+        h ^= zflip[45]
+        flips |= 0x200000000000
+        board[13] = flip_disk[board[13]*8+5]
+        board[24] = flip_disk[board[24]*8+2]
+        board[32] = flip_disk[board[32]*8+5]
+        if fliped >= 3:
+          h ^= zflip[46]
+          flips |= 0x400000000000
+          board[14] = flip_disk[board[14]*8+5]
+          board[25] = flip_disk[board[25]*8+1]
+          board[31] = flip_disk[board[31]*8+5]
+    i = board[11]*16+10+color
+    board[11] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[35]
+      flips |= 0x800000000
+      board[4] = flip_disk[board[4]*8+3]
+      board[21] = flip_disk[board[21]*8+4]
+      board[33] = flip_disk[board[33]*8+3]
+      if fliped >= 2:
+        h ^= zflip[27]
+        flips |= 0x8000000
+        board[3] = flip_disk[board[3]*8+3]
+        board[20] = flip_disk[board[20]*8+3]
+        board[32] = flip_disk[board[32]*8+3]
+        if fliped >= 3:
+          h ^= zflip[19]
+          flips |= 0x80000
+          board[2] = flip_disk[board[2]*8+3]
+          board[19] = flip_disk[board[19]*8+2]
+          board[31] = flip_disk[board[31]*8+2]
+          if fliped >= 4:
+            h ^= zflip[11]
+            flips |= 0x800
+            board[1] = flip_disk[board[1]*8+3]
+            board[18] = flip_disk[board[18]*8+1]
+            board[30] = flip_disk[board[30]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[51]
+      flips |= 0x8000000000000
+      board[6] = flip_disk[board[6]*8+3]
+      board[23] = flip_disk[board[23]*8+4]
+      board[35] = flip_disk[board[35]*8+3]
+    i = board[22]*16+8+color
+    board[22] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[36]
+      flips |= 0x1000000000
+      board[4] = flip_disk[board[4]*8+4]
+      board[12] = flip_disk[board[12]*8+4]
+      board[32] = flip_disk[board[32]*8+4]
+      if fliped >= 2:
+        h ^= zflip[29]
+        flips |= 0x20000000
+        board[3] = flip_disk[board[3]*8+5]
+        board[13] = flip_disk[board[13]*8+3]
+        board[30] = flip_disk[board[30]*8+3]
+        if fliped >= 3:
+          h ^= zflip[22]
+          flips |= 0x400000
+          board[2] = flip_disk[board[2]*8+6]
+          board[14] = flip_disk[board[14]*8+2]
+          board[28] = flip_disk[board[28]*8+2]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[50]
+      flips |= 0x4000000000000
+      board[6] = flip_disk[board[6]*8+2]
+      board[10] = flip_disk[board[10]*8+6]
+      board[36] = flip_disk[board[36]*8+2]
+    i = board[34]*16+6+color
+    board[34] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[34]
+      flips |= 0x400000000
+      board[4] = flip_disk[board[4]*8+2]
+      board[10] = flip_disk[board[10]*8+4]
+      board[20] = flip_disk[board[20]*8+4]
+      if fliped >= 2:
+        h ^= zflip[25]
+        flips |= 0x2000000
+        board[3] = flip_disk[board[3]*8+1]
+        board[9] = flip_disk[board[9]*8+3]
+        board[18] = flip_disk[board[18]*8+3]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[52]
+      flips |= 0x10000000000000
+      board[6] = flip_disk[board[6]*8+4]
+      board[12] = flip_disk[board[12]*8+6]
+      board[24] = flip_disk[board[24]*8+3]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(43, color, flips)
   def putAt44(self, color):
-    self.__board[5],fliped = self.__index.flip_line(self.__board[5],4,color)
-    if fliped[0] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],5)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],4)
-      self.__board[34] = self.__index.flip_disk(self.__board[34],3)
-      if fliped[0] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],5)
-        self.__board[21] = self.__index.flip_disk(self.__board[21],5)
-        self.__board[35] = self.__index.flip_disk(self.__board[35],2)
-        if fliped[0] >= 3:
-          self.__board[9] = self.__index.flip_disk(self.__board[9],5)
-          self.__board[20] = self.__index.flip_disk(self.__board[20],5)
-          self.__board[36] = self.__index.flip_disk(self.__board[36],1)
-    if fliped[1] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],5)
-      self.__board[24] = self.__index.flip_disk(self.__board[24],2)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],5)
-      if fliped[1] >= 2:
-        self.__board[14] = self.__index.flip_disk(self.__board[14],5)
-        self.__board[25] = self.__index.flip_disk(self.__board[25],1)
-        self.__board[31] = self.__index.flip_disk(self.__board[31],5)
-    self.__board[12],fliped = self.__index.flip_line(self.__board[12],5,color)
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-            self.__board[19] = self.__index.flip_disk(self.__board[19],1);
-            self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],3);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-    self.__board[23],fliped = self.__index.flip_line(self.__board[23],3,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-        self.__board[14] = self.__index.flip_disk(self.__board[14],3);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],6);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-    self.__board[33],fliped = self.__index.flip_line(self.__board[33],4,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-          self.__board[9] = self.__index.flip_disk(self.__board[9],2);
-          self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],6);
-      self.__board[25] = self.__index.flip_disk(self.__board[25],2);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[88+color]
+    i = board[5]*16+8+color
+    board[5] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[43]
+      flips |= 0x80000000000
+      board[11] = flip_disk[board[11]*8+5]
+      board[22] = flip_disk[board[22]*8+4]
+      board[34] = flip_disk[board[34]*8+3]
+      if fliped >= 2:
+        h ^= zflip[42]
+        flips |= 0x40000000000
+        board[10] = flip_disk[board[10]*8+5]
+        board[21] = flip_disk[board[21]*8+5]
+        board[35] = flip_disk[board[35]*8+2]
+        if fliped >= 3:
+          h ^= zflip[41]
+          flips |= 0x20000000000
+          board[9] = flip_disk[board[9]*8+5]
+          board[20] = flip_disk[board[20]*8+5]
+          board[36] = flip_disk[board[36]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[45]
+      flips |= 0x200000000000
+      board[13] = flip_disk[board[13]*8+5]
+      board[24] = flip_disk[board[24]*8+2]
+      board[32] = flip_disk[board[32]*8+5]
+      if fliped >= 2:
+        h ^= zflip[46]
+        flips |= 0x400000000000
+        board[14] = flip_disk[board[14]*8+5]
+        board[25] = flip_disk[board[25]*8+1]
+        board[31] = flip_disk[board[31]*8+5]
+    i = board[12]*16+10+color
+    board[12] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[36]
+      flips |= 0x1000000000
+      board[4] = flip_disk[board[4]*8+4]
+      board[22] = flip_disk[board[22]*8+3]
+      board[32] = flip_disk[board[32]*8+4]
+      if fliped >= 2:
+        h ^= zflip[28]
+        flips |= 0x10000000
+        board[3] = flip_disk[board[3]*8+4]
+        board[21] = flip_disk[board[21]*8+3]
+        board[31] = flip_disk[board[31]*8+3]
+        if fliped >= 3:
+          h ^= zflip[20]
+          flips |= 0x100000
+          board[2] = flip_disk[board[2]*8+4]
+          board[20] = flip_disk[board[20]*8+2]
+          board[30] = flip_disk[board[30]*8+2]
+          if fliped >= 4:
+            h ^= zflip[12]
+            flips |= 0x1000
+            board[1] = flip_disk[board[1]*8+4]
+            board[19] = flip_disk[board[19]*8+1]
+            board[29] = flip_disk[board[29]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[52]
+      flips |= 0x10000000000000
+      board[6] = flip_disk[board[6]*8+4]
+      board[24] = flip_disk[board[24]*8+3]
+      board[34] = flip_disk[board[34]*8+4]
+    i = board[23]*16+6+color
+    board[23] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[37]
+      flips |= 0x2000000000
+      board[4] = flip_disk[board[4]*8+5]
+      board[13] = flip_disk[board[13]*8+4]
+      board[31] = flip_disk[board[31]*8+4]
+      if fliped >= 2:
+        h ^= zflip[30]
+        flips |= 0x40000000
+        board[3] = flip_disk[board[3]*8+6]
+        board[14] = flip_disk[board[14]*8+3]
+        board[29] = flip_disk[board[29]*8+3]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[51]
+      flips |= 0x8000000000000
+      board[6] = flip_disk[board[6]*8+3]
+      board[11] = flip_disk[board[11]*8+6]
+      board[35] = flip_disk[board[35]*8+3]
+    i = board[33]*16+8+color
+    board[33] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[35]
+      flips |= 0x800000000
+      board[4] = flip_disk[board[4]*8+3]
+      board[11] = flip_disk[board[11]*8+4]
+      board[21] = flip_disk[board[21]*8+4]
+      if fliped >= 2:
+        h ^= zflip[26]
+        flips |= 0x4000000
+        board[3] = flip_disk[board[3]*8+2]
+        board[10] = flip_disk[board[10]*8+3]
+        board[19] = flip_disk[board[19]*8+3]
+        if fliped >= 3:
+          h ^= zflip[17]
+          flips |= 0x20000
+          board[2] = flip_disk[board[2]*8+1]
+          board[9] = flip_disk[board[9]*8+2]
+          board[17] = flip_disk[board[17]*8+2]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[53]
+      flips |= 0x20000000000000
+      board[6] = flip_disk[board[6]*8+5]
+      board[13] = flip_disk[board[13]*8+6]
+      board[25] = flip_disk[board[25]*8+2]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(44, color, flips)
   def putAt45(self, color):
-    self.__board[5],fliped = self.__index.flip_line(self.__board[5],5,color)
-    if fliped[0] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],5)
-      self.__board[23] = self.__index.flip_disk(self.__board[23],3)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],4)
-      if fliped[0] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],5)
-        self.__board[22] = self.__index.flip_disk(self.__board[22],4)
-        self.__board[34] = self.__index.flip_disk(self.__board[34],3)
-        if fliped[0] >= 3:
-          self.__board[10] = self.__index.flip_disk(self.__board[10],5)
-          self.__board[21] = self.__index.flip_disk(self.__board[21],5)
-          self.__board[35] = self.__index.flip_disk(self.__board[35],2)
-          if fliped[0] >= 4:
-            self.__board[9] = self.__index.flip_disk(self.__board[9],5)
-            self.__board[20] = self.__index.flip_disk(self.__board[20],5)
-            self.__board[36] = self.__index.flip_disk(self.__board[36],1)
-    if fliped[1] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],5)
-      self.__board[25] = self.__index.flip_disk(self.__board[25],1)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],5)
-    self.__board[13],fliped = self.__index.flip_line(self.__board[13],5,color)
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-          self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-            self.__board[20] = self.__index.flip_disk(self.__board[20],1);
-            self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-      self.__board[25] = self.__index.flip_disk(self.__board[25],2);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],5);
-    self.__board[24],fliped = self.__index.flip_line(self.__board[24],2,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],4);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],6);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-    self.__board[32],fliped = self.__index.flip_line(self.__board[32],5,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-          self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-          self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-            self.__board[9] = self.__index.flip_disk(self.__board[9],1);
-            self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],6);
-      self.__board[26] = self.__index.flip_disk(self.__board[26],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[90+color]
+    i = board[5]*16+10+color
+    board[5] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[44]
+      flips |= 0x100000000000
+      board[12] = flip_disk[board[12]*8+5]
+      board[23] = flip_disk[board[23]*8+3]
+      board[33] = flip_disk[board[33]*8+4]
+      if fliped >= 2:
+        h ^= zflip[43]
+        flips |= 0x80000000000
+        board[11] = flip_disk[board[11]*8+5]
+        board[22] = flip_disk[board[22]*8+4]
+        board[34] = flip_disk[board[34]*8+3]
+        if fliped >= 3:
+          h ^= zflip[42]
+          flips |= 0x40000000000
+          board[10] = flip_disk[board[10]*8+5]
+          board[21] = flip_disk[board[21]*8+5]
+          board[35] = flip_disk[board[35]*8+2]
+          if fliped >= 4:
+            h ^= zflip[41]
+            flips |= 0x20000000000
+            board[9] = flip_disk[board[9]*8+5]
+            board[20] = flip_disk[board[20]*8+5]
+            board[36] = flip_disk[board[36]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[46]
+      flips |= 0x400000000000
+      board[14] = flip_disk[board[14]*8+5]
+      board[25] = flip_disk[board[25]*8+1]
+      board[31] = flip_disk[board[31]*8+5]
+    i = board[13]*16+10+color
+    board[13] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[37]
+      flips |= 0x2000000000
+      board[4] = flip_disk[board[4]*8+5]
+      board[23] = flip_disk[board[23]*8+2]
+      board[31] = flip_disk[board[31]*8+4]
+      if fliped >= 2:
+        h ^= zflip[29]
+        flips |= 0x20000000
+        board[3] = flip_disk[board[3]*8+5]
+        board[22] = flip_disk[board[22]*8+2]
+        board[30] = flip_disk[board[30]*8+3]
+        if fliped >= 3:
+          h ^= zflip[21]
+          flips |= 0x200000
+          board[2] = flip_disk[board[2]*8+5]
+          board[21] = flip_disk[board[21]*8+2]
+          board[29] = flip_disk[board[29]*8+2]
+          if fliped >= 4:
+            h ^= zflip[13]
+            flips |= 0x2000
+            board[1] = flip_disk[board[1]*8+5]
+            board[20] = flip_disk[board[20]*8+1]
+            board[28] = flip_disk[board[28]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[53]
+      flips |= 0x20000000000000
+      board[6] = flip_disk[board[6]*8+5]
+      board[25] = flip_disk[board[25]*8+2]
+      board[33] = flip_disk[board[33]*8+5]
+    i = board[24]*16+4+color
+    board[24] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[38]
+      flips |= 0x4000000000
+      board[4] = flip_disk[board[4]*8+6]
+      board[14] = flip_disk[board[14]*8+4]
+      board[30] = flip_disk[board[30]*8+4]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[52]
+      flips |= 0x10000000000000
+      board[6] = flip_disk[board[6]*8+4]
+      board[12] = flip_disk[board[12]*8+6]
+      board[34] = flip_disk[board[34]*8+4]
+    i = board[32]*16+10+color
+    board[32] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[36]
+      flips |= 0x1000000000
+      board[4] = flip_disk[board[4]*8+4]
+      board[12] = flip_disk[board[12]*8+4]
+      board[22] = flip_disk[board[22]*8+3]
+      if fliped >= 2:
+        h ^= zflip[27]
+        flips |= 0x8000000
+        board[3] = flip_disk[board[3]*8+3]
+        board[11] = flip_disk[board[11]*8+3]
+        board[20] = flip_disk[board[20]*8+3]
+        if fliped >= 3:
+          h ^= zflip[18]
+          flips |= 0x40000
+          board[2] = flip_disk[board[2]*8+2]
+          board[10] = flip_disk[board[10]*8+2]
+          board[18] = flip_disk[board[18]*8+2]
+          if fliped >= 4:
+            h ^= zflip[9]
+            flips |= 0x200
+            board[1] = flip_disk[board[1]*8+1]
+            board[9] = flip_disk[board[9]*8+1]
+            board[16] = flip_disk[board[16]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[54]
+      flips |= 0x40000000000000
+      board[6] = flip_disk[board[6]*8+6]
+      board[14] = flip_disk[board[14]*8+6]
+      board[26] = flip_disk[board[26]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(45, color, flips)
   def putAt46(self, color):
-    self.__board[5],fliped = self.__index.flip_line(self.__board[5],6,color)
-    if fliped[0] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],5)
-      self.__board[24] = self.__index.flip_disk(self.__board[24],2)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],5)
-      if fliped[0] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],5)
-        self.__board[23] = self.__index.flip_disk(self.__board[23],3)
-        self.__board[33] = self.__index.flip_disk(self.__board[33],4)
-        if fliped[0] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],5)
-          self.__board[22] = self.__index.flip_disk(self.__board[22],4)
-          self.__board[34] = self.__index.flip_disk(self.__board[34],3)
-          if fliped[0] >= 4:
-            self.__board[10] = self.__index.flip_disk(self.__board[10],5)
-            self.__board[21] = self.__index.flip_disk(self.__board[21],5)
-            self.__board[35] = self.__index.flip_disk(self.__board[35],2)
-            if fliped[0] >= 5:
-              self.__board[9] = self.__index.flip_disk(self.__board[9],5)
-              self.__board[20] = self.__index.flip_disk(self.__board[20],5)
-              self.__board[36] = self.__index.flip_disk(self.__board[36],1)
-    self.__board[14],fliped = self.__index.flip_line(self.__board[14],5,color)
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],1);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],1);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],1);
-          self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-            self.__board[21] = self.__index.flip_disk(self.__board[21],1);
-            self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-      self.__board[26] = self.__index.flip_disk(self.__board[26],1);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],6);
-    self.__board[25],fliped = self.__index.flip_line(self.__board[25],1,color);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],6);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],5);
-    self.__board[31],fliped = self.__index.flip_line(self.__board[31],5,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-            self.__board[10] = self.__index.flip_disk(self.__board[10],1);
-            self.__board[17] = self.__index.flip_disk(self.__board[17],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[92+color]
+    i = board[5]*16+12+color
+    board[5] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[45]
+      flips |= 0x200000000000
+      board[13] = flip_disk[board[13]*8+5]
+      board[24] = flip_disk[board[24]*8+2]
+      board[32] = flip_disk[board[32]*8+5]
+      if fliped >= 2:
+        h ^= zflip[44]
+        flips |= 0x100000000000
+        board[12] = flip_disk[board[12]*8+5]
+        board[23] = flip_disk[board[23]*8+3]
+        board[33] = flip_disk[board[33]*8+4]
+        if fliped >= 3:
+          h ^= zflip[43]
+          flips |= 0x80000000000
+          board[11] = flip_disk[board[11]*8+5]
+          board[22] = flip_disk[board[22]*8+4]
+          board[34] = flip_disk[board[34]*8+3]
+          if fliped >= 4:
+            h ^= zflip[42]
+            flips |= 0x40000000000
+            board[10] = flip_disk[board[10]*8+5]
+            board[21] = flip_disk[board[21]*8+5]
+            board[35] = flip_disk[board[35]*8+2]
+            if fliped >= 5:
+              h ^= zflip[41]
+              flips |= 0x20000000000
+              board[9] = flip_disk[board[9]*8+5]
+              board[20] = flip_disk[board[20]*8+5]
+              board[36] = flip_disk[board[36]*8+1]
+    i = board[14]*16+10+color
+    board[14] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[38]
+      flips |= 0x4000000000
+      board[4] = flip_disk[board[4]*8+6]
+      board[24] = flip_disk[board[24]*8+1]
+      board[30] = flip_disk[board[30]*8+4]
+      if fliped >= 2:
+        h ^= zflip[30]
+        flips |= 0x40000000
+        board[3] = flip_disk[board[3]*8+6]
+        board[23] = flip_disk[board[23]*8+1]
+        board[29] = flip_disk[board[29]*8+3]
+        if fliped >= 3:
+          h ^= zflip[22]
+          flips |= 0x400000
+          board[2] = flip_disk[board[2]*8+6]
+          board[22] = flip_disk[board[22]*8+1]
+          board[28] = flip_disk[board[28]*8+2]
+          if fliped >= 4:
+            h ^= zflip[14]
+            flips |= 0x4000
+            board[1] = flip_disk[board[1]*8+6]
+            board[21] = flip_disk[board[21]*8+1]
+            board[27] = flip_disk[board[27]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[54]
+      flips |= 0x40000000000000
+      board[6] = flip_disk[board[6]*8+6]
+      board[26] = flip_disk[board[26]*8+1]
+      board[32] = flip_disk[board[32]*8+6]
+    i = board[25]*16+2+color
+    board[25] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[53]
+      flips |= 0x20000000000000
+      board[6] = flip_disk[board[6]*8+5]
+      board[13] = flip_disk[board[13]*8+6]
+      board[33] = flip_disk[board[33]*8+5]
+    i = board[31]*16+10+color
+    board[31] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[37]
+      flips |= 0x2000000000
+      board[4] = flip_disk[board[4]*8+5]
+      board[13] = flip_disk[board[13]*8+4]
+      board[23] = flip_disk[board[23]*8+2]
+      if fliped >= 2:
+        h ^= zflip[28]
+        flips |= 0x10000000
+        board[3] = flip_disk[board[3]*8+4]
+        board[12] = flip_disk[board[12]*8+3]
+        board[21] = flip_disk[board[21]*8+3]
+        if fliped >= 3:
+          h ^= zflip[19]
+          flips |= 0x80000
+          board[2] = flip_disk[board[2]*8+3]
+          board[11] = flip_disk[board[11]*8+2]
+          board[19] = flip_disk[board[19]*8+2]
+          if fliped >= 4:
+            h ^= zflip[10]
+            flips |= 0x400
+            board[1] = flip_disk[board[1]*8+2]
+            board[10] = flip_disk[board[10]*8+1]
+            board[17] = flip_disk[board[17]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(46, color, flips)
   def putAt47(self, color):
-    self.__board[5],fliped = self.__index.flip_line(self.__board[5],7,color)
-    if fliped[0] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],5)
-      self.__board[25] = self.__index.flip_disk(self.__board[25],1)
-      self.__board[31] = self.__index.flip_disk(self.__board[31],5)
-      if fliped[0] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],5)
-        self.__board[24] = self.__index.flip_disk(self.__board[24],2)
-        self.__board[32] = self.__index.flip_disk(self.__board[32],5)
-        if fliped[0] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],5)
-          self.__board[23] = self.__index.flip_disk(self.__board[23],3)
-          self.__board[33] = self.__index.flip_disk(self.__board[33],4)
-          if fliped[0] >= 4:
-            self.__board[11] = self.__index.flip_disk(self.__board[11],5)
-            self.__board[22] = self.__index.flip_disk(self.__board[22],4)
-            self.__board[34] = self.__index.flip_disk(self.__board[34],3)
-            if fliped[0] >= 5:
-              self.__board[10] = self.__index.flip_disk(self.__board[10],5)
-              self.__board[21] = self.__index.flip_disk(self.__board[21],5)
-              self.__board[35] = self.__index.flip_disk(self.__board[35],2)
-              if fliped[0] >= 6:
-                self.__board[9] = self.__index.flip_disk(self.__board[9],5)
-                self.__board[20] = self.__index.flip_disk(self.__board[20],5)
-                self.__board[36] = self.__index.flip_disk(self.__board[36],1)
-    self.__board[15],fliped = self.__index.flip_line(self.__board[15],5,color)
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],7);
-      self.__board[25] = self.__index.flip_disk(self.__board[25],0);
-      self.__board[29] = self.__index.flip_disk(self.__board[29],4);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],7);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],0);
-        self.__board[28] = self.__index.flip_disk(self.__board[28],3);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],7);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],0);
-          self.__board[27] = self.__index.flip_disk(self.__board[27],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],7);
-            self.__board[22] = self.__index.flip_disk(self.__board[22],0);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],7);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],6);
-    self.__board[26],fliped = self.__index.flip_line(self.__board[26],0,color);
-    if fliped[1] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],6);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],6);
-    self.__board[30],fliped = self.__index.flip_line(self.__board[30],5,color);
-    if fliped[0] >= 1:
-      self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],4);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],1);
-      if fliped[0] >= 2:
-        self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-        if fliped[0] >= 3:
-          self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-          if fliped[0] >= 4:
-            self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-            self.__board[11] = self.__index.flip_disk(self.__board[11],1);
-            self.__board[18] = self.__index.flip_disk(self.__board[18],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[94+color]
+    i = board[5]*16+14+color
+    board[5] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[46]
+      flips |= 0x400000000000
+      board[14] = flip_disk[board[14]*8+5]
+      board[25] = flip_disk[board[25]*8+1]
+      board[31] = flip_disk[board[31]*8+5]
+      if fliped >= 2:
+        h ^= zflip[45]
+        flips |= 0x200000000000
+        board[13] = flip_disk[board[13]*8+5]
+        board[24] = flip_disk[board[24]*8+2]
+        board[32] = flip_disk[board[32]*8+5]
+        if fliped >= 3:
+          h ^= zflip[44]
+          flips |= 0x100000000000
+          board[12] = flip_disk[board[12]*8+5]
+          board[23] = flip_disk[board[23]*8+3]
+          board[33] = flip_disk[board[33]*8+4]
+          if fliped >= 4:
+            h ^= zflip[43]
+            flips |= 0x80000000000
+            board[11] = flip_disk[board[11]*8+5]
+            board[22] = flip_disk[board[22]*8+4]
+            board[34] = flip_disk[board[34]*8+3]
+            if fliped >= 5:
+              h ^= zflip[42]
+              flips |= 0x40000000000
+              board[10] = flip_disk[board[10]*8+5]
+              board[21] = flip_disk[board[21]*8+5]
+              board[35] = flip_disk[board[35]*8+2]
+              if fliped >= 6:
+                h ^= zflip[41]
+                flips |= 0x20000000000
+                board[9] = flip_disk[board[9]*8+5]
+                board[20] = flip_disk[board[20]*8+5]
+                board[36] = flip_disk[board[36]*8+1]
+    i = board[15]*16+10+color
+    board[15] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[39]
+      flips |= 0x8000000000
+      board[4] = flip_disk[board[4]*8+7]
+      board[25] = flip_disk[board[25]*8+0]
+      board[29] = flip_disk[board[29]*8+4]
+      if fliped >= 2:
+        h ^= zflip[31]
+        flips |= 0x80000000
+        board[3] = flip_disk[board[3]*8+7]
+        board[24] = flip_disk[board[24]*8+0]
+        board[28] = flip_disk[board[28]*8+3]
+        if fliped >= 3:
+          h ^= zflip[23]
+          flips |= 0x800000
+          board[2] = flip_disk[board[2]*8+7]
+          board[23] = flip_disk[board[23]*8+0]
+          board[27] = flip_disk[board[27]*8+2]
+          if fliped >= 4:
+            h ^= zflip[15]
+            flips |= 0x8000
+            board[1] = flip_disk[board[1]*8+7]
+            board[22] = flip_disk[board[22]*8+0]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[55]
+      flips |= 0x80000000000000
+      board[6] = flip_disk[board[6]*8+7]
+      board[31] = flip_disk[board[31]*8+6]
+    i = board[26]*16+color
+    board[26] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[54]
+      flips |= 0x40000000000000
+      board[6] = flip_disk[board[6]*8+6]
+      board[14] = flip_disk[board[14]*8+6]
+      board[32] = flip_disk[board[32]*8+6]
+    i = board[30]*16+10+color
+    board[30] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[38]
+      flips |= 0x4000000000
+      board[4] = flip_disk[board[4]*8+6]
+      board[14] = flip_disk[board[14]*8+4]
+      board[24] = flip_disk[board[24]*8+1]
+      if fliped >= 2:
+        h ^= zflip[29]
+        flips |= 0x20000000
+        board[3] = flip_disk[board[3]*8+5]
+        board[13] = flip_disk[board[13]*8+3]
+        board[22] = flip_disk[board[22]*8+2]
+        if fliped >= 3:
+          h ^= zflip[20]
+          flips |= 0x100000
+          board[2] = flip_disk[board[2]*8+4]
+          board[12] = flip_disk[board[12]*8+2]
+          board[20] = flip_disk[board[20]*8+2]
+          if fliped >= 4:
+            h ^= zflip[11]
+            flips |= 0x800
+            board[1] = flip_disk[board[1]*8+3]
+            board[11] = flip_disk[board[11]*8+1]
+            board[18] = flip_disk[board[18]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(47, color, flips)
   def putAt48(self, color):
-    self.__board[6],fliped = self.__index.flip_line(self.__board[6],0,color)
-    if fliped[1] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],6)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],6)
-      self.__board[37] = self.__index.flip_disk(self.__board[37],1)
-      if fliped[1] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],6)
-        self.__board[22] = self.__index.flip_disk(self.__board[22],5)
-        self.__board[36] = self.__index.flip_disk(self.__board[36],2)
-        if fliped[1] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],6)
-          self.__board[23] = self.__index.flip_disk(self.__board[23],4)
-          self.__board[35] = self.__index.flip_disk(self.__board[35],3)
-          if fliped[1] >= 4:
-            self.__board[12] = self.__index.flip_disk(self.__board[12],6)
-            self.__board[24] = self.__index.flip_disk(self.__board[24],3)
-            self.__board[34] = self.__index.flip_disk(self.__board[34],4)
-            if fliped[1] >= 5:
-              self.__board[13] = self.__index.flip_disk(self.__board[13],6)
-              self.__board[25] = self.__index.flip_disk(self.__board[25],2)
-              self.__board[33] = self.__index.flip_disk(self.__board[33],5)
-              if fliped[1] >= 6:
-                self.__board[14] = self.__index.flip_disk(self.__board[14],6)
-                self.__board[26] = self.__index.flip_disk(self.__board[26],1)
-                self.__board[32] = self.__index.flip_disk(self.__board[32],6)
-    self.__board[8],fliped = self.__index.flip_line(self.__board[8],6,color)
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],0);
-      self.__board[19] = self.__index.flip_disk(self.__board[19],5);
-      self.__board[37] = self.__index.flip_disk(self.__board[37],0);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],0);
-        self.__board[18] = self.__index.flip_disk(self.__board[18],4);
-        self.__board[36] = self.__index.flip_disk(self.__board[36],0);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],0);
-          self.__board[17] = self.__index.flip_disk(self.__board[17],3);
-          self.__board[35] = self.__index.flip_disk(self.__board[35],0);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],0);
-            self.__board[16] = self.__index.flip_disk(self.__board[16],2);
-            self.__board[34] = self.__index.flip_disk(self.__board[34],0);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],0);
-              self.__board[33] = self.__index.flip_disk(self.__board[33],0);
-    self.__board[20],fliped = self.__index.flip_line(self.__board[20],6,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],5);
-      self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-            self.__board[12] = self.__index.flip_disk(self.__board[12],2);
-            self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-              self.__board[13] = self.__index.flip_disk(self.__board[13],1);
-              self.__board[28] = self.__index.flip_disk(self.__board[28],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[96+color]
+    i = board[6]*16+color
+    board[6] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[49]
+      flips |= 0x2000000000000
+      board[9] = flip_disk[board[9]*8+6]
+      board[21] = flip_disk[board[21]*8+6]
+      board[37] = flip_disk[board[37]*8+1]
+      if fliped >= 2:
+        h ^= zflip[50]
+        flips |= 0x4000000000000
+        board[10] = flip_disk[board[10]*8+6]
+        board[22] = flip_disk[board[22]*8+5]
+        board[36] = flip_disk[board[36]*8+2]
+        if fliped >= 3:
+          h ^= zflip[51]
+          flips |= 0x8000000000000
+          board[11] = flip_disk[board[11]*8+6]
+          board[23] = flip_disk[board[23]*8+4]
+          board[35] = flip_disk[board[35]*8+3]
+          if fliped >= 4:
+            h ^= zflip[52]
+            flips |= 0x10000000000000
+            board[12] = flip_disk[board[12]*8+6]
+            board[24] = flip_disk[board[24]*8+3]
+            board[34] = flip_disk[board[34]*8+4]
+            if fliped >= 5:
+              h ^= zflip[53]
+              flips |= 0x20000000000000
+              board[13] = flip_disk[board[13]*8+6]
+              board[25] = flip_disk[board[25]*8+2]
+              board[33] = flip_disk[board[33]*8+5]
+              if fliped >= 6:
+                h ^= zflip[54]
+                flips |= 0x40000000000000
+                board[14] = flip_disk[board[14]*8+6]
+                board[26] = flip_disk[board[26]*8+1]
+                board[32] = flip_disk[board[32]*8+6]
+    i = board[8]*16+12+color
+    board[8] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[40]
+      flips |= 0x10000000000
+      board[5] = flip_disk[board[5]*8+0]
+      board[19] = flip_disk[board[19]*8+5]
+      board[37] = flip_disk[board[37]*8+0]
+      if fliped >= 2:
+        h ^= zflip[32]
+        flips |= 0x100000000
+        board[4] = flip_disk[board[4]*8+0]
+        board[18] = flip_disk[board[18]*8+4]
+        board[36] = flip_disk[board[36]*8+0]
+        if fliped >= 3:
+          h ^= zflip[24]
+          flips |= 0x1000000
+          board[3] = flip_disk[board[3]*8+0]
+          board[17] = flip_disk[board[17]*8+3]
+          board[35] = flip_disk[board[35]*8+0]
+          if fliped >= 4:
+            h ^= zflip[16]
+            flips |= 0x10000
+            board[2] = flip_disk[board[2]*8+0]
+            board[16] = flip_disk[board[16]*8+2]
+            board[34] = flip_disk[board[34]*8+0]
+            if fliped >= 5:
+              h ^= zflip[8]
+              flips |= 0x100
+              board[1] = flip_disk[board[1]*8+0]
+              board[33] = flip_disk[board[33]*8+0]
+    i = board[20]*16+12+color
+    board[20] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[41]
+      flips |= 0x20000000000
+      board[5] = flip_disk[board[5]*8+1]
+      board[9] = flip_disk[board[9]*8+5]
+      board[36] = flip_disk[board[36]*8+1]
+      if fliped >= 2:
+        h ^= zflip[34]
+        flips |= 0x400000000
+        board[4] = flip_disk[board[4]*8+2]
+        board[10] = flip_disk[board[10]*8+4]
+        board[34] = flip_disk[board[34]*8+2]
+        if fliped >= 3:
+          h ^= zflip[27]
+          flips |= 0x8000000
+          board[3] = flip_disk[board[3]*8+3]
+          board[11] = flip_disk[board[11]*8+3]
+          board[32] = flip_disk[board[32]*8+3]
+          if fliped >= 4:
+            h ^= zflip[20]
+            flips |= 0x100000
+            board[2] = flip_disk[board[2]*8+4]
+            board[12] = flip_disk[board[12]*8+2]
+            board[30] = flip_disk[board[30]*8+2]
+            if fliped >= 5:
+              h ^= zflip[13]
+              flips |= 0x2000
+              board[1] = flip_disk[board[1]*8+5]
+              board[13] = flip_disk[board[13]*8+1]
+              board[28] = flip_disk[board[28]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(48, color, flips)
   def putAt49(self, color):
-    self.__board[6],fliped = self.__index.flip_line(self.__board[6],1,color)
-    if fliped[1] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],6)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],5)
-      self.__board[36] = self.__index.flip_disk(self.__board[36],2)
-      if fliped[1] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],6)
-        self.__board[23] = self.__index.flip_disk(self.__board[23],4)
-        self.__board[35] = self.__index.flip_disk(self.__board[35],3)
-        if fliped[1] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],6)
-          self.__board[24] = self.__index.flip_disk(self.__board[24],3)
-          self.__board[34] = self.__index.flip_disk(self.__board[34],4)
-          if fliped[1] >= 4:
-            self.__board[13] = self.__index.flip_disk(self.__board[13],6)
-            self.__board[25] = self.__index.flip_disk(self.__board[25],2)
-            self.__board[33] = self.__index.flip_disk(self.__board[33],5)
-            if fliped[1] >= 5:
-              self.__board[14] = self.__index.flip_disk(self.__board[14],6)
-              self.__board[26] = self.__index.flip_disk(self.__board[26],1)
-              self.__board[32] = self.__index.flip_disk(self.__board[32],6)
-    self.__board[9],fliped = self.__index.flip_line(self.__board[9],6,color)
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],5);
-      self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],4);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-          self.__board[18] = self.__index.flip_disk(self.__board[18],3);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-            self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-            self.__board[33] = self.__index.flip_disk(self.__board[33],1);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-              self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-              self.__board[32] = self.__index.flip_disk(self.__board[32],1);
-    self.__board[21],fliped = self.__index.flip_line(self.__board[21],6,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-            self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-            self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-              self.__board[14] = self.__index.flip_disk(self.__board[14],1);
-              self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    self.__board[37],fliped = self.__index.flip_line(self.__board[37],1,color);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[98+color]
+    i = board[6]*16+2+color
+    board[6] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[50]
+      flips |= 0x4000000000000
+      board[10] = flip_disk[board[10]*8+6]
+      board[22] = flip_disk[board[22]*8+5]
+      board[36] = flip_disk[board[36]*8+2]
+      if fliped >= 2:
+        h ^= zflip[51]
+        flips |= 0x8000000000000
+        board[11] = flip_disk[board[11]*8+6]
+        board[23] = flip_disk[board[23]*8+4]
+        board[35] = flip_disk[board[35]*8+3]
+        if fliped >= 3:
+          h ^= zflip[52]
+          flips |= 0x10000000000000
+          board[12] = flip_disk[board[12]*8+6]
+          board[24] = flip_disk[board[24]*8+3]
+          board[34] = flip_disk[board[34]*8+4]
+          if fliped >= 4:
+            h ^= zflip[53]
+            flips |= 0x20000000000000
+            board[13] = flip_disk[board[13]*8+6]
+            board[25] = flip_disk[board[25]*8+2]
+            board[33] = flip_disk[board[33]*8+5]
+            if fliped >= 5:
+              h ^= zflip[54]
+              flips |= 0x40000000000000
+              board[14] = flip_disk[board[14]*8+6]
+              board[26] = flip_disk[board[26]*8+1]
+              board[32] = flip_disk[board[32]*8+6]
+    i = board[9]*16+12+color
+    board[9] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[41]
+      flips |= 0x20000000000
+      board[5] = flip_disk[board[5]*8+1]
+      board[20] = flip_disk[board[20]*8+5]
+      board[36] = flip_disk[board[36]*8+1]
+      if fliped >= 2:
+        h ^= zflip[33]
+        flips |= 0x200000000
+        board[4] = flip_disk[board[4]*8+1]
+        board[19] = flip_disk[board[19]*8+4]
+        board[35] = flip_disk[board[35]*8+1]
+        if fliped >= 3:
+          h ^= zflip[25]
+          flips |= 0x2000000
+          board[3] = flip_disk[board[3]*8+1]
+          board[18] = flip_disk[board[18]*8+3]
+          board[34] = flip_disk[board[34]*8+1]
+          if fliped >= 4:
+            h ^= zflip[17]
+            flips |= 0x20000
+            board[2] = flip_disk[board[2]*8+1]
+            board[17] = flip_disk[board[17]*8+2]
+            board[33] = flip_disk[board[33]*8+1]
+            if fliped >= 5:
+              h ^= zflip[9]
+              flips |= 0x200
+              board[1] = flip_disk[board[1]*8+1]
+              board[16] = flip_disk[board[16]*8+1]
+              board[32] = flip_disk[board[32]*8+1]
+    i = board[21]*16+12+color
+    board[21] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[42]
+      flips |= 0x40000000000
+      board[5] = flip_disk[board[5]*8+2]
+      board[10] = flip_disk[board[10]*8+5]
+      board[35] = flip_disk[board[35]*8+2]
+      if fliped >= 2:
+        h ^= zflip[35]
+        flips |= 0x800000000
+        board[4] = flip_disk[board[4]*8+3]
+        board[11] = flip_disk[board[11]*8+4]
+        board[33] = flip_disk[board[33]*8+3]
+        if fliped >= 3:
+          h ^= zflip[28]
+          flips |= 0x10000000
+          board[3] = flip_disk[board[3]*8+4]
+          board[12] = flip_disk[board[12]*8+3]
+          board[31] = flip_disk[board[31]*8+3]
+          if fliped >= 4:
+            h ^= zflip[21]
+            flips |= 0x200000
+            board[2] = flip_disk[board[2]*8+5]
+            board[13] = flip_disk[board[13]*8+2]
+            board[29] = flip_disk[board[29]*8+2]
+            if fliped >= 5:
+              h ^= zflip[14]
+              flips |= 0x4000
+              board[1] = flip_disk[board[1]*8+6]
+              board[14] = flip_disk[board[14]*8+1]
+              board[27] = flip_disk[board[27]*8+1]
+    i = board[37]*16+2+color
+    board[37] = new_code[i]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(49, color, flips)
   def putAt50(self, color):
-    self.__board[6],fliped = self.__index.flip_line(self.__board[6],2,color)
-    if fliped[0] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],6)
-      self.__board[21] = self.__index.flip_disk(self.__board[21],6)
-      self.__board[37] = self.__index.flip_disk(self.__board[37],1)
-    if fliped[1] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],6)
-      self.__board[23] = self.__index.flip_disk(self.__board[23],4)
-      self.__board[35] = self.__index.flip_disk(self.__board[35],3)
-      if fliped[1] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],6)
-        self.__board[24] = self.__index.flip_disk(self.__board[24],3)
-        self.__board[34] = self.__index.flip_disk(self.__board[34],4)
-        if fliped[1] >= 3:
-          self.__board[13] = self.__index.flip_disk(self.__board[13],6)
-          self.__board[25] = self.__index.flip_disk(self.__board[25],2)
-          self.__board[33] = self.__index.flip_disk(self.__board[33],5)
-          if fliped[1] >= 4:
-            self.__board[14] = self.__index.flip_disk(self.__board[14],6)
-            self.__board[26] = self.__index.flip_disk(self.__board[26],1)
-            self.__board[32] = self.__index.flip_disk(self.__board[32],6)
-    self.__board[10],fliped = self.__index.flip_line(self.__board[10],6,color)
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-            self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-            self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-              self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-              self.__board[31] = self.__index.flip_disk(self.__board[31],1);
-    self.__board[22],fliped = self.__index.flip_line(self.__board[22],5,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-          self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-            self.__board[14] = self.__index.flip_disk(self.__board[14],2);
-            self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-    self.__board[36],fliped = self.__index.flip_line(self.__board[36],2,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],5);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],5);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[100+color]
+    i = board[6]*16+4+color
+    board[6] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[49]
+      flips |= 0x2000000000000
+      board[9] = flip_disk[board[9]*8+6]
+      board[21] = flip_disk[board[21]*8+6]
+      board[37] = flip_disk[board[37]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[51]
+      flips |= 0x8000000000000
+      board[11] = flip_disk[board[11]*8+6]
+      board[23] = flip_disk[board[23]*8+4]
+      board[35] = flip_disk[board[35]*8+3]
+      if fliped >= 2:
+        h ^= zflip[52]
+        flips |= 0x10000000000000
+        board[12] = flip_disk[board[12]*8+6]
+        board[24] = flip_disk[board[24]*8+3]
+        board[34] = flip_disk[board[34]*8+4]
+        if fliped >= 3:
+          h ^= zflip[53]
+          flips |= 0x20000000000000
+          board[13] = flip_disk[board[13]*8+6]
+          board[25] = flip_disk[board[25]*8+2]
+          board[33] = flip_disk[board[33]*8+5]
+          if fliped >= 4:
+            h ^= zflip[54]
+            flips |= 0x40000000000000
+            board[14] = flip_disk[board[14]*8+6]
+            board[26] = flip_disk[board[26]*8+1]
+            board[32] = flip_disk[board[32]*8+6]
+    i = board[10]*16+12+color
+    board[10] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[42]
+      flips |= 0x40000000000
+      board[5] = flip_disk[board[5]*8+2]
+      board[21] = flip_disk[board[21]*8+5]
+      board[35] = flip_disk[board[35]*8+2]
+      if fliped >= 2:
+        h ^= zflip[34]
+        flips |= 0x400000000
+        board[4] = flip_disk[board[4]*8+2]
+        board[20] = flip_disk[board[20]*8+4]
+        board[34] = flip_disk[board[34]*8+2]
+        if fliped >= 3:
+          h ^= zflip[26]
+          flips |= 0x4000000
+          board[3] = flip_disk[board[3]*8+2]
+          board[19] = flip_disk[board[19]*8+3]
+          board[33] = flip_disk[board[33]*8+2]
+          if fliped >= 4:
+            h ^= zflip[18]
+            flips |= 0x40000
+            board[2] = flip_disk[board[2]*8+2]
+            board[18] = flip_disk[board[18]*8+2]
+            board[32] = flip_disk[board[32]*8+2]
+            if fliped >= 5:
+              h ^= zflip[10]
+              flips |= 0x400
+              board[1] = flip_disk[board[1]*8+2]
+              board[17] = flip_disk[board[17]*8+1]
+              board[31] = flip_disk[board[31]*8+1]
+    i = board[22]*16+10+color
+    board[22] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[43]
+      flips |= 0x80000000000
+      board[5] = flip_disk[board[5]*8+3]
+      board[11] = flip_disk[board[11]*8+5]
+      board[34] = flip_disk[board[34]*8+3]
+      if fliped >= 2:
+        h ^= zflip[36]
+        flips |= 0x1000000000
+        board[4] = flip_disk[board[4]*8+4]
+        board[12] = flip_disk[board[12]*8+4]
+        board[32] = flip_disk[board[32]*8+4]
+        if fliped >= 3:
+          h ^= zflip[29]
+          flips |= 0x20000000
+          board[3] = flip_disk[board[3]*8+5]
+          board[13] = flip_disk[board[13]*8+3]
+          board[30] = flip_disk[board[30]*8+3]
+          if fliped >= 4:
+            h ^= zflip[22]
+            flips |= 0x400000
+            board[2] = flip_disk[board[2]*8+6]
+            board[14] = flip_disk[board[14]*8+2]
+            board[28] = flip_disk[board[28]*8+2]
+    i = board[36]*16+4+color
+    board[36] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[41]
+      flips |= 0x20000000000
+      board[5] = flip_disk[board[5]*8+1]
+      board[9] = flip_disk[board[9]*8+5]
+      board[20] = flip_disk[board[20]*8+5]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(50, color, flips)
   def putAt51(self, color):
-    self.__board[6],fliped = self.__index.flip_line(self.__board[6],3,color)
-    if fliped[0] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],6)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],5)
-      self.__board[36] = self.__index.flip_disk(self.__board[36],2)
-      if fliped[0] >= 2:
-        self.__board[9] = self.__index.flip_disk(self.__board[9],6)
-        self.__board[21] = self.__index.flip_disk(self.__board[21],6)
-        self.__board[37] = self.__index.flip_disk(self.__board[37],1)
-    if fliped[1] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],6)
-      self.__board[24] = self.__index.flip_disk(self.__board[24],3)
-      self.__board[34] = self.__index.flip_disk(self.__board[34],4)
-      if fliped[1] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],6)
-        self.__board[25] = self.__index.flip_disk(self.__board[25],2)
-        self.__board[33] = self.__index.flip_disk(self.__board[33],5)
-        if fliped[1] >= 3:
-          self.__board[14] = self.__index.flip_disk(self.__board[14],6)
-          self.__board[26] = self.__index.flip_disk(self.__board[26],1)
-          self.__board[32] = self.__index.flip_disk(self.__board[32],6)
-    self.__board[11],fliped = self.__index.flip_line(self.__board[11],6,color)
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-            self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-            self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-              self.__board[18] = self.__index.flip_disk(self.__board[18],1);
-              self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-    self.__board[23],fliped = self.__index.flip_line(self.__board[23],4,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-          self.__board[14] = self.__index.flip_disk(self.__board[14],3);
-          self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-    self.__board[35],fliped = self.__index.flip_line(self.__board[35],3,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-        self.__board[9] = self.__index.flip_disk(self.__board[9],4);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],4);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[102+color]
+    i = board[6]*16+6+color
+    board[6] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[50]
+      flips |= 0x4000000000000
+      board[10] = flip_disk[board[10]*8+6]
+      board[22] = flip_disk[board[22]*8+5]
+      board[36] = flip_disk[board[36]*8+2]
+      if fliped >= 2:
+        h ^= zflip[49]
+        flips |= 0x2000000000000
+        board[9] = flip_disk[board[9]*8+6]
+        board[21] = flip_disk[board[21]*8+6]
+        board[37] = flip_disk[board[37]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[52]
+      flips |= 0x10000000000000
+      board[12] = flip_disk[board[12]*8+6]
+      board[24] = flip_disk[board[24]*8+3]
+      board[34] = flip_disk[board[34]*8+4]
+      if fliped >= 2:
+        h ^= zflip[53]
+        flips |= 0x20000000000000
+        board[13] = flip_disk[board[13]*8+6]
+        board[25] = flip_disk[board[25]*8+2]
+        board[33] = flip_disk[board[33]*8+5]
+        if fliped >= 3:
+          h ^= zflip[54]
+          flips |= 0x40000000000000
+          board[14] = flip_disk[board[14]*8+6]
+          board[26] = flip_disk[board[26]*8+1]
+          board[32] = flip_disk[board[32]*8+6]
+    i = board[11]*16+12+color
+    board[11] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[43]
+      flips |= 0x80000000000
+      board[5] = flip_disk[board[5]*8+3]
+      board[22] = flip_disk[board[22]*8+4]
+      board[34] = flip_disk[board[34]*8+3]
+      if fliped >= 2:
+        h ^= zflip[35]
+        flips |= 0x800000000
+        board[4] = flip_disk[board[4]*8+3]
+        board[21] = flip_disk[board[21]*8+4]
+        board[33] = flip_disk[board[33]*8+3]
+        if fliped >= 3:
+          h ^= zflip[27]
+          flips |= 0x8000000
+          board[3] = flip_disk[board[3]*8+3]
+          board[20] = flip_disk[board[20]*8+3]
+          board[32] = flip_disk[board[32]*8+3]
+          if fliped >= 4:
+            h ^= zflip[19]
+            flips |= 0x80000
+            board[2] = flip_disk[board[2]*8+3]
+            board[19] = flip_disk[board[19]*8+2]
+            board[31] = flip_disk[board[31]*8+2]
+            if fliped >= 5:
+              h ^= zflip[11]
+              flips |= 0x800
+              board[1] = flip_disk[board[1]*8+3]
+              board[18] = flip_disk[board[18]*8+1]
+              board[30] = flip_disk[board[30]*8+1]
+    i = board[23]*16+8+color
+    board[23] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[44]
+      flips |= 0x100000000000
+      board[5] = flip_disk[board[5]*8+4]
+      board[12] = flip_disk[board[12]*8+5]
+      board[33] = flip_disk[board[33]*8+4]
+      if fliped >= 2:
+        h ^= zflip[37]
+        flips |= 0x2000000000
+        board[4] = flip_disk[board[4]*8+5]
+        board[13] = flip_disk[board[13]*8+4]
+        board[31] = flip_disk[board[31]*8+4]
+        if fliped >= 3:
+          h ^= zflip[30]
+          flips |= 0x40000000
+          board[3] = flip_disk[board[3]*8+6]
+          board[14] = flip_disk[board[14]*8+3]
+          board[29] = flip_disk[board[29]*8+3]
+    i = board[35]*16+6+color
+    board[35] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[42]
+      flips |= 0x40000000000
+      board[5] = flip_disk[board[5]*8+2]
+      board[10] = flip_disk[board[10]*8+5]
+      board[21] = flip_disk[board[21]*8+5]
+      if fliped >= 2:
+        h ^= zflip[33]
+        flips |= 0x200000000
+        board[4] = flip_disk[board[4]*8+1]
+        board[9] = flip_disk[board[9]*8+4]
+        board[19] = flip_disk[board[19]*8+4]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(51, color, flips)
   def putAt52(self, color):
-    self.__board[6],fliped = self.__index.flip_line(self.__board[6],4,color)
-    if fliped[0] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],6)
-      self.__board[23] = self.__index.flip_disk(self.__board[23],4)
-      self.__board[35] = self.__index.flip_disk(self.__board[35],3)
-      if fliped[0] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],6)
-        self.__board[22] = self.__index.flip_disk(self.__board[22],5)
-        self.__board[36] = self.__index.flip_disk(self.__board[36],2)
-        if fliped[0] >= 3:
-          self.__board[9] = self.__index.flip_disk(self.__board[9],6)
-          self.__board[21] = self.__index.flip_disk(self.__board[21],6)
-          self.__board[37] = self.__index.flip_disk(self.__board[37],1)
-    if fliped[1] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],6)
-      self.__board[25] = self.__index.flip_disk(self.__board[25],2)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],5)
-      if fliped[1] >= 2:
-        self.__board[14] = self.__index.flip_disk(self.__board[14],6)
-        self.__board[26] = self.__index.flip_disk(self.__board[26],1)
-        self.__board[32] = self.__index.flip_disk(self.__board[32],6)
-    self.__board[12],fliped = self.__index.flip_line(self.__board[12],6,color)
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-            self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-            self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-              self.__board[19] = self.__index.flip_disk(self.__board[19],1);
-              self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-    self.__board[24],fliped = self.__index.flip_line(self.__board[24],3,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-        self.__board[14] = self.__index.flip_disk(self.__board[14],4);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-    self.__board[34],fliped = self.__index.flip_line(self.__board[34],4,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-          self.__board[9] = self.__index.flip_disk(self.__board[9],3);
-          self.__board[18] = self.__index.flip_disk(self.__board[18],3);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[104+color]
+    i = board[6]*16+8+color
+    board[6] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[51]
+      flips |= 0x8000000000000
+      board[11] = flip_disk[board[11]*8+6]
+      board[23] = flip_disk[board[23]*8+4]
+      board[35] = flip_disk[board[35]*8+3]
+      if fliped >= 2:
+        h ^= zflip[50]
+        flips |= 0x4000000000000
+        board[10] = flip_disk[board[10]*8+6]
+        board[22] = flip_disk[board[22]*8+5]
+        board[36] = flip_disk[board[36]*8+2]
+        if fliped >= 3:
+          h ^= zflip[49]
+          flips |= 0x2000000000000
+          board[9] = flip_disk[board[9]*8+6]
+          board[21] = flip_disk[board[21]*8+6]
+          board[37] = flip_disk[board[37]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[53]
+      flips |= 0x20000000000000
+      board[13] = flip_disk[board[13]*8+6]
+      board[25] = flip_disk[board[25]*8+2]
+      board[33] = flip_disk[board[33]*8+5]
+      if fliped >= 2:
+        h ^= zflip[54]
+        flips |= 0x40000000000000
+        board[14] = flip_disk[board[14]*8+6]
+        board[26] = flip_disk[board[26]*8+1]
+        board[32] = flip_disk[board[32]*8+6]
+    i = board[12]*16+12+color
+    board[12] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[44]
+      flips |= 0x100000000000
+      board[5] = flip_disk[board[5]*8+4]
+      board[23] = flip_disk[board[23]*8+3]
+      board[33] = flip_disk[board[33]*8+4]
+      if fliped >= 2:
+        h ^= zflip[36]
+        flips |= 0x1000000000
+        board[4] = flip_disk[board[4]*8+4]
+        board[22] = flip_disk[board[22]*8+3]
+        board[32] = flip_disk[board[32]*8+4]
+        if fliped >= 3:
+          h ^= zflip[28]
+          flips |= 0x10000000
+          board[3] = flip_disk[board[3]*8+4]
+          board[21] = flip_disk[board[21]*8+3]
+          board[31] = flip_disk[board[31]*8+3]
+          if fliped >= 4:
+            h ^= zflip[20]
+            flips |= 0x100000
+            board[2] = flip_disk[board[2]*8+4]
+            board[20] = flip_disk[board[20]*8+2]
+            board[30] = flip_disk[board[30]*8+2]
+            if fliped >= 5:
+              h ^= zflip[12]
+              flips |= 0x1000
+              board[1] = flip_disk[board[1]*8+4]
+              board[19] = flip_disk[board[19]*8+1]
+              board[29] = flip_disk[board[29]*8+1]
+    i = board[24]*16+6+color
+    board[24] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[45]
+      flips |= 0x200000000000
+      board[5] = flip_disk[board[5]*8+5]
+      board[13] = flip_disk[board[13]*8+5]
+      board[32] = flip_disk[board[32]*8+5]
+      if fliped >= 2:
+        h ^= zflip[38]
+        flips |= 0x4000000000
+        board[4] = flip_disk[board[4]*8+6]
+        board[14] = flip_disk[board[14]*8+4]
+        board[30] = flip_disk[board[30]*8+4]
+    i = board[34]*16+8+color
+    board[34] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[43]
+      flips |= 0x80000000000
+      board[5] = flip_disk[board[5]*8+3]
+      board[11] = flip_disk[board[11]*8+5]
+      board[22] = flip_disk[board[22]*8+4]
+      if fliped >= 2:
+        h ^= zflip[34]
+        flips |= 0x400000000
+        board[4] = flip_disk[board[4]*8+2]
+        board[10] = flip_disk[board[10]*8+4]
+        board[20] = flip_disk[board[20]*8+4]
+        if fliped >= 3:
+          h ^= zflip[25]
+          flips |= 0x2000000
+          board[3] = flip_disk[board[3]*8+1]
+          board[9] = flip_disk[board[9]*8+3]
+          board[18] = flip_disk[board[18]*8+3]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(52, color, flips)
   def putAt53(self, color):
-    self.__board[6],fliped = self.__index.flip_line(self.__board[6],5,color)
-    if fliped[0] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],6)
-      self.__board[24] = self.__index.flip_disk(self.__board[24],3)
-      self.__board[34] = self.__index.flip_disk(self.__board[34],4)
-      if fliped[0] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],6)
-        self.__board[23] = self.__index.flip_disk(self.__board[23],4)
-        self.__board[35] = self.__index.flip_disk(self.__board[35],3)
-        if fliped[0] >= 3:
-          self.__board[10] = self.__index.flip_disk(self.__board[10],6)
-          self.__board[22] = self.__index.flip_disk(self.__board[22],5)
-          self.__board[36] = self.__index.flip_disk(self.__board[36],2)
-          if fliped[0] >= 4:
-            self.__board[9] = self.__index.flip_disk(self.__board[9],6)
-            self.__board[21] = self.__index.flip_disk(self.__board[21],6)
-            self.__board[37] = self.__index.flip_disk(self.__board[37],1)
-    if fliped[1] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],6)
-      self.__board[26] = self.__index.flip_disk(self.__board[26],1)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],6)
-    self.__board[13],fliped = self.__index.flip_line(self.__board[13],6,color)
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-            self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-            self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-              self.__board[20] = self.__index.flip_disk(self.__board[20],1);
-              self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-    self.__board[25],fliped = self.__index.flip_line(self.__board[25],2,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],5);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],5);
-    self.__board[33],fliped = self.__index.flip_line(self.__board[33],5,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-          self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-            self.__board[9] = self.__index.flip_disk(self.__board[9],2);
-            self.__board[17] = self.__index.flip_disk(self.__board[17],2);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[106+color]
+    i = board[6]*16+10+color
+    board[6] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[52]
+      flips |= 0x10000000000000
+      board[12] = flip_disk[board[12]*8+6]
+      board[24] = flip_disk[board[24]*8+3]
+      board[34] = flip_disk[board[34]*8+4]
+      if fliped >= 2:
+        h ^= zflip[51]
+        flips |= 0x8000000000000
+        board[11] = flip_disk[board[11]*8+6]
+        board[23] = flip_disk[board[23]*8+4]
+        board[35] = flip_disk[board[35]*8+3]
+        if fliped >= 3:
+          h ^= zflip[50]
+          flips |= 0x4000000000000
+          board[10] = flip_disk[board[10]*8+6]
+          board[22] = flip_disk[board[22]*8+5]
+          board[36] = flip_disk[board[36]*8+2]
+          if fliped >= 4:
+            h ^= zflip[49]
+            flips |= 0x2000000000000
+            board[9] = flip_disk[board[9]*8+6]
+            board[21] = flip_disk[board[21]*8+6]
+            board[37] = flip_disk[board[37]*8+1]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[54]
+      flips |= 0x40000000000000
+      board[14] = flip_disk[board[14]*8+6]
+      board[26] = flip_disk[board[26]*8+1]
+      board[32] = flip_disk[board[32]*8+6]
+    i = board[13]*16+12+color
+    board[13] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[45]
+      flips |= 0x200000000000
+      board[5] = flip_disk[board[5]*8+5]
+      board[24] = flip_disk[board[24]*8+2]
+      board[32] = flip_disk[board[32]*8+5]
+      if fliped >= 2:
+        h ^= zflip[37]
+        flips |= 0x2000000000
+        board[4] = flip_disk[board[4]*8+5]
+        board[23] = flip_disk[board[23]*8+2]
+        board[31] = flip_disk[board[31]*8+4]
+        if fliped >= 3:
+          h ^= zflip[29]
+          flips |= 0x20000000
+          board[3] = flip_disk[board[3]*8+5]
+          board[22] = flip_disk[board[22]*8+2]
+          board[30] = flip_disk[board[30]*8+3]
+          if fliped >= 4:
+            h ^= zflip[21]
+            flips |= 0x200000
+            board[2] = flip_disk[board[2]*8+5]
+            board[21] = flip_disk[board[21]*8+2]
+            board[29] = flip_disk[board[29]*8+2]
+            if fliped >= 5:
+              h ^= zflip[13]
+              flips |= 0x2000
+              board[1] = flip_disk[board[1]*8+5]
+              board[20] = flip_disk[board[20]*8+1]
+              board[28] = flip_disk[board[28]*8+1]
+    i = board[25]*16+4+color
+    board[25] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[46]
+      flips |= 0x400000000000
+      board[5] = flip_disk[board[5]*8+6]
+      board[14] = flip_disk[board[14]*8+5]
+      board[31] = flip_disk[board[31]*8+5]
+    i = board[33]*16+10+color
+    board[33] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[44]
+      flips |= 0x100000000000
+      board[5] = flip_disk[board[5]*8+4]
+      board[12] = flip_disk[board[12]*8+5]
+      board[23] = flip_disk[board[23]*8+3]
+      if fliped >= 2:
+        h ^= zflip[35]
+        flips |= 0x800000000
+        board[4] = flip_disk[board[4]*8+3]
+        board[11] = flip_disk[board[11]*8+4]
+        board[21] = flip_disk[board[21]*8+4]
+        if fliped >= 3:
+          h ^= zflip[26]
+          flips |= 0x4000000
+          board[3] = flip_disk[board[3]*8+2]
+          board[10] = flip_disk[board[10]*8+3]
+          board[19] = flip_disk[board[19]*8+3]
+          if fliped >= 4:
+            h ^= zflip[17]
+            flips |= 0x20000
+            board[2] = flip_disk[board[2]*8+1]
+            board[9] = flip_disk[board[9]*8+2]
+            board[17] = flip_disk[board[17]*8+2]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(53, color, flips)
   def putAt54(self, color):
-    self.__board[6],fliped = self.__index.flip_line(self.__board[6],6,color)
-    if fliped[0] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],6)
-      self.__board[25] = self.__index.flip_disk(self.__board[25],2)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],5)
-      if fliped[0] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],6)
-        self.__board[24] = self.__index.flip_disk(self.__board[24],3)
-        self.__board[34] = self.__index.flip_disk(self.__board[34],4)
-        if fliped[0] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],6)
-          self.__board[23] = self.__index.flip_disk(self.__board[23],4)
-          self.__board[35] = self.__index.flip_disk(self.__board[35],3)
-          if fliped[0] >= 4:
-            self.__board[10] = self.__index.flip_disk(self.__board[10],6)
-            self.__board[22] = self.__index.flip_disk(self.__board[22],5)
-            self.__board[36] = self.__index.flip_disk(self.__board[36],2)
-            if fliped[0] >= 5:
-              self.__board[9] = self.__index.flip_disk(self.__board[9],6)
-              self.__board[21] = self.__index.flip_disk(self.__board[21],6)
-              self.__board[37] = self.__index.flip_disk(self.__board[37],1)
-    self.__board[14],fliped = self.__index.flip_line(self.__board[14],6,color)
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-      self.__board[25] = self.__index.flip_disk(self.__board[25],1);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],5);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],1);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],1);
-          self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-            self.__board[22] = self.__index.flip_disk(self.__board[22],1);
-            self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-              self.__board[21] = self.__index.flip_disk(self.__board[21],1);
-              self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    self.__board[26],fliped = self.__index.flip_line(self.__board[26],1,color);
-    self.__board[32],fliped = self.__index.flip_line(self.__board[32],6,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-            self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-            self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-              self.__board[9] = self.__index.flip_disk(self.__board[9],1);
-              self.__board[16] = self.__index.flip_disk(self.__board[16],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[108+color]
+    i = board[6]*16+12+color
+    board[6] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[53]
+      flips |= 0x20000000000000
+      board[13] = flip_disk[board[13]*8+6]
+      board[25] = flip_disk[board[25]*8+2]
+      board[33] = flip_disk[board[33]*8+5]
+      if fliped >= 2:
+        h ^= zflip[52]
+        flips |= 0x10000000000000
+        board[12] = flip_disk[board[12]*8+6]
+        board[24] = flip_disk[board[24]*8+3]
+        board[34] = flip_disk[board[34]*8+4]
+        if fliped >= 3:
+          h ^= zflip[51]
+          flips |= 0x8000000000000
+          board[11] = flip_disk[board[11]*8+6]
+          board[23] = flip_disk[board[23]*8+4]
+          board[35] = flip_disk[board[35]*8+3]
+          if fliped >= 4:
+            h ^= zflip[50]
+            flips |= 0x4000000000000
+            board[10] = flip_disk[board[10]*8+6]
+            board[22] = flip_disk[board[22]*8+5]
+            board[36] = flip_disk[board[36]*8+2]
+            if fliped >= 5:
+              h ^= zflip[49]
+              flips |= 0x2000000000000
+              board[9] = flip_disk[board[9]*8+6]
+              board[21] = flip_disk[board[21]*8+6]
+              board[37] = flip_disk[board[37]*8+1]
+    i = board[14]*16+12+color
+    board[14] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[46]
+      flips |= 0x400000000000
+      board[5] = flip_disk[board[5]*8+6]
+      board[25] = flip_disk[board[25]*8+1]
+      board[31] = flip_disk[board[31]*8+5]
+      if fliped >= 2:
+        h ^= zflip[38]
+        flips |= 0x4000000000
+        board[4] = flip_disk[board[4]*8+6]
+        board[24] = flip_disk[board[24]*8+1]
+        board[30] = flip_disk[board[30]*8+4]
+        if fliped >= 3:
+          h ^= zflip[30]
+          flips |= 0x40000000
+          board[3] = flip_disk[board[3]*8+6]
+          board[23] = flip_disk[board[23]*8+1]
+          board[29] = flip_disk[board[29]*8+3]
+          if fliped >= 4:
+            h ^= zflip[22]
+            flips |= 0x400000
+            board[2] = flip_disk[board[2]*8+6]
+            board[22] = flip_disk[board[22]*8+1]
+            board[28] = flip_disk[board[28]*8+2]
+            if fliped >= 5:
+              h ^= zflip[14]
+              flips |= 0x4000
+              board[1] = flip_disk[board[1]*8+6]
+              board[21] = flip_disk[board[21]*8+1]
+              board[27] = flip_disk[board[27]*8+1]
+    i = board[26]*16+2+color
+    board[26] = new_code[i]
+    i = board[32]*16+12+color
+    board[32] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[45]
+      flips |= 0x200000000000
+      board[5] = flip_disk[board[5]*8+5]
+      board[13] = flip_disk[board[13]*8+5]
+      board[24] = flip_disk[board[24]*8+2]
+      if fliped >= 2:
+        h ^= zflip[36]
+        flips |= 0x1000000000
+        board[4] = flip_disk[board[4]*8+4]
+        board[12] = flip_disk[board[12]*8+4]
+        board[22] = flip_disk[board[22]*8+3]
+        if fliped >= 3:
+          h ^= zflip[27]
+          flips |= 0x8000000
+          board[3] = flip_disk[board[3]*8+3]
+          board[11] = flip_disk[board[11]*8+3]
+          board[20] = flip_disk[board[20]*8+3]
+          if fliped >= 4:
+            h ^= zflip[18]
+            flips |= 0x40000
+            board[2] = flip_disk[board[2]*8+2]
+            board[10] = flip_disk[board[10]*8+2]
+            board[18] = flip_disk[board[18]*8+2]
+            if fliped >= 5:
+              h ^= zflip[9]
+              flips |= 0x200
+              board[1] = flip_disk[board[1]*8+1]
+              board[9] = flip_disk[board[9]*8+1]
+              board[16] = flip_disk[board[16]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(54, color, flips)
   def putAt55(self, color):
-    self.__board[6],fliped = self.__index.flip_line(self.__board[6],7,color)
-    if fliped[0] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],6)
-      self.__board[26] = self.__index.flip_disk(self.__board[26],1)
-      self.__board[32] = self.__index.flip_disk(self.__board[32],6)
-      if fliped[0] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],6)
-        self.__board[25] = self.__index.flip_disk(self.__board[25],2)
-        self.__board[33] = self.__index.flip_disk(self.__board[33],5)
-        if fliped[0] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],6)
-          self.__board[24] = self.__index.flip_disk(self.__board[24],3)
-          self.__board[34] = self.__index.flip_disk(self.__board[34],4)
-          if fliped[0] >= 4:
-            self.__board[11] = self.__index.flip_disk(self.__board[11],6)
-            self.__board[23] = self.__index.flip_disk(self.__board[23],4)
-            self.__board[35] = self.__index.flip_disk(self.__board[35],3)
-            if fliped[0] >= 5:
-              self.__board[10] = self.__index.flip_disk(self.__board[10],6)
-              self.__board[22] = self.__index.flip_disk(self.__board[22],5)
-              self.__board[36] = self.__index.flip_disk(self.__board[36],2)
-              if fliped[0] >= 6:
-                self.__board[9] = self.__index.flip_disk(self.__board[9],6)
-                self.__board[21] = self.__index.flip_disk(self.__board[21],6)
-                self.__board[37] = self.__index.flip_disk(self.__board[37],1)
-    self.__board[15],fliped = self.__index.flip_line(self.__board[15],6,color)
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],7);
-      self.__board[26] = self.__index.flip_disk(self.__board[26],0);
-      self.__board[30] = self.__index.flip_disk(self.__board[30],5);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],7);
-        self.__board[25] = self.__index.flip_disk(self.__board[25],0);
-        self.__board[29] = self.__index.flip_disk(self.__board[29],4);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],7);
-          self.__board[24] = self.__index.flip_disk(self.__board[24],0);
-          self.__board[28] = self.__index.flip_disk(self.__board[28],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],7);
-            self.__board[23] = self.__index.flip_disk(self.__board[23],0);
-            self.__board[27] = self.__index.flip_disk(self.__board[27],2);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],7);
-              self.__board[22] = self.__index.flip_disk(self.__board[22],0);
-    self.__board[31],fliped = self.__index.flip_line(self.__board[31],6,color);
-    if fliped[0] >= 1:
-      self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],5);
-      self.__board[25] = self.__index.flip_disk(self.__board[25],1);
-      if fliped[0] >= 2:
-        self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-        if fliped[0] >= 3:
-          self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-          if fliped[0] >= 4:
-            self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-            self.__board[11] = self.__index.flip_disk(self.__board[11],2);
-            self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-            if fliped[0] >= 5:
-              self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-              self.__board[10] = self.__index.flip_disk(self.__board[10],1);
-              self.__board[17] = self.__index.flip_disk(self.__board[17],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[110+color]
+    i = board[6]*16+14+color
+    board[6] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[54]
+      flips |= 0x40000000000000
+      board[14] = flip_disk[board[14]*8+6]
+      board[26] = flip_disk[board[26]*8+1]
+      board[32] = flip_disk[board[32]*8+6]
+      if fliped >= 2:
+        h ^= zflip[53]
+        flips |= 0x20000000000000
+        board[13] = flip_disk[board[13]*8+6]
+        board[25] = flip_disk[board[25]*8+2]
+        board[33] = flip_disk[board[33]*8+5]
+        if fliped >= 3:
+          h ^= zflip[52]
+          flips |= 0x10000000000000
+          board[12] = flip_disk[board[12]*8+6]
+          board[24] = flip_disk[board[24]*8+3]
+          board[34] = flip_disk[board[34]*8+4]
+          if fliped >= 4:
+            h ^= zflip[51]
+            flips |= 0x8000000000000
+            board[11] = flip_disk[board[11]*8+6]
+            board[23] = flip_disk[board[23]*8+4]
+            board[35] = flip_disk[board[35]*8+3]
+            if fliped >= 5:
+              h ^= zflip[50]
+              flips |= 0x4000000000000
+              board[10] = flip_disk[board[10]*8+6]
+              board[22] = flip_disk[board[22]*8+5]
+              board[36] = flip_disk[board[36]*8+2]
+              if fliped >= 6:
+                h ^= zflip[49]
+                flips |= 0x2000000000000
+                board[9] = flip_disk[board[9]*8+6]
+                board[21] = flip_disk[board[21]*8+6]
+                board[37] = flip_disk[board[37]*8+1]
+    i = board[15]*16+12+color
+    board[15] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[47]
+      flips |= 0x800000000000
+      board[5] = flip_disk[board[5]*8+7]
+      board[26] = flip_disk[board[26]*8+0]
+      board[30] = flip_disk[board[30]*8+5]
+      if fliped >= 2:
+        h ^= zflip[39]
+        flips |= 0x8000000000
+        board[4] = flip_disk[board[4]*8+7]
+        board[25] = flip_disk[board[25]*8+0]
+        board[29] = flip_disk[board[29]*8+4]
+        if fliped >= 3:
+          h ^= zflip[31]
+          flips |= 0x80000000
+          board[3] = flip_disk[board[3]*8+7]
+          board[24] = flip_disk[board[24]*8+0]
+          board[28] = flip_disk[board[28]*8+3]
+          if fliped >= 4:
+            h ^= zflip[23]
+            flips |= 0x800000
+            board[2] = flip_disk[board[2]*8+7]
+            board[23] = flip_disk[board[23]*8+0]
+            board[27] = flip_disk[board[27]*8+2]
+            if fliped >= 5:
+              h ^= zflip[15]
+              flips |= 0x8000
+              board[1] = flip_disk[board[1]*8+7]
+              board[22] = flip_disk[board[22]*8+0]
+    i = board[31]*16+12+color
+    board[31] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[46]
+      flips |= 0x400000000000
+      board[5] = flip_disk[board[5]*8+6]
+      board[14] = flip_disk[board[14]*8+5]
+      board[25] = flip_disk[board[25]*8+1]
+      if fliped >= 2:
+        h ^= zflip[37]
+        flips |= 0x2000000000
+        board[4] = flip_disk[board[4]*8+5]
+        board[13] = flip_disk[board[13]*8+4]
+        board[23] = flip_disk[board[23]*8+2]
+        if fliped >= 3:
+          h ^= zflip[28]
+          flips |= 0x10000000
+          board[3] = flip_disk[board[3]*8+4]
+          board[12] = flip_disk[board[12]*8+3]
+          board[21] = flip_disk[board[21]*8+3]
+          if fliped >= 4:
+            h ^= zflip[19]
+            flips |= 0x80000
+            board[2] = flip_disk[board[2]*8+3]
+            board[11] = flip_disk[board[11]*8+2]
+            board[19] = flip_disk[board[19]*8+2]
+            if fliped >= 5:
+              h ^= zflip[10]
+              flips |= 0x400
+              board[1] = flip_disk[board[1]*8+2]
+              board[10] = flip_disk[board[10]*8+1]
+              board[17] = flip_disk[board[17]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(55, color, flips)
   def putAt56(self, color):
-    self.__board[7],fliped = self.__index.flip_line(self.__board[7],0,color)
-    if fliped[1] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],7)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],6)
-      if fliped[1] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],7)
-        self.__board[23] = self.__index.flip_disk(self.__board[23],5)
-        self.__board[37] = self.__index.flip_disk(self.__board[37],2)
-        if fliped[1] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],7)
-          self.__board[24] = self.__index.flip_disk(self.__board[24],4)
-          self.__board[36] = self.__index.flip_disk(self.__board[36],3)
-          if fliped[1] >= 4:
-            self.__board[12] = self.__index.flip_disk(self.__board[12],7)
-            self.__board[25] = self.__index.flip_disk(self.__board[25],3)
-            self.__board[35] = self.__index.flip_disk(self.__board[35],4)
-            if fliped[1] >= 5:
-              self.__board[13] = self.__index.flip_disk(self.__board[13],7)
-              self.__board[26] = self.__index.flip_disk(self.__board[26],2)
-              self.__board[34] = self.__index.flip_disk(self.__board[34],5)
-              if fliped[1] >= 6:
-                self.__board[14] = self.__index.flip_disk(self.__board[14],7)
-                self.__board[33] = self.__index.flip_disk(self.__board[33],6)
-    self.__board[8],fliped = self.__index.flip_line(self.__board[8],7,color)
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],0);
-      self.__board[20] = self.__index.flip_disk(self.__board[20],6);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],0);
-        self.__board[19] = self.__index.flip_disk(self.__board[19],5);
-        self.__board[37] = self.__index.flip_disk(self.__board[37],0);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],0);
-          self.__board[18] = self.__index.flip_disk(self.__board[18],4);
-          self.__board[36] = self.__index.flip_disk(self.__board[36],0);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],0);
-            self.__board[17] = self.__index.flip_disk(self.__board[17],3);
-            self.__board[35] = self.__index.flip_disk(self.__board[35],0);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],0);
-              self.__board[16] = self.__index.flip_disk(self.__board[16],2);
-              self.__board[34] = self.__index.flip_disk(self.__board[34],0);
-              if fliped[0] >= 6:
-                self.__board[1] = self.__index.flip_disk(self.__board[1],0);
-                self.__board[33] = self.__index.flip_disk(self.__board[33],0);
-    self.__board[21],fliped = self.__index.flip_line(self.__board[21],7,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],6);
-      self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-            self.__board[12] = self.__index.flip_disk(self.__board[12],3);
-            self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-              self.__board[13] = self.__index.flip_disk(self.__board[13],2);
-              self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-              if fliped[0] >= 6:
-                self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-                self.__board[14] = self.__index.flip_disk(self.__board[14],1);
-                self.__board[27] = self.__index.flip_disk(self.__board[27],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[112+color]
+    i = board[7]*16+color
+    board[7] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[57]
+      flips |= 0x200000000000000
+      board[9] = flip_disk[board[9]*8+7]
+      board[22] = flip_disk[board[22]*8+6]
+      if fliped >= 2:
+        h ^= zflip[58]
+        flips |= 0x400000000000000
+        board[10] = flip_disk[board[10]*8+7]
+        board[23] = flip_disk[board[23]*8+5]
+        board[37] = flip_disk[board[37]*8+2]
+        if fliped >= 3:
+          h ^= zflip[59]
+          flips |= 0x800000000000000
+          board[11] = flip_disk[board[11]*8+7]
+          board[24] = flip_disk[board[24]*8+4]
+          board[36] = flip_disk[board[36]*8+3]
+          if fliped >= 4:
+            h ^= zflip[60]
+            flips |= 0x1000000000000000
+            board[12] = flip_disk[board[12]*8+7]
+            board[25] = flip_disk[board[25]*8+3]
+            board[35] = flip_disk[board[35]*8+4]
+            if fliped >= 5:
+              h ^= zflip[61]
+              flips |= 0x2000000000000000
+              board[13] = flip_disk[board[13]*8+7]
+              board[26] = flip_disk[board[26]*8+2]
+              board[34] = flip_disk[board[34]*8+5]
+              if fliped >= 6:
+                h ^= zflip[62]
+                flips |= 0x4000000000000000
+                board[14] = flip_disk[board[14]*8+7]
+                board[33] = flip_disk[board[33]*8+6]
+    i = board[8]*16+14+color
+    board[8] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[48]
+      flips |= 0x1000000000000
+      board[6] = flip_disk[board[6]*8+0]
+      board[20] = flip_disk[board[20]*8+6]
+      if fliped >= 2:
+        h ^= zflip[40]
+        flips |= 0x10000000000
+        board[5] = flip_disk[board[5]*8+0]
+        board[19] = flip_disk[board[19]*8+5]
+        board[37] = flip_disk[board[37]*8+0]
+        if fliped >= 3:
+          h ^= zflip[32]
+          flips |= 0x100000000
+          board[4] = flip_disk[board[4]*8+0]
+          board[18] = flip_disk[board[18]*8+4]
+          board[36] = flip_disk[board[36]*8+0]
+          if fliped >= 4:
+            h ^= zflip[24]
+            flips |= 0x1000000
+            board[3] = flip_disk[board[3]*8+0]
+            board[17] = flip_disk[board[17]*8+3]
+            board[35] = flip_disk[board[35]*8+0]
+            if fliped >= 5:
+              h ^= zflip[16]
+              flips |= 0x10000
+              board[2] = flip_disk[board[2]*8+0]
+              board[16] = flip_disk[board[16]*8+2]
+              board[34] = flip_disk[board[34]*8+0]
+              if fliped >= 6:
+                h ^= zflip[8]
+                flips |= 0x100
+                board[1] = flip_disk[board[1]*8+0]
+                board[33] = flip_disk[board[33]*8+0]
+    i = board[21]*16+14+color
+    board[21] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[49]
+      flips |= 0x2000000000000
+      board[6] = flip_disk[board[6]*8+1]
+      board[9] = flip_disk[board[9]*8+6]
+      board[37] = flip_disk[board[37]*8+1]
+      if fliped >= 2:
+        h ^= zflip[42]
+        flips |= 0x40000000000
+        board[5] = flip_disk[board[5]*8+2]
+        board[10] = flip_disk[board[10]*8+5]
+        board[35] = flip_disk[board[35]*8+2]
+        if fliped >= 3:
+          h ^= zflip[35]
+          flips |= 0x800000000
+          board[4] = flip_disk[board[4]*8+3]
+          board[11] = flip_disk[board[11]*8+4]
+          board[33] = flip_disk[board[33]*8+3]
+          if fliped >= 4:
+            h ^= zflip[28]
+            flips |= 0x10000000
+            board[3] = flip_disk[board[3]*8+4]
+            board[12] = flip_disk[board[12]*8+3]
+            board[31] = flip_disk[board[31]*8+3]
+            if fliped >= 5:
+              h ^= zflip[21]
+              flips |= 0x200000
+              board[2] = flip_disk[board[2]*8+5]
+              board[13] = flip_disk[board[13]*8+2]
+              board[29] = flip_disk[board[29]*8+2]
+              if fliped >= 6:
+                h ^= zflip[14]
+                flips |= 0x4000
+                board[1] = flip_disk[board[1]*8+6]
+                board[14] = flip_disk[board[14]*8+1]
+                board[27] = flip_disk[board[27]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(56, color, flips)
   def putAt57(self, color):
-    self.__board[7],fliped = self.__index.flip_line(self.__board[7],1,color)
-    if fliped[1] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],7)
-      self.__board[23] = self.__index.flip_disk(self.__board[23],5)
-      self.__board[37] = self.__index.flip_disk(self.__board[37],2)
-      if fliped[1] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],7)
-        self.__board[24] = self.__index.flip_disk(self.__board[24],4)
-        self.__board[36] = self.__index.flip_disk(self.__board[36],3)
-        if fliped[1] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],7)
-          self.__board[25] = self.__index.flip_disk(self.__board[25],3)
-          self.__board[35] = self.__index.flip_disk(self.__board[35],4)
-          if fliped[1] >= 4:
-            self.__board[13] = self.__index.flip_disk(self.__board[13],7)
-            self.__board[26] = self.__index.flip_disk(self.__board[26],2)
-            self.__board[34] = self.__index.flip_disk(self.__board[34],5)
-            if fliped[1] >= 5:
-              self.__board[14] = self.__index.flip_disk(self.__board[14],7)
-              self.__board[33] = self.__index.flip_disk(self.__board[33],6)
-    self.__board[9],fliped = self.__index.flip_line(self.__board[9],7,color)
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],6);
-      self.__board[37] = self.__index.flip_disk(self.__board[37],1);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],5);
-        self.__board[36] = self.__index.flip_disk(self.__board[36],1);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],4);
-          self.__board[35] = self.__index.flip_disk(self.__board[35],1);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-            self.__board[18] = self.__index.flip_disk(self.__board[18],3);
-            self.__board[34] = self.__index.flip_disk(self.__board[34],1);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-              self.__board[17] = self.__index.flip_disk(self.__board[17],2);
-              self.__board[33] = self.__index.flip_disk(self.__board[33],1);
-              if fliped[0] >= 6:
-                self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-                self.__board[16] = self.__index.flip_disk(self.__board[16],1);
-                self.__board[32] = self.__index.flip_disk(self.__board[32],1);
-    self.__board[22],fliped = self.__index.flip_line(self.__board[22],6,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],6);
-      self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-            self.__board[13] = self.__index.flip_disk(self.__board[13],3);
-            self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-              self.__board[14] = self.__index.flip_disk(self.__board[14],2);
-              self.__board[28] = self.__index.flip_disk(self.__board[28],2);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[114+color]
+    i = board[7]*16+2+color
+    board[7] = new_code[i]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[58]
+      flips |= 0x400000000000000
+      board[10] = flip_disk[board[10]*8+7]
+      board[23] = flip_disk[board[23]*8+5]
+      board[37] = flip_disk[board[37]*8+2]
+      if fliped >= 2:
+        h ^= zflip[59]
+        flips |= 0x800000000000000
+        board[11] = flip_disk[board[11]*8+7]
+        board[24] = flip_disk[board[24]*8+4]
+        board[36] = flip_disk[board[36]*8+3]
+        if fliped >= 3:
+          h ^= zflip[60]
+          flips |= 0x1000000000000000
+          board[12] = flip_disk[board[12]*8+7]
+          board[25] = flip_disk[board[25]*8+3]
+          board[35] = flip_disk[board[35]*8+4]
+          if fliped >= 4:
+            h ^= zflip[61]
+            flips |= 0x2000000000000000
+            board[13] = flip_disk[board[13]*8+7]
+            board[26] = flip_disk[board[26]*8+2]
+            board[34] = flip_disk[board[34]*8+5]
+            if fliped >= 5:
+              h ^= zflip[62]
+              flips |= 0x4000000000000000
+              board[14] = flip_disk[board[14]*8+7]
+              board[33] = flip_disk[board[33]*8+6]
+    i = board[9]*16+14+color
+    board[9] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[49]
+      flips |= 0x2000000000000
+      board[6] = flip_disk[board[6]*8+1]
+      board[21] = flip_disk[board[21]*8+6]
+      board[37] = flip_disk[board[37]*8+1]
+      if fliped >= 2:
+        h ^= zflip[41]
+        flips |= 0x20000000000
+        board[5] = flip_disk[board[5]*8+1]
+        board[20] = flip_disk[board[20]*8+5]
+        board[36] = flip_disk[board[36]*8+1]
+        if fliped >= 3:
+          h ^= zflip[33]
+          flips |= 0x200000000
+          board[4] = flip_disk[board[4]*8+1]
+          board[19] = flip_disk[board[19]*8+4]
+          board[35] = flip_disk[board[35]*8+1]
+          if fliped >= 4:
+            h ^= zflip[25]
+            flips |= 0x2000000
+            board[3] = flip_disk[board[3]*8+1]
+            board[18] = flip_disk[board[18]*8+3]
+            board[34] = flip_disk[board[34]*8+1]
+            if fliped >= 5:
+              h ^= zflip[17]
+              flips |= 0x20000
+              board[2] = flip_disk[board[2]*8+1]
+              board[17] = flip_disk[board[17]*8+2]
+              board[33] = flip_disk[board[33]*8+1]
+              if fliped >= 6:
+                h ^= zflip[9]
+                flips |= 0x200
+                board[1] = flip_disk[board[1]*8+1]
+                board[16] = flip_disk[board[16]*8+1]
+                board[32] = flip_disk[board[32]*8+1]
+    i = board[22]*16+12+color
+    board[22] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[50]
+      flips |= 0x4000000000000
+      board[6] = flip_disk[board[6]*8+2]
+      board[10] = flip_disk[board[10]*8+6]
+      board[36] = flip_disk[board[36]*8+2]
+      if fliped >= 2:
+        h ^= zflip[43]
+        flips |= 0x80000000000
+        board[5] = flip_disk[board[5]*8+3]
+        board[11] = flip_disk[board[11]*8+5]
+        board[34] = flip_disk[board[34]*8+3]
+        if fliped >= 3:
+          h ^= zflip[36]
+          flips |= 0x1000000000
+          board[4] = flip_disk[board[4]*8+4]
+          board[12] = flip_disk[board[12]*8+4]
+          board[32] = flip_disk[board[32]*8+4]
+          if fliped >= 4:
+            h ^= zflip[29]
+            flips |= 0x20000000
+            board[3] = flip_disk[board[3]*8+5]
+            board[13] = flip_disk[board[13]*8+3]
+            board[30] = flip_disk[board[30]*8+3]
+            if fliped >= 5:
+              h ^= zflip[22]
+              flips |= 0x400000
+              board[2] = flip_disk[board[2]*8+6]
+              board[14] = flip_disk[board[14]*8+2]
+              board[28] = flip_disk[board[28]*8+2]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(57, color, flips)
   def putAt58(self, color):
-    self.__board[7],fliped = self.__index.flip_line(self.__board[7],2,color)
-    if fliped[0] >= 1:
-      self.__board[9] = self.__index.flip_disk(self.__board[9],7)
-      self.__board[22] = self.__index.flip_disk(self.__board[22],6)
-    if fliped[1] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],7)
-      self.__board[24] = self.__index.flip_disk(self.__board[24],4)
-      self.__board[36] = self.__index.flip_disk(self.__board[36],3)
-      if fliped[1] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],7)
-        self.__board[25] = self.__index.flip_disk(self.__board[25],3)
-        self.__board[35] = self.__index.flip_disk(self.__board[35],4)
-        if fliped[1] >= 3:
-          self.__board[13] = self.__index.flip_disk(self.__board[13],7)
-          self.__board[26] = self.__index.flip_disk(self.__board[26],2)
-          self.__board[34] = self.__index.flip_disk(self.__board[34],5)
-          if fliped[1] >= 4:
-            self.__board[14] = self.__index.flip_disk(self.__board[14],7)
-            self.__board[33] = self.__index.flip_disk(self.__board[33],6)
-    self.__board[10],fliped = self.__index.flip_line(self.__board[10],7,color)
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],5);
-      self.__board[36] = self.__index.flip_disk(self.__board[36],2);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-        self.__board[35] = self.__index.flip_disk(self.__board[35],2);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-          self.__board[34] = self.__index.flip_disk(self.__board[34],2);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-            self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-            self.__board[33] = self.__index.flip_disk(self.__board[33],2);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-              self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-              self.__board[32] = self.__index.flip_disk(self.__board[32],2);
-              if fliped[0] >= 6:
-                self.__board[1] = self.__index.flip_disk(self.__board[1],2);
-                self.__board[17] = self.__index.flip_disk(self.__board[17],1);
-                self.__board[31] = self.__index.flip_disk(self.__board[31],1);
-    self.__board[23],fliped = self.__index.flip_line(self.__board[23],5,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],6);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-          self.__board[13] = self.__index.flip_disk(self.__board[13],4);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-            self.__board[14] = self.__index.flip_disk(self.__board[14],3);
-            self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-    self.__board[37],fliped = self.__index.flip_line(self.__board[37],2,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],1);
-      self.__board[9] = self.__index.flip_disk(self.__board[9],6);
-      self.__board[21] = self.__index.flip_disk(self.__board[21],6);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[116+color]
+    i = board[7]*16+4+color
+    board[7] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[57]
+      flips |= 0x200000000000000
+      board[9] = flip_disk[board[9]*8+7]
+      board[22] = flip_disk[board[22]*8+6]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[59]
+      flips |= 0x800000000000000
+      board[11] = flip_disk[board[11]*8+7]
+      board[24] = flip_disk[board[24]*8+4]
+      board[36] = flip_disk[board[36]*8+3]
+      if fliped >= 2:
+        h ^= zflip[60]
+        flips |= 0x1000000000000000
+        board[12] = flip_disk[board[12]*8+7]
+        board[25] = flip_disk[board[25]*8+3]
+        board[35] = flip_disk[board[35]*8+4]
+        if fliped >= 3:
+          h ^= zflip[61]
+          flips |= 0x2000000000000000
+          board[13] = flip_disk[board[13]*8+7]
+          board[26] = flip_disk[board[26]*8+2]
+          board[34] = flip_disk[board[34]*8+5]
+          if fliped >= 4:
+            h ^= zflip[62]
+            flips |= 0x4000000000000000
+            board[14] = flip_disk[board[14]*8+7]
+            board[33] = flip_disk[board[33]*8+6]
+    i = board[10]*16+14+color
+    board[10] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[50]
+      flips |= 0x4000000000000
+      board[6] = flip_disk[board[6]*8+2]
+      board[22] = flip_disk[board[22]*8+5]
+      board[36] = flip_disk[board[36]*8+2]
+      if fliped >= 2:
+        h ^= zflip[42]
+        flips |= 0x40000000000
+        board[5] = flip_disk[board[5]*8+2]
+        board[21] = flip_disk[board[21]*8+5]
+        board[35] = flip_disk[board[35]*8+2]
+        if fliped >= 3:
+          h ^= zflip[34]
+          flips |= 0x400000000
+          board[4] = flip_disk[board[4]*8+2]
+          board[20] = flip_disk[board[20]*8+4]
+          board[34] = flip_disk[board[34]*8+2]
+          if fliped >= 4:
+            h ^= zflip[26]
+            flips |= 0x4000000
+            board[3] = flip_disk[board[3]*8+2]
+            board[19] = flip_disk[board[19]*8+3]
+            board[33] = flip_disk[board[33]*8+2]
+            if fliped >= 5:
+              h ^= zflip[18]
+              flips |= 0x40000
+              board[2] = flip_disk[board[2]*8+2]
+              board[18] = flip_disk[board[18]*8+2]
+              board[32] = flip_disk[board[32]*8+2]
+              if fliped >= 6:
+                h ^= zflip[10]
+                flips |= 0x400
+                board[1] = flip_disk[board[1]*8+2]
+                board[17] = flip_disk[board[17]*8+1]
+                board[31] = flip_disk[board[31]*8+1]
+    i = board[23]*16+10+color
+    board[23] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[51]
+      flips |= 0x8000000000000
+      board[6] = flip_disk[board[6]*8+3]
+      board[11] = flip_disk[board[11]*8+6]
+      board[35] = flip_disk[board[35]*8+3]
+      if fliped >= 2:
+        h ^= zflip[44]
+        flips |= 0x100000000000
+        board[5] = flip_disk[board[5]*8+4]
+        board[12] = flip_disk[board[12]*8+5]
+        board[33] = flip_disk[board[33]*8+4]
+        if fliped >= 3:
+          h ^= zflip[37]
+          flips |= 0x2000000000
+          board[4] = flip_disk[board[4]*8+5]
+          board[13] = flip_disk[board[13]*8+4]
+          board[31] = flip_disk[board[31]*8+4]
+          if fliped >= 4:
+            h ^= zflip[30]
+            flips |= 0x40000000
+            board[3] = flip_disk[board[3]*8+6]
+            board[14] = flip_disk[board[14]*8+3]
+            board[29] = flip_disk[board[29]*8+3]
+    i = board[37]*16+4+color
+    board[37] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[49]
+      flips |= 0x2000000000000
+      board[6] = flip_disk[board[6]*8+1]
+      board[9] = flip_disk[board[9]*8+6]
+      board[21] = flip_disk[board[21]*8+6]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(58, color, flips)
   def putAt59(self, color):
-    self.__board[7],fliped = self.__index.flip_line(self.__board[7],3,color)
-    if fliped[0] >= 1:
-      self.__board[10] = self.__index.flip_disk(self.__board[10],7)
-      self.__board[23] = self.__index.flip_disk(self.__board[23],5)
-      self.__board[37] = self.__index.flip_disk(self.__board[37],2)
-      if fliped[0] >= 2:
-        self.__board[9] = self.__index.flip_disk(self.__board[9],7)
-        self.__board[22] = self.__index.flip_disk(self.__board[22],6)
-    if fliped[1] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],7)
-      self.__board[25] = self.__index.flip_disk(self.__board[25],3)
-      self.__board[35] = self.__index.flip_disk(self.__board[35],4)
-      if fliped[1] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],7)
-        self.__board[26] = self.__index.flip_disk(self.__board[26],2)
-        self.__board[34] = self.__index.flip_disk(self.__board[34],5)
-        if fliped[1] >= 3:
-          self.__board[14] = self.__index.flip_disk(self.__board[14],7)
-          self.__board[33] = self.__index.flip_disk(self.__board[33],6)
-    self.__board[11],fliped = self.__index.flip_line(self.__board[11],7,color)
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],4);
-      self.__board[35] = self.__index.flip_disk(self.__board[35],3);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-        self.__board[34] = self.__index.flip_disk(self.__board[34],3);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-          self.__board[33] = self.__index.flip_disk(self.__board[33],3);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-            self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-            self.__board[32] = self.__index.flip_disk(self.__board[32],3);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],3);
-              self.__board[19] = self.__index.flip_disk(self.__board[19],2);
-              self.__board[31] = self.__index.flip_disk(self.__board[31],2);
-              if fliped[0] >= 6:
-                self.__board[1] = self.__index.flip_disk(self.__board[1],3);
-                self.__board[18] = self.__index.flip_disk(self.__board[18],1);
-                self.__board[30] = self.__index.flip_disk(self.__board[30],1);
-    self.__board[24],fliped = self.__index.flip_line(self.__board[24],4,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],6);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-          self.__board[14] = self.__index.flip_disk(self.__board[14],4);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-    self.__board[36],fliped = self.__index.flip_line(self.__board[36],3,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],2);
-      self.__board[10] = self.__index.flip_disk(self.__board[10],6);
-      self.__board[22] = self.__index.flip_disk(self.__board[22],5);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],1);
-        self.__board[9] = self.__index.flip_disk(self.__board[9],5);
-        self.__board[20] = self.__index.flip_disk(self.__board[20],5);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[118+color]
+    i = board[7]*16+6+color
+    board[7] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[58]
+      flips |= 0x400000000000000
+      board[10] = flip_disk[board[10]*8+7]
+      board[23] = flip_disk[board[23]*8+5]
+      board[37] = flip_disk[board[37]*8+2]
+      if fliped >= 2:
+        h ^= zflip[57]
+        flips |= 0x200000000000000
+        board[9] = flip_disk[board[9]*8+7]
+        board[22] = flip_disk[board[22]*8+6]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[60]
+      flips |= 0x1000000000000000
+      board[12] = flip_disk[board[12]*8+7]
+      board[25] = flip_disk[board[25]*8+3]
+      board[35] = flip_disk[board[35]*8+4]
+      if fliped >= 2:
+        h ^= zflip[61]
+        flips |= 0x2000000000000000
+        board[13] = flip_disk[board[13]*8+7]
+        board[26] = flip_disk[board[26]*8+2]
+        board[34] = flip_disk[board[34]*8+5]
+        if fliped >= 3:
+          h ^= zflip[62]
+          flips |= 0x4000000000000000
+          board[14] = flip_disk[board[14]*8+7]
+          board[33] = flip_disk[board[33]*8+6]
+    i = board[11]*16+14+color
+    board[11] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[51]
+      flips |= 0x8000000000000
+      board[6] = flip_disk[board[6]*8+3]
+      board[23] = flip_disk[board[23]*8+4]
+      board[35] = flip_disk[board[35]*8+3]
+      if fliped >= 2:
+        h ^= zflip[43]
+        flips |= 0x80000000000
+        board[5] = flip_disk[board[5]*8+3]
+        board[22] = flip_disk[board[22]*8+4]
+        board[34] = flip_disk[board[34]*8+3]
+        if fliped >= 3:
+          h ^= zflip[35]
+          flips |= 0x800000000
+          board[4] = flip_disk[board[4]*8+3]
+          board[21] = flip_disk[board[21]*8+4]
+          board[33] = flip_disk[board[33]*8+3]
+          if fliped >= 4:
+            h ^= zflip[27]
+            flips |= 0x8000000
+            board[3] = flip_disk[board[3]*8+3]
+            board[20] = flip_disk[board[20]*8+3]
+            board[32] = flip_disk[board[32]*8+3]
+            if fliped >= 5:
+              h ^= zflip[19]
+              flips |= 0x80000
+              board[2] = flip_disk[board[2]*8+3]
+              board[19] = flip_disk[board[19]*8+2]
+              board[31] = flip_disk[board[31]*8+2]
+              if fliped >= 6:
+                h ^= zflip[11]
+                flips |= 0x800
+                board[1] = flip_disk[board[1]*8+3]
+                board[18] = flip_disk[board[18]*8+1]
+                board[30] = flip_disk[board[30]*8+1]
+    i = board[24]*16+8+color
+    board[24] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[52]
+      flips |= 0x10000000000000
+      board[6] = flip_disk[board[6]*8+4]
+      board[12] = flip_disk[board[12]*8+6]
+      board[34] = flip_disk[board[34]*8+4]
+      if fliped >= 2:
+        h ^= zflip[45]
+        flips |= 0x200000000000
+        board[5] = flip_disk[board[5]*8+5]
+        board[13] = flip_disk[board[13]*8+5]
+        board[32] = flip_disk[board[32]*8+5]
+        if fliped >= 3:
+          h ^= zflip[38]
+          flips |= 0x4000000000
+          board[4] = flip_disk[board[4]*8+6]
+          board[14] = flip_disk[board[14]*8+4]
+          board[30] = flip_disk[board[30]*8+4]
+    i = board[36]*16+6+color
+    board[36] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[50]
+      flips |= 0x4000000000000
+      board[6] = flip_disk[board[6]*8+2]
+      board[10] = flip_disk[board[10]*8+6]
+      board[22] = flip_disk[board[22]*8+5]
+      if fliped >= 2:
+        h ^= zflip[41]
+        flips |= 0x20000000000
+        board[5] = flip_disk[board[5]*8+1]
+        board[9] = flip_disk[board[9]*8+5]
+        board[20] = flip_disk[board[20]*8+5]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(59, color, flips)
   def putAt60(self, color):
-    self.__board[7],fliped = self.__index.flip_line(self.__board[7],4,color)
-    if fliped[0] >= 1:
-      self.__board[11] = self.__index.flip_disk(self.__board[11],7)
-      self.__board[24] = self.__index.flip_disk(self.__board[24],4)
-      self.__board[36] = self.__index.flip_disk(self.__board[36],3)
-      if fliped[0] >= 2:
-        self.__board[10] = self.__index.flip_disk(self.__board[10],7)
-        self.__board[23] = self.__index.flip_disk(self.__board[23],5)
-        self.__board[37] = self.__index.flip_disk(self.__board[37],2)
-        if fliped[0] >= 3:
-          self.__board[9] = self.__index.flip_disk(self.__board[9],7)
-          self.__board[22] = self.__index.flip_disk(self.__board[22],6)
-    if fliped[1] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],7)
-      self.__board[26] = self.__index.flip_disk(self.__board[26],2)
-      self.__board[34] = self.__index.flip_disk(self.__board[34],5)
-      if fliped[1] >= 2:
-        self.__board[14] = self.__index.flip_disk(self.__board[14],7)
-        self.__board[33] = self.__index.flip_disk(self.__board[33],6)
-    self.__board[12],fliped = self.__index.flip_line(self.__board[12],7,color)
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],3);
-      self.__board[34] = self.__index.flip_disk(self.__board[34],4);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-        self.__board[33] = self.__index.flip_disk(self.__board[33],4);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-          self.__board[32] = self.__index.flip_disk(self.__board[32],4);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],4);
-            self.__board[21] = self.__index.flip_disk(self.__board[21],3);
-            self.__board[31] = self.__index.flip_disk(self.__board[31],3);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],4);
-              self.__board[20] = self.__index.flip_disk(self.__board[20],2);
-              self.__board[30] = self.__index.flip_disk(self.__board[30],2);
-              if fliped[0] >= 6:
-                self.__board[1] = self.__index.flip_disk(self.__board[1],4);
-                self.__board[19] = self.__index.flip_disk(self.__board[19],1);
-                self.__board[29] = self.__index.flip_disk(self.__board[29],1);
-    self.__board[25],fliped = self.__index.flip_line(self.__board[25],3,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],6);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],5);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-        self.__board[14] = self.__index.flip_disk(self.__board[14],5);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],5);
-    self.__board[35],fliped = self.__index.flip_line(self.__board[35],4,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],3);
-      self.__board[11] = self.__index.flip_disk(self.__board[11],6);
-      self.__board[23] = self.__index.flip_disk(self.__board[23],4);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],2);
-        self.__board[10] = self.__index.flip_disk(self.__board[10],5);
-        self.__board[21] = self.__index.flip_disk(self.__board[21],5);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],1);
-          self.__board[9] = self.__index.flip_disk(self.__board[9],4);
-          self.__board[19] = self.__index.flip_disk(self.__board[19],4);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[120+color]
+    i = board[7]*16+8+color
+    board[7] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[59]
+      flips |= 0x800000000000000
+      board[11] = flip_disk[board[11]*8+7]
+      board[24] = flip_disk[board[24]*8+4]
+      board[36] = flip_disk[board[36]*8+3]
+      if fliped >= 2:
+        h ^= zflip[58]
+        flips |= 0x400000000000000
+        board[10] = flip_disk[board[10]*8+7]
+        board[23] = flip_disk[board[23]*8+5]
+        board[37] = flip_disk[board[37]*8+2]
+        if fliped >= 3:
+          h ^= zflip[57]
+          flips |= 0x200000000000000
+          board[9] = flip_disk[board[9]*8+7]
+          board[22] = flip_disk[board[22]*8+6]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[61]
+      flips |= 0x2000000000000000
+      board[13] = flip_disk[board[13]*8+7]
+      board[26] = flip_disk[board[26]*8+2]
+      board[34] = flip_disk[board[34]*8+5]
+      if fliped >= 2:
+        h ^= zflip[62]
+        flips |= 0x4000000000000000
+        board[14] = flip_disk[board[14]*8+7]
+        board[33] = flip_disk[board[33]*8+6]
+    i = board[12]*16+14+color
+    board[12] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[52]
+      flips |= 0x10000000000000
+      board[6] = flip_disk[board[6]*8+4]
+      board[24] = flip_disk[board[24]*8+3]
+      board[34] = flip_disk[board[34]*8+4]
+      if fliped >= 2:
+        h ^= zflip[44]
+        flips |= 0x100000000000
+        board[5] = flip_disk[board[5]*8+4]
+        board[23] = flip_disk[board[23]*8+3]
+        board[33] = flip_disk[board[33]*8+4]
+        if fliped >= 3:
+          h ^= zflip[36]
+          flips |= 0x1000000000
+          board[4] = flip_disk[board[4]*8+4]
+          board[22] = flip_disk[board[22]*8+3]
+          board[32] = flip_disk[board[32]*8+4]
+          if fliped >= 4:
+            h ^= zflip[28]
+            flips |= 0x10000000
+            board[3] = flip_disk[board[3]*8+4]
+            board[21] = flip_disk[board[21]*8+3]
+            board[31] = flip_disk[board[31]*8+3]
+            if fliped >= 5:
+              h ^= zflip[20]
+              flips |= 0x100000
+              board[2] = flip_disk[board[2]*8+4]
+              board[20] = flip_disk[board[20]*8+2]
+              board[30] = flip_disk[board[30]*8+2]
+              if fliped >= 6:
+                h ^= zflip[12]
+                flips |= 0x1000
+                board[1] = flip_disk[board[1]*8+4]
+                board[19] = flip_disk[board[19]*8+1]
+                board[29] = flip_disk[board[29]*8+1]
+    i = board[25]*16+6+color
+    board[25] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[53]
+      flips |= 0x20000000000000
+      board[6] = flip_disk[board[6]*8+5]
+      board[13] = flip_disk[board[13]*8+6]
+      board[33] = flip_disk[board[33]*8+5]
+      if fliped >= 2:
+        h ^= zflip[46]
+        flips |= 0x400000000000
+        board[5] = flip_disk[board[5]*8+6]
+        board[14] = flip_disk[board[14]*8+5]
+        board[31] = flip_disk[board[31]*8+5]
+    i = board[35]*16+8+color
+    board[35] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[51]
+      flips |= 0x8000000000000
+      board[6] = flip_disk[board[6]*8+3]
+      board[11] = flip_disk[board[11]*8+6]
+      board[23] = flip_disk[board[23]*8+4]
+      if fliped >= 2:
+        h ^= zflip[42]
+        flips |= 0x40000000000
+        board[5] = flip_disk[board[5]*8+2]
+        board[10] = flip_disk[board[10]*8+5]
+        board[21] = flip_disk[board[21]*8+5]
+        if fliped >= 3:
+          h ^= zflip[33]
+          flips |= 0x200000000
+          board[4] = flip_disk[board[4]*8+1]
+          board[9] = flip_disk[board[9]*8+4]
+          board[19] = flip_disk[board[19]*8+4]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(60, color, flips)
   def putAt61(self, color):
-    self.__board[7],fliped = self.__index.flip_line(self.__board[7],5,color)
-    if fliped[0] >= 1:
-      self.__board[12] = self.__index.flip_disk(self.__board[12],7)
-      self.__board[25] = self.__index.flip_disk(self.__board[25],3)
-      self.__board[35] = self.__index.flip_disk(self.__board[35],4)
-      if fliped[0] >= 2:
-        self.__board[11] = self.__index.flip_disk(self.__board[11],7)
-        self.__board[24] = self.__index.flip_disk(self.__board[24],4)
-        self.__board[36] = self.__index.flip_disk(self.__board[36],3)
-        if fliped[0] >= 3:
-          self.__board[10] = self.__index.flip_disk(self.__board[10],7)
-          self.__board[23] = self.__index.flip_disk(self.__board[23],5)
-          self.__board[37] = self.__index.flip_disk(self.__board[37],2)
-          if fliped[0] >= 4:
-            self.__board[9] = self.__index.flip_disk(self.__board[9],7)
-            self.__board[22] = self.__index.flip_disk(self.__board[22],6)
-    if fliped[1] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],7)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],6)
-    self.__board[13],fliped = self.__index.flip_line(self.__board[13],7,color)
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-      self.__board[25] = self.__index.flip_disk(self.__board[25],2);
-      self.__board[33] = self.__index.flip_disk(self.__board[33],5);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-        self.__board[32] = self.__index.flip_disk(self.__board[32],5);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],5);
-          self.__board[23] = self.__index.flip_disk(self.__board[23],2);
-          self.__board[31] = self.__index.flip_disk(self.__board[31],4);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],5);
-            self.__board[22] = self.__index.flip_disk(self.__board[22],2);
-            self.__board[30] = self.__index.flip_disk(self.__board[30],3);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],5);
-              self.__board[21] = self.__index.flip_disk(self.__board[21],2);
-              self.__board[29] = self.__index.flip_disk(self.__board[29],2);
-              if fliped[0] >= 6:
-                self.__board[1] = self.__index.flip_disk(self.__board[1],5);
-                self.__board[20] = self.__index.flip_disk(self.__board[20],1);
-                self.__board[28] = self.__index.flip_disk(self.__board[28],1);
-    self.__board[26],fliped = self.__index.flip_line(self.__board[26],2,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],6);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],6);
-    self.__board[34],fliped = self.__index.flip_line(self.__board[34],5,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],4);
-      self.__board[12] = self.__index.flip_disk(self.__board[12],6);
-      self.__board[24] = self.__index.flip_disk(self.__board[24],3);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],3);
-        self.__board[11] = self.__index.flip_disk(self.__board[11],5);
-        self.__board[22] = self.__index.flip_disk(self.__board[22],4);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],2);
-          self.__board[10] = self.__index.flip_disk(self.__board[10],4);
-          self.__board[20] = self.__index.flip_disk(self.__board[20],4);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],1);
-            self.__board[9] = self.__index.flip_disk(self.__board[9],3);
-            self.__board[18] = self.__index.flip_disk(self.__board[18],3);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_right = self.__flip_right
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[122+color]
+    i = board[7]*16+10+color
+    board[7] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[60]
+      flips |= 0x1000000000000000
+      board[12] = flip_disk[board[12]*8+7]
+      board[25] = flip_disk[board[25]*8+3]
+      board[35] = flip_disk[board[35]*8+4]
+      if fliped >= 2:
+        h ^= zflip[59]
+        flips |= 0x800000000000000
+        board[11] = flip_disk[board[11]*8+7]
+        board[24] = flip_disk[board[24]*8+4]
+        board[36] = flip_disk[board[36]*8+3]
+        if fliped >= 3:
+          h ^= zflip[58]
+          flips |= 0x400000000000000
+          board[10] = flip_disk[board[10]*8+7]
+          board[23] = flip_disk[board[23]*8+5]
+          board[37] = flip_disk[board[37]*8+2]
+          if fliped >= 4:
+            h ^= zflip[57]
+            flips |= 0x200000000000000
+            board[9] = flip_disk[board[9]*8+7]
+            board[22] = flip_disk[board[22]*8+6]
+    fliped = flip_right[i]
+    if fliped >= 1:
+      h ^= zflip[62]
+      flips |= 0x4000000000000000
+      board[14] = flip_disk[board[14]*8+7]
+      board[33] = flip_disk[board[33]*8+6]
+    i = board[13]*16+14+color
+    board[13] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[53]
+      flips |= 0x20000000000000
+      board[6] = flip_disk[board[6]*8+5]
+      board[25] = flip_disk[board[25]*8+2]
+      board[33] = flip_disk[board[33]*8+5]
+      if fliped >= 2:
+        h ^= zflip[45]
+        flips |= 0x200000000000
+        board[5] = flip_disk[board[5]*8+5]
+        board[24] = flip_disk[board[24]*8+2]
+        board[32] = flip_disk[board[32]*8+5]
+        if fliped >= 3:
+          h ^= zflip[37]
+          flips |= 0x2000000000
+          board[4] = flip_disk[board[4]*8+5]
+          board[23] = flip_disk[board[23]*8+2]
+          board[31] = flip_disk[board[31]*8+4]
+          if fliped >= 4:
+            h ^= zflip[29]
+            flips |= 0x20000000
+            board[3] = flip_disk[board[3]*8+5]
+            board[22] = flip_disk[board[22]*8+2]
+            board[30] = flip_disk[board[30]*8+3]
+            if fliped >= 5:
+              h ^= zflip[21]
+              flips |= 0x200000
+              board[2] = flip_disk[board[2]*8+5]
+              board[21] = flip_disk[board[21]*8+2]
+              board[29] = flip_disk[board[29]*8+2]
+              if fliped >= 6:
+                h ^= zflip[13]
+                flips |= 0x2000
+                board[1] = flip_disk[board[1]*8+5]
+                board[20] = flip_disk[board[20]*8+1]
+                board[28] = flip_disk[board[28]*8+1]
+    i = board[26]*16+4+color
+    board[26] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[54]
+      flips |= 0x40000000000000
+      board[6] = flip_disk[board[6]*8+6]
+      board[14] = flip_disk[board[14]*8+6]
+      board[32] = flip_disk[board[32]*8+6]
+    i = board[34]*16+10+color
+    board[34] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[52]
+      flips |= 0x10000000000000
+      board[6] = flip_disk[board[6]*8+4]
+      board[12] = flip_disk[board[12]*8+6]
+      board[24] = flip_disk[board[24]*8+3]
+      if fliped >= 2:
+        h ^= zflip[43]
+        flips |= 0x80000000000
+        board[5] = flip_disk[board[5]*8+3]
+        board[11] = flip_disk[board[11]*8+5]
+        board[22] = flip_disk[board[22]*8+4]
+        if fliped >= 3:
+          h ^= zflip[34]
+          flips |= 0x400000000
+          board[4] = flip_disk[board[4]*8+2]
+          board[10] = flip_disk[board[10]*8+4]
+          board[20] = flip_disk[board[20]*8+4]
+          if fliped >= 4:
+            h ^= zflip[25]
+            flips |= 0x2000000
+            board[3] = flip_disk[board[3]*8+1]
+            board[9] = flip_disk[board[9]*8+3]
+            board[18] = flip_disk[board[18]*8+3]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(61, color, flips)
   def putAt62(self, color):
-    self.__board[7],fliped = self.__index.flip_line(self.__board[7],6,color)
-    if fliped[0] >= 1:
-      self.__board[13] = self.__index.flip_disk(self.__board[13],7)
-      self.__board[26] = self.__index.flip_disk(self.__board[26],2)
-      self.__board[34] = self.__index.flip_disk(self.__board[34],5)
-      if fliped[0] >= 2:
-        self.__board[12] = self.__index.flip_disk(self.__board[12],7)
-        self.__board[25] = self.__index.flip_disk(self.__board[25],3)
-        self.__board[35] = self.__index.flip_disk(self.__board[35],4)
-        if fliped[0] >= 3:
-          self.__board[11] = self.__index.flip_disk(self.__board[11],7)
-          self.__board[24] = self.__index.flip_disk(self.__board[24],4)
-          self.__board[36] = self.__index.flip_disk(self.__board[36],3)
-          if fliped[0] >= 4:
-            self.__board[10] = self.__index.flip_disk(self.__board[10],7)
-            self.__board[23] = self.__index.flip_disk(self.__board[23],5)
-            self.__board[37] = self.__index.flip_disk(self.__board[37],2)
-            if fliped[0] >= 5:
-              self.__board[9] = self.__index.flip_disk(self.__board[9],7)
-              self.__board[22] = self.__index.flip_disk(self.__board[22],6)
-    self.__board[14],fliped = self.__index.flip_line(self.__board[14],7,color)
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-      self.__board[26] = self.__index.flip_disk(self.__board[26],1);
-      self.__board[32] = self.__index.flip_disk(self.__board[32],6);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],6);
-        self.__board[25] = self.__index.flip_disk(self.__board[25],1);
-        self.__board[31] = self.__index.flip_disk(self.__board[31],5);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],6);
-          self.__board[24] = self.__index.flip_disk(self.__board[24],1);
-          self.__board[30] = self.__index.flip_disk(self.__board[30],4);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],6);
-            self.__board[23] = self.__index.flip_disk(self.__board[23],1);
-            self.__board[29] = self.__index.flip_disk(self.__board[29],3);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],6);
-              self.__board[22] = self.__index.flip_disk(self.__board[22],1);
-              self.__board[28] = self.__index.flip_disk(self.__board[28],2);
-              if fliped[0] >= 6:
-                self.__board[1] = self.__index.flip_disk(self.__board[1],6);
-                self.__board[21] = self.__index.flip_disk(self.__board[21],1);
-                self.__board[27] = self.__index.flip_disk(self.__board[27],1);
-    self.__board[33],fliped = self.__index.flip_line(self.__board[33],6,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],5);
-      self.__board[13] = self.__index.flip_disk(self.__board[13],6);
-      self.__board[25] = self.__index.flip_disk(self.__board[25],2);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],4);
-        self.__board[12] = self.__index.flip_disk(self.__board[12],5);
-        self.__board[23] = self.__index.flip_disk(self.__board[23],3);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],3);
-          self.__board[11] = self.__index.flip_disk(self.__board[11],4);
-          self.__board[21] = self.__index.flip_disk(self.__board[21],4);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],2);
-            self.__board[10] = self.__index.flip_disk(self.__board[10],3);
-            self.__board[19] = self.__index.flip_disk(self.__board[19],3);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],1);
-              self.__board[9] = self.__index.flip_disk(self.__board[9],2);
-              self.__board[17] = self.__index.flip_disk(self.__board[17],2);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[124+color]
+    i = board[7]*16+12+color
+    board[7] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[61]
+      flips |= 0x2000000000000000
+      board[13] = flip_disk[board[13]*8+7]
+      board[26] = flip_disk[board[26]*8+2]
+      board[34] = flip_disk[board[34]*8+5]
+      if fliped >= 2:
+        h ^= zflip[60]
+        flips |= 0x1000000000000000
+        board[12] = flip_disk[board[12]*8+7]
+        board[25] = flip_disk[board[25]*8+3]
+        board[35] = flip_disk[board[35]*8+4]
+        if fliped >= 3:
+          h ^= zflip[59]
+          flips |= 0x800000000000000
+          board[11] = flip_disk[board[11]*8+7]
+          board[24] = flip_disk[board[24]*8+4]
+          board[36] = flip_disk[board[36]*8+3]
+          if fliped >= 4:
+            h ^= zflip[58]
+            flips |= 0x400000000000000
+            board[10] = flip_disk[board[10]*8+7]
+            board[23] = flip_disk[board[23]*8+5]
+            board[37] = flip_disk[board[37]*8+2]
+            if fliped >= 5:
+              h ^= zflip[57]
+              flips |= 0x200000000000000
+              board[9] = flip_disk[board[9]*8+7]
+              board[22] = flip_disk[board[22]*8+6]
+    i = board[14]*16+14+color
+    board[14] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[54]
+      flips |= 0x40000000000000
+      board[6] = flip_disk[board[6]*8+6]
+      board[26] = flip_disk[board[26]*8+1]
+      board[32] = flip_disk[board[32]*8+6]
+      if fliped >= 2:
+        h ^= zflip[46]
+        flips |= 0x400000000000
+        board[5] = flip_disk[board[5]*8+6]
+        board[25] = flip_disk[board[25]*8+1]
+        board[31] = flip_disk[board[31]*8+5]
+        if fliped >= 3:
+          h ^= zflip[38]
+          flips |= 0x4000000000
+          board[4] = flip_disk[board[4]*8+6]
+          board[24] = flip_disk[board[24]*8+1]
+          board[30] = flip_disk[board[30]*8+4]
+          if fliped >= 4:
+            h ^= zflip[30]
+            flips |= 0x40000000
+            board[3] = flip_disk[board[3]*8+6]
+            board[23] = flip_disk[board[23]*8+1]
+            board[29] = flip_disk[board[29]*8+3]
+            if fliped >= 5:
+              h ^= zflip[22]
+              flips |= 0x400000
+              board[2] = flip_disk[board[2]*8+6]
+              board[22] = flip_disk[board[22]*8+1]
+              board[28] = flip_disk[board[28]*8+2]
+              if fliped >= 6:
+                h ^= zflip[14]
+                flips |= 0x4000
+                board[1] = flip_disk[board[1]*8+6]
+                board[21] = flip_disk[board[21]*8+1]
+                board[27] = flip_disk[board[27]*8+1]
+    i = board[33]*16+12+color
+    board[33] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[53]
+      flips |= 0x20000000000000
+      board[6] = flip_disk[board[6]*8+5]
+      board[13] = flip_disk[board[13]*8+6]
+      board[25] = flip_disk[board[25]*8+2]
+      if fliped >= 2:
+        h ^= zflip[44]
+        flips |= 0x100000000000
+        board[5] = flip_disk[board[5]*8+4]
+        board[12] = flip_disk[board[12]*8+5]
+        board[23] = flip_disk[board[23]*8+3]
+        if fliped >= 3:
+          h ^= zflip[35]
+          flips |= 0x800000000
+          board[4] = flip_disk[board[4]*8+3]
+          board[11] = flip_disk[board[11]*8+4]
+          board[21] = flip_disk[board[21]*8+4]
+          if fliped >= 4:
+            h ^= zflip[26]
+            flips |= 0x4000000
+            board[3] = flip_disk[board[3]*8+2]
+            board[10] = flip_disk[board[10]*8+3]
+            board[19] = flip_disk[board[19]*8+3]
+            if fliped >= 5:
+              h ^= zflip[17]
+              flips |= 0x20000
+              board[2] = flip_disk[board[2]*8+1]
+              board[9] = flip_disk[board[9]*8+2]
+              board[17] = flip_disk[board[17]*8+2]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(62, color, flips)
   def putAt63(self, color):
-    self.__board[7],fliped = self.__index.flip_line(self.__board[7],7,color)
-    if fliped[0] >= 1:
-      self.__board[14] = self.__index.flip_disk(self.__board[14],7)
-      self.__board[33] = self.__index.flip_disk(self.__board[33],6)
-      if fliped[0] >= 2:
-        self.__board[13] = self.__index.flip_disk(self.__board[13],7)
-        self.__board[26] = self.__index.flip_disk(self.__board[26],2)
-        self.__board[34] = self.__index.flip_disk(self.__board[34],5)
-        if fliped[0] >= 3:
-          self.__board[12] = self.__index.flip_disk(self.__board[12],7)
-          self.__board[25] = self.__index.flip_disk(self.__board[25],3)
-          self.__board[35] = self.__index.flip_disk(self.__board[35],4)
-          if fliped[0] >= 4:
-            self.__board[11] = self.__index.flip_disk(self.__board[11],7)
-            self.__board[24] = self.__index.flip_disk(self.__board[24],4)
-            self.__board[36] = self.__index.flip_disk(self.__board[36],3)
-            if fliped[0] >= 5:
-              self.__board[10] = self.__index.flip_disk(self.__board[10],7)
-              self.__board[23] = self.__index.flip_disk(self.__board[23],5)
-              self.__board[37] = self.__index.flip_disk(self.__board[37],2)
-              if fliped[0] >= 6:
-                self.__board[9] = self.__index.flip_disk(self.__board[9],7)
-                self.__board[22] = self.__index.flip_disk(self.__board[22],6)
-    self.__board[15],fliped = self.__index.flip_line(self.__board[15],7,color)
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],7);
-      self.__board[31] = self.__index.flip_disk(self.__board[31],6);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],7);
-        self.__board[26] = self.__index.flip_disk(self.__board[26],0);
-        self.__board[30] = self.__index.flip_disk(self.__board[30],5);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],7);
-          self.__board[25] = self.__index.flip_disk(self.__board[25],0);
-          self.__board[29] = self.__index.flip_disk(self.__board[29],4);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],7);
-            self.__board[24] = self.__index.flip_disk(self.__board[24],0);
-            self.__board[28] = self.__index.flip_disk(self.__board[28],3);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],7);
-              self.__board[23] = self.__index.flip_disk(self.__board[23],0);
-              self.__board[27] = self.__index.flip_disk(self.__board[27],2);
-              if fliped[0] >= 6:
-                self.__board[1] = self.__index.flip_disk(self.__board[1],7);
-                self.__board[22] = self.__index.flip_disk(self.__board[22],0);
-    self.__board[32],fliped = self.__index.flip_line(self.__board[32],7,color);
-    if fliped[0] >= 1:
-      self.__board[6] = self.__index.flip_disk(self.__board[6],6);
-      self.__board[14] = self.__index.flip_disk(self.__board[14],6);
-      self.__board[26] = self.__index.flip_disk(self.__board[26],1);
-      if fliped[0] >= 2:
-        self.__board[5] = self.__index.flip_disk(self.__board[5],5);
-        self.__board[13] = self.__index.flip_disk(self.__board[13],5);
-        self.__board[24] = self.__index.flip_disk(self.__board[24],2);
-        if fliped[0] >= 3:
-          self.__board[4] = self.__index.flip_disk(self.__board[4],4);
-          self.__board[12] = self.__index.flip_disk(self.__board[12],4);
-          self.__board[22] = self.__index.flip_disk(self.__board[22],3);
-          if fliped[0] >= 4:
-            self.__board[3] = self.__index.flip_disk(self.__board[3],3);
-            self.__board[11] = self.__index.flip_disk(self.__board[11],3);
-            self.__board[20] = self.__index.flip_disk(self.__board[20],3);
-            if fliped[0] >= 5:
-              self.__board[2] = self.__index.flip_disk(self.__board[2],2);
-              self.__board[10] = self.__index.flip_disk(self.__board[10],2);
-              self.__board[18] = self.__index.flip_disk(self.__board[18],2);
-              if fliped[0] >= 6:
-                self.__board[1] = self.__index.flip_disk(self.__board[1],1);
-                self.__board[9] = self.__index.flip_disk(self.__board[9],1);
-                self.__board[16] = self.__index.flip_disk(self.__board[16],1);
+    board = self.__board
+    self.__ply += 1
+    self.__undo_buffer[self.__ply][:] = board
+    self.__hash_buffer[self.__ply] = h = self.__hash
+    flips = 0  # 裏返した石のbitmask
+    new_code = self.__new_code
+    flip_left = self.__flip_left
+    flip_disk = self.__flip_disk
+    zflip = ZOBRIST_FLIP
+    h ^= ZOBRIST[126+color]
+    i = board[7]*16+14+color
+    board[7] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[62]
+      flips |= 0x4000000000000000
+      board[14] = flip_disk[board[14]*8+7]
+      board[33] = flip_disk[board[33]*8+6]
+      if fliped >= 2:
+        h ^= zflip[61]
+        flips |= 0x2000000000000000
+        board[13] = flip_disk[board[13]*8+7]
+        board[26] = flip_disk[board[26]*8+2]
+        board[34] = flip_disk[board[34]*8+5]
+        if fliped >= 3:
+          h ^= zflip[60]
+          flips |= 0x1000000000000000
+          board[12] = flip_disk[board[12]*8+7]
+          board[25] = flip_disk[board[25]*8+3]
+          board[35] = flip_disk[board[35]*8+4]
+          if fliped >= 4:
+            h ^= zflip[59]
+            flips |= 0x800000000000000
+            board[11] = flip_disk[board[11]*8+7]
+            board[24] = flip_disk[board[24]*8+4]
+            board[36] = flip_disk[board[36]*8+3]
+            if fliped >= 5:
+              h ^= zflip[58]
+              flips |= 0x400000000000000
+              board[10] = flip_disk[board[10]*8+7]
+              board[23] = flip_disk[board[23]*8+5]
+              board[37] = flip_disk[board[37]*8+2]
+              if fliped >= 6:
+                h ^= zflip[57]
+                flips |= 0x200000000000000
+                board[9] = flip_disk[board[9]*8+7]
+                board[22] = flip_disk[board[22]*8+6]
+    i = board[15]*16+14+color
+    board[15] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[55]
+      flips |= 0x80000000000000
+      board[6] = flip_disk[board[6]*8+7]
+      board[31] = flip_disk[board[31]*8+6]
+      if fliped >= 2:
+        h ^= zflip[47]
+        flips |= 0x800000000000
+        board[5] = flip_disk[board[5]*8+7]
+        board[26] = flip_disk[board[26]*8+0]
+        board[30] = flip_disk[board[30]*8+5]
+        if fliped >= 3:
+          h ^= zflip[39]
+          flips |= 0x8000000000
+          board[4] = flip_disk[board[4]*8+7]
+          board[25] = flip_disk[board[25]*8+0]
+          board[29] = flip_disk[board[29]*8+4]
+          if fliped >= 4:
+            h ^= zflip[31]
+            flips |= 0x80000000
+            board[3] = flip_disk[board[3]*8+7]
+            board[24] = flip_disk[board[24]*8+0]
+            board[28] = flip_disk[board[28]*8+3]
+            if fliped >= 5:
+              h ^= zflip[23]
+              flips |= 0x800000
+              board[2] = flip_disk[board[2]*8+7]
+              board[23] = flip_disk[board[23]*8+0]
+              board[27] = flip_disk[board[27]*8+2]
+              if fliped >= 6:
+                h ^= zflip[15]
+                flips |= 0x8000
+                board[1] = flip_disk[board[1]*8+7]
+                board[22] = flip_disk[board[22]*8+0]
+    i = board[32]*16+14+color
+    board[32] = new_code[i]
+    fliped = flip_left[i]
+    if fliped >= 1:
+      h ^= zflip[54]
+      flips |= 0x40000000000000
+      board[6] = flip_disk[board[6]*8+6]
+      board[14] = flip_disk[board[14]*8+6]
+      board[26] = flip_disk[board[26]*8+1]
+      if fliped >= 2:
+        h ^= zflip[45]
+        flips |= 0x200000000000
+        board[5] = flip_disk[board[5]*8+5]
+        board[13] = flip_disk[board[13]*8+5]
+        board[24] = flip_disk[board[24]*8+2]
+        if fliped >= 3:
+          h ^= zflip[36]
+          flips |= 0x1000000000
+          board[4] = flip_disk[board[4]*8+4]
+          board[12] = flip_disk[board[12]*8+4]
+          board[22] = flip_disk[board[22]*8+3]
+          if fliped >= 4:
+            h ^= zflip[27]
+            flips |= 0x8000000
+            board[3] = flip_disk[board[3]*8+3]
+            board[11] = flip_disk[board[11]*8+3]
+            board[20] = flip_disk[board[20]*8+3]
+            if fliped >= 5:
+              h ^= zflip[18]
+              flips |= 0x40000
+              board[2] = flip_disk[board[2]*8+2]
+              board[10] = flip_disk[board[10]*8+2]
+              board[18] = flip_disk[board[18]*8+2]
+              if fliped >= 6:
+                h ^= zflip[9]
+                flips |= 0x200
+                board[1] = flip_disk[board[1]*8+1]
+                board[9] = flip_disk[board[9]*8+1]
+                board[16] = flip_disk[board[16]*8+1]
+    self.__hash = h
+    if self.__eval is not None:
+      self.__update_eval(63, color, flips)
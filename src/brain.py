@@ -1,18 +1,106 @@
 # -*- coding:utf-8 -*-
 
+import os
+import math
+import time
+
 import othello
+import parallel
+import timer
+import transposition
+import weights
+
+# 探索の制限時間を過ぎたときに探索関数から投げられる
+class SearchTimeout(Exception):
+  pass
+
+MPC_FILE = os.path.join(weights.WEIGHT_DIR, 'mpc.txt')  # Multi-ProbCutのパラメータ. learn/mpc.py で作る
+
+_NO_CHILDREN = {}  # MoveOrderingしていない節点の着手済みの局面(なし)
+
+# 探索の停止フラグ(multiprocessing.Valueと同じくvalueを持つ). 並列探索しないときは立たない
+class _NoStop:
+  value = 0
+_NO_STOP = _NoStop()
+
+# マスが属する盤面の4分割の領域(左上・右上・左下・右下)のビット. 終盤の偶奇(parity)による手の順序付けに使う
+_QUADRANT = [1 << ((pos >> 5) * 2 + ((pos & 7) >> 2)) for pos in range(64)]
+
+# 期限がない(None)場合は無限の未来とする
+def _deadline(t):
+  if t is None:
+    return float('inf')
+  return t
+
+# Lazy SMP のhelper番目のヘルパーが読むルートの手の順序. 先頭の手はそのままで, 2番目以降をhelperだけずらす
+def _rotate_moves(placeable_cells, helper):
+  if len(placeable_cells) <= 2:
+    return placeable_cells
+  k = 1 + helper % (len(placeable_cells) - 1)
+  return placeable_cells[:1] + placeable_cells[k:] + placeable_cells[1:k]
+
+#######################################################################################################################
+# killer move と history heuristic による手の順序付け
+# 枝刈り(beta cut)を起こした手を覚えておき, 他の節点でも先に探索する. 盤面を動かさないので葉の近くでも使える.
+#   killer : ルートからの手数(ply)毎に, 直近で枝刈りを起こした2手
+#   history: 手番・マス毎に, 枝刈りを起こした回数を 2^(残りの深さ) で重み付けして足したもの
+class MoveHistory():
+  MAX_PLY = 64
+
+  def __init__(self):
+    self.__killers = [[None, None] for i in range(MoveHistory.MAX_PLY)]
+    self.__history = [[0] * 64, [0] * 64]
+
+  # 新しい探索を始める. killerは局面が変わると当てにならないので捨て, historyは重みを半分にして引き継ぐ
+  def new_search(self):
+    for killers in self.__killers:
+      killers[0] = killers[1] = None
+    for history in self.__history:
+      for pos in range(64):
+        history[pos] >>= 1
+
+  # 手番colorの位置posの手が, ルートからply手目・残りの深さheightの節点で枝刈りを起こした
+  def cutoff(self, pos, color, ply, height):
+    killers = self.__killers[ply]
+    if killers[0] != pos:
+      killers[1] = killers[0]
+      killers[0] = pos
+    self.__history[color][pos] += 1 << height
+
+  # 手番colorの history (マス毎の値のリスト)
+  def get(self, color):
+    return self.__history[color]
+
+  # 着手可能位置のリストを history の大きい順に並べ, killer を先頭に移す
+  def order(self, list_pos, color, ply):
+    list_pos = sorted(list_pos, key=self.__history[color].__getitem__, reverse=True)
+    return self.promote(list_pos, ply)
+
+  # 着手可能位置のリストの順序はそのままで killer を先頭に移す
+  def promote(self, list_pos, ply):
+    killer0, killer1 = self.__killers[ply]
+    if killer1 in list_pos:
+      list_pos.remove(killer1)
+      list_pos.insert(0, killer1)
+    if killer0 in list_pos:
+      list_pos.remove(killer0)
+      list_pos.insert(0, killer0)
+    return list_pos
+
 
 #######################################################################################################################
 # 序盤戦用探索アルゴリズム
 # 定石集を用いた着手位置の選択
 class BrainBook():
-  def __init__(self, board, color, opening_book):
+  def __init__(self, board, color, opening_book, time_manager=None):
     self.__board = board  # boardへの参照
     self.__color = color  # 自分の色
     self.__opening_book = opening_book
+    self.__timer = time_manager or timer.TimeManager()  # 時間配分
 
   # OpeningBookを参照して次の手を返す
-  def evaluate(self, _):
+  def evaluate(self, num_discs):
+    self.__timer.start(num_discs, timer.BOOK)
     x, y = self.__opening_book.read()
     return x + y * 8
 
@@ -22,48 +110,238 @@ class BrainBook():
 
 #######################################################################################################################
 # 中盤戦用探索アルゴリズム
-# 探索:AlphaBeta, 盤面評価:位置+着手可能手数+確定石数, MoveOrdering:1手先の盤面評価値
+# 探索:AlphaBeta+Multi-ProbCut, 盤面評価:位置+着手可能手数+確定石数, MoveOrdering:1手先の盤面評価値
 class BrainMid():
   NUM_STAGES = 60/4
   NUM_FEATURES = 11
   NUM_PATTARNS = [3**8]*3 + [3**4, 3**5, 3**6, 3**7, 3**8] + [3**10]*2 + [3**9]
+  MPC_EPS = 1e-6  # Multi-ProbCutの浅い探索のnull windowの幅
 
-  def __init__(self, board, color, weight=None):
+  def __init__(self, board, color, weight=None, time_manager=None):
     self.__board = board  # boardへの参照
     self.__color = color  # 自分の色
     if weight is None:
-      self.__weight = self.__load_weights()
-    else:
-      self.__weight = weight  # Logistello重み
+      weight = self.__load_weights()
+    self.__shared = None      # 重みを共有するハンドル(weights.SharedWeights). 重みをリストで渡された場合はNone
+    self.__scale = 1          # 評価値の1石あたりの値. 量子化した重みならweights.QUANT_SCALEで, 評価値は整数になる
+    self.__weight = self.__attach(weight)  # Logistello重み
     self.__stage = None       # 盤面評価関数で使用するステージ
+    self.__stage_key = 0      # 置換表のキーに混ぜるステージ毎の値. 同じ局面でもステージが違えば評価値が違うため
+    self.__timer = time_manager or timer.TimeManager()  # 時間配分
+    self.__deadline = None    # 探索を打ち切る時刻
+    self.__nodes = 0          # 探索した内部節点の数
+    # 置換表. ゲーム中は着手をまたいで使い回す
+    self.__tt = transposition.TranspositionTable(othello.Config.MID_TT_ENTRIES, othello.Config.MID_TT_MB)
+    self.__mpc = BrainMid.load_mpc()  # Multi-ProbCutのパラメータ
+    self.__mpc_t = None               # Multi-ProbCutの閾値. Noneなら使わない
+    self.__history = MoveHistory()    # killer move と history heuristic. 着手をまたいで使い回す
+    self.__root_height = 0            # 今の反復の深さ. ルートからの手数は root_height - height
+    self.__num_discs = 0              # ルートの石数
+    self.__splitter = None            # ルート分割による並列探索. Config.MID_WORKERS が2以上ならevaluateで作る
+    self.__smp = None                 # Lazy SMP (parallel.LazySMP). set_smpで設定する
+    self.__stop = _NO_STOP            # 立っていたら探索を打ち切るフラグ(Lazy SMPのプロセス間で共有)
 
   # 現盤面の全着手可能位置をそれぞれ評価し,評価値が最大となる位置を返す.
+  # 反復深化: 深さ1から1ずつ深くしながら時間配分の期限まで探索し, 最後に探索し終えた深さの最善手を返す.
+  # 各深さでは前の深さの最善手から探索し, 前の深さまでの評価値を中心とした窓(aspiration window)で探索する.
+  # Lazy SMP: ヘルパーのプロセスも同じ局面を置換表を共有して探索し, ヘルパーの方が深い反復を終えていればその手を返す.
   def evaluate(self, num_discs):
+    self.__timer.start(num_discs, timer.MID)
+    self.__deadline = _deadline(self.__timer.hard)
+    self.__nodes = 0
+    self.__mpc_t = othello.Config.MPC_T
+    self.__tt.new_search()
+    self.__history.new_search()
+    self.__num_discs = num_discs
+    if othello.Config.MID_WORKERS > 1 and self.__splitter is None and self.__smp is None:
+      self.__splitter = parallel.get_root_splitter(othello.Config.MID_WORKERS, self.get_shared_weight())
+    state = self.__board.get_state()  # 打ち切ったときに盤面を戻すため
+    if self.__smp is not None:
+      self.__smp.start(timer.MID, state, self.__color, num_discs, self.__deadline)
+
+    self.__set_stage(num_discs + 1)
+    placeable_cells = self.__board.placeable_cells(self.__color)
+    placeable_cells, _ = self.__move_ordering(placeable_cells, self.__color)
+    res = placeable_cells[0]
+    depth = 0    # 探索し終えた深さ
+    values = {}  # 深さ毎の評価値
+    max_height = min(othello.Config.MID_HEIGHT, 60 - num_discs)
+    try:
+      for height in range(1, max_height + 1):
+        res, values[height] = self.__iterate(placeable_cells, num_discs, height, values)
+        depth = height
+        if self.__smp is not None:
+          self.__smp.publish(depth, res, values[depth])
+        # 次の深さは今の深さより時間がかかるので, soft deadlineを過ぎていたら始めない
+        self.__timer.iteration_done(res)
+        if time.time() > _deadline(self.__timer.soft):
+          break
+    except SearchTimeout:
+      self.__board.restore_state(state)
+    if self.__smp is not None:
+      published = self.__smp.finish()
+      if published is not None and published[0] > depth:
+        depth, res, values[depth] = published
+    print "depth:{0} value:{1} tt".format(depth, self.__to_discs(values.get(depth))), self.__tt
+    self.__tt.reset_stats()
+    return res
+
+  # Lazy SMP のヘルパーとして現盤面を反復深化で探索し, 反復を終える度に publish(深さ, 最善手, 評価値) を呼ぶ.
+  # メインの探索と違う部分木から探索するように, helper番目のヘルパーは深さを helper%2 だけ先から始め,
+  # ルートの2番目以降の手の順序をhelperだけずらす. 期限deadlineを過ぎるか停止フラグが立つまで探索する.
+  def search_helper(self, num_discs, helper, deadline, publish):
+    self.__deadline = deadline
+    self.__nodes = 0
+    self.__mpc_t = othello.Config.MPC_T
+    self.__history.new_search()
+    self.__set_stage(num_discs + 1)
+    placeable_cells, _ = self.__move_ordering(self.__board.placeable_cells(self.__color), self.__color)
+    placeable_cells = _rotate_moves(placeable_cells, helper)
+    values = {}
+    max_height = min(othello.Config.MID_HEIGHT, 60 - num_discs)
+    try:
+      for height in range(1 + helper % 2, max_height + 1):
+        pos, values[height] = self.__iterate(placeable_cells, num_discs, height, values)
+        publish(height, pos, values[height])
+    except SearchTimeout:
+      pass
+
+  # 反復深化の1反復: 深さheightでルートを探索し, 最善手を placeable_cells の先頭に移す
+  # values: それまでの深さ毎の評価値(aspiration windowの中心に使う)
+  # <返値> (最善手, 評価値)
+  def __iterate(self, placeable_cells, num_discs, height, values):
     # 探索関数にnum_discsを渡してincするのはだるいので,
     # num_discs+探索木の高さ から盤面評価関数が呼び出された時点での盤面でのstageを計算してしまう。
     # 途中パスでゲーム終了してしまうような場合には誤った値となるが、まぁそれはいいとする。
-    self.__stage = (num_discs + othello.Config.MID_HEIGHT) / 4
-    placeable_cells = self.__board.placeable_cells(self.__color)
-    placeable_cells = self.__move_ordering(placeable_cells, self.__color)
+    self.__set_stage(num_discs + height)
+    self.__root_height = height
+    # 評価値は深さの偶奇で大きく振れるので, 窓の中心には2つ前の深さの評価値を使う
+    prev = values.get(height - 2)
+    if prev is None:
+      pos, value = self.__search_root(placeable_cells, height, -othello.Config.INF, othello.Config.INF)
+    else:
+      alpha = prev - othello.Config.MID_ASPIRATION * self.__scale
+      beta = prev + othello.Config.MID_ASPIRATION * self.__scale
+      pos, value = self.__search_root(placeable_cells, height, alpha, beta)
+      if value <= alpha or value >= beta:  # 窓の外に出たら窓を広げて探索し直す
+        pos, value = self.__search_root(placeable_cells, height, -othello.Config.INF, othello.Config.INF)
+    placeable_cells.remove(pos)  # 次の深さではこの手から探索する
+    placeable_cells.insert(0, pos)
+    return pos, value
 
-    state_cpy = self.__board.get_state()  # 盤面コピー
+  # 深さheightで窓(alpha, beta)のルートの探索をする
+  # 並列探索する場合は最初の手だけをここで探索し, 残りの手はその評価値をalphaとしてワーカーで探索する
+  # <返値> (最善手, 評価値)
+  def __search_root(self, placeable_cells, height, alpha, beta):
+    if self.__splitter is not None and height >= othello.Config.MID_SPLIT_HEIGHT:
+      return self.__search_root_parallel(placeable_cells, height, alpha, beta)
     max_val = -othello.Config.INF
-    a = -othello.Config.INF
+    a = alpha
     for placeable_cell in placeable_cells:
       self.__board.put[placeable_cell](self.__color)
-      value = -self.__alphaBeta(not self.__color, othello.Config.MID_HEIGHT-1, -othello.Config.INF, -a, False)
-      self.__board.restore_state(state_cpy)
+      value = -self.__alphaBeta(not self.__color, height-1, -beta, -a, False)
+      self.__board.undo()
       if value > max_val:
         a = max(a, value)
         max_val = value
         res = placeable_cell
-    return res
+        if value >= beta:
+          break
+    return res, max_val
+
+  def __search_root_parallel(self, placeable_cells, height, alpha, beta):
+    res = placeable_cells[0]
+    self.__board.put[res](self.__color)
+    max_val = -self.__alphaBeta(not self.__color, height-1, -beta, -alpha, False)
+    self.__board.undo()
+    if max_val >= beta or len(placeable_cells) == 1:
+      return res, max_val
+    results = self.__splitter.search(self.__board.get_state(), self.__color, self.__num_discs, height,
+                                     placeable_cells[1:], max(alpha, max_val), beta, self.__deadline)
+    if results is None:
+      raise SearchTimeout()
+    # 探索に使ったalpha以下の評価値は上界でしかない(同じ評価値の手が先に見つかっていた)ので, 最善手の候補にしない
+    for placeable_cell, value, a in results:
+      if value > a and value > max_val:
+        max_val = value
+        res = placeable_cell
+    return res, max_val
+
+  # ルートの手posを深さheight, 窓(alpha, beta)で探索した評価値を返す. 期限deadlineを過ぎたらSearchTimeoutを投げる
+  # (並列探索のワーカー用)
+  def search_move(self, num_discs, height, pos, alpha, beta, deadline):
+    self.__deadline = deadline
+    self.__mpc_t = othello.Config.MPC_T
+    self.__set_stage(num_discs + height)
+    self.__root_height = height
+    self.__board.put[pos](self.__color)
+    value = -self.__alphaBeta(not self.__color, height-1, -beta, -alpha, False)
+    self.__board.undo()
+    return value
+
+  # 盤面評価関数で使用するステージを石数(初期配置の4つを除く)num_discsの盤面のものにする
+  def __set_stage(self, num_discs):
+    self.__stage = min(num_discs / 4, BrainMid.NUM_STAGES - 1)
+    self.__stage_key = (self.__stage * 0x9E3779B97F4A7C15) & 0x7FFFFFFFFFFFFFFF  # 置換表のキーを64bitに収める
+    self.__board.set_evaluator(self.__weight[self.__stage], self.__scale)
+
+  # 現盤面を深さheight, 全幅の窓で探索した評価値(石数単位)を返す. 時間制限とMulti-ProbCutは使わない.
+  # 盤面評価関数のステージは深さstage_heightの探索と同じにする(learn/mpc.py でのパラメータの推定用)
+  def search_value(self, num_discs, height, stage_height):
+    self.__deadline = float('inf')
+    self.__mpc_t = None
+    self.__tt.clear()  # 深い探索の結果が浅い探索の値として返されないように
+    self.__set_stage(num_discs + stage_height)
+    self.__root_height = height
+    return self.__to_discs(self.__alphaBeta(self.__color, height, -othello.Config.INF, othello.Config.INF, False))
+
+  # 評価値を石数単位にする(量子化した重みの評価値はscale倍されている)
+  def __to_discs(self, value):
+    if value is None or self.__scale == 1:
+      return value
+    return float(value) / self.__scale
 
   def is_valid(self, num_discs):
     return num_discs < othello.Config.FIN_PHASE
 
+  def get_weight(self):
+    return self.__weight
+
+  # 直前の探索で探索した内部節点の数
+  def get_nodes(self):
+    return self.__nodes
+
+  # 他のプロセスに渡す重み. 共有するハンドルがあればそれを, なければ重みそのもの(fork時に引き継がれる)を返す
+  def get_shared_weight(self):
+    if self.__shared is not None:
+      return self.__shared
+    return self.__weight
+
+  # 重みが変わると記録済みの評価値は使えないので置換表も空にする
+  # weightは重み(のリスト)か, 重みを共有するハンドル(weights.SharedWeights)
   def set_weight(self, weight):
-    self.__weight = weight
+    self.__weight = self.__attach(weight)
+    self.__tt.clear()
+
+  # 重みを共有するハンドルならmmapした重みを返し, ハンドルと評価値の単位を覚えておく
+  def __attach(self, weight):
+    if isinstance(weight, weights.SharedWeights):
+      self.__shared = weight
+      self.__scale = weight.scale
+      return weight.attach()
+    self.__shared = None
+    self.__scale = 1
+    return weight
+
+  # Lazy SMP で探索する. 置換表と停止フラグはヘルパーのプロセスと共有するものを使う
+  def set_smp(self, smp):
+    self.__smp = smp
+    self.share(smp.tt, smp.stop)
+
+  # 置換表ttと停止フラグstopを他のプロセスと共有する(Lazy SMPのヘルパー用)
+  def share(self, tt, stop):
+    self.__tt = tt
+    self.__stop = stop
 
   """
   def __negaScout(self, color, height, alpha, beta, passed):
@@ -116,6 +394,11 @@ class BrainMid():
   """
 
   # アルファベータ法： http://uguisu.skr.jp/othello/alpha-beta.html
+  # 置換表に記録された結果で評価値が決まればそれを返し, 決まらなくても記録された最善手から探索する.
+  # 葉の直前(height=1)は置換表を引くより探索する方が安いので使わない.
+  # Multi-ProbCut: 浅い探索の評価値vから深い探索の評価値を a*v+b (誤差の標準偏差sigma) と予測し,
+  # 予測値が beta + t*sigma 以上 (alpha - t*sigma 以下) になりそうならその時点で枝刈りする.
+  # 浅い探索は予測値の閾値を境界とするnull windowで行う. (a, b, sigma)はステージ・深さ毎に learn/mpc.py で求める.
   # <引数> board:Board型, color:int(0~1), height:(1~MAX_SEARCH_HEIGHT), alpha:int, beta:int
   # <返値> int
   def __alphaBeta(self, color, height, alpha, beta, passed):
@@ -123,169 +406,431 @@ class BrainMid():
     if not height:
       return self.__evaluate_leaf(color)
 
+    # 制限時間を過ぎたか停止フラグが立っていたら打ち切る. 内部節点16個毎に見る
+    self.__nodes += 1
+    if not self.__nodes & 15 and (time.time() > self.__deadline or self.__stop.value):
+      raise SearchTimeout()
+
+    # 置換表を引く
+    if height >= 2:
+      key = self.__board.hash(color) ^ self.__stage_key
+      value, best_cell = self.__tt.lookup(key, height, alpha, beta)
+      if value is not None:
+        return value
+    else:
+      key = best_cell = None
+
+    # Multi-ProbCut
+    if self.__mpc_t is not None and height in self.__mpc[self.__stage]:
+      shallow, a, b, sigma = self.__mpc[self.__stage][height]
+      scale = self.__scale  # パラメータは石数単位なので評価値の単位に合わせる
+      if beta < othello.Config.INF:
+        bound = (beta + (self.__mpc_t * sigma - b) * scale) / a
+        if scale == 1:
+          eps = BrainMid.MPC_EPS
+        else:  # 評価値が整数なら, 境界を整数に切り上げて幅1の窓で探索すれば同じ判定になる
+          bound, eps = math.ceil(bound), 1
+        if self.__probe(color, height, shallow, bound - eps, bound, passed) >= bound:
+          return beta
+      if alpha > -othello.Config.INF:
+        bound = (alpha - (self.__mpc_t * sigma + b) * scale) / a
+        if scale == 1:
+          eps = BrainMid.MPC_EPS
+        else:
+          bound, eps = math.floor(bound), 1
+        if self.__probe(color, height, shallow, bound, bound + eps, passed) <= bound:
+          return alpha
+
     # 着手可能位置の取得
     placeable_cells = self.__board.placeable_cells(color)
     if not len(placeable_cells):
       if passed:
         return self.__evaluate_leaf(color) # 連続パスで終了
       return -self.__alphaBeta(not color, height, -beta, -alpha, True)  # パス
+    ply = self.__root_height - height
     if height >= 3:
-      placeable_cells = self.__move_ordering(placeable_cells, color)
+      placeable_cells, children = self.__move_ordering(placeable_cells, color)
+    else:
+      children = _NO_CHILDREN
+      if othello.Config.KILLER_HISTORY:
+        placeable_cells = self.__history.order(placeable_cells, color, ply)
+    if best_cell in placeable_cells:  # 置換表の最善手を最初に探索する
+      placeable_cells.remove(best_cell)
+      placeable_cells.insert(0, best_cell)
 
     # 探索
-    state_cpy = self.__board.get_state()
+    alpha_orig = alpha
     max_val = -othello.Config.INF
     for placeable_cell in placeable_cells:
-      self.__board.put[placeable_cell](color)
+      child = children.get(placeable_cell)
+      if child is None:
+        self.__board.put[placeable_cell](color)
+      else:
+        self.__board.redo(child)  # MoveOrderingで着手済みの局面
       value = -self.__alphaBeta(not color, height - 1, -beta, -alpha, False)
-      self.__board.restore_state(state_cpy)
+      self.__board.undo()
       if value >= beta:
+        if key is not None:
+          self.__tt.store(key, height, alpha_orig, beta, value, placeable_cell)
+        self.__history.cutoff(placeable_cell, color, ply, height)
         return value  # 枝刈り
       if value > max_val:
         alpha = max(alpha, value)
         max_val = value
+        best_cell = placeable_cell
+    if key is not None:
+      self.__tt.store(key, height, alpha_orig, beta, max_val, best_cell)
     return max_val
 
+  # Multi-ProbCutの浅い探索: 残りの深さheightの節点を深さshallow, 窓(alpha, beta)で探索する.
+  # 浅い探索の中でもルートからの手数(killer moveの添字)が本来の節点からの手数になるように, root_heightをずらしておく
+  def __probe(self, color, height, shallow, alpha, beta, passed):
+    root_height = self.__root_height
+    self.__root_height = root_height - height + shallow
+    try:
+      return self.__alphaBeta(color, shallow, alpha, beta, passed)
+    finally:
+      self.__root_height = root_height
+
   # ゲーム木探索中の枝刈り回数増加のために,与えられた次手候補リストを評価値の見込みが高い順にソートする.
+  # 評価のために着手した局面も返し, 探索ではputをやり直さずにredoで使う.
+  # <返値> (ソートした次手候補リスト, {次手: 着手後の局面(board.get_child)})
   def __move_ordering(self, list_pos, color):
-    state_cpy = self.__board.get_state()  # 盤面コピー
     values = [0] * len(list_pos)
+    children = {}
     for i, pos in enumerate(list_pos):
       self.__board.put[pos](color)
       values[i] = self.__evaluate_leaf(color)
-      self.__board.restore_state(state_cpy)
-    return [pos for _, pos in sorted(zip(values, list_pos),reverse=True)]
+      children[pos] = self.__board.get_child()
+      self.__board.undo()
+    return [pos for _, pos in sorted(zip(values, list_pos),reverse=True)], children
 
   # <概要> logistelloパターン+着手可能数差による評価
+  # 評価値は盤面が着手のたびに差分更新している(Board.set_evaluator)ので, 参照するだけ
   def __evaluate_leaf(self, color):
-    feature = self.__board.get_features()
     if color:
-      return -(
-        self.__weight[self.__stage][0][feature[0]]+self.__weight[self.__stage][0][feature[1]]+self.__weight[self.__stage][0][feature[2]]+self.__weight[self.__stage][0][feature[3]]+
-        self.__weight[self.__stage][1][feature[4]]+self.__weight[self.__stage][1][feature[5]]+self.__weight[self.__stage][1][feature[6]]+self.__weight[self.__stage][1][feature[7]]+
-        self.__weight[self.__stage][2][feature[8]]+self.__weight[self.__stage][2][feature[9]]+self.__weight[self.__stage][2][feature[10]]+self.__weight[self.__stage][2][feature[11]]+
-        self.__weight[self.__stage][3][feature[12]]+self.__weight[self.__stage][3][feature[13]]+self.__weight[self.__stage][3][feature[14]]+self.__weight[self.__stage][3][feature[15]]+
-        self.__weight[self.__stage][4][feature[16]]+self.__weight[self.__stage][4][feature[17]]+self.__weight[self.__stage][4][feature[18]]+self.__weight[self.__stage][4][feature[19]]+
-        self.__weight[self.__stage][5][feature[20]]+self.__weight[self.__stage][5][feature[21]]+self.__weight[self.__stage][5][feature[22]]+self.__weight[self.__stage][5][feature[23]]+
-        self.__weight[self.__stage][6][feature[24]]+self.__weight[self.__stage][6][feature[25]]+self.__weight[self.__stage][6][feature[26]]+self.__weight[self.__stage][6][feature[27]]+
-        self.__weight[self.__stage][7][feature[28]]+self.__weight[self.__stage][7][feature[29]]+
-        self.__weight[self.__stage][8][feature[30]]+self.__weight[self.__stage][8][feature[31]]+self.__weight[self.__stage][8][feature[32]]+self.__weight[self.__stage][8][feature[33]]+
-        self.__weight[self.__stage][9][feature[34]]+self.__weight[self.__stage][9][feature[35]]+self.__weight[self.__stage][9][feature[36]]+self.__weight[self.__stage][9][feature[37]]+self.__weight[self.__stage][9][feature[38]]+self.__weight[self.__stage][9][feature[39]]+self.__weight[self.__stage][9][feature[40]]+self.__weight[self.__stage][9][feature[41]]+
-        self.__weight[self.__stage][10][feature[42]]+
-        self.__weight[self.__stage][10][feature[43]]+
-        self.__weight[self.__stage][10][feature[44]]+
-        self.__weight[self.__stage][10][feature[45]]+
-        self.__board.get_mobility(0))
-    else:
-      return (
-        self.__weight[self.__stage][0][feature[0]]+self.__weight[self.__stage][0][feature[1]]+self.__weight[self.__stage][0][feature[2]]+self.__weight[self.__stage][0][feature[3]]+
-        self.__weight[self.__stage][1][feature[4]]+self.__weight[self.__stage][1][feature[5]]+self.__weight[self.__stage][1][feature[6]]+self.__weight[self.__stage][1][feature[7]]+
-        self.__weight[self.__stage][2][feature[8]]+self.__weight[self.__stage][2][feature[9]]+self.__weight[self.__stage][2][feature[10]]+self.__weight[self.__stage][2][feature[11]]+
-        self.__weight[self.__stage][3][feature[12]]+self.__weight[self.__stage][3][feature[13]]+self.__weight[self.__stage][3][feature[14]]+self.__weight[self.__stage][3][feature[15]]+
-        self.__weight[self.__stage][4][feature[16]]+self.__weight[self.__stage][4][feature[17]]+self.__weight[self.__stage][4][feature[18]]+self.__weight[self.__stage][4][feature[19]]+
-        self.__weight[self.__stage][5][feature[20]]+self.__weight[self.__stage][5][feature[21]]+self.__weight[self.__stage][5][feature[22]]+self.__weight[self.__stage][5][feature[23]]+
-        self.__weight[self.__stage][6][feature[24]]+self.__weight[self.__stage][6][feature[25]]+self.__weight[self.__stage][6][feature[26]]+self.__weight[self.__stage][6][feature[27]]+
-        self.__weight[self.__stage][7][feature[28]]+self.__weight[self.__stage][7][feature[29]]+
-        self.__weight[self.__stage][8][feature[30]]+self.__weight[self.__stage][8][feature[31]]+self.__weight[self.__stage][8][feature[32]]+self.__weight[self.__stage][8][feature[33]]+
-        self.__weight[self.__stage][9][feature[34]]+self.__weight[self.__stage][9][feature[35]]+self.__weight[self.__stage][9][feature[36]]+self.__weight[self.__stage][9][feature[37]]+self.__weight[self.__stage][9][feature[38]]+self.__weight[self.__stage][9][feature[39]]+self.__weight[self.__stage][9][feature[40]]+self.__weight[self.__stage][9][feature[41]]+
-        self.__weight[self.__stage][10][feature[42]]+
-        self.__weight[self.__stage][10][feature[43]]+
-        self.__weight[self.__stage][10][feature[44]]+
-        self.__weight[self.__stage][10][feature[45]]+
-        self.__board.get_mobility(0))
-
-  # <概要> 重みをロードする
+      return -self.__board.get_score()
+    return self.__board.get_score()
+
+  # <概要> Multi-ProbCutのパラメータをロードする
+  # <返値> ステージ毎の {深さ: (浅い探索の深さ, a, b, sigma)}. ファイルがなければ空(Multi-ProbCutを使わない)
+  @staticmethod
+  def load_mpc(file_name=MPC_FILE):
+    mpc = [{} for stage in range(BrainMid.NUM_STAGES)]
+    if not os.path.exists(file_name):
+      return mpc
+    f = open(file_name, "r")
+    for line in f:
+      if line.startswith('#') or not line.strip():
+        continue
+      value = line.split()
+      stage, height, shallow = int(value[0]), int(value[1]), int(value[2])
+      mpc[stage][height] = (shallow, float(value[3]), float(value[4]), float(value[5]))
+    f.close()
+    return mpc
+
+  # <概要> 重みをロードする. バイナリ形式(Config.EVAL_INT16なら量子化形式)のファイルを共有するハンドルを返し,
+  #         作れなければテキスト形式から読んだ重みを返す
   def __load_weights(self):
-    weight = [[[0 for i in range(BrainMid.NUM_PATTARNS[j])] for j in range(BrainMid.NUM_FEATURES)] for k in range(BrainMid.NUM_STAGES)]
-    for stage in range(BrainMid.NUM_STAGES):
-      f = open("../wei/w"+str(stage)+".txt", "r")
-      for feature, line in enumerate(f):
-        value = line.split(' ')
-        for pattern in range(BrainMid.NUM_PATTARNS[feature]):
-          weight[stage][feature][pattern] = float(value[pattern])
-      f.close()
-    return weight
+    typecode = 'h' if othello.Config.EVAL_INT16 else 'f'
+    shared = weights.share(BrainMid.NUM_STAGES, BrainMid.NUM_PATTARNS, typecode=typecode)
+    if shared is None:
+      return weights.load_text(BrainMid.NUM_STAGES, BrainMid.NUM_PATTARNS)
+    return shared
 
 
 #######################################################################################################################
 # 終盤戦用探索アルゴリズム
 # 探索:NegaScout + AlphaBeta, 盤面評価:石差, MoveOrdering:着手可能手数の少ない順
 class BrainFin():
-  def __init__(self, board, color):
+  def __init__(self, board, color, time_manager=None):
     self.__board = board  # boardへの参照
     self.__color = color  # 自分の色
+    self.__timer = time_manager or timer.TimeManager()  # 時間配分
+    self.__deadline = None    # 探索を打ち切る時刻
+    self.__nodes = 0          # 探索した内部節点の数
+    self.__history = MoveHistory()  # killer move と history heuristic
+    self.__root_height = 0    # ルートの深さ. ルートからの手数は root_height - height
+    self.__smp = None         # Lazy SMP (parallel.LazySMP). set_smpで設定する
+    self.__stop = _NO_STOP    # 立っていたら探索を打ち切るフラグ(Lazy SMPのプロセス間で共有)
+    self.__splitter = None    # YBWCによる並列探索. Config.FIN_WORKERS が2以上ならevaluateで作る
+    self.__parity = 0         # 空きマスが奇数個の領域のビット(_QUADRANT)の和. 着手する度に着手したマスの領域を反転する
+    self.__empty = 0          # 空きマスのbitmask. 着手する度に着手したマスのビットを反転する
+    self.__root_empties = []  # ルートの空きマスのリスト
+    # 置換表. 読み切りの結果は真値なので, ゲーム中は着手をまたいで使い回す
+    self.__tt = transposition.TranspositionTable(othello.Config.FIN_TT_ENTRIES, othello.Config.FIN_TT_MB)
 
   # 現盤面の全着手可能位置をそれぞれ評価し,評価値が最大となる位置を返す.
+  # soft deadlineを過ぎたらルートの残りの手は読まず, hard deadlineを過ぎたら読みかけの手も打ち切って,
+  # それまでに読み切った手の中で最善のものを返す.
+  # 空きマスが Config.FIN_EXACT_HEIGHT より多く Config.FIN_WLD_HEIGHT 以下の局面では勝敗(WLD)だけを読み切り,
+  # 勝ちを証明できた手があればその手を返す(石差の最大化は空きマスが減ってから).
+  # Lazy SMP: ヘルパーのプロセスもルートの手の順序を変えて読み切り, 先に読み切ったプロセスの結果を使う.
   def evaluate(self, turnCounter):
-    placeable_cells = self.__move_ordering(self.__board.placeable_cells(self.__color), not self.__color)
-    state_cpy = self.__board.get_state()
-    maxValue = -othello.Config.INF
-    a = -othello.Config.INF
-    for placeable_cell in placeable_cells:
-      self.__board.put[placeable_cell](self.__color)
-      value = -self.__negaScout(not self.__color, 59 - turnCounter, -othello.Config.INF, -a, False)
-      self.__board.restore_state(state_cpy)
-      if value > maxValue:
-        a = max(a, value)
-        maxValue = value
-        res = placeable_cell
+    self.__timer.start(turnCounter, timer.FIN)
+    self.__deadline = _deadline(self.__timer.hard)
+    self.__nodes = 0
+    self.__tt.new_search()
+    self.__history.new_search()
+    self.__root_height = 60 - turnCounter
+    self.__init_empties()
+    self.__board.set_evaluator(None)  # 読み切りでは盤面評価関数を使わないので差分計算を止める
+    if othello.Config.FIN_WORKERS > 1 and self.__splitter is None and self.__smp is None:
+      self.__splitter = parallel.get_ybwc_splitter(othello.Config.FIN_WORKERS)
+    state = self.__board.get_state()  # 打ち切ったときに盤面を戻すため
+    if self.__smp is not None:
+      self.__smp.start(timer.FIN, state, self.__color, turnCounter, self.__deadline)
+    placeable_cells, _ = self.__move_ordering(self.__board.placeable_cells(self.__color), not self.__color)
+    alpha, beta = BrainFin.window(turnCounter)
+    res, value, solved = self.__solve_root(placeable_cells, turnCounter, _deadline(self.__timer.soft), alpha, beta)
+    if not solved:
+      self.__board.restore_state(state)
+    if self.__smp is not None:
+      published = self.__smp.finish()
+      if not solved and published is not None:  # ヘルパーが先に読み切った
+        res, value, solved = published[1], int(published[2]), True  # 公開された評価値はdouble
+    if beta == 1:
+      print "wld:{0} value:{1}".format(solved, value)
+    else:
+      print "exact:{0} value:{1}".format(solved, value)
     return res
 
+  # 石数(初期配置の4つを除く)turnCounterの局面のルートの窓
+  # <返値> (alpha, beta). 勝敗だけを読む場合は (-1, 1) (評価値の符号が勝敗を表す)
+  @staticmethod
+  def window(turnCounter):
+    empties = 60 - turnCounter
+    if othello.Config.FIN_EXACT_HEIGHT < empties <= othello.Config.FIN_WLD_HEIGHT:
+      return -1, 1
+    return -othello.Config.INF, othello.Config.INF
+
+  # Lazy SMP のヘルパーとして現盤面を読み切り, 読み切れたら publish(深さ, 最善手, 評価値) を呼ぶ.
+  # helper番目のヘルパーはルートの2番目以降の手の順序をhelperだけずらして読む
+  def search_helper(self, turnCounter, helper, deadline, publish):
+    self.__deadline = deadline
+    self.__nodes = 0
+    self.__history.new_search()
+    self.__root_height = 60 - turnCounter
+    self.__init_empties()
+    self.__board.set_evaluator(None)  # 読み切りでは盤面評価関数を使わないので差分計算を止める
+    placeable_cells, _ = self.__move_ordering(self.__board.placeable_cells(self.__color), not self.__color)
+    placeable_cells = _rotate_moves(placeable_cells, helper)
+    alpha, beta = BrainFin.window(turnCounter)
+    res, value, solved = self.__solve_root(placeable_cells, turnCounter, float('inf'), alpha, beta)
+    if solved:
+      publish(self.__root_height, res, value)
+
+  # ルートの手placeable_cellsを順に窓(alpha, beta)で読み切る. 時刻softを過ぎたら残りの手は読まない
+  # beta以上の手が見つかったら(勝敗を読む場合は勝ちが証明できたら)残りの手は読まない
+  # <返値> (最善手, 評価値, 全ての手を読み切ったか). 打ち切った場合, 盤面は探索途中のまま
+  def __solve_root(self, placeable_cells, turnCounter, soft, alpha, beta):
+    res = placeable_cells[0]
+    maxValue = -othello.Config.INF
+    a = alpha
+    try:
+      for placeable_cell in placeable_cells:
+        if maxValue > -othello.Config.INF and time.time() > soft:
+          return res, maxValue, False
+        self.__board.put[placeable_cell](self.__color)
+        self.__parity ^= _QUADRANT[placeable_cell]
+        self.__empty ^= 1 << placeable_cell
+        value = -self.__negaScout(not self.__color, 59 - turnCounter, -beta, -a, False)
+        self.__board.undo()
+        self.__parity ^= _QUADRANT[placeable_cell]
+        self.__empty ^= 1 << placeable_cell
+        if value > maxValue:
+          a = max(a, value)
+          maxValue = value
+          res = placeable_cell
+          if value >= beta:
+            break
+    except SearchTimeout:
+      return res, maxValue, False
+    return res, maxValue, True
+
   def is_valid(self, turnCounter):
     return True
 
+  # 直前の探索で探索した内部節点の数
+  def get_nodes(self):
+    return self.__nodes
+
+  # Lazy SMP で探索する. 置換表と停止フラグはヘルパーのプロセスと共有するものを使う
+  def set_smp(self, smp):
+    self.__smp = smp
+    self.share(smp.tt, smp.stop)
+
+  # 手番の位置posの手を残りの深さheight, 窓(alpha, beta)で読み切った評価値を返す.
+  # 期限deadlineを過ぎたら SearchTimeout を投げる (YBWCのワーカー用)
+  def solve_move(self, height, pos, alpha, beta, deadline):
+    self.__deadline = deadline
+    self.__root_height = height
+    self.__init_empties()
+    self.__board.set_evaluator(None)  # 読み切りでは盤面評価関数を使わないので差分計算を止める
+    self.__board.put[pos](self.__color)
+    self.__parity ^= _QUADRANT[pos]
+    self.__empty ^= 1 << pos
+    value = -self.__negaScout(not self.__color, height - 1, -alpha - 1, -alpha, False)
+    if alpha < value < beta:
+      value = -self.__negaScout(not self.__color, height - 1, -beta, -alpha, False)
+    self.__board.undo()
+    self.__parity ^= _QUADRANT[pos]
+    self.__empty ^= 1 << pos
+    return value
+
+  # 置換表ttと停止フラグstopを他のプロセスと共有する(BrainMid.shareと同じ). ttがNoneなら置換表は自分のものを使う
+  # (Lazy SMPのヘルパーは両方を, YBWCのワーカーは停止フラグだけを共有する)
+  def share(self, tt, stop):
+    self.__stop = stop
+    if tt is not None:
+      self.__tt = tt
+
   def __negaScout(self, color, height, alpha, beta, passed):
+    if height <= 4 and othello.Config.FIN_LAST_SOLVER:  # 残りの空きマス数はheightに等しい
+      return self.__solve_last(color, height, alpha, beta)
     placeable_cells = self.__board.placeable_cells(color)
     if not len(placeable_cells):
       if passed:
         return self.__evaluate_leaf(color) # 連続パスでゲーム終了 TODO
       return -self.__negaScout(not color, height, -beta, -alpha, True)  # パス
-    state_cpy = self.__board.get_state()
 
-    if height >= 5:
-      placeable_cells = self.__move_ordering(placeable_cells, color)
-      self.__board.put[placeable_cells[0]](color)
-      maxValue = value = -self.__negaScout(not color, height - 1, -beta, -alpha, False)
-      self.__board.restore_state(state_cpy)
-      if value >= beta:
+    # hard deadlineを過ぎたか停止フラグが立っていたら打ち切る
+    self.__nodes += 1
+    if not self.__nodes & 15 and (time.time() > self.__deadline or self.__stop.value):
+      raise SearchTimeout()
+
+    # 確定石で評価値が窓の外にあると分かればすぐに返す
+    if height >= othello.Config.FIN_STABILITY_HEIGHT:
+      value = self.__stability_cutoff(color, height, alpha, beta)
+      if value is not None:
         return value
-      if value > alpha:
-        alpha = value
-      for placeable_cell in placeable_cells[1:]:
-        self.__board.put[placeable_cell](color)
-        value = -self.__negaScout(not color, height - 1, (-alpha) - 1, -alpha, False)
-        self.__board.restore_state(state_cpy)
-        if value >= beta:
+
+    ply = self.__root_height - height
+    if height >= 5:
+      # 置換表を引く. 記録された結果で評価値が決まればそれを返し, 決まらなくても記録された最善手から読む
+      key = best_cell = None
+      if height >= othello.Config.FIN_TT_HEIGHT:
+        key = self.__board.hash(color)
+        value, best_cell = self.__tt.lookup(key, height, alpha, beta)
+        if value is not None:
           return value
-        if value > alpha:
-          alpha = value
-          self.__board.put[placeable_cell](color)
-          value = -self.__negaScout(not color, height - 1, -beta, -alpha, False)
-          self.__board.restore_state(state_cpy)
-          if value >= beta:
-            return value
-          if value > alpha:
-            alpha = value
-        maxValue = max(maxValue, value)
-      return maxValue
+      placeable_cells, children = self.__move_ordering(placeable_cells, color)
+      if best_cell in children:
+        placeable_cells.remove(best_cell)
+        placeable_cells.insert(0, best_cell)
+      etc_height = othello.Config.FIN_ETC_HEIGHT
+      if key is not None and etc_height is not None and height >= etc_height:
+        value = self.__etc(color, height, alpha, beta, placeable_cells, children)
+        if value is not None:
+          return value
+      alpha_orig = alpha
+      value, best_cell = self.__pvs(color, height, alpha, beta, placeable_cells, children, ply)
+      if key is not None:
+        self.__tt.store(key, height, alpha_orig, beta, value, best_cell)
+      return value
 
     else:
+      if othello.Config.KILLER_HISTORY:
+        placeable_cells = self.__history.order(placeable_cells, color, ply)
+      placeable_cells = self.__parity_order(placeable_cells)
       maxValue = -othello.Config.INF
       for placeable_cell in placeable_cells:
         self.__board.put[placeable_cell](color)
+        self.__parity ^= _QUADRANT[placeable_cell]
+        self.__empty ^= 1 << placeable_cell
         value = -self.__alphaBeta(not color, height - 1, -beta, -alpha, False)
-        self.__board.restore_state(state_cpy)
+        self.__board.undo()
+        self.__parity ^= _QUADRANT[placeable_cell]
+        self.__empty ^= 1 << placeable_cell
         if value >= beta:
+          self.__history.cutoff(placeable_cell, color, ply, height)
           return value  # カット
         if value > maxValue:
           alpha = max(alpha, value)
           maxValue = value
       return maxValue
 
+  # NegaScout: 順序付けした手placeable_cellsの長男を窓(alpha, beta)で, 残りをnull windowで読み,
+  # alphaを超えた手だけ窓を広げて読み直す. childrenはMoveOrderingで着手済みの局面
+  # <返値> (評価値, 最善手)
+  def __pvs(self, color, height, alpha, beta, placeable_cells, children, ply):
+    best_cell = placeable_cells[0]
+    self.__board.redo(children[best_cell])
+    self.__parity ^= _QUADRANT[best_cell]
+    self.__empty ^= 1 << best_cell
+    maxValue = value = -self.__negaScout(not color, height - 1, -beta, -alpha, False)
+    self.__board.undo()
+    self.__parity ^= _QUADRANT[best_cell]
+    self.__empty ^= 1 << best_cell
+    if value >= beta:
+      self.__history.cutoff(best_cell, color, ply, height)
+      return value, best_cell
+    if value > alpha:
+      alpha = value
+    if self.__splitter is not None and height >= othello.Config.FIN_SPLIT_HEIGHT and len(placeable_cells) > 1:
+      return self.__split(color, height, placeable_cells[1:], alpha, beta, maxValue, best_cell)
+    for placeable_cell in placeable_cells[1:]:
+      self.__board.redo(children[placeable_cell])
+      self.__parity ^= _QUADRANT[placeable_cell]
+      self.__empty ^= 1 << placeable_cell
+      value = -self.__negaScout(not color, height - 1, (-alpha) - 1, -alpha, False)
+      self.__board.undo()
+      self.__parity ^= _QUADRANT[placeable_cell]
+      self.__empty ^= 1 << placeable_cell
+      if value >= beta:
+        self.__history.cutoff(placeable_cell, color, ply, height)
+        return value, placeable_cell
+      if value > alpha:
+        alpha = value
+        self.__board.redo(children[placeable_cell])  # 再探索
+        self.__parity ^= _QUADRANT[placeable_cell]
+        self.__empty ^= 1 << placeable_cell
+        value = -self.__negaScout(not color, height - 1, -beta, -alpha, False)
+        self.__board.undo()
+        self.__parity ^= _QUADRANT[placeable_cell]
+        self.__empty ^= 1 << placeable_cell
+        if value >= beta:
+          self.__history.cutoff(placeable_cell, color, ply, height)
+          return value, placeable_cell
+        if value > alpha:
+          alpha = value
+      if value > maxValue:
+        maxValue = value
+        best_cell = placeable_cell
+    return maxValue, best_cell
+
+  # Enhanced Transposition Cutoff: 子の局面を置換表で引き, 記録された結果だけでbetaカットできればその評価値を返す
+  # 子を読む前に全ての子を引くので, 子を読むより十分安い(残りの深さが大きい)節点で使う
+  def __etc(self, color, height, alpha, beta, placeable_cells, children):
+    for placeable_cell in placeable_cells:
+      self.__board.redo(children[placeable_cell])
+      key = self.__board.hash(not color)
+      self.__board.undo()
+      value, _ = self.__tt.lookup(key, height - 1, -beta, -alpha)
+      if value is not None and -value >= beta:
+        self.__history.cutoff(placeable_cell, color, self.__root_height - height, height)
+        return -value
+    return None
+
+  # YBWC: 長男を読み切った節点で, 残りの兄弟list_posをワーカーに分けて読み切る
+  # maxValue, best_cell: 長男の評価値と位置 (<返値> (節点の評価値, 最善手))
+  def __split(self, color, height, list_pos, alpha, beta, maxValue, best_cell):
+    results = self.__splitter.search(self.__board.get_state(), color, height, list_pos, alpha, beta, self.__deadline)
+    if results is None:
+      raise SearchTimeout()
+    # fail-lowした兄弟の上界も含めた最大値を取る(逐次の__pvsと同じ). 上界を捨てると節点の上界が小さくなりすぎる
+    for placeable_cell, value, _ in results:
+      if value > maxValue:
+        maxValue = value
+        best_cell = placeable_cell
+    return maxValue, best_cell
+
   # <概要> http://uguisu.skr.jp/othello/alpha-beta.html
   # <引数> board:Board型, color:int(0~1), height:(1~MAX_SEARCH_HEIGHT), alpha:int, beta:int
   # <返値> int
   def __alphaBeta(self, color, height, alpha, beta, passed):
+    if height <= 4 and othello.Config.FIN_LAST_SOLVER:  # 残りの空きマス数はheightに等しい
+      return self.__solve_last(color, height, alpha, beta)
     if not height: # 設定した深さまでたどり着いたら再帰終了
       return self.__evaluate_leaf(color)
     placeable_cells = self.__board.placeable_cells(color)
@@ -293,29 +838,173 @@ class BrainFin():
       if passed:
         return self.__evaluate_leaf(color)
       return -self.__alphaBeta(not color, height, -beta, -alpha, True)
-    state_cpy = self.__board.get_state()
+    self.__nodes += 1
+    ply = self.__root_height - height
+    if othello.Config.KILLER_HISTORY and height >= 3:
+      placeable_cells = self.__history.order(placeable_cells, color, ply)
+    placeable_cells = self.__parity_order(placeable_cells)
     maxValue = -othello.Config.INF
     a = alpha
     for placeable_cell in placeable_cells:
       self.__board.put[placeable_cell](color)
+      self.__parity ^= _QUADRANT[placeable_cell]
+      self.__empty ^= 1 << placeable_cell
       value = -self.__alphaBeta(not color, height - 1, -beta, -a, False)
-      self.__board.restore_state(state_cpy)
+      self.__board.undo()
+      self.__parity ^= _QUADRANT[placeable_cell]
+      self.__empty ^= 1 << placeable_cell
       if value >= beta:
+        self.__history.cutoff(placeable_cell, color, ply, height)
         return value
       if value > maxValue:
         a = max(a, value)
         maxValue = value
     return maxValue
 
-  # <概要> 相手の置ける場所が少なくなる順にソート
+  # <概要> 相手の置ける場所が少なくなる順にソート. 着手した局面も返す(BrainMid.__move_orderingと同じ)
   def __move_ordering(self, list_pos ,color):
-    state_cpy = self.__board.get_state()  # 盤面コピー
     values = [0] * len(list_pos)
+    children = {}
     for i, pos in enumerate(list_pos):
       self.__board.put[pos](color)
       values[i] = self.__board.placeable_cells_num(not color)
-      self.__board.restore_state(state_cpy)
-    return [pos for value, pos in sorted(zip(values, list_pos))]
+      children[pos] = self.__board.get_child()
+      self.__board.undo()
+    if othello.Config.KILLER_HISTORY:  # 着手可能手数が同じ手は history の大きい順
+      history = self.__history.get(color)
+      return [pos for value, h, pos in sorted(zip(values, [-history[pos] for pos in list_pos], list_pos))], children
+    return [pos for value, pos in sorted(zip(values, list_pos))], children
+
+  # 空きマスが奇数個の領域の手を先にする(それぞれの中の順序は変えない). 葉に近い節点(残りの深さ5未満)で使う
+  # 奇数個の領域に打てば, その領域の最後の1マスに打つ手番が自分になりやすい
+  def __parity_order(self, list_pos):
+    parity = self.__parity
+    if not othello.Config.FIN_PARITY or not parity:
+      return list_pos
+    odd = [pos for pos in list_pos if parity & _QUADRANT[pos]]
+    if len(odd) == len(list_pos) or not odd:
+      return list_pos
+    return odd + [pos for pos in list_pos if not parity & _QUADRANT[pos]]
+
+  # 盤面の空きマスと各領域の偶奇を求める
+  def __init_empties(self):
+    self.__parity = 0
+    self.__empty = 0
+    self.__root_empties = []
+    for y in range(8):
+      for x in range(8):
+        if self.__board.at(x, y) == othello.Config.EMPTY:
+          self.__parity ^= _QUADRANT[x + y * 8]
+          self.__empty |= 1 << (x + y * 8)
+          self.__root_empties.append(x + y * 8)
+
+  # ==================== 残り4マス以下の読み切り ====================
+  # 着手可能位置のリストもget_state/restore_stateも使わず, 空きマスを引数で渡して読む.
+  # 最後の1マスは盤面を動かさずに takes (裏返る石の数) から石差を求める.
+
+  # 空きマスheight(4以下)個の節点. 空きマスを求め, 奇数個の領域のマスを先にして読む
+  def __solve_last(self, color, height, alpha, beta):
+    if not height:
+      return self.__evaluate_leaf(color)
+    empty = self.__empty
+    empties = self.__parity_order([pos for pos in self.__root_empties if empty >> pos & 1])
+    if height == 4:
+      return self.__solve4(color, alpha, beta, empties[0], empties[1], empties[2], empties[3], False)
+    if height == 3:
+      return self.__solve3(color, alpha, beta, empties[0], empties[1], empties[2], False)
+    if height == 2:
+      return self.__solve2(color, alpha, beta, empties[0], empties[1], False)
+    return self.__solve1(color, empties[0])
+
+  def __solve4(self, color, alpha, beta, p1, p2, p3, p4, passed):
+    board = self.__board
+    self.__nodes += 1
+    maxValue = -othello.Config.INF
+    for pos, q1, q2, q3 in ((p1, p2, p3, p4), (p2, p1, p3, p4), (p3, p1, p2, p4), (p4, p1, p2, p3)):
+      if board.placeable[pos](color):
+        board.put[pos](color)
+        value = -self.__solve3(not color, -beta, -alpha, q1, q2, q3, False)
+        board.undo()
+        if value >= beta:
+          return value
+        if value > maxValue:
+          alpha = max(alpha, value)
+          maxValue = value
+    if maxValue == -othello.Config.INF:  # パス
+      if passed:
+        return self.__evaluate_leaf(color)
+      return -self.__solve4(not color, -beta, -alpha, p1, p2, p3, p4, True)
+    return maxValue
+
+  def __solve3(self, color, alpha, beta, p1, p2, p3, passed):
+    board = self.__board
+    self.__nodes += 1
+    maxValue = -othello.Config.INF
+    for pos, q1, q2 in ((p1, p2, p3), (p2, p1, p3), (p3, p1, p2)):
+      if board.placeable[pos](color):
+        board.put[pos](color)
+        value = -self.__solve2(not color, -beta, -alpha, q1, q2, False)
+        board.undo()
+        if value >= beta:
+          return value
+        if value > maxValue:
+          alpha = max(alpha, value)
+          maxValue = value
+    if maxValue == -othello.Config.INF:  # パス
+      if passed:
+        return self.__evaluate_leaf(color)
+      return -self.__solve3(not color, -beta, -alpha, p1, p2, p3, True)
+    return maxValue
+
+  def __solve2(self, color, alpha, beta, p1, p2, passed):
+    board = self.__board
+    self.__nodes += 1
+    maxValue = -othello.Config.INF
+    if board.placeable[p1](color):
+      board.put[p1](color)
+      maxValue = -self.__solve1(not color, p2)
+      board.undo()
+      if maxValue >= beta:
+        return maxValue
+    if board.placeable[p2](color):
+      board.put[p2](color)
+      value = -self.__solve1(not color, p1)
+      board.undo()
+      if value > maxValue:
+        maxValue = value
+    if maxValue == -othello.Config.INF:  # パス
+      if passed:
+        return self.__evaluate_leaf(color)
+      return -self.__solve2(not color, -beta, -alpha, p1, p2, True)
+    return maxValue
+
+  # 最後の空きマスpos. 手番colorが打てればcolorが, 打てなければ相手が打ち, どちらも打てなければそのまま終局
+  def __solve1(self, color, pos):
+    board = self.__board
+    diff = board.get_difference(color)
+    flips = board.takes[pos](color)
+    if flips:
+      return diff + flips * 2 + 1
+    flips = board.takes[pos](not color)
+    if flips:
+      return diff - flips * 2 - 1
+    return diff
+
+  # 確定石による評価値の上界・下界が窓(alpha, beta)の外にあればその値を返す. なければNone
+  # 相手の確定石がs個なら石差は 64 - 2s 以下, 自分の確定石がs個なら 2s - 64 以上.
+  # 確定石の計算は重いので, 石の数から上界・下界が窓の外に出うるときだけ数える
+  def __stability_cutoff(self, color, height, alpha, beta):
+    board = self.__board
+    diff = board.get_difference(color)
+    if alpha >= height + diff:  # 相手の石が全て確定石なら上界は height + diff
+      upper = 64 - 2 * board.get_stable(not color)
+      if upper <= alpha:
+        return upper
+    if beta <= diff - height:   # 自分の石が全て確定石なら下界は diff - height
+      lower = 2 * board.get_stable(color) - 64
+      if lower >= beta:
+        return lower
+    return None
 
   # <概要> 石差で評価
   def __evaluate_leaf(self, color):
@@ -0,0 +1,62 @@
+# -*- coding:utf-8 -*-
+
+#######################################################################################################################
+# 盤面上のマスとラインの対応
+# 38ラインそれぞれについて,(ライン上のマス, ライン上の位置)のリスト
+# 0~7:水平(y), 8~15:垂直(x), 16~26:斜め45°(x+y=2~12), 27~37:斜め135°(x-y=5~-5)
+def _init_line_cells():
+  lines = [[] for i in range(38)]
+  for pos in range(64):
+    x, y = pos % 8, pos / 8
+    lines[y].append((pos, x))
+    lines[8 + x].append((pos, y))
+    if 2 <= x + y <= 12:
+      lines[16 + x + y - 2].append((pos, min(y, 7 - x)))
+    if -5 <= x - y <= 5:
+      lines[27 + 5 - (x - y)].append((pos, min(x, y)))
+  return lines
+
+LINE_CELLS = _init_line_cells()
+
+# ライン毎に,ライン上の位置のbitmask(8bit)から盤面上のマスのbitmask(64bit)への変換テーブル. 添字はline*256+mask
+def _init_line_to_squares():
+  table = [0] * (38 * 256)
+  for line, cells in enumerate(LINE_CELLS):
+    for mask in range(256):
+      for pos, x in cells:
+        if mask >> x & 1:
+          table[line * 256 + mask] |= 1 << pos
+  return table
+
+LINE_TO_SQUARES = _init_line_to_squares()
+
+CORNERS = (1 << 0) | (1 << 7) | (1 << 56) | (1 << 63)
+
+def popcount(x):
+  return bin(x).count('1')
+
+# 方向毎(水平, 垂直, 斜め45°, 斜め135°)のラインのマスのbitmaskのリスト
+LINE_MASKS = tuple(tuple(sum(1 << pos for pos, _ in LINE_CELLS[line]) for line in lines)
+                   for lines in (range(0, 8), range(8, 16), range(16, 27), range(27, 38)))
+
+_CENTRAL = 0x007E7E7E7E7E7E00  # 辺以外のマス
+
+# 石pの確定石をbitmaskで返す. oは相手の石, edgeは4辺の確定石(両方の色)
+# 辺以外の石は, 4方向それぞれについてラインが埋まっているか, 両隣のどちらかが確定石であれば確定石となる.
+# 確定石が増えなくなるまで繰り返す
+def stable_discs(p, o, edge):
+  occupied = p | o
+  full = [0, 0, 0, 0]
+  for d, masks in enumerate(LINE_MASKS):
+    for mask in masks:
+      if occupied & mask == mask:
+        full[d] |= mask
+  h, v, d7, d9 = full
+  central = p & _CENTRAL
+  stable = (edge & p) | (central & h & v & d7 & d9)
+  while True:
+    old = stable
+    stable |= (central & (h | stable >> 1 | stable << 1) & (v | stable >> 8 | stable << 8) &
+               (d7 | stable >> 7 | stable << 7) & (d9 | stable >> 9 | stable << 9))
+    if stable == old:
+      return stable
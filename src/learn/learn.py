@@ -3,7 +3,9 @@
 import sys,os
 sys.path.append(os.pardir)
 import board
+import bitboard
 import AI
+import weights
 import random
 
 class Learner:
@@ -17,11 +19,13 @@ class Learner:
   RANDOMBEGIN = 8    # ゲーム最初のランダム手数
   RANDOMMOVE  = 0.01 # AIがランダムにコマを打つ確率
 
-  def __init__(self):
+  def __init__(self, use_bitboard=False):
     self.__weight    = self.__load_weights() # Logistelloパターン重み
-    self.__board     = board.Board(False)
+    if use_bitboard:
+      self.__board   = bitboard.BitBoard(False)
+    else:
+      self.__board   = board.Board(False)
     self.__player    = [AI.AI(self.__board, 0, None, self.__weight),AI.AI(self.__board, 1, None, self.__weight)]
-    self.__symm_table = self.__init_symmTable() # 各パターンの対称形のコードを格納するテーブル
 
   def init(self):
     self.__board.init()
@@ -67,81 +71,25 @@ class Learner:
       stage = turn / 4
       self.__board.restore_state(self.__board_state[turn])
       feature = self.__board.get_features()
-      t_hat = (
-        self.__weight[stage][0][feature[0]]+self.__weight[stage][0][feature[1]]+self.__weight[stage][0][feature[2]]+self.__weight[stage][0][feature[3]]+
-        self.__weight[stage][1][feature[4]]+self.__weight[stage][1][feature[5]]+self.__weight[stage][1][feature[6]]+self.__weight[stage][1][feature[7]]+
-        self.__weight[stage][2][feature[8]]+self.__weight[stage][2][feature[9]]+self.__weight[stage][2][feature[10]]+self.__weight[stage][2][feature[11]]+
-        self.__weight[stage][3][feature[12]]+self.__weight[stage][3][feature[13]]+self.__weight[stage][3][feature[14]]+self.__weight[stage][3][feature[15]]+
-        self.__weight[stage][4][feature[16]]+self.__weight[stage][4][feature[17]]+self.__weight[stage][4][feature[18]]+self.__weight[stage][4][feature[19]]+
-        self.__weight[stage][5][feature[20]]+self.__weight[stage][5][feature[21]]+self.__weight[stage][5][feature[22]]+self.__weight[stage][5][feature[23]]+
-        self.__weight[stage][6][feature[24]]+self.__weight[stage][6][feature[25]]+self.__weight[stage][6][feature[26]]+self.__weight[stage][6][feature[27]]+
-        self.__weight[stage][7][feature[28]]+self.__weight[stage][7][feature[29]]+
-        self.__weight[stage][8][feature[30]]+self.__weight[stage][8][feature[31]]+self.__weight[stage][8][feature[32]]+self.__weight[stage][8][feature[33]]+
-        self.__weight[stage][9][feature[34]]+self.__weight[stage][9][feature[35]]+self.__weight[stage][9][feature[36]]+self.__weight[stage][9][feature[37]]+self.__weight[stage][9][feature[38]]+self.__weight[stage][9][feature[39]]+self.__weight[stage][9][feature[40]]+self.__weight[stage][9][feature[41]]+
-        self.__weight[stage][10][feature[42]]+self.__weight[stage][10][feature[43]]+self.__weight[stage][10][feature[44]]+self.__weight[stage][10][feature[45]]
-      )
+      weight = self.__weight[stage]
+      # 対称形どうしは同じ重みを共有しているので, 対称形にも同じ値を加算したことになる
+      index = [weights.CANONICAL[Learner.PAT2FEA[f]][feature[f]] for f in range(46)]
+      t_hat = sum(weight[Learner.PAT2FEA[f]][index[f]] for f in range(46))
       delta = (t - t_hat) * Learner.STEPSZ
       for f in range(46):
-        self.__weight[stage][Learner.PAT2FEA[f]][feature[f]] += delta
-        symm = self.__symm_table[Learner.PAT2FEA[f]][feature[f]]
-        if symm != feature[f]:                                      # 対称形があれば..
-          self.__weight[stage][Learner.PAT2FEA[f]][symm] += delta   # それにも同じ値を加算
+        weight[Learner.PAT2FEA[f]][index[f]] += delta
 
-  # 重みをファイル出力
+  # 重みをファイル出力. テキスト形式(配布用)とバイナリ形式(BrainMidの読み込み用)の両方に書き出す
   def save_weight(self):
-    for stage in range(Learner.NUM_STAGES):
-      f = open("../../wei/w"+str(stage)+".txt", "w")
-      for feature in range(11):
-        for pattern in range(Learner.NUM_PATTARNS[feature]):
-          f.write(str(self.__weight[stage][feature][pattern])+" ")
-        f.write("\n")
-      f.close()
-
-  # symmTableを初期化する
-  def __init_symmTable(self):
-    line4SymmTable   = self.__initLineSymmTable(4)
-    line5SymmTable   = self.__initLineSymmTable(5)
-    line6SymmTable   = self.__initLineSymmTable(6)
-    line7SymmTable   = self.__initLineSymmTable(7)
-    line8SymmTable   = self.__initLineSymmTable(8)
-    edge2xSymmTable  = self.__initLineSymmTable(10)
-    cornerSymmTable  = self.__initCorner33SymmTable()
-    return [line8SymmTable,line8SymmTable,line8SymmTable,line4SymmTable,line5SymmTable,line6SymmTable,line7SymmTable,line8SymmTable,edge2xSymmTable,range(3**10),cornerSymmTable]
-
-  def __initLineSymmTable(self, length):
-    table = [0] * (3**length)
-    for i in range(3**length):
-      code = i
-      for j in range(length):
-        table[i] += (code/(3**(length-1-j))) * (3**j)
-        code %= 3**(length-1-j)
-    return table
-
-  def __initCorner33SymmTable(self):
-    table = [0] * (3**9)
-    for i in range(3**9):
-      cell = [0] * 9
-      code = i
-      for j in range(9):
-        cell[8-j] = code/(3**(8-j))
-        code %= 3**(8-j)
-      table[i] = cell[0]+cell[3]*(3**1)+cell[6]*(3**2)+cell[1]*(3**3)+cell[4]*(3**4)+cell[7]*(3**5)+cell[2]*(3**6)+cell[5]*(3**7)+cell[8]*(3**8)
-    return table
+    weights.save_text(self.__weight, Learner.NUM_PATTARNS)
+    weights.save(self.__weight, Learner.NUM_PATTARNS)
 
   # 重みをファイル入力
   def __load_weights(self):
-    weight = [[[0 for i in range(Learner.NUM_PATTARNS[j])] for j in range(Learner.NUM_FEATURES)] for k in range(Learner.NUM_STAGES)]
-    for stage in range(Learner.NUM_STAGES):
-      f = open("../../wei/w"+str(stage)+".txt", "r")
-      for feature, line in enumerate(f):
-        value = line.split(' ')
-        for pattern in range(Learner.NUM_PATTARNS[feature]):
-          weight[stage][feature][pattern] = float(value[pattern])
-      f.close()
-    return weight
+    return weights.load(Learner.NUM_STAGES, Learner.NUM_PATTARNS)
 
 def main():
-  learner = Learner()
+  learner = Learner('--bitboard' in sys.argv[1:])
   i = 1
   while True:
     print "game:", i
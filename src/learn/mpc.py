@@ -0,0 +1,112 @@
+# -*- coding:utf-8 -*-
+
+# Multi-ProbCutのパラメータの推定
+# 自己対戦で局面を集め, 各局面で深い探索と浅い探索の評価値を求めて
+# ステージ・深さ毎に 深い探索の評価値 = a * 浅い探索の評価値 + b を最小二乗法で当てはめ, 残差の標準偏差をsigmaとする.
+# 結果は brain.MPC_FILE (wei/mpc.txt) に出力する.
+# usage: python mpc.py [試合数] [深さの上限]
+
+import sys,os
+sys.path.append(os.pardir)
+import math
+import random
+import othello
+import board
+import brain
+
+NUM_GAMES   = 20   # 局面を集める自己対戦の試合数
+MAX_HEIGHT  = 6    # パラメータを求める深さの上限(深い探索に時間がかかるので MID_HEIGHT より浅くしておく)
+RANDOMBEGIN = 8    # ゲーム最初のランダム手数
+PLAY_HEIGHT = 2    # 自己対戦での探索の深さ
+MIN_SAMPLES = 10   # これより標本の少ないステージは全ステージの標本から求めたパラメータを使う
+
+class Calibrator:
+  def __init__(self):
+    self.__board = board.Board(False)
+    self.__brain = [brain.BrainMid(self.__board, 0), None]
+    self.__brain[1] = brain.BrainMid(self.__board, 1, self.__brain[0].get_weight())
+    self.__positions = []  # (盤面, 手番, 石数)
+
+  # 自己対戦を1試合して, 中盤の局面を集める
+  def play(self):
+    self.__board.init()
+    color = 0
+    num_discs = 0
+    passed = False
+    while num_discs < othello.Config.FIN_PHASE:
+      placeable_cells = self.__board.placeable_cells(color)
+      if not placeable_cells:
+        if passed:  # 二人ともパス->終了
+          return
+        passed = True
+        color = not color
+        continue
+      passed = False
+      if num_discs < RANDOMBEGIN:
+        pos = random.choice(placeable_cells)
+      else:
+        self.__positions.append((self.__board.get_state(), color, num_discs))
+        pos = self.__brain[color].evaluate(num_discs)
+      self.__board.put[pos](color)
+      self.__board.update_empty_cells(pos)
+      color = not color
+      num_discs += 1
+
+  # 集めた局面で深い探索と浅い探索の評価値を求める
+  # <返値> {(ステージ, 深さ): [(浅い探索の評価値, 深い探索の評価値), ...]}
+  def sample(self, max_height):
+    samples = {}
+    for i, (state, color, num_discs) in enumerate(self.__positions):
+      print "position:", i + 1, "/", len(self.__positions)
+      self.__board.restore_state(state)
+      for height in sorted(othello.Config.MPC_SHALLOW):
+        if height > max_height:
+          break
+        shallow = othello.Config.MPC_SHALLOW[height]
+        stage = min((num_discs + height) / 4, brain.BrainMid.NUM_STAGES - 1)
+        x = self.__brain[color].search_value(num_discs, shallow, height)
+        y = self.__brain[color].search_value(num_discs, height, height)
+        samples.setdefault((stage, height), []).append((x, y))
+    return samples
+
+# 標本[(x, y), ...]に y = a * x + b を当てはめて (a, b, 残差の標準偏差) を返す
+def fit(xy):
+  n = float(len(xy))
+  mx = sum(x for x, y in xy) / n
+  my = sum(y for x, y in xy) / n
+  sxx = sum((x - mx) ** 2 for x, y in xy)
+  sxy = sum((x - mx) * (y - my) for x, y in xy)
+  a = sxy / sxx if sxx > 0 else 1.0
+  b = my - a * mx
+  sigma = math.sqrt(sum((y - a * x - b) ** 2 for x, y in xy) / n)
+  return a, b, sigma
+
+def save(samples, file_name):
+  f = open(file_name, "w")
+  f.write("# stage height shallow a b sigma\n")
+  heights = sorted(set(height for stage, height in samples))
+  for height in heights:
+    pooled = [xy for (stage, h), l in samples.items() if h == height for xy in l]
+    for stage in range(brain.BrainMid.NUM_STAGES):
+      xy = samples.get((stage, height), [])
+      if len(xy) < MIN_SAMPLES:
+        xy = pooled
+      a, b, sigma = fit(xy)
+      f.write("{0} {1} {2} {3} {4} {5}\n".format(stage, height, othello.Config.MPC_SHALLOW[height], a, b, sigma))
+  f.close()
+
+def main():
+  num_games = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_GAMES
+  max_height = int(sys.argv[2]) if len(sys.argv) > 2 else MAX_HEIGHT
+  othello.Config.MPC_T = None   # 自己対戦も Multi-ProbCut なしで行う
+  othello.Config.MID_HEIGHT = PLAY_HEIGHT
+  othello.Config.MID_TIME = float('inf')
+  random.seed(0)
+  calibrator = Calibrator()
+  for i in range(num_games):
+    print "game:", i + 1
+    calibrator.play()
+  save(calibrator.sample(max_height), brain.MPC_FILE)
+
+if __name__ == "__main__":
+  main()
@@ -5,16 +5,55 @@ import pygame
 from pygame.locals import *
 
 import board
+import bitboard
 import book
 import AI
 
 
 class Config:
   # AIの強さに関するパラメータ
-  MID_HEIGHT  = 7 # 中盤ゲーム木の高さ
+  MID_HEIGHT  = 20 # 中盤ゲーム木の高さの上限(実際の深さは反復深化でMID_TIMEまで深くしたところ)
+  MID_TIME    = 1.0 # 中盤の1手あたりの探索時間[sec]
+  MID_ASPIRATION = 4 # 反復深化で前の深さの評価値の前後何石分を探索窓とするか
+  MID_WORKERS = 1  # 中盤探索のルート分割で使うプロセス数. 1なら並列化しない
+  MID_SPLIT_HEIGHT = 4 # この深さ以上の反復でだけルート分割する(浅い探索はプロセス間通信の方が高くつく)
+  FIN_PARITY = True  # 終盤読み切りで空きマスが奇数個の領域の手を先に読む
+  FIN_WLD_HEIGHT = 14   # BrainFinは空きマスがこれ以下の局面で勝敗(WLD)を読み切る
+  FIN_EXACT_HEIGHT = 12 # 空きマスがこれ以下の局面では石差を読み切る. FIN_WLD_HEIGHT以上ならWLDは読まない
+  FIN_TT_ENTRIES = 2**18  # 終盤読み切りの置換表のエントリ数の上限
+  FIN_TT_MB = None        # 指定した場合, FIN_TT_ENTRIESの代わりにメガバイト数で大きさを決める
+  FIN_TT_HEIGHT = 5       # 空きマスがこれ以上の節点で置換表を使う
+  FIN_ETC_HEIGHT = None   # 空きマスがこれ以上の節点でEnhanced Transposition Cutoffを使う. Noneで無効
+                          # (benchmark.py fintt: 空きマス12で節点は3%減るが, 子を引く分と相殺して時間は変わらない)
+  FIN_STABILITY_HEIGHT = 6  # 空きマスがこれ以上の節点で確定石による枝刈りを行う
+  FIN_LAST_SOLVER = True  # 終盤読み切りの残り4マス以下は専用の関数で読む
+  FIN_WORKERS = 1  # 終盤読み切りのYBWCで使うプロセス数. 1なら並列化しない
+  FIN_SPLIT_HEIGHT = 9 # 残りの深さがこれ以上の節点でだけ兄弟をワーカーに分ける
+  SMP_THREADS = 1  # AIがLazy SMPで探索するプロセス数(メインを含む). 1なら並列化しない. MID_WORKERS, FIN_WORKERSより優先
+  KILLER_HISTORY = True # killer move と history heuristic で手を並べ替える
+  EVAL_INT16  = False # 盤面評価関数の重みをint16に量子化したもの(weights.QUANT_SCALE分の1石単位の整数)を使う
+  MPC_T       = None # Multi-ProbCutの選択性. 小さいほど多く枝刈りする(速いが読み落としが増える). Noneで無効
+                     # (同梱のwei/mpc.txtは8局の自己対戦から推定しただけなので, 十分な局数で推定し直すまで使わない)
+  MPC_SHALLOW = {3: 1, 4: 2, 5: 1, 6: 2, 7: 3, 8: 4, 9: 3, 10: 4} # Multi-ProbCutを使う深さ: 予測に使う浅い探索の深さ
+
+  # AIの持ち時間に関するパラメータ
+  GAME_TIME       = None # AIの1ゲームの持ち時間[sec]. Noneなら持ち時間なし(中盤は1手MID_TIME, 終盤は無制限)
+  GAME_INCREMENT  = 0    # 1手毎に持ち時間に加算する時間[sec]
+  TIME_MARGIN     = 0.5  # 持ち時間のうち探索に使わずに残しておく分[sec]
+  TIME_EMERGENCY  = 5.0  # 持ち時間の残りがこれを下回ったら緊急モード(1手に残り手数で割った半分しか使わない)[sec]
+  TIME_FIN_SHARE  = 0.3  # 中盤で終盤読み切り用に残しておく持ち時間の割合
+  TIME_HARD_RATIO = 3.0  # 1手の配分時間に対するhard deadlineの倍率
+  TIME_UNSTABLE   = 1.5  # 反復深化で最善手が変わったときにsoft deadlineを延ばす倍率
+  TIME_STABLE     = 0.6  # 最善手が3反復変わらなかったときにsoft deadlineを縮める倍率
   FIN_HEIGHT  = 14 # 終盤ゲーム木の高さの上限
   FIN_PHASE   = 60-FIN_HEIGHT # 終盤読み切りを開始するタイミング
 
+  MID_TT_ENTRIES = 2 ** 18 # 中盤探索の置換表のエントリ数の上限
+  MID_TT_MB      = None    # 置換表の大きさの上限[MB]. Noneでなければ MID_TT_ENTRIES より優先する
+
+  BITBOARD    = False # True: 盤面をBitBoardで表現する, False: Board(インデックス)で表現する
+  DEBUG       = False # True: 差分更新している値(ハッシュ値など)を参照のたびに計算し直して検証する
+
   CELL_WIDTH    = 80  # GUIでのマスのサイズ
 
   BLACK = 0
@@ -75,7 +114,10 @@ class UndoRequest(Exception):
 # ゲームの進行
 class Game:
   def __init__( self ):
-    self.__board  = board.Board( True )
+    if Config.BITBOARD:
+      self.__board = bitboard.BitBoard( True )
+    else:
+      self.__board = board.Board( True )
     self.__player = [None] * 2
     self.__opening_book = book.OpeningBook()
 
@@ -0,0 +1,264 @@
+# -*- coding:utf-8 -*-
+
+# 複数プロセスによる並列探索
+
+import functools
+import multiprocessing
+
+import othello
+import board
+import bitboard
+import brain
+import timer
+import transposition
+import weights
+
+#######################################################################################################################
+# ルート分割: ルートの各手の探索をプロセスプールのワーカーに割り振る
+# 最初の手(最善と見込まれる手)は呼び出し側で探索して下限(alpha)を決めておき, 残りの手をワーカーに渡す.
+# alphaはワーカー間で共有し, 各ワーカーは手の探索を始めるときにその時点のalphaを窓に使う.
+# 各ワーカーは自分のBoardとBrainMid(置換表など)を持つ. 重みはプール作成時に渡し, 共有するハンドル(weights.SharedWeights)なら
+# 各ワーカーが同じファイルをmmapするので, ワーカーを増やしても重みの分のメモリは増えない.
+
+TIMEOUT = None  # ワーカーが制限時間で探索を打ち切ったときの評価値
+
+# ワーカープロセスの状態
+_board = None
+_brains = None
+_alpha = None   # 共有するalpha
+_cutoff = None  # betaカットした探索の番号. これと同じ番号の残りの手は探索しない
+
+def _new_board():
+  if othello.Config.BITBOARD:
+    return bitboard.BitBoard(False)
+  return board.Board(False)
+
+# 重みweightをプールのキーにする. 共有するハンドルは同じファイルなら等しく, 重みのリストは同じオブジェクトだけが等しい
+def _weight_key(weight):
+  if isinstance(weight, weights.SharedWeights):
+    return weight
+  return id(weight)
+
+def _init_worker(weight, alpha, cutoff):
+  global _board, _brains, _alpha, _cutoff
+  _board = _new_board()
+  _brains = [brain.BrainMid(_board, color, weight) for color in (0, 1)]
+  _alpha = alpha
+  _cutoff = cutoff
+
+# ワーカーで1手を探索する
+# <返値> (位置, 評価値, 探索に使ったalpha). 評価値はbetaカット済みで探索しなかった場合もTIMEOUT
+def _search_move(task):
+  batch, state, color, num_discs, height, pos, alpha, beta, deadline = task
+  if _cutoff.value == batch:
+    return pos, TIMEOUT, alpha
+  alpha = max(alpha, _alpha.value)
+  _board.restore_state(state)
+  try:
+    value = _brains[color].search_move(num_discs, height, pos, alpha, beta, deadline)
+  except brain.SearchTimeout:
+    return pos, TIMEOUT, alpha
+  with _alpha.get_lock():
+    if value > _alpha.value:
+      _alpha.value = value
+  if value >= beta:
+    _cutoff.value = batch
+  return pos, value, alpha
+
+# ワーカーの結果 [(位置, 評価値, 探索に使ったalpha), ...] から探索し終えた手を取り出す.
+# 探索に使ったalpha以下の評価値はfail-lowした上界なので, 節点の評価値は(逐次の探索と同じく)全ての評価値の最大値とする.
+# cut: betaカットした手があるか. あれば他の手は探索しなくてよいので, 打ち切られた手があっても構わない
+# <返値> [(位置, 評価値, 探索に使ったalpha), ...]. 打ち切られた手があってbetaカットもしていなければNone
+def _collect(results, cut):
+  if not cut and any(value is TIMEOUT for pos, value, a in results):
+    return None
+  return [(pos, value, a) for pos, value, a in results if value is not TIMEOUT]
+
+class RootSplitter:
+  def __init__(self, num_workers, weight):
+    self.__alpha = multiprocessing.Value('d', 0.0)
+    self.__cutoff = multiprocessing.Value('i', -1)
+    self.__pool = multiprocessing.Pool(num_workers, _init_worker, (weight, self.__alpha, self.__cutoff))
+    self.__batch = 0
+
+  # 盤面state, 手番colorで各手list_posを深さheight, 窓(alpha, beta)で探索する
+  # <返値> [(位置, 評価値, 探索に使ったalpha), ...](list_posの順). 制限時間を過ぎた手があればNone
+  def search(self, state, color, num_discs, height, list_pos, alpha, beta, deadline):
+    self.__batch += 1
+    self.__alpha.value = alpha
+    tasks = [(self.__batch, state, color, num_discs, height, pos, alpha, beta, deadline) for pos in list_pos]
+    results = self.__pool.map(_search_move, tasks, chunksize=1)
+    return _collect(results, self.__cutoff.value == self.__batch)
+
+  def close(self):
+    self.__pool.terminate()
+    self.__pool.join()
+
+# プロセスプールは作るのに時間がかかるので, ワーカー数と重みが同じなら使い回す
+_splitters = {}
+
+def get_root_splitter(num_workers, weight):
+  key = (num_workers, _weight_key(weight))
+  if key not in _splitters:
+    _splitters[key] = RootSplitter(num_workers, weight)
+  return _splitters[key]
+
+#######################################################################################################################
+# 終盤読み切りの並列化 (Young Brothers Wait Concept)
+# BrainFinのNegaScoutで, 残りの深さがConfig.FIN_SPLIT_HEIGHT以上の節点では長男(最善と見込まれる手)を
+# 呼び出し側で読み切った後, 残りの兄弟をプロセスプールのワーカーに分けて読む.
+# alphaは兄弟の間で共有し, どれかがbetaカットしたら同じ節点の残りの兄弟は打ち切る.
+# 分割するのは呼び出し側のプロセスだけで, ワーカーは受け取った手を逐次に読む.
+
+_fins = None
+
+# 探索中の分割番号の兄弟がbetaカットしたら立つ停止フラグ(BrainFinの停止フラグとして使う)
+class _Cancel(object):
+  def __init__(self):
+    self.batch = None
+
+  @property
+  def value(self):
+    return _cutoff.value == self.batch
+
+_cancel = None
+
+def _init_fin_worker(alpha, cutoff):
+  global _board, _fins, _alpha, _cutoff, _cancel
+  _board = _new_board()
+  _cancel = _Cancel()
+  _fins = [brain.BrainFin(_board, color) for color in (0, 1)]
+  for fin in _fins:
+    fin.share(None, _cancel)
+  _alpha = alpha
+  _cutoff = cutoff
+
+# ワーカーで1手を読み切る
+# <返値> (位置, 評価値, 探索に使ったalpha). 評価値は打ち切った場合TIMEOUT
+def _solve_move(task):
+  batch, state, color, height, pos, alpha, beta, deadline = task
+  if _cutoff.value == batch:
+    return pos, TIMEOUT, alpha
+  alpha = max(alpha, _alpha.value)
+  _board.restore_state(state)
+  _cancel.batch = batch
+  try:
+    value = _fins[color].solve_move(height, pos, alpha, beta, deadline)
+  except brain.SearchTimeout:
+    _board.restore_state(state)
+    return pos, TIMEOUT, alpha
+  with _alpha.get_lock():
+    if value > _alpha.value:
+      _alpha.value = value
+  if value >= beta:
+    _cutoff.value = batch
+  return pos, value, alpha
+
+class YBWCSplitter:
+  def __init__(self, num_workers):
+    self.__alpha = multiprocessing.Value('l', 0)  # 石差. Config.INFが入るようにlong
+    self.__cutoff = multiprocessing.Value('i', -1)
+    self.__pool = multiprocessing.Pool(num_workers, _init_fin_worker, (self.__alpha, self.__cutoff))
+    self.__batch = 0
+
+  # 盤面state, 手番colorの節点の兄弟list_posを残りの深さheight, 窓(alpha, beta)で読み切る
+  # <返値> [(位置, 評価値, 探索に使ったalpha), ...](list_posの順). 制限時間を過ぎた手があればNone
+  def search(self, state, color, height, list_pos, alpha, beta, deadline):
+    self.__batch += 1
+    self.__alpha.value = alpha
+    tasks = [(self.__batch, state, color, height, pos, alpha, beta, deadline) for pos in list_pos]
+    results = self.__pool.map(_solve_move, tasks, chunksize=1)
+    return _collect(results, self.__cutoff.value == self.__batch)
+
+  def close(self):
+    self.__pool.terminate()
+    self.__pool.join()
+
+_ybwc_splitters = {}
+
+def get_ybwc_splitter(num_workers):
+  if num_workers not in _ybwc_splitters:
+    _ybwc_splitters[num_workers] = YBWCSplitter(num_workers)
+  return _ybwc_splitters[num_workers]
+
+#######################################################################################################################
+# Lazy SMP: 全てのプロセスが同じルートを探索し, 置換表(transposition.SharedTranspositionTable)だけを共有する.
+# ヘルパーは深さや手の順序を少しずつ変えて探索するので, 他のプロセスが置換表に残した結果で探索が速くなる.
+# 反復を終えたプロセスはその結果を公開し(より深い結果だけが残る), メインの探索(呼び出し側のBrain)は
+# 自分の探索を終えたら停止フラグを立ててヘルパーを止め, 公開された結果と自分の結果の深い方を使う.
+# 終盤の読み切りでも置換表を共有し, 最初に読み切ったプロセスが停止フラグを立てる.
+
+_stop = None    # 停止フラグ
+_result = None  # 公開された結果 (深さ, 位置, 評価値). 深さが負なら結果なし
+
+def _init_smp_worker(weight, tt, stop, result):
+  global _board, _brains, _fins, _stop, _result
+  _board = _new_board()
+  _brains = [brain.BrainMid(_board, color, weight) for color in (0, 1)]
+  _fins = [brain.BrainFin(_board, color) for color in (0, 1)]
+  for color in (0, 1):
+    _brains[color].share(tt, stop)
+    _fins[color].share(tt, stop)
+  _stop = stop
+  _result = result
+
+# 共有配列resultに結果 (深さ, 位置, 評価値) を公開する. より深い結果だけを残す
+def _publish(result, depth, pos, value):
+  with result.get_lock():
+    if depth > result[0]:
+      result[0] = depth
+      result[1] = pos
+      result[2] = value
+
+def _smp_search(task):
+  phase, state, color, num_discs, helper, deadline = task
+  _board.restore_state(state)
+  publish = functools.partial(_publish, _result)
+  if phase == timer.MID:
+    _brains[color].search_helper(num_discs, helper, deadline, publish)
+  else:
+    _fins[color].search_helper(num_discs, helper, deadline, publish)
+    if _result[0] >= 0:  # 読み切ったので他のプロセスを止める
+      _stop.value = 1
+
+class LazySMP:
+  def __init__(self, num_threads, weight):
+    self.tt = transposition.SharedTranspositionTable(othello.Config.MID_TT_ENTRIES, othello.Config.MID_TT_MB)
+    self.stop = multiprocessing.RawValue('i', 0)
+    self.__result = multiprocessing.Array('d', [-1, 0, 0])
+    self.__num_helpers = num_threads - 1
+    self.__pool = multiprocessing.Pool(self.__num_helpers, _init_smp_worker, (weight, self.tt, self.stop, self.__result))
+    self.__tasks = []
+
+  # ヘルパーに盤面state, 手番colorの局面の探索を始めさせる. phaseはtimer.MIDかtimer.FIN
+  def start(self, phase, state, color, num_discs, deadline):
+    self.stop.value = 0
+    self.__result[0] = -1
+    self.__tasks = [self.__pool.apply_async(_smp_search, ((phase, state, color, num_discs, helper, deadline),))
+                    for helper in range(1, self.__num_helpers + 1)]
+
+  # メインの探索が深さdepthの結果を得た
+  def publish(self, depth, pos, value):
+    _publish(self.__result, depth, pos, value)
+
+  # ヘルパーを止めて, 公開された最も深い結果 (深さ, 位置, 評価値) を返す. なければNone
+  def finish(self):
+    self.stop.value = 1
+    for task in self.__tasks:
+      task.get()
+    self.__tasks = []
+    if self.__result[0] < 0:
+      return None
+    return int(self.__result[0]), int(self.__result[1]), self.__result[2]
+
+  def close(self):
+    self.__pool.terminate()
+    self.__pool.join()
+
+_smps = {}
+
+def get_lazy_smp(num_threads, weight):
+  key = (num_threads, _weight_key(weight))
+  if key not in _smps:
+    _smps[key] = LazySMP(num_threads, weight)
+  return _smps[key]
@@ -0,0 +1,53 @@
+# -*- coding:utf-8 -*-
+
+# BitBoardがBoardと同じ盤面評価になることのテスト
+# usage: cd src; python -m unittest discover test
+
+import os
+import sys
+import random
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import board
+import bitboard
+import brain
+import weights
+
+class EquivalenceTest(unittest.TestCase):
+  # ランダム対局の全ての局面で, 着手可能位置数差・評価値・各マスの着手可否と裏返る石数がBoardと一致すること
+  def test_mobility_and_score(self):
+    weight = weights.load(brain.BrainMid.NUM_STAGES, brain.BrainMid.NUM_PATTARNS)
+    rand = random.Random(0)
+    b = board.Board(False)
+    bb = bitboard.BitBoard(False)
+    for game in range(20):
+      b.init()
+      bb.init()
+      color = 0
+      num_discs = 0
+      while True:
+        stage = min(num_discs / 4, brain.BrainMid.NUM_STAGES - 1)
+        b.set_evaluator(weight[stage])
+        bb.set_evaluator(weight[stage])
+        for c in (0, 1):
+          self.assertEqual(b.get_mobility(c), bb.get_mobility(c))
+        self.assertAlmostEqual(b.get_score(), bb.get_score(), places=4)
+        cells = b.placeable_cells(color)
+        self.assertEqual(sorted(cells), sorted(bb.placeable_cells(color)))
+        for pos in range(64):
+          self.assertEqual(bool(b.placeable[pos](color)), bool(bb.placeable[pos](color)))
+          self.assertEqual(b.takes[pos](color), bb.takes[pos](color))
+        if not cells:
+          if not b.placeable_cells(not color):
+            break
+          color = not color
+          continue
+        pos = rand.choice(cells)
+        b.put[pos](color)
+        bb.put[pos](color)
+        num_discs += 1
+        color = not color
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,136 @@
+# -*- coding:utf-8 -*-
+
+# 終盤読み切り(BrainFin)のテスト
+# usage: cd src; python -m unittest discover test
+
+import os
+import sys
+import random
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import othello
+import board
+import brain
+
+INF = othello.Config.INF
+
+# 乱数の種seedのランダム対局で石数(初期配置の4つを除く)num_discsになった盤面と手番を返す.
+# 途中で終局するか手番に着手可能位置がなければNone
+def random_position(seed, num_discs):
+  rand = random.Random(seed)
+  b = board.Board(False)
+  color = 0
+  discs = 0
+  while discs < num_discs:
+    cells = b.placeable_cells(color)
+    if not cells:
+      if not b.placeable_cells(not color):
+        return None
+      color = not color
+      continue
+    pos = rand.choice(cells)
+    b.put[pos](color)
+    b.update_empty_cells(pos)
+    discs += 1
+    color = not color
+  if not b.placeable_cells(color):
+    return None
+  return b, color
+
+# 乱数の種を0から順に使い, 石数num_discsの局面をnum_positions個返す
+def random_positions(num_positions, num_discs):
+  res = []
+  seed = 0
+  while len(res) < num_positions:
+    position = random_position(seed, num_discs)
+    if position is not None:
+      res.append(position)
+    seed += 1
+  return res
+
+# 窓(alpha, beta)で読んだfail-softの評価値valueが真の評価値exactと矛盾しないか
+def consistent(value, exact, alpha, beta):
+  if value <= alpha:
+    return exact <= value
+  if value >= beta:
+    return exact >= value
+  return exact == value
+
+# 手番colorから見た読み切りの評価値(石差)を全ての手を読んで求める
+def brute_force(b, color, passed=False):
+  cells = b.placeable_cells(color)
+  if not cells:
+    if passed:
+      return b.get_difference(color)
+    return -brute_force(b, not color, True)
+  res = -INF
+  for pos in cells:
+    b.put[pos](color)
+    res = max(res, -brute_force(b, not color))
+    b.undo()
+  return res
+
+class ConfigTestCase(unittest.TestCase):
+  # テスト中に変えたConfigの値を元に戻す
+  def setUp(self):
+    self.__config = dict((name, getattr(othello.Config, name)) for name in dir(othello.Config) if name.isupper())
+
+  def tearDown(self):
+    for name, value in self.__config.items():
+      setattr(othello.Config, name, value)
+
+class YBWCTest(ConfigTestCase):
+  # 兄弟をワーカーに分けた節点の評価値が, 狭い窓でも逐次の読み切りの評価値とfail-softとして矛盾しないこと
+  # (ワーカーが上げたalpha以下で返した兄弟を捨てると, fail-lowした節点の上界が小さくなりすぎる)
+  def test_split_narrow_window(self):
+    othello.Config.FIN_TT_HEIGHT = 61  # 置換表に残った結果で間違いが隠れないように
+    othello.Config.FIN_SPLIT_HEIGHT = 5
+    empties = 10
+    for b, color in random_positions(3, 60 - empties):
+      state = b.get_state()
+      othello.Config.FIN_WORKERS = 1
+      sequential = brain.BrainFin(b, color)
+      exact = dict((pos, sequential.solve_move(empties, pos, -INF, INF, float('inf')))
+                   for pos in b.placeable_cells(color))
+      othello.Config.FIN_WORKERS = 2
+      split = brain.BrainFin(b, color)
+      split.evaluate(60 - empties)  # ワーカーのプールを作る
+      b.restore_state(state)
+      for pos, value in exact.items():
+        for alpha, beta in ((-2, 2), (value - 3, value - 1), (value + 1, value + 3)):
+          result = split.solve_move(empties, pos, alpha, beta, float('inf'))
+          b.restore_state(state)
+          self.assertTrue(consistent(result, value, alpha, beta),
+                          "pos %d window (%d, %d): %d, exact %d" % (pos, alpha, beta, result, value))
+
+class LastSolverTest(ConfigTestCase):
+  # 残り4マスの節点がNegaScoutから__solve4に渡され, 全ての手を読んだ結果と矛盾しないこと
+  def test_solve4(self):
+    othello.Config.FIN_LAST_SOLVER = True
+    calls = [0]
+    solve4 = brain.BrainFin._BrainFin__solve4
+    def counted(*args):
+      calls[0] += 1
+      return solve4(*args)
+    brain.BrainFin._BrainFin__solve4 = counted
+    try:
+      empties = 6
+      for b, color in random_positions(5, 60 - empties):
+        state = b.get_state()
+        fin = brain.BrainFin(b, color)
+        for pos in b.placeable_cells(color):
+          b.put[pos](color)
+          exact = -brute_force(b, not color)
+          b.undo()
+          for alpha, beta in ((-INF, INF), (exact - 3, exact - 1), (exact + 1, exact + 3), (-1, 1)):
+            value = fin.solve_move(empties, pos, alpha, beta, float('inf'))
+            b.restore_state(state)
+            self.assertTrue(consistent(value, exact, alpha, beta),
+                            "pos %d window (%d, %d): %d, exact %d" % (pos, alpha, beta, value, exact))
+    finally:
+      brain.BrainFin._BrainFin__solve4 = solve4
+    self.assertTrue(calls[0] > 0, "__solve4 was never called")
+
+if __name__ == "__main__":
+  unittest.main()
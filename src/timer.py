@@ -0,0 +1,96 @@
+# -*- coding:utf-8 -*-
+
+import time
+
+import othello
+
+# 探索の局面
+BOOK = 0  # 定石
+MID  = 1  # 中盤
+FIN  = 2  # 終盤読み切り
+
+#######################################################################################################################
+# 持ち時間の管理と1手あたりの時間配分
+# 1手毎に2つの期限を決める.
+#   soft: これを過ぎたら新しい反復(深さ)やルートの次の手の探索を始めない
+#   hard: これを過ぎたら探索中でも打ち切る(探索関数がSearchTimeoutを投げる)
+# 持ち時間がNoneの場合は中盤は1手あたりConfig.MID_TIME, 定石と終盤は時間制限なしとする.
+class TimeManager:
+  def __init__(self, total=None, increment=0):
+    self.remaining = total       # 持ち時間の残り[sec]
+    self.__increment = increment # 1手毎に加算される時間[sec]
+    self.soft = None             # soft deadline(時刻). Noneなら期限なし
+    self.hard = None             # hard deadline(時刻). Noneなら期限なし
+    self.emergency = False       # 持ち時間が残り少ないときTrue
+    self.__start = None
+    self.__base_soft = None
+    self.__best = None           # 直前の反復の最善手
+    self.__stable = 0            # 最善手が変わらなかった反復の回数
+
+  # 石数(初期配置の4つを除く)num_discsの局面で, 局面phaseの探索を始める
+  def start(self, num_discs, phase):
+    self.__start = time.time()
+    self.__best = None
+    self.__stable = 0
+    self.emergency = False
+    if self.remaining is None:
+      if phase == MID:
+        self.__set_deadlines(othello.Config.MID_TIME / 2, othello.Config.MID_TIME)
+      else:
+        self.__set_deadlines(None, None)
+      return
+
+    if phase == BOOK:  # 定石は探索しない
+      self.__set_deadlines(None, None)
+      return
+
+    usable = max(0.0, self.remaining - othello.Config.TIME_MARGIN)
+    moves = max(1, (60 - num_discs + 1) / 2)  # 自分の残り手数
+    if usable < othello.Config.TIME_EMERGENCY:
+      # 持ち時間が残り少ないので, 残り手数で均等に割った時間を超えたらすぐに打ち切る
+      self.emergency = True
+      budget = usable / (moves * 2)
+      self.__set_deadlines(budget / 2, budget)
+      return
+
+    if phase == MID:
+      # 持ち時間のうち終盤読み切り用に残す分を除いて, 読み切り開始までの自分の手数で割る
+      mid_moves = max(1, (othello.Config.FIN_PHASE - num_discs + 1) / 2)
+      budget = usable * (1 - othello.Config.TIME_FIN_SHARE) / mid_moves + self.__increment
+    else:
+      # 読み切りは最初の数手がほとんどの時間を使うので, 残り手数の半分で割る
+      budget = usable * 2 / (moves + 1) + self.__increment
+    self.__set_deadlines(budget / 2, min(budget * othello.Config.TIME_HARD_RATIO, usable / 2))
+
+  # 反復深化の1反復が終わったときに呼ぶ. 最善手が変わり続けていれば soft を延ばし, 安定していれば縮める
+  def iteration_done(self, best):
+    if self.__base_soft is None:
+      return
+    if best == self.__best:
+      self.__stable += 1
+    elif self.__best is not None:
+      self.__stable = -1  # 最善手が変わった
+    self.__best = best
+    if self.__stable < 0:
+      ratio = othello.Config.TIME_UNSTABLE
+    elif self.__stable >= 3:
+      ratio = othello.Config.TIME_STABLE
+    else:
+      ratio = 1.0
+    self.soft = min(self.__start + self.__base_soft * ratio, self.hard)
+
+  # 着手が決まったときに呼ぶ. 使った時間を持ち時間から引く
+  # <返値> この手で使った時間[sec]
+  def stop(self):
+    elapsed = time.time() - self.__start
+    if self.remaining is not None:
+      self.remaining += self.__increment - elapsed
+    return elapsed
+
+  def __set_deadlines(self, soft, hard):
+    self.__base_soft = soft
+    if soft is None:
+      self.soft = self.hard = None
+    else:
+      self.soft = self.__start + min(soft, hard)
+      self.hard = self.__start + hard
@@ -0,0 +1,188 @@
+# -*- coding:utf-8 -*-
+
+# 置換表: 探索済みの局面の評価値(またはその上界・下界)と最善手を, 局面のハッシュ値をキーにして記録する.
+# 同じ局面に別の手順で到達したとき(transposition)に探索を省略したり, 記録された最善手から探索したりする.
+
+import ctypes
+import multiprocessing
+import struct
+
+EXACT = 0  # 評価値は真値
+LOWER = 1  # 評価値は下界 (betaカットした)
+UPPER = 2  # 評価値は上界 (全ての手がalpha以下だった)
+
+#######################################################################################################################
+# 置換表
+# 各インデックスに2つのスロットを持つ.
+#   スロット0: 深さ優先. 記録済みのものより深い探索の結果か, 以前の探索(new_search以前)の結果なら置き換える
+#   スロット1: 常に置き換える
+# 大きさはエントリ数かメガバイト数で指定し, それを超えて大きくはならない.
+class TranspositionTable:
+  ENTRY_BYTES = 160  # 1エントリが占めるメモリの概算(キー, エントリのタプルとその要素, 参照2つ)
+
+  def __init__(self, num_entries=None, megabytes=None):
+    if megabytes is not None:
+      num_entries = int(megabytes * 1024 * 1024 / TranspositionTable.ENTRY_BYTES)
+    size = 1
+    while size * 4 <= num_entries:  # 2スロット分でnum_entriesを超えない2の冪
+      size *= 2
+    self.__mask    = size - 1
+    self.__keys    = [None] * (size * 2)
+    self.__entries = [None] * (size * 2)  # (深さ, 評価値の種類, 評価値, 最善手, 探索の世代)
+    self.__age     = 0
+    self.reset_stats()
+
+  # エントリ数の上限
+  def capacity(self):
+    return len(self.__keys)
+
+  def clear(self):
+    self.__keys    = [None] * len(self.__keys)
+    self.__entries = [None] * len(self.__entries)
+
+  # 新しい探索を始める. 以前の探索の結果は深さ優先スロットでも置き換えの対象になる
+  def new_search(self):
+    self.__age += 1
+
+  # 局面keyを探索深さdepth, 窓(alpha, beta)で探索するときに置換表を引く
+  # <返値> (評価値, 最善手). 記録された結果だけで評価値が決まる場合はその評価値, 決まらなければNone.
+  #        最善手が記録されていなければNone.
+  def lookup(self, key, depth, alpha, beta):
+    self.probes += 1
+    i = (key & self.__mask) * 2
+    if self.__keys[i] == key:
+      entry = self.__entries[i]
+    elif self.__keys[i + 1] == key:
+      entry = self.__entries[i + 1]
+    else:
+      return None, None
+    self.hits += 1
+    if entry[0] >= depth:
+      flag = entry[1]
+      value = entry[2]
+      if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+        self.cutoffs += 1
+        return value, entry[3]
+    return None, entry[3]
+
+  # 局面keyを探索深さdepth, 窓(alpha, beta)で探索した結果(評価値value, 最善手move)を記録する
+  def store(self, key, depth, alpha, beta, value, move):
+    if value <= alpha:
+      flag = UPPER
+    elif value >= beta:
+      flag = LOWER
+    else:
+      flag = EXACT
+    i = (key & self.__mask) * 2
+    entry = self.__entries[i]
+    if entry is None or self.__keys[i] == key or entry[0] <= depth or entry[4] != self.__age:
+      self.__keys[i] = key
+      self.__entries[i] = (depth, flag, value, move, self.__age)
+    else:
+      self.__keys[i + 1] = key
+      self.__entries[i + 1] = (depth, flag, value, move, self.__age)
+
+  def reset_stats(self):
+    self.probes  = 0  # 置換表を引いた回数
+    self.hits    = 0  # 局面が記録されていた回数
+    self.cutoffs = 0  # 記録された結果だけで評価値が決まった回数
+
+  def __str__(self):
+    return "probes:{0} hits:{1} cutoffs:{2}".format(self.probes, self.hits, self.cutoffs)
+
+#######################################################################################################################
+# プロセス間で共有する置換表 (Lazy SMP用)
+# TranspositionTableと同じインターフェースで, 中身はfork前に確保した共有メモリ(multiprocessing.RawArray)に置く.
+# ロックは使わず, 各スロットに キー^データ^評価値のビット列 を検査値として書く(Hyatt の lockless hashing).
+# 他のプロセスが書きかけのスロットを読んだ場合は検査値が一致しないので, 記録されていないものとして扱う.
+# キーは符号付き64bitに収まる整数であること.
+class SharedTranspositionTable:
+  ENTRY_BYTES = 24     # 1エントリが占めるメモリ(検査値, データ, 評価値 各8byte)
+  NO_MOVE = 127        # データ中の「最善手なし」
+  INT_VALUE = 1 << 25  # データ中の「評価値が整数」. 評価値の配列はdoubleなので, 読んだ値をintに戻す
+
+  def __init__(self, num_entries=None, megabytes=None):
+    if megabytes is not None:
+      num_entries = int(megabytes * 1024 * 1024 / SharedTranspositionTable.ENTRY_BYTES)
+    size = 1
+    while size * 4 <= num_entries:
+      size *= 2
+    self.__mask   = size - 1
+    self.__checks = multiprocessing.RawArray(ctypes.c_longlong, size * 2)  # キー^データ^評価値のビット列
+    self.__data   = multiprocessing.RawArray(ctypes.c_longlong, size * 2)  # 深さ+1 | 種類<<8 | 最善手<<10 | 世代<<17 | 整数か<<25. 0なら空
+    self.__values = multiprocessing.RawArray(ctypes.c_double, size * 2)    # 評価値
+    self.__age    = multiprocessing.RawValue(ctypes.c_int, 0)              # 探索の世代. 全プロセスで共通
+    self.reset_stats()
+
+  def capacity(self):
+    return len(self.__checks)
+
+  def clear(self):
+    for array in (self.__checks, self.__data, self.__values):
+      ctypes.memset(array, 0, ctypes.sizeof(array))
+
+  def new_search(self):
+    self.__age.value = (self.__age.value + 1) & 255
+
+  def lookup(self, key, depth, alpha, beta):
+    self.probes += 1
+    i = (key & self.__mask) * 2
+    for j in (i, i + 1):
+      data = self.__data[j]
+      value = self.__values[j]
+      if self.__checks[j] ^ data ^ _bits(value) == key and data:
+        break
+    else:
+      return None, None
+    self.hits += 1
+    move = (data >> 10) & 127
+    if move == SharedTranspositionTable.NO_MOVE:
+      move = None
+    if data & SharedTranspositionTable.INT_VALUE:
+      value = int(value)
+    if (data & 255) - 1 >= depth:
+      flag = (data >> 8) & 3
+      if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+        self.cutoffs += 1
+        return value, move
+    return None, move
+
+  def store(self, key, depth, alpha, beta, value, move):
+    if value <= alpha:
+      flag = UPPER
+    elif value >= beta:
+      flag = LOWER
+    else:
+      flag = EXACT
+    age = self.__age.value
+    i = (key & self.__mask) * 2
+    data = self.__data[i]
+    if (not data or self.__checks[i] ^ data ^ _bits(self.__values[i]) == key or (data & 255) - 1 <= depth or
+        (data >> 17) & 255 != age):
+      j = i
+    else:
+      j = i + 1
+    if move is None:
+      move = SharedTranspositionTable.NO_MOVE
+    data = (depth + 1) | flag << 8 | move << 10 | age << 17
+    if isinstance(value, int):
+      data |= SharedTranspositionTable.INT_VALUE
+    value = float(value)
+    self.__data[j] = data
+    self.__values[j] = value
+    self.__checks[j] = key ^ data ^ _bits(value)
+
+  def reset_stats(self):
+    self.probes  = 0  # 置換表を引いた回数(このプロセスの分)
+    self.hits    = 0
+    self.cutoffs = 0
+
+  def __str__(self):
+    return "probes:{0} hits:{1} cutoffs:{2}".format(self.probes, self.hits, self.cutoffs)
+
+_DOUBLE = struct.Struct("<d")
+_LONG = struct.Struct("<q")
+
+# 浮動小数点数のビット列を符号付き64bit整数として返す
+def _bits(value):
+  return _LONG.unpack(_DOUBLE.pack(value))[0]
@@ -0,0 +1,254 @@
+# -*- coding:utf-8 -*-
+
+# Logistelloパターンの重みファイルの読み書き
+# 対称形(マスの並びを反転したもの等)どうしのパターンの値は同じ重みになるので, 重みは対称形の組毎に1つだけ持つ.
+# 重みは weight[ステージ][パターン][CANONICAL[パターン][パターンの値]] の3段の添字で引く.
+#   テキスト形式: WEIGHT_DIR/w<ステージ>.txt. 1行に1パターン分の重みを全てのパターンの値について空白区切りで並べる(学習結果の保存・配布用)
+#   バイナリ形式: WEIGHT_FILE. ヘッダの後にステージ毎に全パターンの対称形の組毎の重みをfloat32で連続して並べる.
+#                 mmapして各パターンの範囲をctypesの配列として参照するので, 読み込みは一瞬で, ページは複数のプロセスで共有される
+#   量子化形式:   WEIGHT_FILE_INT16. バイナリ形式と同じ並びで, 重みをQUANT_SCALE倍して丸めたint16を並べる(大きさは半分).
+#                 評価値はQUANT_SCALE分の1石単位の整数になる
+# バイナリ形式・量子化形式のファイルが無いかテキスト形式より古ければ, テキスト形式から作り直す.
+# usage: python weights.py [bin|int16|text]
+#        (テキスト形式 -> バイナリ形式 / テキスト形式 -> 量子化形式 / バイナリ形式 -> テキスト形式 に変換する)
+
+import os
+import sys
+import mmap
+import array
+import ctypes
+import struct
+
+WEIGHT_DIR  = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'wei')
+WEIGHT_FILE = os.path.join(WEIGHT_DIR, 'weights.bin')
+WEIGHT_FILE_INT16 = os.path.join(WEIGHT_DIR, 'weights16.bin')
+
+QUANT_SCALE = 128  # 量子化形式の重みの単位. 1石 = QUANT_SCALE
+
+MAGIC  = 'OWEI'
+HEADER = struct.Struct('=4sIII')  # マジックナンバー, ステージ数, パターン数, 1石あたりの値. 続けてパターン毎の重みの数(uint32)を並べる
+
+# board.features()のパターン毎の (マス数, 対称形の種類)
+# 'line': マスの並びを反転する, 'corner': 3x3の隅を対角線で折り返す, None: 対称形なし(2x5の隅は8通りの向きを別のパターンとして数える)
+PATTERNS = ((8, 'line'),) * 3 + tuple((n, 'line') for n in (4, 5, 6, 7, 8, 10)) + ((10, None), (9, 'corner'))
+
+# 対称形の種類kindのマス数lengthのパターンの値 -> 対称形のパターンの値 の表
+def symmetry_table(length, kind):
+  if kind == 'line':
+    table = [0]
+    for n in range(length):  # 長さnの表から長さn+1の表を作る. 最下位のマスは反転すると最上位のマスになる
+      table = [(code % 3) * 3**n + table[code / 3] for code in range(3**(n+1))]
+    return table
+  if kind == 'corner':  # マスi(3**iの桁)は3x3の(i/3, i%3)
+    transpose = [(i % 3) * 3 + i / 3 for i in range(9)]
+    return [sum((code / 3**i) % 3 * 3**transpose[i] for i in range(9)) for code in range(3**9)]
+  return range(3**length)
+
+# パターンの値 -> 重みの添字 の表と重みの数(対称形の組の数). 値の小さい方から順に組に添字を振る
+def _init_canonical():
+  tables, sizes = [], []
+  for length, kind in PATTERNS:
+    symmetry = symmetry_table(length, kind)
+    table = array.array('H', [0]) * 3**length
+    size = 0
+    for code, symm in enumerate(symmetry):
+      if symm < code:
+        table[code] = table[symm]
+      else:
+        table[code] = size
+        size += 1
+    tables.append(table)
+    sizes.append(size)
+  return tables, sizes
+
+# CANONICAL[パターン][パターンの値]: 重みの添字. NUM_CANONICAL[パターン]: 重みの数
+CANONICAL, NUM_CANONICAL = _init_canonical()
+
+# 形式毎の (要素の型, arrayの型コード, 1石あたりの値)
+FORMATS = {
+  'f': (ctypes.c_float, 'f', 1),
+  'h': (ctypes.c_int16, 'h', QUANT_SCALE),
+}
+
+# 型コードtypecodeの形式のファイル名
+def binary_file(typecode):
+  if typecode == 'h':
+    return WEIGHT_FILE_INT16
+  return WEIGHT_FILE
+
+def text_files(num_stages, weight_dir=WEIGHT_DIR):
+  return [os.path.join(weight_dir, "w" + str(stage) + ".txt") for stage in range(num_stages)]
+
+# 重みを読み込む. バイナリ形式が使えなければテキスト形式から作る
+# 返す重みはmmapしたファイル(書き込みはプロセス内だけに反映される)なので, 学習で書き換えても構わない
+def load(num_stages, num_patterns, file_name=WEIGHT_FILE, weight_dir=WEIGHT_DIR):
+  shared = share(num_stages, num_patterns, file_name, weight_dir)
+  if shared is None:  # 書き込めなければテキスト形式から読んだものを使う
+    return load_text(num_stages, num_patterns, weight_dir)
+  return shared.attach()
+
+# 重みのバイナリ形式(typecodeが'h'なら量子化形式)のファイルを共有するハンドルを返す.
+# ファイルが無いか古いか形式が合わなければテキスト形式から作る. 作れなければNone
+def share(num_stages, num_patterns, file_name=None, weight_dir=WEIGHT_DIR, typecode='f'):
+  file_name = file_name or binary_file(typecode)
+  if (not is_fresh(file_name, text_files(num_stages, weight_dir)) or
+      load_binary(file_name, num_stages, num_patterns, typecode) is None):
+    weight = load_text(num_stages, num_patterns, weight_dir)
+    if typecode == 'h':
+      weight = quantize(weight)
+    if not save(weight, num_patterns, file_name, typecode):
+      return None
+  return SharedWeights(file_name, num_stages, num_patterns, typecode)
+
+# プロセスがmmapした重み. 添字はファイル名. 同じファイルは1プロセスで1回だけmmapする
+_attached = {}
+
+# 複数のプロセスで1つの重みを共有するためのハンドル
+# ファイル名だけを持ち, pickleしてワーカーに渡すとワーカーはattachで同じファイルをmmapする.
+# ページはOSのページキャッシュを共有するので, ワーカーを増やしても重みの分のメモリは増えない.
+# 重みは読み取り専用として扱う(書き換えてもそのプロセス内だけに反映され, ページが複製される)
+class SharedWeights(object):
+  def __init__(self, file_name, num_stages, num_patterns, typecode='f'):
+    self.file_name = os.path.abspath(file_name)
+    self.num_stages = num_stages
+    self.num_patterns = tuple(num_patterns)
+    self.typecode = typecode
+    self.scale = FORMATS[typecode][2]  # 1石あたりの値
+
+  # このプロセスでmmapした重みを返す
+  def attach(self):
+    if self.file_name not in _attached:
+      weight = load_binary(self.file_name, self.num_stages, self.num_patterns, self.typecode)
+      if weight is None:
+        raise IOError("invalid weight file: " + self.file_name)
+      _attached[self.file_name] = weight
+    return _attached[self.file_name]
+
+  def __eq__(self, other):
+    return isinstance(other, SharedWeights) and self.file_name == other.file_name
+
+  def __ne__(self, other):
+    return not self == other
+
+  def __hash__(self):
+    return hash(self.file_name)
+
+# バイナリ形式のファイルがあり, どのテキスト形式のファイルよりも新しいか
+def is_fresh(file_name, text_file_names):
+  if not os.path.exists(file_name):
+    return False
+  mtime = os.path.getmtime(file_name)
+  return all(not os.path.exists(name) or os.path.getmtime(name) <= mtime for name in text_file_names)
+
+# バイナリ形式(typecodeが'h'なら量子化形式)の重みをmmapして返す.
+# ヘッダが形式・ステージ数・パターン毎の重みの数と合わなければNone
+def load_binary(file_name, num_stages, num_patterns, typecode='f'):
+  ctype, _, scale = FORMATS[typecode]
+  try:
+    f = open(file_name, 'rb')
+  except IOError:
+    return None
+  try:
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+  except (ValueError, mmap.error):
+    return None
+  finally:
+    f.close()
+  num_weights = _num_weights(num_patterns)
+  sizes = struct.Struct('=%dI' % len(num_weights))
+  offset = HEADER.size + sizes.size
+  if len(mm) != offset + num_stages * sum(num_weights) * ctypes.sizeof(ctype):
+    return None
+  magic, stages, patterns, file_scale = HEADER.unpack_from(mm)
+  if magic != MAGIC or stages != num_stages or patterns != len(num_patterns) or file_scale != scale:
+    return None
+  if list(sizes.unpack_from(mm, HEADER.size)) != num_weights:
+    return None
+  weight = []
+  for stage in range(num_stages):
+    weight.append([])
+    for size in num_weights:
+      weight[stage].append((ctype * size).from_buffer(mm, offset))
+      offset += size * ctypes.sizeof(ctype)
+  return weight
+
+# 重みをバイナリ形式(typecodeが'h'なら量子化形式. weightはquantizeしたもの)で書き出す. 書き込めなければFalse
+def save(weight, num_patterns, file_name=None, typecode='f'):
+  _, array_typecode, scale = FORMATS[typecode]
+  file_name = file_name or binary_file(typecode)
+  tmp_name = file_name + '.%d.tmp' % os.getpid()
+  try:
+    f = open(tmp_name, 'wb')
+    f.write(HEADER.pack(MAGIC, len(weight), len(num_patterns), scale))
+    f.write(struct.pack('=%dI' % len(num_patterns), *_num_weights(num_patterns)))
+    for stage in weight:
+      for table in stage:
+        f.write(array.array(array_typecode, table).tostring())
+    f.close()
+    os.rename(tmp_name, file_name)  # 書きかけのファイルを読まれないように置き換える
+  except (IOError, OSError):
+    return False
+  return True
+
+# 重みをQUANT_SCALE倍してint16に丸める
+def quantize(weight):
+  return [[[max(-32768, min(32767, int(round(value * QUANT_SCALE)))) for value in table] for table in stage]
+          for stage in weight]
+
+# パターン毎の重みの数. num_patternsはパターン毎のパターンの値の数(PATTERNSと同じ並びのもの)
+def _num_weights(num_patterns):
+  if list(num_patterns) != [3**length for length, _ in PATTERNS]:
+    raise ValueError("num_patterns does not match weights.PATTERNS")
+  return NUM_CANONICAL
+
+# テキスト形式の重みを読み込む. 対称形どうしの重みが違えば平均を取る
+def load_text(num_stages, num_patterns, weight_dir=WEIGHT_DIR):
+  num_weights = _num_weights(num_patterns)
+  weight = [[[0.0] * num_weights[j] for j in range(len(num_weights))] for k in range(num_stages)]
+  for stage, file_name in enumerate(text_files(num_stages, weight_dir)):
+    f = open(file_name, "r")
+    for feature, line in enumerate(f):
+      value = line.split(' ')
+      table = weight[stage][feature]
+      count = [0] * num_weights[feature]
+      for pattern, index in enumerate(CANONICAL[feature]):
+        table[index] += float(value[pattern])
+        count[index] += 1
+      for index in range(num_weights[feature]):
+        table[index] /= count[index]
+    f.close()
+  return weight
+
+# 重みをテキスト形式で書き出す. 対称形どうしには同じ重みを書く
+def save_text(weight, num_patterns, weight_dir=WEIGHT_DIR):
+  _num_weights(num_patterns)
+  for stage, file_name in enumerate(text_files(len(weight), weight_dir)):
+    f = open(file_name, "w")
+    for feature in range(len(num_patterns)):
+      table = weight[stage][feature]
+      for index in CANONICAL[feature]:
+        f.write(str(table[index])+" ")
+      f.write("\n")
+    f.close()
+
+def main():
+  import brain
+  num_stages, num_patterns = brain.BrainMid.NUM_STAGES, brain.BrainMid.NUM_PATTARNS
+  if len(sys.argv) < 2 or sys.argv[1] not in ('bin', 'int16', 'text'):
+    print "usage: python weights.py [bin|int16|text]"
+    return
+  if sys.argv[1] == 'bin':
+    if not save(load_text(num_stages, num_patterns), num_patterns):
+      print "cannot write", WEIGHT_FILE
+  elif sys.argv[1] == 'int16':
+    if not save(quantize(load_text(num_stages, num_patterns)), num_patterns, typecode='h'):
+      print "cannot write", WEIGHT_FILE_INT16
+  else:
+    weight = load_binary(WEIGHT_FILE, num_stages, num_patterns)
+    if weight is None:
+      print "invalid weight file:", WEIGHT_FILE
+      return
+    save_text(weight, num_patterns)
+
+if __name__ == "__main__":
+  main()